@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark package extraction and shared model migration on the example fixtures.
+
+For every FM package in examples/packages, runs
+ConsolidatedPackageExtractor.extract_package and then
+migrate_package_with_local_reports end to end, with the report specs in
+examples/Report XMLs DE whose modelPath names that package. The DAX / LLM API
+and the Cognos session check are answered by a local stub server with
+deterministic responses, so results only depend on the migrator.
+
+Each fixture runs in a fresh subprocess, so peak RSS is measured per fixture.
+Reported per fixture: wall time of extraction and migration, the migration's
+top-level steps from its timings.json, peak RSS, files and bytes written by
+the migration, write system calls of the whole run (from /proc/self/io, on
+Linux) and DAX API requests.
+
+--artifacts lean runs the fixtures with the lean artifact policy (see
+cognos_migrator/common/artifact_policy.py), so comparing a lean run with a
+full baseline shows the files, bytes and write calls it saves:
+    python benchmarks/bench_fixtures.py --save-baseline /tmp/full.json
+    python benchmarks/bench_fixtures.py --artifacts lean --compare /tmp/full.json
+
+Results can be saved as a baseline and compared against later, e.g. before
+and after a change:
+    python benchmarks/bench_fixtures.py --save-baseline /tmp/baseline.json
+    python benchmarks/bench_fixtures.py --compare /tmp/baseline.json
+Comparing exits with status 1 if a fixture got slower or bigger than the
+tolerance allows.
+
+Usage:
+    python benchmarks/bench_fixtures.py [--package NAME ...] [--max-size-kb N] [--repeat 1]
+                                        [--artifacts full|lean] [--save-baseline PATH]
+                                        [--compare PATH] [--tolerance 0.25]
+"""
+
+import argparse
+import datetime
+import hashlib
+import html
+import json
+import logging
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+PACKAGES_DIR = REPO_ROOT / 'examples' / 'packages'
+REPORTS_DIR = REPO_ROOT / 'examples' / 'Report XMLs DE'
+
+# Measurements compared against a baseline; lower is better for all of them
+COMPARED_METRICS = ('extract_s', 'migrate_s', 'peak_rss_mb', 'bytes_written', 'write_syscalls')
+
+_model_path_re = re.compile(r'<modelPath>(.*?)</modelPath>', re.S)
+_package_name_re = re.compile(r"package\[@name='([^']+)'\]")
+
+
+class StubServiceHandler(BaseHTTPRequestHandler):
+    """Deterministic stand-in for the DAX API and the Cognos session endpoint"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/health':
+            self._reply({"status": "healthy"})
+        elif path.endswith('/session'):
+            self._reply({"userName": "benchmark"})
+        else:
+            self._reply({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        payload = json.loads(body or b'{}')
+        path = self.path.split('?')[0]
+        if path == '/api/dax/convert':
+            expression = payload.get('cognos_expression', '')
+            digest = hashlib.sha1(expression.encode('utf-8')).hexdigest()[:8]
+            self._reply({"dax_expression": f"BLANK() /* {digest} */", "confidence": 0.9,
+                         "notes": "benchmark stub"})
+        elif path == '/api/mquery/validate':
+            self._reply({"is_valid": True, "issues": []})
+        elif path.startswith('/api/mquery/'):
+            self._reply({"m_query": "let\n    Source = #table({}, {})\nin\n    Source",
+                         "processing_time": 0.0, "validation_result": {"is_valid": True}})
+        else:
+            self._reply({"error": "not found"}, status=404)
+
+    def _reply(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def reports_for_package(package_name: str) -> list:
+    """Report specs in examples/Report XMLs DE whose modelPath names the package"""
+    reports = []
+    for report_file in sorted(REPORTS_DIR.glob('*.xml')):
+        match = _model_path_re.search(report_file.read_text(encoding='utf-8', errors='replace'))
+        if match:
+            package = _package_name_re.search(html.unescape(match.group(1)))
+            if package and package.group(1) == package_name:
+                reports.append(str(report_file))
+    return reports
+
+
+def write_syscalls() -> int:
+    """Number of write system calls made by this process so far, or 0 where unknown"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                if line.startswith('syscw:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def run_fixture(package_file: str, artifacts: str = 'full') -> dict:
+    """Extract and migrate one package with its reports in this process
+
+    Returns:
+        Dictionary with the measurements of the fixture
+    """
+    logging.disable(logging.CRITICAL)
+    stub = ThreadingHTTPServer(('127.0.0.1', 0), StubServiceHandler)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+    os.environ['DAX_API_URL'] = stub_url
+    os.environ['COGNOS_MIGRATOR_LLM_CACHE'] = 'off'
+
+    from cognos_migrator.common.artifact_policy import ArtifactPolicy, artifact_policy_scope
+    from cognos_migrator.extractors.packages import ConsolidatedPackageExtractor
+    from cognos_migrator.migrations.package import migrate_package_with_local_reports
+
+    package_name = Path(package_file).stem
+    reports = reports_for_package(package_name)
+    # Reports select the tables to migrate; without reports the whole package is migrated
+    settings = {
+        "date_table_mode": "visible",
+        "table_filtering": {"mode": "direct" if reports else "include-all", "always_include": []},
+        "staging_tables": {"enabled": False},
+        "artifacts": {"mode": artifacts},
+    }
+
+    work_dir = Path(tempfile.mkdtemp(prefix='bench_fixture_'))
+    try:
+        syscalls_before = write_syscalls()
+        start = time.perf_counter()
+        with artifact_policy_scope(ArtifactPolicy.from_settings(settings)):
+            ConsolidatedPackageExtractor(config=settings).extract_package(package_file, str(work_dir / 'extract'))
+        extract_s = time.perf_counter() - start
+
+        output_dir = work_dir / 'migration'
+        start = time.perf_counter()
+        succeeded = migrate_package_with_local_reports(package_file, str(output_dir), reports,
+                                                       f"{stub_url}/api/v1", "benchmark", settings=settings)
+        migrate_s = time.perf_counter() - start
+        syscalls = write_syscalls() - syscalls_before
+
+        timings = json.loads((output_dir / 'timings.json').read_text(encoding='utf-8'))
+        root_id = timings['spans'][0]['id']
+        stages = {}
+        for span in timings['spans']:
+            if span['parent_id'] == root_id and span['duration_ms'] is not None:
+                stages[span['name']] = round(stages.get(span['name'], 0) + span['duration_ms'] / 1000, 3)
+        counters = timings['counters']
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        stub.shutdown()
+
+    return {
+        "package_kb": os.path.getsize(package_file) // 1024,
+        "reports": len(reports),
+        "succeeded": bool(succeeded[0] if isinstance(succeeded, tuple) else succeeded),
+        "extract_s": round(extract_s, 3),
+        "migrate_s": round(migrate_s, 3),
+        "stages_s": stages,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "files_written": counters.get('files_written', 0),
+        "bytes_written": counters.get('bytes_written', 0),
+        "write_syscalls": syscalls,
+        "artifacts_skipped": counters.get('artifacts_skipped', 0),
+        "llm_requests": counters.get('llm_requests', 0),
+    }
+
+
+def measure(package_file: Path, repeat: int, artifacts: str = 'full') -> dict:
+    """Run a fixture in fresh interpreters and keep the fastest run"""
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', str(package_file), '--artifacts', artifacts],
+            check=True, capture_output=True, text=True, cwd=str(REPO_ROOT)
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result['extract_s'] + result['migrate_s'] < best['extract_s'] + best['migrate_s']:
+            best = result
+    return best
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """List the measurements that got worse than the baseline by more than tolerance"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get('fixtures', {}).get(name)
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            # Small absolute differences are noise, not regressions
+            floor = 0.05 if metric.endswith('_s') else 0
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append(f"{name}: {metric} {old} -> {new} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extraction and migration of the example packages')
+    parser.add_argument('--package', action='append', help='Only benchmark packages with this file stem')
+    parser.add_argument('--max-size-kb', type=int, help='Skip packages larger than this')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per fixture, the fastest is reported')
+    parser.add_argument('--artifacts', choices=('full', 'lean'), default='full',
+                        help='Artifact policy of the migrations (default: full)')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Write the results to a baseline JSON file')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results with a baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative increase over the baseline (default: 0.25)')
+    parser.add_argument('--worker', metavar='PACKAGE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_fixture(args.worker, args.artifacts)))
+        return
+
+    packages = sorted(PACKAGES_DIR.glob('*.xml'), key=lambda p: p.stat().st_size)
+    if args.package:
+        packages = [p for p in packages if p.stem in args.package]
+    if args.max_size_kb:
+        packages = [p for p in packages if p.stat().st_size // 1024 <= args.max_size_kb]
+
+    header = (f"{'package':<40} {'KB':>6} {'reports':>7} {'extract s':>9} {'migrate s':>9} "
+              f"{'RSS MB':>7} {'files':>6} {'KB written':>10} {'writes':>7}  slowest stages")
+    print(header)
+    print('-' * len(header))
+    results = {}
+    for package_file in packages:
+        result = results[package_file.stem] = measure(package_file, args.repeat, args.artifacts)
+        slowest = sorted(result['stages_s'].items(), key=lambda item: item[1], reverse=True)[:3]
+        print(f"{package_file.stem[:40]:<40} {result['package_kb']:>6} {result['reports']:>7} "
+              f"{result['extract_s']:>9.3f} {result['migrate_s']:>9.3f} {result['peak_rss_mb']:>7.1f} "
+              f"{result['files_written']:>6} {result['bytes_written'] // 1024:>10} {result['write_syscalls']:>7}  "
+              + ', '.join(f"{name} {seconds:.2f}" for name, seconds in slowest)
+              + ('' if result['succeeded'] else '  FAILED'))
+
+    if args.save_baseline:
+        baseline = {
+            "created": datetime.datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "artifacts": args.artifacts,
+            "fixtures": results,
+        }
+        Path(args.save_baseline).write_text(json.dumps(baseline, indent=2), encoding='utf-8')
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"\nCompared with baseline from {baseline.get('created')}: "
+              f"{len(regressions)} regression(s) over {args.tolerance:.0%}")
+        for regression in regressions:
+            print(f"  {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
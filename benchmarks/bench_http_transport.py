@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pooled HTTP transport against one-shot requests.post calls.
+
+Starts a local keep-alive stub of the DAX API and sends the same number of
+conversion requests, first with module-level requests.post (a new connection
+per request, the previous behaviour) and then through HTTPTransport, both
+sequentially and from a thread pool sized like a DAX conversion batch.
+
+Usage:
+    python benchmarks/bench_http_transport.py [--requests 500] [--workers 8] [--delay-ms 0]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a small DAX conversion result"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    delay_s = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        body = json.dumps({"dax_expression": "SUM(Sales[Amount])", "confidence": 0.9}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(send, count: int, workers: int) -> dict:
+    """Send count requests with the given function and return the timings
+
+    Args:
+        send: Function sending one request
+        count: Number of requests
+        workers: Number of concurrent senders; 1 sends sequentially
+
+    Returns:
+        Dictionary with total wall time and mean and p95 per-call latency
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def timed(_):
+        start = time.perf_counter()
+        send().raise_for_status()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    if workers == 1:
+        for i in range(count):
+            timed(i)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(timed, range(count)))
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "total_s": total,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    from cognos_migrator.http_transport import HTTPTransport
+
+    parser = argparse.ArgumentParser(description='Benchmark the pooled HTTP transport')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per run')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent senders for the parallel runs')
+    parser.add_argument('--delay-ms', type=float, default=0, help='Simulated service time per request')
+    args = parser.parse_args()
+
+    StubHandler.delay_s = args.delay_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/api/dax/convert'
+    payload = {"cognos_formula": "total([Sales].[Amount])", "table_name": "Sales"}
+
+    transport = HTTPTransport(pool_size=args.workers)
+    modes = [
+        ('requests.post', lambda: requests.post(url, json=payload, timeout=30)),
+        ('HTTPTransport', lambda: transport.post(url, json=payload)),
+    ]
+
+    header = f"{'client':<16} {'workers':>7} {'total s':>8} {'mean ms':>8} {'p95 ms':>7} {'req/s':>8}"
+    print(header)
+    print('-' * len(header))
+    for workers in (1, args.workers):
+        for name, send in modes:
+            result = run(send, args.requests, workers)
+            print(f"{name:<16} {workers:>7} {result['total_s']:>8.3f} {result['mean_ms']:>8.2f} "
+                  f"{result['p95_ms']:>7.2f} {args.requests / result['total_s']:>8.0f}")
+
+    stats = transport.metrics.snapshot()
+    print(f"\nHTTPTransport: {stats['requests']} requests, {stats['retries']} retries, {stats['errors']} errors")
+    transport.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-report setup: migrate_single_report versus a MigrationRuntime.
+
+Copies an example report XML to a temporary directory N times and migrates
+every copy through migrate_report_from_file, first with migrate_single_report
+(logging, Cognos client, templates, LLM client and extractors set up for each
+report, the previous behaviour) and then through one MigrationRuntime. A
+local stub answers the Cognos session check and the DAX API, so the numbers
+measure setup and migration work rather than network timeouts.
+
+Usage:
+    python benchmarks/bench_migration_runtime.py [--reports 100] [--report PATH]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+DEFAULT_REPORT = REPO_ROOT / 'examples' / 'Report XMLs DE' / 'PartNumbers_UC013.xml'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Accepts every Cognos session check and answers the DAX API"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json({"status": "healthy", "isAnonymous": False})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._send_json({"dax_expression": "SUM(Sales[Amount])", "confidence": 0.9})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(migrate, report_files, output_root: Path) -> dict:
+    """Migrate every report file and return the timings
+
+    Args:
+        migrate: Function migrating one report file into an output directory
+        report_files: Report XML files
+        output_root: Directory receiving one output folder per report
+
+    Returns:
+        Dictionary with total wall time, mean and p95 per-report time and failures
+    """
+    durations = []
+    failures = 0
+    start = time.perf_counter()
+    for path in report_files:
+        report_start = time.perf_counter()
+        if not migrate(str(path), str(output_root / path.stem)):
+            failures += 1
+        durations.append(time.perf_counter() - report_start)
+    total = time.perf_counter() - start
+
+    durations.sort()
+    return {
+        "total_s": total,
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-report migration setup')
+    parser.add_argument('--reports', type=int, default=100, help='Number of report copies to migrate')
+    parser.add_argument('--report', type=Path, default=DEFAULT_REPORT, help='Report XML to copy')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f'http://127.0.0.1:{server.server_address[1]}'
+    cognos_url = f'{stub_url}/api/v1'
+
+    work_dir = Path(tempfile.mkdtemp(prefix='bench_runtime_'))
+    os.environ['DAX_API_URL'] = stub_url
+    os.environ['COGNOS_MIGRATOR_LLM_CACHE'] = 'off'
+    os.environ['COGNOS_MIGRATOR_LOG_LEVEL'] = 'error'
+    # configure_logging writes its log files to ./logs
+    os.chdir(work_dir)
+
+    from cognos_migrator.migrations.report import migrate_single_report
+    from cognos_migrator.runtime import MigrationRuntime
+
+    report_files = []
+    for i in range(args.reports):
+        path = work_dir / 'reports' / f'report_{i:04d}.xml'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(args.report, path)
+        report_files.append(path)
+
+    def fresh(path, output_path):
+        return migrate_single_report(output_path=output_path, cognos_url=cognos_url,
+                                     session_key='session', report_file_path=path)
+
+    setup_start = time.perf_counter()
+    runtime = MigrationRuntime(cognos_url, 'session')
+    setup_s = time.perf_counter() - setup_start
+
+    def reused(path, output_path):
+        return runtime.migrate_report(output_path=output_path, report_file_path=path)
+
+    header = f"{'setup':<24} {'reports':>7} {'total s':>8} {'mean ms':>8} {'p95 ms':>7} {'failed':>6}"
+    print(f"Report: {args.report.name}, runtime setup: {setup_s * 1000:.0f} ms")
+    print(header)
+    print('-' * len(header))
+    for name, migrate in (('migrate_single_report', fresh), ('MigrationRuntime', reused)):
+        result = run(migrate, report_files, work_dir / name)
+        print(f"{name:<24} {len(report_files):>7} {result['total_s']:>8.3f} {result['mean_ms']:>8.2f} "
+              f"{result['p95_ms']:>7.2f} {result['failures']:>6}")
+
+    runtime.close()
+    server.shutdown()
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory held by the data model of a consolidated FM package.
+
+Extracts an example package with ConsolidatedPackageExtractor (the largest one
+by default), converts it to a DataModel and measures with tracemalloc what a
+deep copy of the model allocates, as _migrate_shared_model and the staging
+table handlers copy it. The same model is also copied as plain, unslotted
+dataclasses with an annotations dict per column (the previous model
+classes), so the two rows compare the object overhead of the model types.
+Strings are shared by deep copies and not counted in either row.
+
+Usage:
+    python benchmarks/bench_model_memory.py [--package NAME] [--packages-dir examples/packages]
+"""
+
+import argparse
+import copy
+import dataclasses
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from cognos_migrator.models import Column, DataModel, Measure, Relationship, Table
+
+MODEL_CLASSES = (Column, Table, Relationship, Measure, DataModel)
+
+
+def plain_classes() -> dict:
+    """Unslotted dataclasses with the fields of the model classes
+
+    Column gets no metadata field, the previous classes added it only to the
+    columns that needed one.
+    """
+    plain = {}
+    for cls in MODEL_CLASSES:
+        model_fields = [(f.name, f.type, dataclasses.field(default=None))
+                        for f in dataclasses.fields(cls) if not (cls is Column and f.name == 'metadata')]
+        plain[cls] = dataclasses.make_dataclass(f"Plain{cls.__name__}", model_fields)
+    return plain
+
+
+def to_plain(value, plain: dict):
+    """Copy a model into the plain classes, giving every column its own annotations dict"""
+    if isinstance(value, list):
+        return [to_plain(item, plain) for item in value]
+    if type(value) not in plain:
+        return value
+    kwargs = {f.name: to_plain(getattr(value, f.name), plain) for f in dataclasses.fields(plain[type(value)])}
+    if isinstance(value, Column):
+        kwargs['annotations'] = dict(value.annotations)
+    converted = plain[type(value)](**kwargs)
+    if isinstance(value, Column) and value.metadata:
+        converted.metadata = value.metadata
+    return converted
+
+
+def measure_copy(model) -> dict:
+    """Bytes allocated and time taken by a deep copy of the model"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    copied = copy.deepcopy(model)
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copied
+    return {"bytes": allocated, "copy_s": elapsed}
+
+
+def build_model(package_file: Path) -> DataModel:
+    """Extract the package and convert it to a data model, with every query subject as a table"""
+    from cognos_migrator.extractors.packages import ConsolidatedPackageExtractor
+
+    extractor = ConsolidatedPackageExtractor()
+    with tempfile.TemporaryDirectory() as output_dir:
+        package_info = extractor.extract_package(str(package_file), output_dir)
+        return extractor.convert_to_data_model(package_info)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the memory of a consolidated package data model')
+    parser.add_argument('--packages-dir', default=str(REPO_ROOT / 'examples' / 'packages'),
+                        help='Directory containing FM package XML files')
+    parser.add_argument('--package', help='File stem of the package, the largest one by default')
+    args = parser.parse_args()
+
+    packages = sorted(Path(args.packages_dir).glob('*.xml'), key=lambda p: p.stat().st_size)
+    package_file = next(p for p in packages if p.stem == args.package) if args.package else packages[-1]
+
+    logging.disable(logging.CRITICAL)
+    model = build_model(package_file)
+    columns = sum(len(table.columns) for table in model.tables)
+    measures = len(model.measures) + sum(len(table.measures) for table in model.tables)
+    print(f"{package_file.stem}: {len(model.tables)} tables, {columns} columns, "
+          f"{len(model.relationships)} relationships, {measures} measures")
+
+    plain = to_plain(model, plain_classes())
+    header = f"{'model classes':<16} {'KB':>10} {'bytes/column':>13} {'deepcopy s':>11}"
+    print(header)
+    print('-' * len(header))
+    for label, instance in (('plain', plain), ('slotted', model)):
+        result = measure_copy(instance)
+        print(f"{label:<16} {result['bytes'] / 1024:>10.1f} {result['bytes'] / max(columns, 1):>13.1f} "
+              f"{result['copy_s']:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark parse-once package extraction against per-extractor parsing.
+
+Runs the structure, query subject, relationship, calculation, filter and SQL
+relationship extractors over the example FM packages, once with every
+extractor parsing the package file itself (the previous behaviour) and once
+with a single shared ParsedPackage. Each run happens in a fresh subprocess so
+peak RSS is measured per mode.
+
+Usage:
+    python benchmarks/bench_package_parse.py [--packages-dir examples/packages] [--package NAME ...]
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def run_extraction(package_file: str, mode: str) -> dict:
+    """Run all package extractors once in the requested mode
+
+    Args:
+        package_file: Path to the FM package file
+        mode: 'per-extractor' to let every extractor parse the file, 'shared' to parse once
+
+    Returns:
+        Dictionary with wall time and peak RSS
+    """
+    from cognos_migrator.extractors.packages import (
+        PackageStructureExtractor, PackageQuerySubjectExtractor, PackageRelationshipExtractor,
+        PackageCalculationExtractor, PackageFilterExtractor, ParsedPackage
+    )
+    from cognos_migrator.extractors.packages.sql_relationship_extractor import SQLRelationshipExtractor
+
+    logging.disable(logging.CRITICAL)
+    extractors = [PackageStructureExtractor(), PackageQuerySubjectExtractor(), PackageRelationshipExtractor(),
+                  PackageCalculationExtractor(), PackageFilterExtractor()]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        if mode == 'shared':
+            parsed_package = ParsedPackage.from_file(package_file)
+            for extractor in extractors:
+                extractor.extract_and_save(package_file, output_dir, parsed_package)
+            SQLRelationshipExtractor().extract_and_save(package_file, output_dir, parsed_package=parsed_package)
+        else:
+            # ConsolidatedPackageExtractor used to parse once for namespaces, then each extractor again
+            root = ET.parse(package_file).getroot()
+            for extractor in extractors:
+                extractor.update_namespaces_from_root(root)
+                extractor.extract_and_save(package_file, output_dir)
+            SQLRelationshipExtractor().extract_and_save(package_file, output_dir)
+        elapsed = time.perf_counter() - start
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"wall_time_s": round(elapsed, 3), "peak_rss_mb": round(peak_rss_mb, 1)}
+
+
+def measure(package_file: str, mode: str) -> dict:
+    """Run one extraction in a fresh interpreter and return its measurements"""
+    output = subprocess.run(
+        [sys.executable, __file__, '--worker', mode, package_file],
+        check=True, capture_output=True, text=True, cwd=str(REPO_ROOT)
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parse-once FM package extraction')
+    parser.add_argument('--packages-dir', default=str(REPO_ROOT / 'examples' / 'packages'),
+                        help='Directory containing FM package XML files')
+    parser.add_argument('--package', action='append', help='Only benchmark packages with this file stem')
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'PACKAGE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_extraction(args.worker[1], args.worker[0])))
+        return
+
+    packages = sorted(Path(args.packages_dir).glob('*.xml'), key=lambda p: p.stat().st_size)
+    if args.package:
+        packages = [p for p in packages if p.stem in args.package]
+
+    header = f"{'package':<40} {'size KB':>8} {'before s':>9} {'after s':>8} {'before MB':>10} {'after MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for package_file in packages:
+        before = measure(str(package_file), 'per-extractor')
+        after = measure(str(package_file), 'shared')
+        print(f"{package_file.stem[:40]:<40} {os.path.getsize(package_file) // 1024:>8} "
+              f"{before['wall_time_s']:>9.3f} {after['wall_time_s']:>8.3f} "
+              f"{before['peak_rss_mb']:>10.1f} {after['peak_rss_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
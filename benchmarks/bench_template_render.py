@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark table TMDL rendering and Jinja2 context preparation.
+
+Builds a synthetic model of wide tables and writes one TMDL file per table,
+first rendering Table.tmdl with pybars into a string (the previous
+behaviour) and then streaming it with the table writer. It then renders the
+relationships and model templates with a context of the same size, with
+eager *_json keys for every context value (the previous behaviour) and with
+the lazy context that only prepares referenced variables.
+
+Usage:
+    python benchmarks/bench_template_render.py [--tables 300] [--columns 60] [--repeat 3]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+TEMPLATE_DIR = REPO_ROOT / 'cognos_migrator' / 'templates'
+
+
+def table_context(index: int, columns: int) -> dict:
+    """Context shaped like the generators' table contexts"""
+    name = f"Fact Sales {index}"
+    return {
+        'name': name,
+        'source_name': name,
+        'has_spaces_or_special_chars': True,
+        'columns': [
+            {
+                'source_name': f"Column {i}",
+                'datatype': 'decimal' if i % 3 else 'string',
+                'source_column': f"COLUMN_{i}",
+                'is_calculated': i % 10 == 9,
+                'summarize_by': 'sum' if i % 3 else 'none',
+                'format_string': '#,0.00' if i % 3 else None,
+                'annotations': {'SummarizationSetBy': 'Automatic'},
+            }
+            for i in range(columns)
+        ],
+        'measures': [{'name': f"Total {i}", 'expression': f"SUM('{name}'[Column {i}])"} for i in range(5)],
+        'partitions': [{
+            'name': name, 'source_type': 'm', 'mode': 'import',
+            'expression': 'let\n    Source = Sql.Database("server", "db")\nin\n    Source',
+        }],
+    }
+
+
+def timed(function, repeat: int) -> float:
+    """Best wall time of repeat runs in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    from cognos_migrator.generators.template_engine import TemplateEngine, get_render_metrics
+
+    parser = argparse.ArgumentParser(description='Benchmark template rendering')
+    parser.add_argument('--tables', type=int, default=300, help='Number of tables')
+    parser.add_argument('--columns', type=int, default=60, help='Columns per table')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode, the best is reported')
+    args = parser.parse_args()
+
+    engine = TemplateEngine(str(TEMPLATE_DIR))
+    eager_engine = TemplateEngine(str(TEMPLATE_DIR), lazy_context=False)
+    contexts = [table_context(i, args.columns) for i in range(args.tables)]
+    output_dir = Path(tempfile.mkdtemp(prefix='bench_render_'))
+
+    def pybars_to_string():
+        for i, context in enumerate(contexts):
+            content = engine.templates['table'](context)
+            with open(output_dir / f"table_{i}.tmdl", 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    def streaming_writer():
+        for i, context in enumerate(contexts):
+            engine.render_to_file('table', context, output_dir / f"table_{i}.tmdl")
+
+    relationships = {'relationships': [
+        {'id': f"rel_{i}", 'from_table': f"'Fact Sales {i}'", 'from_column': 'Key', 'to_table': 'Dim',
+         'to_column': 'Key', 'cardinality_type': 'toCardinality', 'cardinality_value': 'one',
+         'cross_filtering_behavior': 'oneDirection', 'is_active': True, 'join_on_date_behavior': None}
+        for i in range(args.tables)
+    ]}
+    model = {'model_name': 'Model', 'tables': [f"Fact Sales {i}" for i in range(args.tables)],
+             'default_culture': 'en-US', 'time_intelligence_enabled': 'true', 'desktop_version': '2.118',
+             # Extra, unreferenced context such as generators pass along
+             'data_model': contexts}
+
+    def jinja(selected_engine):
+        def render():
+            selected_engine.render('relationship', relationships)
+            selected_engine.render('model', model)
+        return render
+
+    print(f"{args.tables} tables x {args.columns} columns, best of {args.repeat}")
+    header = f"{'mode':<34} {'total ms':>9} {'per table ms':>13}"
+    print(header)
+    print('-' * len(header))
+    for name, function in (('table: pybars string + write', pybars_to_string),
+                           ('table: streaming writer', streaming_writer),
+                           ('jinja: eager *_json context', jinja(eager_engine)),
+                           ('jinja: lazy context', jinja(engine))):
+        elapsed = timed(function, args.repeat)
+        print(f"{name:<34} {elapsed * 1000:>9.1f} {elapsed * 1000 / args.tables:>13.3f}")
+
+    table_stats = get_render_metrics().snapshot()['table']
+    print(f"\nRender histogram for 'table' (ms upper bound: count): {table_stats['buckets']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ Main Functions:
     post_process_module_with_explicit_session: Post-process migrated modules
     migrate_package_with_explicit_session: Migrate a Cognos Framework Manager package
     migrate_package_with_reports_explicit_session: Migrate a package with its reports
+    MigrationRuntime: Reusable setup for migrating many reports, modules and packages
 
 Examples:
     import cognos_migrator
@@ -52,6 +53,7 @@ from .migrations import (
     migrate_package_with_explicit_session,
     migrate_package_with_reports_explicit_session
     )
+from .runtime import MigrationRuntime
 
 # Import key exception classes for error handling
 from .client import CognosAPIError
@@ -73,6 +75,9 @@ __all__ = [
     'migrate_package_with_reports_explicit_session',
     'migrate_package_with_local_reports',
     
+    # Batch migrations
+    'MigrationRuntime',
+    
     # Exception handling
     'CognosAPIError'
 ]
\ No newline at end of file
@@ -1,18 +1,32 @@
 """Cognos Analytics REST API Client."""
 
+import contextvars
 import json
 import logging
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 
 import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
+from .common.tracing import count_http_request
 from .config import CognosConfig
 from .models import CognosObject, DataSource, ObjectType, CognosReport
 
 __all__ = ['CognosAPIError', 'CognosClient']
 
+# Fields requested when crawling folders: what _convert_to_cognos_object reads
+CRAWL_FIELDS = 'id,type,defaultName,defaultDescription,modificationTime,owner,permissions'
+
+# Object types whose children are listed by the crawler
+CONTAINER_TYPES = ('folder', 'package')
+
+_CRAWL_DONE = object()
+
 
 class CognosAPIError(Exception):
     """Custom exception for Cognos API errors"""
@@ -33,7 +47,7 @@ class CognosClient:
             # Direct initialization with session
             self.config = config
             self.base_url = base_url
-            self.session = requests.Session()
+            self.session = self._create_session()
             self.session.headers[self.config.auth_key] = session_key
             self.logger = logging.getLogger(__name__)
             self.auth_token = session_key
@@ -45,7 +59,7 @@ class CognosClient:
             self.authenticated = True
         else: 
             self.config = config
-            self.session = requests.Session()
+            self.session = self._create_session()
             self.session.headers.update({
                 'Content-Type': 'application/json',
                 'Accept': 'application/json'
@@ -54,6 +68,14 @@ class CognosClient:
             self.auth_token = None
             self._authenticate()
     
+    def _create_session(self) -> requests.Session:
+        """Create the HTTP session, with enough pooled connections for the folder crawler"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(DEFAULT_POOLSIZE, self.config.crawl_concurrency))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
     @staticmethod
     def test_connection_with_session(cognos_url: str, session_key: str) -> bool:
         """Test connection to Cognos using only URL and session key
@@ -283,6 +305,7 @@ class CognosClient:
                     timeout=self.config.request_timeout,
                     **kwargs
                 )
+                count_http_request('cognos', response)
                 
                 if response.status_code == 401 and attempt == 0:
                     self.logger.warning("Authentication failed, attempting to re-authenticate")
@@ -293,6 +316,8 @@ class CognosClient:
                 return response
                 
             except requests.exceptions.RequestException as e:
+                if getattr(e, 'response', None) is None:
+                    count_http_request('cognos')
                 self.logger.warning(f"Request attempt {attempt + 1} failed: {e}")
                 if attempt == self.config.max_retries - 1:
                     raise CognosAPIError(f"Request failed after {self.config.max_retries} attempts: {e}")
@@ -368,7 +393,7 @@ class CognosClient:
                 objects.append(cognos_obj)
                 
                 # Recursively get child objects
-                if obj.get('type') in ['folder', 'package']:
+                if obj.get('type') in CONTAINER_TYPES:
                     child_objects = self._get_all_child_objects(obj['id'])
                     objects.extend(child_objects)
         
@@ -379,23 +404,85 @@ class CognosClient:
         return objects
     
     def _get_all_child_objects(self, parent_id: str) -> List[CognosObject]:
-        """Recursively get all child objects"""
-        objects = []
-        try:
-            child_items = self.list_child_objects(parent_id)
-            for item in child_items:
-                cognos_obj = self._convert_to_cognos_object(item)
-                objects.append(cognos_obj)
+        """Recursively get all child objects, in depth-first order"""
+        found = sorted(self.crawl_folder(parent_id, CONTAINER_TYPES), key=lambda entry: entry[0])
+        return [self._convert_to_cognos_object(item) for _, item in found]
+    
+    def crawl_folder(self, folder_id: str, container_types: Iterable[str] = ('folder',),
+                     fields: Optional[str] = CRAWL_FIELDS,
+                     max_concurrency: Optional[int] = None) -> Iterator[Tuple[Tuple[int, ...], Dict[str, Any]]]:
+        """Crawl a folder tree breadth-first, listing sibling folders concurrently
+        
+        Listings run on a pool of max_concurrency threads in the background and
+        items are yielded as soon as their folder listing arrives, so callers can
+        start working on the first items while the rest of the tree is crawled.
+        A folder that cannot be listed is logged and skipped, like the
+        recursive walk did.
+        
+        Args:
+            folder_id: ID of the folder to crawl
+            container_types: Object types whose children are listed as well;
+                empty to list only the folder itself
+            fields: Fields requested for every item, None for the server default
+            max_concurrency: Maximum number of concurrent folder listings
+                (default: CognosConfig.crawl_concurrency)
+            
+        Yields:
+            Tuples of (position, item) in discovery order. position holds the
+            item's index in each folder on its path, so sorting by position gives
+            the depth-first order of a recursive walk.
+        """
+        container_types = frozenset(container_types)
+        concurrency = max(1, max_concurrency or self.config.crawl_concurrency)
+        found = queue.Queue()
+        stopped = threading.Event()
+        pending_lock = threading.Lock()
+        pending = [1]
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cognos-crawler")
+        
+        def list_folder(parent_id: str, position: Tuple[int, ...]):
+            try:
+                if stopped.is_set():
+                    return
+                try:
+                    items = self.list_child_objects(parent_id, fields=fields)
+                except Exception as e:
+                    self.logger.warning(f"Failed to list child objects of {parent_id}: {e}")
+                    items = []
                 
-                # Recursively get children if it's a container
-                if item.get('type') in ['folder', 'package']:
-                    child_objects = self._get_all_child_objects(item['id'])
-                    objects.extend(child_objects)
+                for index, item in enumerate(items):
+                    if not isinstance(item, dict):
+                        self.logger.warning(f"Expected dict item, got {type(item)}: {item}")
+                        continue
+                    item_position = position + (index,)
+                    found.put((item_position, item))
                     
-        except Exception as e:
-            self.logger.warning(f"Failed to get child objects for {parent_id}: {e}")
-            
-        return objects
+                    if item.get('type') in container_types and item.get('id') and not stopped.is_set():
+                        with pending_lock:
+                            pending[0] += 1
+                        try:
+                            executor.submit(contextvars.copy_context().run, list_folder, item['id'], item_position)
+                        except RuntimeError:
+                            # The consumer stopped the crawl and the pool is shut down
+                            with pending_lock:
+                                pending[0] -= 1
+            finally:
+                with pending_lock:
+                    pending[0] -= 1
+                    if pending[0] == 0:
+                        found.put(_CRAWL_DONE)
+        
+        # Listings run in the caller's context, so their requests are counted in its trace
+        executor.submit(contextvars.copy_context().run, list_folder, folder_id, ())
+        try:
+            while True:
+                entry = found.get()
+                if entry is _CRAWL_DONE:
+                    break
+                yield entry
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def _convert_to_cognos_object(self, api_obj: Dict[str, Any]) -> CognosObject:
         """Convert API response to CognosObject"""
@@ -530,40 +617,31 @@ class CognosClient:
             return None
     
     def list_reports_in_folder(self, folder_id: str, recursive: bool = True) -> List[CognosObject]:
-        """List all reports in a folder"""
-        reports = []
-        try:
-            # Get items in folder
-            items = self.list_child_objects(folder_id)
-            
-            # Ensure items is a list
-            if not isinstance(items, list):
-                self.logger.warning(f"Expected list from list_child_objects, got {type(items)}")
-                return reports
-            
-            for item in items:
-                # Ensure item is a dictionary
-                if not isinstance(item, dict):
-                    self.logger.warning(f"Expected dict item, got {type(item)}: {item}")
-                    continue
-                    
-                item_type = item.get('type', '')
-                if item_type == 'report':
-                    cognos_obj = self._convert_to_cognos_object(item)
-                    reports.append(cognos_obj)
-                elif recursive and item_type == 'folder':
-                    # Recursively get reports from subfolders
-                    item_id = item.get('id', '')
-                    if item_id:
-                        sub_reports = self.list_reports_in_folder(item_id, recursive)
-                        reports.extend(sub_reports)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to list reports in folder {folder_id}: {e}")
-            import traceback
-            self.logger.debug(f"Full traceback: {traceback.format_exc()}")
+        """List all reports in a folder, in depth-first order"""
+        container_types = ('folder',) if recursive else ()
+        found = sorted(
+            (entry for entry in self.crawl_folder(folder_id, container_types) if entry[1].get('type') == 'report'),
+            key=lambda entry: entry[0]
+        )
+        return [self._convert_to_cognos_object(item) for _, item in found]
+    
+    def iter_reports_in_folder(self, folder_id: str, recursive: bool = True,
+                               max_concurrency: Optional[int] = None) -> Iterator[CognosObject]:
+        """Yield the reports in a folder as they are discovered
+        
+        Unlike list_reports_in_folder this does not wait for the whole tree:
+        subfolders are crawled concurrently in the background while the
+        caller processes the first reports. The order follows discovery.
         
-        return reports
+        Args:
+            folder_id: ID of the folder
+            recursive: Whether to include reports in subfolders
+            max_concurrency: Maximum number of concurrent folder listings
+        """
+        container_types = ('folder',) if recursive else ()
+        for _, item in self.crawl_folder(folder_id, container_types, max_concurrency=max_concurrency):
+            if item.get('type') == 'report':
+                yield self._convert_to_cognos_object(item)
     
     def export_report(self, report_id: str, format_type: str = 'XML') -> Optional[bytes]:
         """Export report in specified format"""
@@ -0,0 +1,250 @@
+"""
+Policy for the intermediate artifacts a migration writes to extracted/.
+
+Besides the files later steps read back (table JSON, report queries and data
+items, calculations, relationships, ...), every migration writes files that
+are only there to investigate a migration: formatted copies of the report
+specification and package XML, the consolidated package JSON, the SQL join
+CSV and more. All of them are indented for reading.
+
+In "full" mode (the default) everything is written as before. In "lean" mode
+the investigation-only files listed in DEBUG_ARTIFACTS are not written at all,
+and the remaining JSON artifacts are written without indentation. The policy
+is set per migration with artifact_policy_scope() and applies to every
+artifact written inside the block, including in worker threads started with
+run_ordered. Code writing an artifact asks the current policy whether and
+how to write it, through write_json_artifact(), json_dump_options() and
+should_write_artifact().
+
+Settings (``artifacts`` section):
+    mode: "full" or "lean"
+    keep: File name patterns still written in lean mode, e.g. ["cognos_report.json"]
+    skip: File name patterns never written, in either mode
+"""
+
+import contextvars
+import fnmatch
+import functools
+import inspect
+import json
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Union
+
+from cognos_migrator.common.tracing import add_count
+
+PathLike = Union[str, Path]
+
+ARTIFACT_MODES = ('full', 'lean')
+
+# Files written only to investigate a migration; nothing in the migration reads them back.
+# File name patterns, matched with fnmatch.
+DEBUG_ARTIFACTS = (
+    # Report specification
+    'report_specification_formatted.xml',
+    'report_layout_specification.xml',
+    'report_query_specification.xml',
+    'cognos_report.json',
+    'report_metadata.json',
+    'report_layout.json',
+    'report_parameters.json',
+    # Copies of the generated model and report files
+    'database.json',
+    'model.json',
+    'culture.json',
+    'version.json',
+    'date_table_*.json',
+    'report_config.json',
+    'report_settings.json',
+    # Package
+    '*_formatted.xml',
+    '*_consolidated.json',
+    'package_info.json',
+    'package_structure.json',
+    'sql_relationships.json',
+    'sql_relationship_joins.csv',
+    # Module
+    'module_info.json',
+    'module_metadata.json',
+    'parsed_module.json',
+    'module_structure.json',
+    'query_items.json',
+    'query_data.json',
+    'all_items.json',
+    'calculated_items.json',
+    'cognos_hierarchies.json',
+    'powerbi_hierarchies.json',
+    'hierarchy_data.json',
+    'cognos_relationships.json',
+    'source_data.json',
+)
+
+_INDENTED = {'indent': 2}
+_COMPACT = {'separators': (',', ':')}
+
+
+class ArtifactPolicy:
+    """Which intermediate artifacts are written, and how"""
+
+    def __init__(self, mode: str = 'full', keep: Iterable[str] = (), skip: Iterable[str] = ()):
+        """
+        Args:
+            mode: "full" writes every artifact indented, "lean" skips DEBUG_ARTIFACTS
+                and writes JSON compactly
+            keep: File name patterns written even if lean mode would skip them
+            skip: File name patterns never written
+        """
+        if mode not in ARTIFACT_MODES:
+            raise ValueError(f"Unknown artifact mode {mode!r}, expected one of {ARTIFACT_MODES}")
+        self.mode = mode
+        self.keep = tuple(keep)
+        self.skip = tuple(skip)
+
+    @property
+    def lean(self) -> bool:
+        return self.mode == 'lean'
+
+    @classmethod
+    def from_settings(cls, settings: Union[Mapping[str, Any], str, None] = None,
+                      migration_config: Any = None) -> 'ArtifactPolicy':
+        """Get the policy configured in the settings and migration configuration
+
+        The artifact_mode of the migration configuration, when set, takes
+        precedence over the mode in the settings. Invalid settings are logged
+        and the full mode is used.
+
+        Args:
+            settings: Settings dictionary, path of a settings JSON file, or None
+                for settings.json in the working directory
+            migration_config: MigrationConfig of the migration, if any
+        """
+        section = _load_settings(settings).get('artifacts') or {}
+        mode = getattr(migration_config, 'artifact_mode', None) or section.get('mode', 'full')
+        try:
+            return cls(mode, keep=section.get('keep') or (), skip=section.get('skip') or ())
+        except (ValueError, TypeError) as e:
+            logging.getLogger(__name__).warning(f"Invalid artifact settings, writing all artifacts: {e}")
+            return cls()
+
+    def should_write(self, path: PathLike) -> bool:
+        """Check whether the artifact at path is written"""
+        name = os.path.basename(path)
+        if _matches(name, self.skip):
+            return False
+        if self.lean and _matches(name, DEBUG_ARTIFACTS):
+            return _matches(name, self.keep)
+        return True
+
+    def json_dump_options(self) -> Dict[str, Any]:
+        """Keyword arguments for json.dump of an artifact"""
+        return dict(_COMPACT if self.lean else _INDENTED)
+
+    def __repr__(self) -> str:
+        return f"ArtifactPolicy(mode={self.mode!r}, keep={list(self.keep)}, skip={list(self.skip)})"
+
+
+_DEFAULT_POLICY = ArtifactPolicy()
+
+_current_policy: contextvars.ContextVar = contextvars.ContextVar('cognos_artifact_policy', default=_DEFAULT_POLICY)
+
+
+def _matches(name: str, patterns: Iterable[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def _load_settings(settings: Union[Mapping[str, Any], str, None]) -> Mapping[str, Any]:
+    if isinstance(settings, Mapping):
+        return settings
+    path = settings if isinstance(settings, str) else 'settings.json'
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+        return loaded if isinstance(loaded, Mapping) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def get_artifact_policy() -> ArtifactPolicy:
+    """Get the artifact policy of the current migration; the full policy outside a scope"""
+    return _current_policy.get()
+
+
+@contextmanager
+def artifact_policy_scope(policy: Optional[ArtifactPolicy]) -> Iterator[ArtifactPolicy]:
+    """Apply the policy to the artifacts written inside the block
+
+    Args:
+        policy: Policy to apply, or None to keep the current one
+    """
+    if policy is None:
+        yield get_artifact_policy()
+        return
+    token = _current_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _current_policy.reset(token)
+
+
+def artifact_policy_from(argument: str) -> Callable:
+    """Decorator running a migration function under the policy of its settings argument
+
+    Args:
+        argument: Name of the function's settings parameter (a settings
+            dictionary, settings file path or None)
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            settings = signature.bind(*args, **kwargs).arguments.get(argument)
+            with artifact_policy_scope(ArtifactPolicy.from_settings(settings)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def applies_artifact_policy(method: Callable) -> Callable:
+    """Decorator running a migrator method under the migrator's artifact_policy
+
+    A migrator whose artifact_policy is None keeps the current policy.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with artifact_policy_scope(getattr(self, 'artifact_policy', None)):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def should_write_artifact(path: PathLike) -> bool:
+    """Check whether the current policy writes the artifact at path; counts skipped artifacts"""
+    if get_artifact_policy().should_write(path):
+        return True
+    add_count('artifacts_skipped')
+    return False
+
+
+def json_dump_options() -> Dict[str, Any]:
+    """Keyword arguments for json.dump of an artifact under the current policy"""
+    return get_artifact_policy().json_dump_options()
+
+
+def write_json_artifact(path: PathLike, data: Any, ensure_ascii: bool = True) -> bool:
+    """Write a JSON artifact as the current policy says
+
+    Args:
+        path: File to write
+        data: JSON-serializable document
+        ensure_ascii: Passed to json.dump
+
+    Returns:
+        True if the artifact was written, False if the policy skips it
+    """
+    if not should_write_artifact(path):
+        return False
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=ensure_ascii, **json_dump_options())
+    return True
@@ -0,0 +1,239 @@
+"""
+In-memory store for the JSON documents a migration writes to extracted/.
+
+Model generation used to write every table_<name>.json to disk and then read
+it back several times: to build the TMDL, to look up the original M-query in
+the staging handlers, for the package M-query converter, and to merge
+calculations. Shared inputs such as calculations.json were re-parsed once per
+table. Within an artifact scope these documents are held in memory instead:
+writes are kept until the scope ends (or flush() is called) and then written
+once, and reads are served from memory, loading a file from disk at most once.
+
+Outside an artifact scope the helpers read and write the files directly, so
+code that runs without a scope behaves exactly as before.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from cognos_migrator.common.artifact_policy import json_dump_options, should_write_artifact, write_json_artifact
+
+PathLike = Union[str, Path]
+
+_current_store: contextvars.ContextVar = contextvars.ContextVar('cognos_artifact_store', default=None)
+
+_MISSING = object()
+
+
+class _Document:
+    """A cached JSON document and how it is written back"""
+
+    __slots__ = ('data', 'dirty', 'ensure_ascii', 'dump_options', 'stamp')
+
+    def __init__(self, data: Any, dirty: bool, ensure_ascii: bool = True, stamp: Optional[tuple] = None,
+                 dump_options: Optional[Dict[str, Any]] = None):
+        self.data = data
+        self.dirty = dirty
+        self.ensure_ascii = ensure_ascii
+        # json.dump formatting of the artifact policy the document was stored under
+        self.dump_options = dump_options or {'indent': 2}
+        # (mtime_ns, size) of the file the data was loaded from, to notice outside writes
+        self.stamp = stamp
+
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ArtifactStore:
+    """JSON documents of one migration, keyed by their path under extracted/
+
+    Documents returned by get() are the stored objects, not copies: code that
+    changes a document must put() it back so it is written on flush.
+    Thread-safe, so reports migrated in parallel can share a store.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self._documents: Dict[Path, _Document] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.writes = 0
+
+    @staticmethod
+    def _key(path: PathLike) -> Path:
+        return Path(os.path.abspath(path))
+
+    def put(self, path: PathLike, data: Any, ensure_ascii: bool = True) -> None:
+        """Store a document; it is written to path on flush
+
+        Args:
+            path: File the document belongs to
+            data: JSON-serializable document
+            ensure_ascii: Passed to json.dump when the document is written
+        """
+        dump_options = json_dump_options()
+        with self._lock:
+            self._documents[self._key(path)] = _Document(data, dirty=True, ensure_ascii=ensure_ascii,
+                                                         dump_options=dump_options)
+
+    def get(self, path: PathLike, default: Any = None) -> Any:
+        """Get a document, loading it from disk if it is not in memory yet
+
+        Returns:
+            The document, or default if it neither was stored nor exists on disk
+
+        Raises:
+            ValueError: If the file on disk is not valid JSON
+        """
+        key = self._key(path)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None and (document.dirty or document.stamp == _file_stamp(key)):
+                return document.data
+
+            stamp = _file_stamp(key)
+            if stamp is None:
+                self._documents.pop(key, None)
+                return default
+            with open(key, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.loads += 1
+            self._documents[key] = _Document(data, dirty=False, stamp=stamp)
+            return data
+
+    def exists(self, path: PathLike) -> bool:
+        """Check whether a document was stored or exists on disk"""
+        key = self._key(path)
+        with self._lock:
+            return key in self._documents or key.exists()
+
+    def delete(self, path: PathLike) -> None:
+        """Remove a document from memory and disk"""
+        key = self._key(path)
+        with self._lock:
+            self._documents.pop(key, None)
+            if key.exists():
+                key.unlink()
+
+    def glob(self, directory: PathLike, pattern: str) -> List[Path]:
+        """List the documents in directory matching pattern, stored or on disk
+
+        Returns:
+            Sorted list of matching paths
+        """
+        directory = self._key(directory)
+        with self._lock:
+            paths = {key for key in self._documents if key.parent == directory and key.match(pattern)}
+        if directory.exists():
+            paths.update(self._key(path) for path in directory.glob(pattern))
+        return sorted(paths)
+
+    def flush(self) -> int:
+        """Write every changed document to disk
+
+        Returns:
+            Number of files written
+        """
+        with self._lock:
+            pending = [(key, document) for key, document in self._documents.items() if document.dirty]
+            for key, document in pending:
+                key.parent.mkdir(parents=True, exist_ok=True)
+                with open(key, 'w', encoding='utf-8') as f:
+                    json.dump(document.data, f, ensure_ascii=document.ensure_ascii, **document.dump_options)
+                document.dirty = False
+                document.stamp = _file_stamp(key)
+            self.writes += len(pending)
+        if pending:
+            self.logger.debug(f"Flushed {len(pending)} artifact documents")
+        return len(pending)
+
+
+def get_artifact_store() -> Optional[ArtifactStore]:
+    """Get the artifact store of the current migration, or None outside a scope"""
+    return _current_store.get()
+
+
+@contextmanager
+def artifact_scope() -> Iterator[ArtifactStore]:
+    """Hold the JSON artifacts written inside the block in memory and flush them at the end
+
+    Also usable as a decorator. Documents are flushed even if the block raises,
+    so a failed migration leaves the same files behind as before.
+    """
+    store = ArtifactStore()
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
+        store.flush()
+
+
+def save_json(path: PathLike, data: Any, ensure_ascii: bool = True) -> None:
+    """Write a JSON document, deferred to the end of the current artifact scope
+
+    The current artifact policy decides whether and how the document is written.
+    """
+    if not should_write_artifact(path):
+        return
+    store = get_artifact_store()
+    if store is not None:
+        store.put(path, data, ensure_ascii=ensure_ascii)
+        return
+    write_json_artifact(path, data, ensure_ascii=ensure_ascii)
+
+
+def load_json(path: PathLike, default: Any = _MISSING) -> Any:
+    """Read a JSON document, from memory when the current artifact scope has it
+
+    Args:
+        path: File to read
+        default: Returned when the document does not exist; raises FileNotFoundError if omitted
+    """
+    store = get_artifact_store()
+    if store is not None:
+        data = store.get(path, _MISSING)
+    elif Path(path).exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = _MISSING
+    if data is _MISSING:
+        if default is _MISSING:
+            raise FileNotFoundError(f"No such JSON document: {path}")
+        return default
+    return data
+
+
+def json_exists(path: PathLike) -> bool:
+    """Check whether a JSON document was written in the current scope or exists on disk"""
+    store = get_artifact_store()
+    return store.exists(path) if store is not None else Path(path).exists()
+
+
+def delete_json(path: PathLike) -> None:
+    """Delete a JSON document from the current scope and from disk"""
+    store = get_artifact_store()
+    if store is not None:
+        store.delete(path)
+    elif Path(path).exists():
+        Path(path).unlink()
+
+
+def glob_json(directory: PathLike, pattern: str) -> List[Path]:
+    """List JSON documents in directory matching pattern, including unflushed ones"""
+    store = get_artifact_store()
+    if store is not None:
+        return store.glob(directory, pattern)
+    return sorted(Path(directory).glob(pattern))
@@ -0,0 +1,231 @@
+"""
+Manifest for incremental shared model migrations.
+
+A shared model migration used to delete its intermediate_reports directory
+and rebuild every intermediate report, M-query and TMDL file on every run,
+even when only one of many reports had changed. In incremental mode the
+migration keeps migration_manifest.json in its output directory, recording
+a fingerprint of the inputs each artifact was built from:
+
+- an intermediate report: the report spec, the settings and the converter version
+- the model (extracted/, pbit/ and the consolidated report sections): the
+  package file, the settings, the converter version and the fingerprints of
+  all intermediate reports that went into it
+
+On the next run an intermediate report is reused when its fingerprint is
+unchanged and its previous migration succeeded, and all model steps are
+skipped when the model fingerprint is unchanged. The model is consolidated
+from all reports together, so it is rebuilt as a whole when any of its
+inputs changed; the model directories of the previous run are removed first,
+so no table the new inputs no longer produce is left behind.
+
+The converter version combines the package version with a digest of the
+migrator's source and template files, so upgrading or editing the migrator
+invalidates every artifact.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+import logging
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+PathLike = Union[str, Path]
+
+MANIFEST_FILE_NAME = 'migration_manifest.json'
+
+# Bump when the manifest layout or the fingerprint derivation changes
+MANIFEST_FORMAT_VERSION = 1
+
+# Directories of the output that hold the consolidated model
+MODEL_DIRECTORIES = ('extracted', 'pbit')
+
+# Settings sections that do not change the migration output
+_RUNTIME_SETTINGS = ('incremental', 'report_migration')
+
+_SOURCE_SUFFIXES = ('.py', '.json', '.tmdl', '.txt')
+
+
+def file_digest(path: PathLike) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def settings_digest(settings: Optional[Dict[str, Any]]) -> str:
+    """SHA-256 of the settings that affect the migration output"""
+    relevant = {key: value for key, value in (settings or {}).items() if key not in _RUNTIME_SETTINGS}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def converter_version() -> str:
+    """Version of the migrator code, e.g. "1.0.0+3f2a..."
+
+    Computed once per process from the package version and the contents of
+    the cognos_migrator source and template files.
+    """
+    from cognos_migrator import __version__
+
+    package_dir = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob('*')):
+        if path.suffix in _SOURCE_SUFFIXES and path.is_file() and '__pycache__' not in path.parts:
+            digest.update(path.relative_to(package_dir).as_posix().encode('utf-8'))
+            digest.update(path.read_bytes())
+    return f"{__version__}+{digest.hexdigest()[:16]}"
+
+
+def _combine(*parts: str) -> str:
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class MigrationManifest:
+    """Fingerprints of the artifacts of one shared model migration
+
+    Thread-safe, so intermediate reports migrated in parallel can record
+    their results.
+    """
+
+    def __init__(self, output_path: PathLike, package_file: PathLike,
+                 settings: Optional[Dict[str, Any]] = None, logger=None):
+        """Load the manifest of a previous run from output_path, if any
+
+        Args:
+            output_path: Output directory of the shared model migration
+            package_file: Path of the FM package file being migrated
+            settings: Settings of the migration
+            logger: Optional logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.path = Path(output_path) / MANIFEST_FILE_NAME
+        self.converter_version = converter_version()
+        self.settings_digest = settings_digest(settings)
+        self.package_digest = file_digest(package_file)
+        self._lock = threading.Lock()
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.model: Dict[str, Any] = {}
+
+        previous = self._load()
+        if previous.get('format_version') == MANIFEST_FORMAT_VERSION:
+            self.reports = previous.get('reports', {})
+            self.model = previous.get('model', {})
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+            return {}
+
+    def report_fingerprint(self, report_file: PathLike) -> str:
+        """Fingerprint of an intermediate report migrated from a local spec file"""
+        return _combine('report', file_digest(report_file), self.settings_digest, self.converter_version)
+
+    def is_report_current(self, name: str, fingerprint: Optional[str], report_output_path: PathLike) -> bool:
+        """Check whether a previous migration of the report can be reused
+
+        Returns:
+            True if the report was migrated successfully from the same inputs
+            and its output directory still exists
+        """
+        if fingerprint is None:
+            return False
+        with self._lock:
+            entry = self.reports.get(name)
+        return (entry is not None and entry.get('fingerprint') == fingerprint and entry.get('succeeded')
+                and Path(report_output_path, 'extracted').is_dir())
+
+    def record_report(self, name: str, fingerprint: Optional[str], succeeded: bool,
+                      source: Optional[str] = None) -> None:
+        """Record the result of migrating an intermediate report"""
+        with self._lock:
+            self.reports[name] = {'source': source, 'fingerprint': fingerprint, 'succeeded': bool(succeeded)}
+
+    def remove_stale_reports(self, intermediate_dir: PathLike, report_names: Iterable[str]) -> List[str]:
+        """Delete intermediate report directories of reports that are no longer migrated
+
+        Returns:
+            Names of the removed reports
+        """
+        keep = set(report_names)
+        removed = []
+        directory = Path(intermediate_dir)
+        if directory.is_dir():
+            for report_dir in directory.iterdir():
+                if report_dir.is_dir() and report_dir.name not in keep:
+                    shutil.rmtree(report_dir, ignore_errors=True)
+                    removed.append(report_dir.name)
+        with self._lock:
+            for name in list(self.reports):
+                if name not in keep:
+                    del self.reports[name]
+        return sorted(removed)
+
+    def model_fingerprint(self, report_fingerprints: Dict[str, Optional[str]]) -> Optional[str]:
+        """Fingerprint of the model built from the package and the given intermediate reports
+
+        Args:
+            report_fingerprints: Fingerprint of each successfully migrated report by name
+
+        Returns:
+            The fingerprint, or None if a report has no fingerprint (e.g. it was fetched by ID)
+        """
+        if any(fingerprint is None for fingerprint in report_fingerprints.values()):
+            return None
+        reports = [f"{name}={report_fingerprints[name]}" for name in sorted(report_fingerprints)]
+        return _combine('model', self.package_digest, self.settings_digest, self.converter_version, *reports)
+
+    def is_model_current(self, fingerprint: Optional[str], output_path: PathLike) -> bool:
+        """Check whether the model of a previous run was built from the same inputs"""
+        return (fingerprint is not None and self.model.get('fingerprint') == fingerprint
+                and all(Path(output_path, name).is_dir() for name in MODEL_DIRECTORIES))
+
+    def remove_model_artifacts(self, output_path: PathLike) -> List[str]:
+        """Delete the model directories (extracted/ and pbit/) of a previous run
+
+        Returns:
+            Names of the removed directories
+        """
+        removed = []
+        for name in MODEL_DIRECTORIES:
+            directory = Path(output_path, name)
+            if directory.is_dir():
+                shutil.rmtree(directory, ignore_errors=True)
+                removed.append(name)
+        return removed
+
+    def record_model(self, fingerprint: Optional[str]) -> None:
+        """Record the fingerprint of the model that was built, or None while it is being rebuilt"""
+        self.model = {'fingerprint': fingerprint,
+                      'built_at': datetime.datetime.now().isoformat(timespec='seconds') if fingerprint else None}
+
+    def save(self) -> None:
+        """Write the manifest; failures are logged, never raised"""
+        with self._lock:
+            data = {
+                'format_version': MANIFEST_FORMAT_VERSION,
+                'converter_version': self.converter_version,
+                'settings_digest': self.settings_digest,
+                'package_digest': self.package_digest,
+                'reports': dict(self.reports),
+                'model': dict(self.model),
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write {self.path}: {e}")
@@ -0,0 +1,115 @@
+"""
+Bounded parallel execution for batch migrations.
+
+This module provides a small helper that runs one task per item on a bounded
+thread pool while keeping results in input order. It is used to migrate the
+reports of a folder or of a shared model concurrently: each report is
+dominated by network fetches and LLM round-trips, so threads overlap the
+waiting time.
+"""
+
+import contextvars
+import logging
+import queue
+from collections.abc import Sized
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Called on the submitting thread once per finished item: (index, item, result, completed_count)
+CompletionCallback = Optional[Callable[[int, Any, Any, int], None]]
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_max_workers(max_workers: Optional[int], item_count: Optional[int]) -> int:
+    """Clamp a configured worker count to a usable pool size.
+
+    Args:
+        max_workers: Configured worker count; None or values below 1 mean sequential
+        item_count: Number of items to process, None if not known in advance
+
+    Returns:
+        Number of workers to use, at least 1 and at most item_count
+    """
+    try:
+        workers = int(max_workers or 1)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid max_workers value {max_workers!r}, running sequentially")
+        workers = 1
+    if item_count is None:
+        return max(1, workers)
+    return max(1, min(workers, item_count or 1))
+
+
+def run_ordered(items: Iterable[T], task: Callable[[T], R], max_workers: Optional[int] = 1,
+                on_complete: CompletionCallback = None) -> List[R]:
+    """Run task on every item with at most max_workers threads.
+
+    Tasks are expected to isolate their own failures and return a result.
+    Any exception that escapes a task aborts the whole batch: items that have
+    not started yet are cancelled, running ones are awaited, and the exception
+    is re-raised to the caller. With a single worker the items are processed
+    inline, one at a time, exactly like a plain loop.
+
+    items may be a lazy iterable, such as reports streamed from a folder
+    crawl: each item is submitted as soon as the iterable produces it, so
+    the first tasks run while later items are still being discovered.
+
+    Every task runs in a copy of the caller's context, so it sees the
+    caller's task information for progress messages, while task information
+    set by the task itself (e.g. by a nested single report migration) stays
+    local to that task.
+
+    Args:
+        items: Items to process
+        task: Callable applied to each item
+        max_workers: Maximum number of concurrent tasks
+        on_complete: Optional callback invoked on the calling thread after each
+            item finishes, in completion order
+
+    Returns:
+        Task results in the same order as items
+    """
+    workers = resolve_max_workers(max_workers, len(items) if isinstance(items, Sized) else None)
+    results: List[Any] = []
+
+    if workers == 1:
+        for index, item in enumerate(items):
+            results.append(contextvars.copy_context().run(task, item))
+            if on_complete:
+                on_complete(index, item, results[index], index + 1)
+        return results
+
+    submitted: List[Any] = []
+    done: queue.SimpleQueue = queue.SimpleQueue()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="migration-worker")
+
+    def finish(completed: int) -> None:
+        index, future = done.get()
+        # Re-raises the task's exception, which cancels the batch below
+        results[index] = future.result()
+        if on_complete:
+            on_complete(index, submitted[index], results[index], completed)
+
+    try:
+        completed = 0
+        for index, item in enumerate(items):
+            submitted.append(item)
+            results.append(None)
+            future = executor.submit(contextvars.copy_context().run, task, item)
+            future.add_done_callback(lambda f, index=index: done.put((index, f)))
+            # Handle items that finished while the input was still being produced
+            while not done.empty():
+                completed += 1
+                finish(completed)
+        while completed < len(submitted):
+            completed += 1
+            finish(completed)
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return results
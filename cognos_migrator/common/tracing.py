@@ -0,0 +1,321 @@
+"""
+Stage timings for migrations.
+
+The migration entry points only reported progress through hardcoded
+percentages, so there was no way to tell which step of a slow migration took
+the time. Within a trace, code marks its steps with span(), which records the
+start, duration and nesting of each step, and counts events such as HTTP
+requests with add_count(). When the traced migration finishes, the spans and
+counters are written to timings.json in its output directory, next to
+migration_summary.md, together with the size of everything written there.
+
+Outside a trace span() and add_count() do nothing, so instrumented code can
+be called freely on its own. Traces started inside another trace, such as the
+intermediate report migrations of a shared model, become spans of the outer
+trace instead of writing their own timings.json.
+
+Finished step spans can also be pushed over the WebSocket channel. This is
+configured with an environment variable:
+    COGNOS_MIGRATOR_TRACE_PUSH: Push finished spans as WebSocket messages (default: off)
+"""
+
+import contextvars
+import datetime
+import functools
+import inspect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .websocket_client import post_websocket_data
+
+ENV_TRACE_PUSH = 'COGNOS_MIGRATOR_TRACE_PUSH'
+
+TIMINGS_FILE_NAME = 'timings.json'
+
+# Spans nested deeper than this (e.g. per-table spans) are not pushed over the WebSocket
+PUSH_MAX_DEPTH = 2
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar('cognos_tracer', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('cognos_span', default=None)
+
+
+class Span:
+    """One timed step of a migration"""
+
+    __slots__ = ('id', 'parent_id', 'name', 'depth', 'attributes', 'start', 'duration', 'status', 'thread')
+
+    def __init__(self, span_id: int, parent: Optional['Span'], name: str, attributes: Dict[str, Any]):
+        self.id = span_id
+        self.parent_id = parent.id if parent is not None else None
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = 'ok'
+        self.thread = threading.current_thread().name
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        """Span as written to timings.json, with times in milliseconds since origin"""
+        return {
+            'id': self.id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'status': self.status,
+            'thread': self.thread,
+            'attributes': self.attributes,
+        }
+
+
+class Tracer:
+    """Spans and counters of one migration
+
+    Thread-safe: reports migrated on worker threads record into the tracer of
+    the migration that started them.
+    """
+
+    def __init__(self, name: str, push: bool = False, logger=None):
+        """Initialize an empty trace
+
+        Args:
+            name: Name of the traced migration, e.g. "report_migration"
+            push: Whether finished spans are posted over the WebSocket channel
+            logger: Optional logger instance
+        """
+        self.name = name
+        self.push = push
+        self.logger = logger or logging.getLogger(__name__)
+        self.started_at = datetime.datetime.now()
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.counters: Dict[str, Union[int, float]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+        """Start a span; it is recorded when it is started, so unfinished spans show up too"""
+        with self._lock:
+            span = Span(next(self._ids), parent, name, attributes)
+            self.spans.append(span)
+        return span
+
+    def end_span(self, span: Span, status: str = 'ok') -> None:
+        """Finish a span and push it if enabled"""
+        span.duration = time.perf_counter() - span.start
+        span.status = status
+        if self.push and span.depth <= PUSH_MAX_DEPTH:
+            post_websocket_data({
+                "message": f"{span.name} finished in {span.duration * 1000:.0f} ms",
+                "progress": None,
+                "message_type": "info",
+                "span": span.to_dict(self.origin),
+            })
+
+    def add_count(self, name: str, value: Union[int, float] = 1) -> None:
+        """Add value to a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the trace as written to timings.json
+
+        Returns:
+            Dictionary with the trace name, start time, total duration, counters,
+            total time and count per step name, and every span
+        """
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        steps: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            if span.duration is None:
+                continue
+            step = steps.setdefault(span.name, {'count': 0, 'total_ms': 0.0})
+            step['count'] += 1
+            step['total_ms'] += span.duration * 1000
+        for step in steps.values():
+            step['total_ms'] = round(step['total_ms'], 3)
+        root = spans[0] if spans else None
+        return {
+            'name': self.name,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': root.to_dict(self.origin)['duration_ms'] if root else None,
+            'status': root.status if root else None,
+            'counters': counters,
+            'steps': steps,
+            'spans': [span.to_dict(self.origin) for span in spans],
+        }
+
+    def write(self, output_path: Union[str, Path]) -> Optional[Path]:
+        """Write timings.json to output_path
+
+        The bytes_written and files_written counters are set to the size of the
+        output directory first. Failures are logged, never raised, so timing
+        output cannot fail a migration.
+
+        Returns:
+            Path of the written file, or None if it could not be written
+        """
+        output_dir = Path(output_path)
+        timings_path = output_dir / TIMINGS_FILE_NAME
+        try:
+            files, size = _directory_size(output_dir, exclude=timings_path)
+            with self._lock:
+                self.counters['files_written'] = files
+                self.counters['bytes_written'] = size
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with open(timings_path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, indent=2, default=str)
+            return timings_path
+        except Exception as e:
+            self.logger.warning(f"Could not write {timings_path}: {e}")
+            return None
+
+
+def _directory_size(directory: Path, exclude: Path) -> tuple:
+    files = 0
+    size = 0
+    if not directory.is_dir():
+        return files, size
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = Path(root) / name
+            if path == exclude:
+                continue
+            try:
+                size += path.stat().st_size
+                files += 1
+            except OSError:
+                pass
+    return files, size
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the tracer of the current migration, or None outside a trace"""
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time the block as a step of the current trace
+
+    Args:
+        name: Step name, e.g. "extract" or "convert_mquery"
+        **attributes: Details stored with the span, e.g. table="Sales"
+
+    Usage:
+        >>> with span("render_table", table=table_name):
+        ...     engine.render_to_file("table", context, table_file)
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    current = tracer.start_span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    status = 'ok'
+    try:
+        yield current
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.end_span(current, status)
+
+
+def add_count(name: str, value: Union[int, float] = 1) -> None:
+    """Add value to a counter of the current trace; does nothing outside a trace"""
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        tracer.add_count(name, value)
+
+
+def count_http_request(service: str, response: Any = None, retries: int = 0) -> None:
+    """Count one HTTP request in the current trace
+
+    Adds to the <service>_requests, <service>_retries, <service>_errors and
+    <service>_bytes_received counters.
+
+    Args:
+        service: Short name of the called service, e.g. "cognos" or "llm"
+        response: The final response, or None if no response was received
+        retries: Number of retries the request needed
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return
+    tracer.add_count(f"{service}_requests")
+    if retries:
+        tracer.add_count(f"{service}_retries", retries)
+    if response is None or response.status_code >= 400:
+        tracer.add_count(f"{service}_errors")
+    if response is not None:
+        tracer.add_count(f"{service}_bytes_received", len(response.content or b''))
+
+
+@contextmanager
+def trace_scope(name: str, output_path: Optional[Union[str, Path]] = None,
+                **attributes: Any) -> Iterator[Span]:
+    """Trace the block and write timings.json to output_path at the end
+
+    Inside an existing trace the block becomes a span of that trace and
+    nothing is written.
+
+    Args:
+        name: Name of the traced migration
+        output_path: Directory timings.json is written to; not written if None
+        **attributes: Details stored with the root span
+
+    Yields:
+        The span of the block
+    """
+    if _current_tracer.get() is not None:
+        with span(name, **attributes) as block_span:
+            yield block_span
+        return
+
+    push = os.environ.get(ENV_TRACE_PUSH, '').strip().lower() in ('1', 'true', 'yes', 'on')
+    tracer = Tracer(name, push=push)
+    token = _current_tracer.set(tracer)
+    try:
+        with span(name, **attributes) as block_span:
+            yield block_span
+    finally:
+        _current_tracer.reset(token)
+        if output_path is not None:
+            tracer.write(output_path)
+
+
+def traced_migration(name: str, path_argument: str = 'output_path') -> Callable:
+    """Decorator running a migration entry point in trace_scope()
+
+    Args:
+        name: Name of the traced migration
+        path_argument: Name of the function argument holding the output directory
+    """
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            try:
+                output_path = signature.bind(*args, **kwargs).arguments.get(path_argument)
+            except TypeError:
+                output_path = None
+            with trace_scope(name, output_path) as block_span:
+                result = function(*args, **kwargs)
+                # Entry points report failure by returning False (or (False, path))
+                block_span.attributes['succeeded'] = bool(result[0] if isinstance(result, tuple) else result)
+                return result
+        return wrapper
+    return decorator
@@ -8,17 +8,42 @@ It can be used alongside the existing logging system.
 import json
 import logging
 import datetime
-from typing import Dict, Any, Optional, Callable, Union, Literal
+import atexit
+import contextvars
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Union, Literal, List, Iterator
 
 # Type hint for the WebSocket post function
 WebSocketPostFunc = Optional[Callable[[Dict[str, Any]], None]]
 
+# Maximum number of messages delivered per wake-up of the background sender
+MAX_SEND_BATCH_SIZE = 100
+
+
+@dataclass
+class TaskContext:
+    """Progress tracking state of one migration task."""
+    task_id: Optional[str] = None
+    total_steps: Optional[int] = None
+    current_step: int = 0
+
+
 # Global variables
 _cognos_websocket_post_function: WebSocketPostFunc = None
-_cognos_task_id: Optional[str] = None
-_cognos_total_steps: Optional[int] = None
-_cognos_current_step: int = 0
 _cognos_db_save_function: Optional[Callable[[Dict[str, Any]], None]] = None
+_cognos_db_save_batch_function: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+_cognos_async_delivery: bool = False
+
+# The task context is per thread / asyncio task, so concurrent migrations in one
+# process keep their own task IDs and progress
+_cognos_task_context: contextvars.ContextVar[Optional[TaskContext]] = contextvars.ContextVar(
+    'cognos_task_context', default=None
+)
 
 def set_websocket_post_function(func: WebSocketPostFunc) -> None:
     """
@@ -33,18 +58,70 @@ def set_websocket_post_function(func: WebSocketPostFunc) -> None:
     global _cognos_websocket_post_function
     _cognos_websocket_post_function = func
 
-def set_task_info(task_id: str, total_steps: int) -> None:
+def set_task_info(task_id: str, total_steps: int) -> contextvars.Token:
     """
     Set information about the current task for progress tracking.
     
+    The information is stored in the current context only, so it does not
+    affect migrations running concurrently in other threads or tasks.
+    
     Args:
         task_id: The ID of the current task
         total_steps: The total number of steps in the task
+        
+    Returns:
+        A token that can be passed to reset_task_info to restore the previous task
+    """
+    return _cognos_task_context.set(TaskContext(task_id=task_id, total_steps=total_steps))
+
+def reset_task_info(token: contextvars.Token) -> None:
+    """
+    Restore the task information that was current before set_task_info.
+    
+    Args:
+        token: The token returned by set_task_info
+    """
+    _cognos_task_context.reset(token)
+
+@contextmanager
+def task_context(task_id: str, total_steps: Optional[int] = None) -> Iterator[TaskContext]:
+    """
+    Run a block of code with its own task information.
+    
+    Args:
+        task_id: The ID of the task
+        total_steps: The total number of steps in the task
+    
+    Usage:
+        >>> with task_context("task-1", total_steps=10):
+        ...     logging_helper("Starting", progress=0)
     """
-    global _cognos_task_id, _cognos_total_steps, _cognos_current_step
-    _cognos_task_id = task_id
-    _cognos_total_steps = total_steps
-    _cognos_current_step = 0
+    token = set_task_info(task_id, total_steps)
+    try:
+        yield _cognos_task_context.get()
+    finally:
+        reset_task_info(token)
+        # The task's last messages are delivered before it is reported as finished
+        flush_websocket_data()
+
+def get_task_context() -> Optional[TaskContext]:
+    """
+    Get the task information of the current context.
+    
+    Returns:
+        The current TaskContext or None if no task is set
+    """
+    return _cognos_task_context.get()
+
+def get_task_id() -> Optional[str]:
+    """
+    Get the ID of the task running in the current context.
+    
+    Returns:
+        The current task ID or None if not set
+    """
+    context = _cognos_task_context.get()
+    return context.task_id if context is not None else None
 
 def increment_progress() -> None:
     """
@@ -53,10 +130,10 @@ def increment_progress() -> None:
     Returns:
         The current progress percentage (0-100)
     """
-    global _cognos_current_step, _cognos_total_steps
-    if _cognos_total_steps is not None and _cognos_total_steps > 0:
-        _cognos_current_step = min(_cognos_current_step + 1, _cognos_total_steps)
-        return int((_cognos_current_step / _cognos_total_steps) * 100)
+    context = _cognos_task_context.get()
+    if context is not None and context.total_steps is not None and context.total_steps > 0:
+        context.current_step = min(context.current_step + 1, context.total_steps)
+        return int((context.current_step / context.total_steps) * 100)
     return None
 
 def get_progress() -> Optional[int]:
@@ -66,9 +143,9 @@ def get_progress() -> Optional[int]:
     Returns:
         The current progress percentage (0-100) or None if not set
     """
-    global _cognos_current_step, _cognos_total_steps
-    if _cognos_total_steps is not None and _cognos_total_steps > 0:
-        return int((_cognos_current_step / _cognos_total_steps) * 100)
+    context = _cognos_task_context.get()
+    if context is not None and context.total_steps is not None and context.total_steps > 0:
+        return int((context.current_step / context.total_steps) * 100)
     return None
 
 def set_db_save_function(func: Callable[[Dict[str, Any]], None]) -> None:
@@ -81,39 +158,180 @@ def set_db_save_function(func: Callable[[Dict[str, Any]], None]) -> None:
     global _cognos_db_save_function
     _cognos_db_save_function = func
 
+def set_db_save_batch_function(func: Optional[Callable[[List[Dict[str, Any]]], None]]) -> None:
+    """
+    Set a function that saves several log messages to the database at once.
+    
+    When set, it is used instead of the function given to set_db_save_function,
+    so the background sender can write a whole batch with one call
+    (e.g. a Django bulk_create).
+    
+    Args:
+        func: A function that takes a list of dictionaries and saves them to the database
+    """
+    global _cognos_db_save_batch_function
+    _cognos_db_save_batch_function = func
+
+def set_async_delivery(enabled: bool) -> None:
+    """
+    Enable or disable delivery of messages on the background sender thread.
+    
+    By default post_websocket_data calls the WebSocket and database functions
+    directly on the calling thread, so every message is delivered and saved
+    before the migration returns, using the caller's database connection.
+    When enabled, a slow WebSocket or database write never blocks a
+    migration; queued messages are flushed when a task_context ends and when
+    a MigrationRuntime is closed. The functions then run on the sender
+    thread, so a database save function must not rely on the caller's
+    connection.
+    
+    Args:
+        enabled: Whether to deliver messages on the background sender
+    """
+    global _cognos_async_delivery
+    _cognos_async_delivery = enabled
+    if not enabled:
+        flush_websocket_data()
+
+def _deliver_batch(batch: List[Dict[str, Any]]) -> None:
+    """
+    Send a batch of messages to the WebSocket and database functions.
+    
+    Args:
+        batch: Messages in the order they were posted
+    """
+    post_function = _cognos_websocket_post_function
+    if post_function is not None:
+        for data in batch:
+            try:
+                post_function(data)
+            except Exception as e:
+                logging.error(f"Error sending to WebSocket: {str(e)}")
+    else:
+        for data in batch:
+            # Log that we would have sent data if the function was set
+            logging.debug(f"WebSocket post function not set, would have posted: {data}")
+    
+    # Save to database if function is set
+    if _cognos_db_save_batch_function is not None:
+        try:
+            _cognos_db_save_batch_function(batch)
+        except Exception as e:
+            logging.error(f"Error saving to database: {str(e)}")
+    elif _cognos_db_save_function is not None:
+        for data in batch:
+            try:
+                _cognos_db_save_function(data)
+            except Exception as e:
+                logging.error(f"Error saving to database: {str(e)}")
+
+class _OutboundSender:
+    """
+    Background thread that delivers queued messages in batches.
+    
+    The thread is started on first use and restarted in a forked child
+    process, where the parent's thread does not exist.
+    """
+    
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, data: Dict[str, Any]) -> None:
+        """Queue a message for delivery without blocking."""
+        self._ensure_started()
+        self._queue.put_nowait(data)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been delivered.
+        
+        Returns:
+            True if the queue was drained, False on timeout
+        """
+        if self._pid != os.getpid():
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                # Messages queued before a fork belong to the parent process
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="cognos-websocket-sender", daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < MAX_SEND_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                _deliver_batch(batch)
+            except Exception as e:
+                logging.error(f"Error delivering WebSocket messages: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+_outbound_sender = _OutboundSender()
+
+def flush_websocket_data(timeout: Optional[float] = None) -> bool:
+    """
+    Wait until all queued WebSocket and database messages have been delivered.
+    
+    Args:
+        timeout: Maximum number of seconds to wait, or None to wait indefinitely
+        
+    Returns:
+        True if every message was delivered, False on timeout
+    """
+    return _outbound_sender.flush(timeout)
+
+# Deliver what is still queued when the interpreter exits
+atexit.register(flush_websocket_data, 5.0)
+
 def post_websocket_data(data: Dict[str, Any]) -> None:
     """
     Post data to WebSockets if a posting function has been set.
     
+    The message is stamped with the current task ID and delivered, or queued
+    for the background sender when asynchronous delivery is enabled.
+    
     Args:
         data: The data to post to WebSockets
     """
-    global _cognos_websocket_post_function, _cognos_task_id, _cognos_db_save_function
-    
     # Add task_id if available
-    if _cognos_task_id is not None and "task_id" not in data:
-        data["task_id"] = _cognos_task_id
+    task_id = get_task_id()
+    if task_id is not None and "task_id" not in data:
+        data["task_id"] = task_id
         
     # Add timestamp if not present
     if "timestamp" not in data:
         data["timestamp"] = datetime.datetime.now().isoformat()
     
-    # Send to WebSocket if function is set
-    if _cognos_websocket_post_function is not None:
-        try:
-            _cognos_websocket_post_function(data)
-        except Exception as e:
-            logging.error(f"Error sending to WebSocket: {str(e)}")
+    has_receiver = (_cognos_websocket_post_function is not None or _cognos_db_save_function is not None
+                    or _cognos_db_save_batch_function is not None)
+    if _cognos_async_delivery and has_receiver:
+        _outbound_sender.submit(data)
     else:
-        # Log that we would have sent data if the function was set
-        logging.debug(f"WebSocket post function not set, would have posted: {data}")
-    
-    # Save to database if function is set
-    if _cognos_db_save_function is not None:
-        try:
-            _cognos_db_save_function(data)
-        except Exception as e:
-            logging.error(f"Error saving to database: {str(e)}")
+        _deliver_batch([data])
 
 def logging_helper(
     message: str,
@@ -0,0 +1,212 @@
+"""
+XML documents that can be written back out with their namespace prefixes.
+
+ElementTree drops comments and namespace declarations when it parses a
+document. XmlDocument keeps them next to the tree and writes the document
+indented, element by element, so formatted copies of report specifications
+and FM packages are written from the tree the extractors already use instead
+of parsing the file again.
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple, Union
+from xml.sax.saxutils import escape
+
+# Namespace of the xml: prefix, which is never declared
+_XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+
+_ATTRIBUTE_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
+
+class XmlDocument:
+    """
+    An XML document parsed once into an ElementTree.
+    
+    The tree is the same one ET.fromstring() returns, so it can be handed to
+    the extractors. ElementTree drops comments and namespace declarations;
+    they are kept next to the tree so the document can be written back out.
+    """
+    
+    def __init__(self, root: ET.Element,
+                 namespaces: Optional[Dict[ET.Element, List[Tuple[str, str]]]] = None,
+                 comments: Optional[Dict[Optional[ET.Element], List[Tuple[int, str]]]] = None):
+        """
+        Args:
+            root: Root element of the document
+            namespaces: (prefix, uri) declarations by the element they are made on
+            comments: (child position, text) of comments by their parent element;
+                comments outside the root element have no parent (None)
+        """
+        self.root = root
+        self.namespaces = namespaces or {}
+        self.comments = comments or {}
+    
+    @classmethod
+    def from_string(cls, xml_content: str) -> 'XmlDocument':
+        """
+        Parse an XML document.
+        
+        Raises:
+            ET.ParseError: If the content is not well-formed XML
+        """
+        parser = ET.XMLPullParser(events=('start-ns', 'start', 'end', 'comment'))
+        parser.feed(xml_content)
+        parser.close()
+        
+        root = None
+        namespaces = {}
+        comments = {}
+        pending_namespaces = []
+        # Open elements with the number of child elements seen so far; the document comes first
+        open_elements = [[None, 0]]
+        for event, value in parser.read_events():
+            if event == 'start':
+                open_elements[-1][1] += 1
+                open_elements.append([value, 0])
+                if root is None:
+                    root = value
+                if pending_namespaces:
+                    namespaces[value] = pending_namespaces
+                    pending_namespaces = []
+            elif event == 'end':
+                open_elements.pop()
+            elif event == 'start-ns':
+                pending_namespaces.append(value)
+            else:
+                parent, position = open_elements[-1]
+                comments.setdefault(parent, []).append((position, value.text or ''))
+        
+        return cls(root, namespaces, comments)
+    
+    @classmethod
+    def from_parsed_file(cls, root: ET.Element, file_path: Union[str, Path]) -> 'XmlDocument':
+        """
+        Wrap the tree ET.parse() built from a file, to write it back out.
+        
+        Only the namespace declarations of the root element are read from the
+        file again; reading stops at the root's start tag. Comments are not kept.
+        
+        Args:
+            root: Root element parsed from the file
+            file_path: Path of the file the tree was parsed from
+        """
+        declarations = []
+        with open(file_path, 'rb') as f:
+            for event, value in ET.iterparse(f, events=('start-ns', 'start')):
+                if event == 'start':
+                    break
+                declarations.append(value)
+        return cls(root, {root: declarations} if declarations else None)
+    
+    def section(self, names: Tuple[str, ...]) -> 'XmlDocument':
+        """
+        Get a document with the root element, its comments and the first
+        element with each of the given local names, in that order.
+        
+        Elements are shared with this document, not copied.
+        """
+        namespace = self.root.tag[1:].split('}', 1)[0] if self.root.tag.startswith('{') else None
+        root = ET.Element(self.root.tag, self.root.attrib)
+        for name in names:
+            element = next(self.root.iter(f"{{{namespace}}}{name}" if namespace else name), None)
+            if element is not None:
+                root.append(element)
+        
+        namespaces = dict(self.namespaces)
+        if self.root in self.namespaces:
+            namespaces[root] = self.namespaces[self.root]
+        comments = dict(self.comments)
+        comments.pop(None, None)
+        if self.root in self.comments:
+            comments[root] = [(0, text) for _, text in self.comments[self.root]]
+        return XmlDocument(root, namespaces, comments)
+    
+    def write(self, destination: Union[str, Path, TextIO], indent: str = '  ') -> None:
+        """
+        Write the document with one element per line, indented by depth.
+        
+        Elements are written to the destination as they are visited, so no
+        string of the whole document is built. Whitespace between elements
+        is replaced by the indentation.
+        
+        Args:
+            destination: File path or text stream to write to
+            indent: Indentation of each nesting level
+        """
+        if not isinstance(destination, (str, Path)):
+            self._write_document(destination.write, indent)
+            return
+        with open(destination, 'w', encoding='utf-8') as f:
+            self._write_document(f.write, indent)
+    
+    def to_string(self, indent: str = '  ') -> str:
+        """Get the indented document as a string"""
+        buffer = io.StringIO()
+        self.write(buffer, indent)
+        return buffer.getvalue()
+    
+    def _write_document(self, write: Callable[[str], Any], indent: str) -> None:
+        write('<?xml version="1.0" encoding="utf-8"?>\n')
+        prolog = self.comments.get(None, [])
+        for position, text in prolog:
+            if position == 0:
+                write(f"<!--{text}-->\n")
+        self._write_element(write, self.root, {_XML_NAMESPACE: 'xml'}, '', indent)
+        for position, text in prolog:
+            if position > 0:
+                write(f"<!--{text}-->\n")
+    
+    def _write_element(self, write: Callable[[str], Any], element: ET.Element, prefixes: Dict[str, str],
+                       padding: str, indent: str) -> None:
+        declarations = self.namespaces.get(element, ())
+        if declarations:
+            prefixes = {**prefixes, **{uri: prefix for prefix, uri in declarations}}
+        attributes = [f' xmlns:{prefix}="{escape(uri, _ATTRIBUTE_ENTITIES)}"' if prefix
+                      else f' xmlns="{escape(uri, _ATTRIBUTE_ENTITIES)}"'
+                      for prefix, uri in declarations]
+        
+        # Namespaces without a declaration in scope, as in elements built by section(), are declared here
+        def qualified(name: str, attribute: bool = False) -> str:
+            nonlocal prefixes
+            if not name.startswith('{'):
+                return name
+            uri, local = name[1:].split('}', 1)
+            prefix = prefixes.get(uri)
+            if prefix is None or (attribute and not prefix):
+                prefix = f"ns{len(prefixes)}"
+                while prefix in prefixes.values():
+                    prefix += '_'
+                prefixes = {**prefixes, uri: prefix}
+                attributes.append(f' xmlns:{prefix}="{escape(uri, _ATTRIBUTE_ENTITIES)}"')
+            return f"{prefix}:{local}" if prefix else local
+        
+        tag = qualified(element.tag)
+        for name, value in element.attrib.items():
+            attributes.append(f' {qualified(name, attribute=True)}="{escape(value, _ATTRIBUTE_ENTITIES)}"')
+        start = f"{padding}<{tag}{''.join(attributes)}"
+        
+        comments = self.comments.get(element, ())
+        if not len(element) and not comments:
+            if element.text:
+                write(f"{start}>{escape(element.text)}</{tag}>\n")
+            else:
+                write(f"{start}/>\n")
+            return
+        
+        write(f"{start}>\n")
+        child_padding = padding + indent
+        if element.text and element.text.strip():
+            write(f"{child_padding}{escape(element.text.strip())}\n")
+        comment_index = 0
+        for position, child in enumerate(element):
+            while comment_index < len(comments) and comments[comment_index][0] <= position:
+                write(f"{child_padding}<!--{comments[comment_index][1]}-->\n")
+                comment_index += 1
+            self._write_element(write, child, prefixes, child_padding, indent)
+            if child.tail and child.tail.strip():
+                write(f"{child_padding}{escape(child.tail.strip())}\n")
+        for _, text in comments[comment_index:]:
+            write(f"{child_padding}<!--{text}-->\n")
+        write(f"{padding}</{tag}>\n")
@@ -18,6 +18,8 @@ class CognosConfig:
     session_timeout: int = 3600
     max_retries: int = 3
     request_timeout: int = 30
+    # Number of folders listed concurrently when crawling the content store
+    crawl_concurrency: int = 8
     username: Optional[str] = None
     password: Optional[str] = None
     namespace: Optional[str] = None
@@ -34,4 +36,10 @@ class MigrationConfig:
     # LLM service configuration
     llm_service_url: Optional[str] = None
     llm_service_api_key: Optional[str] = None
-    llm_service_enabled: bool = False
\ No newline at end of file
+    llm_service_enabled: bool = False
+    # Number of reports migrated concurrently by batch migrations (1 = sequential)
+    max_workers: int = 1
+    # Intermediate artifacts written to extracted/: "full" or "lean" (skips files only
+    # written for investigation and writes JSON unindented); None uses artifacts.mode
+    # from the settings, see common/artifact_policy.py
+    artifact_mode: Optional[str] = None
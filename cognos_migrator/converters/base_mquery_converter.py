@@ -9,6 +9,7 @@ from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from ..models import Table
+from ..llm_cache import get_llm_cache, post_llm_request
 
 
 class BaseMQueryConverter(ABC):
@@ -23,6 +24,20 @@ class BaseMQueryConverter(ABC):
         """
         self.output_path = output_path
         self.logger = logging.getLogger(__name__)
+        # Responses of the DAX API are reused across runs for identical requests
+        self.llm_cache = get_llm_cache()
+    
+    def _post_llm_api(self, url: str, headers: Optional[Dict[str, str]] = None,
+                      json: Optional[Dict[str, Any]] = None, timeout: int = 30):
+        """
+        POST to the DAX API, answering repeat requests from the LLM cache
+        
+        Takes the same arguments as requests.post.
+        
+        Returns:
+            The API response, or a CachedResponse for a repeat request
+        """
+        return post_llm_request(url, headers=headers, json=json, timeout=timeout, cache=self.llm_cache)
     
     @abstractmethod
     def convert_to_m_query(self, table: Table, spec: Optional[str] = None, data_sample: Optional[Dict] = None) -> str:
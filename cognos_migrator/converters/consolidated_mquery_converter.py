@@ -1,15 +1,14 @@
 """
 Consolidated M-Query Converter for the final shared semantic model.
 """
-import json
 import re
 import textwrap
-import requests
 import os
 from typing import Dict, Any, Optional
 
 from ..models import Table
 from .base_mquery_converter import BaseMQueryConverter
+from ..common.artifact_store import load_json
 from pathlib import Path
 
 
@@ -110,8 +109,7 @@ class ConsolidatedMQueryConverter(BaseMQueryConverter):
         if not qs_path.exists():
             return None
         try:
-            with open(qs_path, 'r') as f:
-                query_subjects = json.load(f)
+            query_subjects = load_json(qs_path)
             return next((qs for qs in query_subjects if qs['name'] == table.name), None)
         except Exception as e:
             self.logger.error(f"Error reading {qs_path}: {e}")
@@ -151,7 +149,7 @@ class ConsolidatedMQueryConverter(BaseMQueryConverter):
             
             # Try enhanced endpoint first
             try:
-                response = requests.post(
+                response = self._post_llm_api(
                     f'{api_base_url}/api/mquery/complete',
                     headers={'Content-Type': 'application/json'},
                     json=payload,
@@ -165,7 +163,7 @@ class ConsolidatedMQueryConverter(BaseMQueryConverter):
                         self.logger.info(f"API processing time for table {table.name}: {result['processing_time']:.2f}s")
                 else:
                     # Fallback to basic endpoint
-                    response = requests.post(
+                    response = self._post_llm_api(
                         f'{api_base_url}/api/mquery/generate',
                         headers={'Content-Type': 'application/json'},
                         json=payload,
@@ -191,7 +189,7 @@ class ConsolidatedMQueryConverter(BaseMQueryConverter):
             }
             
             self.logger.info(f"Calling validation API for quality assurance (table: {table_name})")
-            response = requests.post(
+            response = self._post_llm_api(
                 f'{api_base_url}/api/mquery/validate',
                 headers={'Content-Type': 'application/json'},
                 json=validation_payload,
@@ -4,29 +4,62 @@ LLM-powered Cognos Expression to DAX Converter
 This module provides functionality to convert Cognos expressions to DAX using the LLM service.
 """
 
+import contextvars
 import logging
 import json
 import re
-import requests
-from typing import Dict, List, Any, Optional
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 
 from cognos_migrator.llm_service import LLMServiceClient
+from cognos_migrator.llm_cache import post_llm_request
+from cognos_migrator.common.tracing import span
+
+# Quoted string literals keep their whitespace when formulas are normalized
+_STRING_LITERAL = re.compile(r"('(?:[^']|'')*'|\"[^\"]*\")")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_formula(cognos_formula: str) -> str:
+    """
+    Normalize a Cognos formula for de-duplication
+    
+    Whitespace outside string literals is collapsed, so formulas that only
+    differ in layout are converted once.
+    
+    Args:
+        cognos_formula: The Cognos formula
+        
+    Returns:
+        The normalized formula text
+    """
+    parts = _STRING_LITERAL.split(cognos_formula.strip())
+    return ''.join(part if i % 2 else _WHITESPACE.sub(' ', part) for i, part in enumerate(parts))
 
 
 class ExpressionConverter:
     """Converts Cognos expressions to DAX using LLM service"""
     
-    def __init__(self, llm_service_client=None, logger=None):
+    # Number of distinct formulas sent to the LLM service at a time
+    DEFAULT_BATCH_SIZE = 8
+    
+    def __init__(self, llm_service_client=None, logger=None, batch_size: int = DEFAULT_BATCH_SIZE):
         """
         Initialize the expression converter
         
         Args:
             llm_service_client: Optional LLMServiceClient instance
             logger: Optional logger instance
+            batch_size: Number of distinct formulas converted concurrently
         """
         self.logger = logger or logging.getLogger(__name__)
         self.llm_service_client = llm_service_client
+        self.batch_size = max(1, batch_size)
+        
+        # Conversion results by request key, reused for every report migrated with this converter
+        self._results: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._results_lock = threading.Lock()
         
     def convert_expression(self, 
                           cognos_formula: str, 
@@ -48,14 +81,80 @@ class ExpressionConverter:
                 - confidence: Confidence score (0-1)
                 - notes: Any notes about the conversion
         """
-        if not cognos_formula:
-            self.logger.warning("Empty Cognos formula provided")
-            return {
-                "dax_expression": "",
-                "confidence": 0,
-                "notes": "Empty Cognos formula provided"
-            }
+        return self.convert_expressions([{
+            "cognos_formula": cognos_formula,
+            "table_name": table_name,
+            "column_mappings": column_mappings,
+            "query_data": query_data
+        }])[0]
+    
+    def convert_expressions(self, expressions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert many Cognos formulas to DAX using the LLM service
+        
+        Formulas are de-duplicated by normalized text and context, results
+        already known to this converter are reused, and the remaining
+        distinct formulas are sent in batches of batch_size concurrent
+        requests over the LLM client's pooled transport. The service health is
+        checked once per batch run rather than once per formula.
+        
+        Args:
+            expressions: List of dictionaries with the convert_expression arguments
+                (cognos_formula, and optionally table_name, column_mappings, query_data)
+            
+        Returns:
+            Conversion results in the same order as expressions, in the format of convert_expression
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(expressions)
+        pending: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        indices_by_key: Dict[Tuple[str, str, str], List[int]] = {}
+        
+        for i, expression in enumerate(expressions):
+            cognos_formula = expression.get("cognos_formula")
+            if not cognos_formula:
+                self.logger.warning("Empty Cognos formula provided")
+                results[i] = {
+                    "dax_expression": "",
+                    "confidence": 0,
+                    "notes": "Empty Cognos formula provided"
+                }
+                continue
+            
+            payload = self._build_payload(cognos_formula, expression.get("table_name"),
+                                          expression.get("column_mappings"), expression.get("query_data"))
+            key = (normalize_formula(cognos_formula), payload["table_name"],
+                   json.dumps(payload["column_mappings"], sort_keys=True))
+            
+            with self._results_lock:
+                known = self._results.get(key)
+            if known is not None:
+                results[i] = dict(known)
+                continue
+            
+            pending.setdefault(key, payload)
+            indices_by_key.setdefault(key, []).append(i)
         
+        if pending:
+            duplicates = sum(len(indices) for indices in indices_by_key.values()) - len(pending)
+            if duplicates:
+                self.logger.info(f"Converting {len(pending)} distinct expressions ({duplicates} duplicates reused)")
+            
+            with span('dax_conversion', expressions=len(pending)):
+                converted = self._convert_pending(pending)
+            for key, result in converted.items():
+                for i in indices_by_key[key]:
+                    results[i] = dict(result)
+        
+        return results
+    
+    def clear_cache(self) -> None:
+        """Forget the conversion results kept by this converter"""
+        with self._results_lock:
+            self._results.clear()
+    
+    def _build_payload(self, cognos_formula: str, table_name: Optional[str],
+                       column_mappings: Optional[Dict[str, str]], query_data: Optional[List[Dict]]) -> Dict[str, Any]:
+        """Resolve the table name and column mappings for a formula into an LLM request payload"""
         # Extract table name from expression if not provided
         extracted_table = self._extract_table_from_expression(cognos_formula)
         if extracted_table and not table_name:
@@ -69,34 +168,62 @@ class ExpressionConverter:
                 column_mappings = extracted_mappings
                 self.logger.info(f"Extracted column mappings: {column_mappings}")
         
-        # Try to convert with LLM service
-        if self.llm_service_client:
-            try:
-                result = self._convert_with_llm(cognos_formula, table_name, column_mappings)
-                if result and result.get("dax_expression"):
-                    return result
-                else:
-                    # Return error if LLM service didn't return a valid result
-                    return {
-                        "dax_expression": cognos_formula,  # Keep original expression
-                        "confidence": 0.0,
-                        "notes": "LLM service conversion failed: No valid result returned"
-                    }
-            except Exception as e:
-                error_message = f"LLM service conversion failed: {e}"
-                self.logger.error(error_message)
-                return {
-                    "dax_expression": cognos_formula,  # Keep original expression
-                    "confidence": 0.0,
-                    "notes": error_message
-                }
-        else:
+        return {
+            "cognos_expression": cognos_formula,
+            "table_name": table_name or "",
+            "column_mappings": column_mappings or {}
+        }
+    
+    def _convert_pending(self, pending: Dict[Tuple[str, str, str], Dict[str, Any]]) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """
+        Convert distinct formulas with the LLM service
+        
+        Args:
+            pending: LLM request payloads by request key
+            
+        Returns:
+            Conversion results by request key
+        """
+        if not self.llm_service_client:
             # No LLM service client available
-            return {
-                "dax_expression": cognos_formula,  # Keep original expression
+            return {key: {
+                "dax_expression": payload["cognos_expression"],  # Keep original expression
                 "confidence": 0.0,
                 "notes": "LLM service not available"
-            }
+            } for key, payload in pending.items()}
+        
+        # Check if LLM service is healthy
+        health = self.llm_service_client.check_health()
+        if health.get("status") != "healthy":
+            self.logger.warning(f"LLM service is not healthy: {health}")
+            return {key: self._failed_result(payload["cognos_expression"]) for key, payload in pending.items()}
+        
+        results = {}
+        keys = list(pending)
+        workers = min(self.batch_size, len(keys))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dax-conversion") as executor:
+            for start in range(0, len(keys), self.batch_size):
+                batch = keys[start:start + self.batch_size]
+                # Requests run in the caller's context, so they are counted in its trace
+                futures = [executor.submit(contextvars.copy_context().run, self._convert_with_llm, pending[k])
+                           for k in batch]
+                for key, result in zip(batch, (future.result() for future in futures)):
+                    if result and result.get("dax_expression"):
+                        results[key] = result
+                        with self._results_lock:
+                            self._results[key] = result
+                    else:
+                        # Failures are not remembered, so a later migration can retry them
+                        results[key] = self._failed_result(pending[key]["cognos_expression"])
+        return results
+    
+    def _failed_result(self, cognos_formula: str) -> Dict[str, Any]:
+        """Result returned when the LLM service did not convert a formula"""
+        return {
+            "dax_expression": cognos_formula,  # Keep original expression
+            "confidence": 0.0,
+            "notes": "LLM service conversion failed: No valid result returned"
+        }
     
     def _extract_table_from_expression(self, expression):
         """
@@ -147,49 +274,29 @@ class ExpressionConverter:
         
         return column_mappings
     
-    def _convert_with_llm(self, 
-                         cognos_formula: str, 
-                         table_name: str = None, 
-                         column_mappings: Dict[str, str] = None) -> Dict[str, Any]:
+    def _convert_with_llm(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Convert a Cognos formula to DAX using the LLM service
         
         Args:
-            cognos_formula: The Cognos formula to convert
-            table_name: Optional table name for context
-            column_mappings: Optional mapping of Cognos column names to DAX column names
+            payload: Request payload with cognos_expression, table_name and column_mappings
             
         Returns:
-            Dictionary containing the conversion result
+            Dictionary containing the conversion result, or None on failure
         """
+        cognos_formula = payload["cognos_expression"]
         try:
-            # Check if LLM service is healthy
-            health = self.llm_service_client.check_health()
-            if health.get("status") != "healthy":
-                self.logger.warning(f"LLM service is not healthy: {health}")
-                return None
-            
-            # Extract table name from the expression if not provided
-            extracted_table = self._extract_table_from_expression(cognos_formula)
-            if extracted_table and not table_name:
-                table_name = extracted_table
-                
-            # Prepare the request payload
-            payload = {
-                "cognos_expression": cognos_formula,
-                "table_name": table_name or "",
-                "column_mappings": column_mappings or {}
-            }
-            
             # Make the API request
             self.logger.info(f"Converting expression with LLM service: {cognos_formula}")
             
             headers = {'Content-Type': 'application/json'}
-            response = requests.post(
+            response = post_llm_request(
                 f'{self.llm_service_client.base_url}/api/dax/convert',
                 headers=headers,
                 json=payload,
-                timeout=30  # 30 second timeout
+                timeout=30,  # 30 second timeout
+                cache=getattr(self.llm_service_client, 'cache', None),
+                transport=getattr(self.llm_service_client, 'transport', None)
             )
             
             response.raise_for_status()
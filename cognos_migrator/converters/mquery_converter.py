@@ -5,10 +5,19 @@ Uses LLM service to generate optimized M-queries.
 import logging
 import re
 import json
+import xml.etree.ElementTree as ET
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from ..models import Table
+from ..common.artifact_store import load_json
+from ..extractors.report_spec_index import ReportSpecIndex
+
+# Filter expressions of a report spec, on a (possibly qualified) column reference
+_COLUMN_REFERENCE = r'(?:\[[^\]]*\]\.)*\[([^\]]+)\]'
+_COMPARISON_FILTER = re.compile(_COLUMN_REFERENCE + r'\s*([=<>!]+)\s*(.+)', re.DOTALL)
+_IN_FILTER = re.compile(_COLUMN_REFERENCE + r'\s+in\s+\(([^)]+)\)', re.IGNORECASE)
+_BETWEEN_FILTER = re.compile(_COLUMN_REFERENCE + r'\s+between\s+(\S+)\s+and\s+(\S+)', re.IGNORECASE)
 
 
 class MQueryConverter:
@@ -23,6 +32,8 @@ class MQueryConverter:
         """
         self.output_path = output_path
         self.logger = logging.getLogger(__name__)
+        # Last report specification and its index, see _report_spec_index
+        self._spec_index = None
     
     def convert_to_m_query(self, table: Table, report_spec: Optional[str] = None, data_sample: Optional[Dict] = None) -> str:
         """
@@ -243,8 +254,7 @@ in
             return None
 
         try:
-            with open(report_queries_path, 'r') as f:
-                queries = json.load(f)
+            queries = load_json(report_queries_path)
         except json.JSONDecodeError:
             self.logger.error(f"Invalid JSON in {report_queries_path}")
             return None
@@ -292,6 +302,60 @@ in
             
         return sql
     
+    def _report_spec_index(self, report_spec: str) -> Optional[ReportSpecIndex]:
+        """
+        Get the structural index of a report specification, built once per report
+        
+        The index of the last specification is kept, so the lookups for each
+        table of the same report share one parse.
+        
+        Args:
+            report_spec: Full report specification XML
+            
+        Returns:
+            Index over the parsed specification, or None if it is not well-formed XML
+        """
+        cached = self._spec_index
+        if cached is not None and cached[0] == report_spec:
+            return cached[1]
+        
+        try:
+            root = ET.fromstring(report_spec)
+        except ET.ParseError as e:
+            self.logger.warning(f"Could not parse report specification: {e}")
+            index = None
+        else:
+            ns = {'ns': root.tag[1:].split('}')[0]} if root.tag.startswith('{') else {}
+            index = ReportSpecIndex(root, ns, logger=self.logger)
+        self._spec_index = (report_spec, index)
+        return index
+    
+    def _table_spec_elements(self, report_spec: str, table_name: str):
+        """
+        Find the parts of the report specification that belong to a table
+        
+        These are the outermost elements with an attribute naming the table,
+        such as the query of the table and the lists and charts referring to it.
+        
+        Args:
+            report_spec: Full report specification XML
+            table_name: Name of the table
+            
+        Returns:
+            Tuple of the specification index (None if the specification could not
+            be parsed) and the matched elements in document order
+        """
+        index = self._report_spec_index(report_spec)
+        if index is None:
+            return None, []
+        
+        elements = []
+        for elem in index.elements_with_attribute_value(table_name):
+            # Elements inside an earlier match are part of its fragment already
+            if not elements or not index.contains(elements[-1], elem):
+                elements.append(elem)
+        return index, elements
+    
     def _extract_relevant_report_spec(self, report_spec: str, table_name: str) -> str:
         """
         Extract relevant parts of the report specification for a specific table
@@ -303,18 +367,19 @@ in
         Returns:
             Relevant parts of the report specification
         """
-        # This is a simplified implementation - in a real-world scenario,
-        # you would parse the XML and extract only the parts relevant to the table
         try:
-            # Look for sections related to the table
-            table_pattern = f"<.*?{table_name}.*?>"
-            matches = re.findall(f"(?s)<.*?{table_name}.*?>.*?</.*?>", report_spec)
-            
-            if matches:
-                # Return first 1000 characters of matches to keep context size manageable
-                return "".join(matches)[:1000]
-            else:
-                return ""
+            _, elements = self._table_spec_elements(report_spec, table_name)
+            
+            # Return first 1000 characters of matches to keep context size manageable
+            fragments = []
+            length = 0
+            for elem in elements:
+                if length >= 1000:
+                    break
+                fragment = ET.tostring(elem, encoding='unicode').strip()
+                fragments.append(fragment)
+                length += len(fragment)
+            return "".join(fragments)[:1000]
         except Exception as e:
             self.logger.warning(f"Error extracting relevant report spec: {e}")
             return ""
@@ -332,60 +397,59 @@ in
         """
         filters = []
         try:
-            # Look for filter sections in the report spec
-            # This is a simplified implementation that looks for common filter patterns in Cognos XML
-            filter_patterns = [
-                # Pattern for simple filters
-                r'<filter.*?<expression>\s*\[([^\]]+)\]\s*([=<>!]+)\s*([^<]+)</expression>',
-                # Pattern for IN filters
-                r'<filter.*?<expression>\s*\[([^\]]+)\]\s+in\s+\(([^)]+)\)</expression>',
-                # Pattern for BETWEEN filters
-                r'<filter.*?<expression>\s*\[([^\]]+)\]\s+between\s+([^\s]+)\s+and\s+([^\s<]+)</expression>'
-            ]
-            
-            # Extract the relevant part of the report spec for this table
-            relevant_spec = self._extract_relevant_report_spec(report_spec, table_name)
-            
-            # Process each filter pattern
-            for pattern in filter_patterns:
-                matches = re.findall(pattern, relevant_spec, re.IGNORECASE)
+            index, elements = self._table_spec_elements(report_spec, table_name)
+            
+            # Filter expressions in the parts of the report spec for this table
+            expressions = []
+            for elem in elements:
+                expressions.extend(index.findall(elem, 'filterExpression'))
+                for filter_elem in index.findall(elem, 'filter'):
+                    expression = index.find(filter_elem, 'expression')
+                    if expression is not None:
+                        expressions.append(expression)
+            
+            for expression in expressions:
+                text = (expression.text or '').strip()
                 
-                for match in matches:
-                    if len(match) == 3 and '=' in match[1]:
-                        # Simple equality filter
-                        filters.append({
-                            'column_name': match[0].strip(),
-                            'operator': 'equals',
-                            'values': [match[2].strip().strip('"\'')] 
-                        })
-                    elif len(match) == 3 and '>' in match[1]:
-                        # Greater than filter
-                        filters.append({
-                            'column_name': match[0].strip(),
-                            'operator': 'greaterThan',
-                            'values': [match[2].strip().strip('"\'')] 
-                        })
-                    elif len(match) == 3 and '<' in match[1]:
-                        # Less than filter
-                        filters.append({
-                            'column_name': match[0].strip(),
-                            'operator': 'lessThan',
-                            'values': [match[2].strip().strip('"\'')] 
-                        })
-                    elif len(match) == 2:  # IN filter
-                        # Split the values and clean them
-                        values = [v.strip().strip('"\'\'') for v in match[1].split(',')]
-                        filters.append({
-                            'column_name': match[0].strip(),
-                            'operator': 'in',
-                            'values': values
-                        })
-                    elif len(match) == 3:  # BETWEEN filter
-                        filters.append({
-                            'column_name': match[0].strip(),
-                            'operator': 'between',
-                            'values': [match[1].strip().strip('"\'\''), match[2].strip().strip('"\'\'')]
-                        })
+                # IN filter
+                match = _IN_FILTER.match(text)
+                if match:
+                    # Split the values and clean them
+                    values = [v.strip().strip('"\'\'') for v in match.group(2).split(',')]
+                    filters.append({
+                        'column_name': match.group(1).strip(),
+                        'operator': 'in',
+                        'values': values
+                    })
+                    continue
+                
+                # BETWEEN filter
+                match = _BETWEEN_FILTER.match(text)
+                if match:
+                    filters.append({
+                        'column_name': match.group(1).strip(),
+                        'operator': 'between',
+                        'values': [match.group(2).strip().strip('"\'\''), match.group(3).strip().strip('"\'\'')]
+                    })
+                    continue
+                
+                # Simple comparison filter
+                match = _COMPARISON_FILTER.match(text)
+                if match:
+                    column_name, operator, value = match.groups()
+                    if '=' in operator:
+                        operator = 'equals'
+                    elif '>' in operator:
+                        operator = 'greaterThan'
+                    elif '<' in operator:
+                        operator = 'lessThan'
+                    else:
+                        continue
+                    filters.append({
+                        'column_name': column_name.strip(),
+                        'operator': operator,
+                        'values': [value.strip().strip('"\'')]
+                    })
             
             return filters
         except Exception as e:
@@ -405,36 +469,23 @@ in
         """
         calculations = []
         try:
-            # Look for calculation sections in the report spec
-            # This is a simplified implementation that looks for common calculation patterns in Cognos XML
-            calc_patterns = [
-                # Pattern for calculated columns
-                r'<calculation.*?<name>([^<]+)</name>.*?<expression>([^<]+)</expression>',
-                # Pattern for calculated measures
-                r'<measure.*?<name>([^<]+)</name>.*?<expression>([^<]+)</expression>'
-            ]
-            
-            # Extract the relevant part of the report spec for this table
-            relevant_spec = self._extract_relevant_report_spec(report_spec, table_name)
-            
-            # Process each calculation pattern
-            for pattern in calc_patterns:
-                matches = re.findall(pattern, relevant_spec, re.IGNORECASE | re.DOTALL)
-                
-                for match in matches:
-                    if len(match) == 2:
-                        # Extract description if available
-                        description = None
-                        desc_match = re.search(r'<description>([^<]+)</description>', 
-                                              relevant_spec, re.IGNORECASE)
-                        if desc_match:
-                            description = desc_match.group(1).strip()
-                        
-                        calculations.append({
-                            'new_column_name': match[0].strip(),
-                            'source_expression': match[1].strip(),
-                            'description': description
-                        })
+            index, elements = self._table_spec_elements(report_spec, table_name)
+            
+            # Calculated columns and measures in the parts of the report spec for this table
+            for elem in elements:
+                for calculation in index.findall(elem, 'calculation') + index.findall(elem, 'measure'):
+                    name = index.find(calculation, 'name')
+                    expression = index.find(calculation, 'expression')
+                    if name is None or expression is None or not (name.text or '').strip() \
+                            or not (expression.text or '').strip():
+                        continue
+                    
+                    description = index.find(calculation, 'description')
+                    calculations.append({
+                        'new_column_name': name.text.strip(),
+                        'source_expression': expression.text.strip(),
+                        'description': description.text.strip() if description is not None and description.text else None
+                    })
             
             return calculations
         except Exception as e:
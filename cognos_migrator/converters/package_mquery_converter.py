@@ -1,16 +1,15 @@
 """
 Package-specific M-Query Converter for converting Cognos package queries to Power BI M-query format.
 """
-import json
 import os
 import re
-import requests
 import textwrap
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from ..models import Table
 from .base_mquery_converter import BaseMQueryConverter
+from ..common.artifact_store import json_exists, load_json
 
 
 class PackageMQueryConverter(BaseMQueryConverter):
@@ -173,13 +172,12 @@ in
     def _get_table_metadata(self, table: Table) -> Optional[Dict]:
         """Get table metadata from table_*.json file"""
         table_json_path = Path(self.output_path) / "extracted" / f"table_{table.name}.json"
-        if not table_json_path.exists():
+        if not json_exists(table_json_path):
             self.logger.warning(f"Table metadata file not found at {table_json_path}")
             return None
                 
         try:
-            with open(table_json_path, 'r') as f:
-                return json.load(f)
+            return load_json(table_json_path)
         except Exception as e:
             self.logger.error(f"Error reading table metadata file {table_json_path}: {e}")
             return None
@@ -218,7 +216,7 @@ in
             
             # Try enhanced endpoint first
             try:
-                response = requests.post(
+                response = self._post_llm_api(
                     f'{api_base_url}/api/mquery/complete',
                     headers={'Content-Type': 'application/json'},
                     json=payload,
@@ -232,7 +230,7 @@ in
                         self.logger.info(f"API processing time for table {table.name}: {result['processing_time']:.2f}s")
                 else:
                     # Fallback to basic endpoint
-                    response = requests.post(
+                    response = self._post_llm_api(
                         f'{api_base_url}/api/mquery/generate',
                         headers={'Content-Type': 'application/json'},
                         json=payload,
@@ -258,7 +256,7 @@ in
             }
             
             self.logger.info(f"Calling validation API for quality assurance (table: {table_name})")
-            response = requests.post(
+            response = self._post_llm_api(
                 f'{api_base_url}/api/mquery/validate',
                 headers={'Content-Type': 'application/json'},
                 json=validation_payload,
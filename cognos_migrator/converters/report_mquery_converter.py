@@ -3,13 +3,13 @@ Report-specific M-Query Converter for converting Cognos report queries to Power
 """
 import json
 import re
-import requests
 import os
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from ..models import Table
 from .base_mquery_converter import BaseMQueryConverter
+from ..common.artifact_store import load_json
 
 
 class ReportMQueryConverter(BaseMQueryConverter):
@@ -76,8 +76,7 @@ class ReportMQueryConverter(BaseMQueryConverter):
             return None
 
         try:
-            with open(report_queries_path, 'r') as f:
-                queries = json.load(f)
+            queries = load_json(report_queries_path)
         except json.JSONDecodeError:
             self.logger.error(f"Invalid JSON in {report_queries_path}")
             return None
@@ -163,7 +162,7 @@ class ReportMQueryConverter(BaseMQueryConverter):
             
             # Try enhanced endpoint first
             try:
-                response = requests.post(
+                response = self._post_llm_api(
                     f'{api_base_url}/api/mquery/complete',
                     headers={'Content-Type': 'application/json'},
                     json=payload,
@@ -177,7 +176,7 @@ class ReportMQueryConverter(BaseMQueryConverter):
                         self.logger.info(f"API processing time for table {table.name}: {result['processing_time']:.2f}s")
                 else:
                     # Fallback to basic endpoint
-                    response = requests.post(
+                    response = self._post_llm_api(
                         f'{api_base_url}/api/mquery/generate',
                         headers={'Content-Type': 'application/json'},
                         json=payload,
@@ -203,7 +202,7 @@ class ReportMQueryConverter(BaseMQueryConverter):
             }
             
             self.logger.info(f"Calling validation API for quality assurance (table: {table_name})")
-            response = requests.post(
+            response = self._post_llm_api(
                 f'{api_base_url}/api/mquery/validate',
                 headers={'Content-Type': 'application/json'},
                 json=validation_payload,
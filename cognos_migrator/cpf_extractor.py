@@ -3,6 +3,11 @@ CPF Extractor Module for integrating Framework Manager metadata into the migrati
 
 This module provides functionality to extract and use metadata from Cognos Framework Manager
 .cpf files during the Power BI migration process.
+
+Lookups by name, ID, table name and column ID are served from hash indexes
+built once from the loaded metadata, and the related query subjects of each
+query subject are precomputed, so enhancing every table and column of a large
+model no longer scans all query subjects per lookup.
 """
 
 import os
@@ -29,6 +34,7 @@ class CPFExtractor:
         self.logger = logging.getLogger(__name__)
         self.metadata = {}
         self.parser = None
+        self._index_key = None
         
         if cpf_file_path:
             self.load_cpf(cpf_file_path)
@@ -49,6 +55,7 @@ class CPFExtractor:
             
             if self.parser.parse():
                 self.metadata = self.parser.extract_all()
+                self._build_indexes()
                 self.logger.info(f"Successfully loaded CPF metadata from: {cpf_file_path}")
                 return True
             else:
@@ -59,6 +66,59 @@ class CPFExtractor:
             self.logger.error(f"Error loading CPF file: {e}")
             return False
     
+    def _metadata_key(self) -> tuple:
+        """Identity and size of the indexed metadata, to notice when it was replaced"""
+        query_subjects = self.metadata.get('querySubjects') if self.metadata else None
+        data_sources = self.metadata.get('dataSources') if self.metadata else None
+        return (id(self.metadata), id(query_subjects), len(query_subjects or ()),
+                id(data_sources), len(data_sources or ()))
+    
+    def _build_indexes(self) -> None:
+        """
+        Build the lookup indexes from the loaded metadata
+        
+        The first query subject, data source or column with a given key wins,
+        as with the linear scans the indexes replace.
+        """
+        query_subjects = (self.metadata or {}).get('querySubjects') or []
+        data_sources = (self.metadata or {}).get('dataSources') or []
+        
+        self._query_subjects_by_name = {}
+        self._query_subjects_by_id = {}
+        self._query_subjects_by_table_name = {}
+        self._column_names_by_id = {}
+        all_by_id = {}
+        for qs in query_subjects:
+            self._query_subjects_by_name.setdefault(qs.get('name'), qs)
+            self._query_subjects_by_id.setdefault(qs.get('id'), qs)
+            self._query_subjects_by_table_name.setdefault(qs.get('tableName'), qs)
+            all_by_id.setdefault(qs.get('id'), []).append(qs)
+            for col in qs.get('columns', []):
+                self._column_names_by_id.setdefault(col.get('id'), col.get('name', ''))
+        
+        self._data_sources_by_name = {}
+        self._data_sources_by_id = {}
+        for ds in data_sources:
+            self._data_sources_by_name.setdefault(ds.get('name'), ds)
+            self._data_sources_by_id.setdefault(ds.get('id'), ds)
+        
+        # Adjacency list: every query subject with a relationship's target ID, per relationship
+        self._related_query_subjects = {}
+        for qs_id, qs in self._query_subjects_by_id.items():
+            related = []
+            for rel in qs.get('relationships', []):
+                target_id = rel.get('targetQuerySubjectId')
+                if target_id:
+                    related.extend(all_by_id.get(target_id, ()))
+            self._related_query_subjects[qs_id] = related
+        
+        self._index_key = self._metadata_key()
+    
+    def _ensure_indexes(self) -> None:
+        """Rebuild the indexes if the metadata was replaced since they were built"""
+        if self._index_key != self._metadata_key():
+            self._build_indexes()
+    
     def get_data_source_by_name(self, name: str) -> Dict[str, Any]:
         """
         Get data source information by name
@@ -69,14 +129,8 @@ class CPFExtractor:
         Returns:
             Dictionary containing data source information or empty dict if not found
         """
-        if not self.metadata or 'dataSources' not in self.metadata:
-            return {}
-        
-        for ds in self.metadata['dataSources']:
-            if ds.get('name') == name:
-                return ds
-        
-        return {}
+        self._ensure_indexes()
+        return self._data_sources_by_name.get(name) or {}
     
     def get_query_subject_by_name(self, name: str) -> Dict[str, Any]:
         """
@@ -88,14 +142,8 @@ class CPFExtractor:
         Returns:
             Dictionary containing query subject information or empty dict if not found
         """
-        if not self.metadata or 'querySubjects' not in self.metadata:
-            return {}
-        
-        for qs in self.metadata['querySubjects']:
-            if qs.get('name') == name:
-                return qs
-        
-        return {}
+        self._ensure_indexes()
+        return self._query_subjects_by_name.get(name) or {}
     
     def get_related_query_subjects(self, query_subject_id: str) -> List[Dict[str, Any]]:
         """
@@ -107,30 +155,8 @@ class CPFExtractor:
         Returns:
             List of dictionaries containing related query subject information
         """
-        related_subjects = []
-        
-        if not self.metadata or 'querySubjects' not in self.metadata:
-            return related_subjects
-        
-        # Find the query subject by ID
-        query_subject = None
-        for qs in self.metadata['querySubjects']:
-            if qs.get('id') == query_subject_id:
-                query_subject = qs
-                break
-        
-        if not query_subject:
-            return related_subjects
-        
-        # Get related query subjects through relationships
-        for rel in query_subject.get('relationships', []):
-            target_id = rel.get('targetQuerySubjectId')
-            if target_id:
-                for qs in self.metadata['querySubjects']:
-                    if qs.get('id') == target_id:
-                        related_subjects.append(qs)
-        
-        return related_subjects
+        self._ensure_indexes()
+        return list(self._related_query_subjects.get(query_subject_id, ()))
     
     def get_table_schema(self, table_name: str) -> Dict[str, Any]:
         """
@@ -152,11 +178,8 @@ class CPFExtractor:
         query_subject = self.get_query_subject_by_name(table_name)
         
         # If not found, try to find by table name
-        if not query_subject and 'querySubjects' in self.metadata:
-            for qs in self.metadata['querySubjects']:
-                if qs.get('tableName') == table_name:
-                    query_subject = qs
-                    break
+        if not query_subject:
+            query_subject = self._query_subjects_by_table_name.get(table_name)
         
         if query_subject:
             schema['name'] = query_subject.get('name', table_name)
@@ -205,17 +228,15 @@ class CPFExtractor:
         # Add data source information if available
         if 'dataSourceId' in table_schema:
             ds_id = table_schema.get('dataSourceId')
-            if ds_id and 'dataSources' in self.metadata:
-                for ds in self.metadata['dataSources']:
-                    if ds.get('id') == ds_id:
-                        context['data_source'] = {
-                            'name': ds.get('name', ''),
-                            'type': ds.get('type', ''),
-                            'connectionString': ds.get('connectionString', ''),
-                            'catalog': ds.get('catalog', ''),
-                            'schema': ds.get('schema', '')
-                        }
-                        break
+            ds = self._data_sources_by_id.get(ds_id) if ds_id else None
+            if ds:
+                context['data_source'] = {
+                    'name': ds.get('name', ''),
+                    'type': ds.get('type', ''),
+                    'connectionString': ds.get('connectionString', ''),
+                    'catalog': ds.get('catalog', ''),
+                    'schema': ds.get('schema', '')
+                }
         
         return context
     
@@ -229,14 +250,8 @@ class CPFExtractor:
         Returns:
             Dictionary containing query subject information or empty dict if not found
         """
-        if not self.metadata or 'querySubjects' not in self.metadata:
-            return {}
-        
-        for qs in self.metadata['querySubjects']:
-            if qs.get('id') == query_subject_id:
-                return qs
-        
-        return {}
+        self._ensure_indexes()
+        return self._query_subjects_by_id.get(query_subject_id) or {}
     
     def get_column_name_by_id(self, column_id: str) -> str:
         """
@@ -248,12 +263,5 @@ class CPFExtractor:
         Returns:
             Column name or empty string if not found
         """
-        if not self.metadata or 'querySubjects' not in self.metadata:
-            return ''
-        
-        for qs in self.metadata['querySubjects']:
-            for col in qs.get('columns', []):
-                if col.get('id') == column_id:
-                    return col.get('name', '')
-        
-        return ''
+        self._ensure_indexes()
+        return self._column_names_by_id.get(column_id, '')
@@ -25,8 +25,14 @@ class CPFMetadataEnhancer:
             
             self.logger.info("Enhancing Power BI project with CPF metadata")
             
+            data_model = powerbi_project.data_model
+            tables_by_name = {}
+            for table in data_model.tables:
+                tables_by_name.setdefault(table.name, table)
+            relationship_keys = {self._relationship_key(rel) for rel in data_model.relationships}
+            
             # Enhance tables with CPF metadata
-            for table in powerbi_project.data_model.tables:
+            for table in data_model.tables:
                 table_name = table.name
                 
                 # Get table schema from CPF metadata
@@ -36,25 +42,30 @@ class CPFMetadataEnhancer:
                 
                 self.logger.info(f"Enhancing table: {table_name} with CPF metadata")
                 
+                # CPF columns by name; the first column with a name wins
+                cpf_columns = {}
+                for cpf_col in table_schema.get('columns', []):
+                    cpf_columns.setdefault(cpf_col.get('name'), cpf_col)
+                
                 # Update column metadata
                 for col in table.columns:
                     # Find matching column in CPF metadata
-                    for cpf_col in table_schema.get('columns', []):
-                        if cpf_col.get('name') == col.name:
-                            # Update column data type if available
-                            if cpf_col.get('dataType'):
-                                col.data_type = self._map_cpf_data_type(cpf_col.get('dataType'))
-                            
-                            # Update column description if available
-                            if cpf_col.get('expression'):
-                                col.description = f"Expression: {cpf_col.get('expression')}"
-                            
-                            break
+                    cpf_col = cpf_columns.get(col.name)
+                    if cpf_col is None:
+                        continue
+                    
+                    # Update column data type if available
+                    if cpf_col.get('dataType'):
+                        col.data_type = self._map_cpf_data_type(cpf_col.get('dataType'))
+                    
+                    # Update column description if available
+                    if cpf_col.get('expression'):
+                        col.description = f"Expression: {cpf_col.get('expression')}"
                 
                 # Add relationships if available
                 for rel in table_schema.get('relationships', []):
-                    target_table = self._find_table_by_name(powerbi_project.data_model, 
-                                                      self.cpf_extractor.get_query_subject_by_id(rel.get('targetQuerySubjectId', '')).get('name', ''))
+                    target_table = tables_by_name.get(
+                        self.cpf_extractor.get_query_subject_by_id(rel.get('targetQuerySubjectId', '')).get('name', ''))
                     
                     if target_table:
                         # Get column names
@@ -72,8 +83,10 @@ class CPFMetadataEnhancer:
                             )
                             
                             # Add relationship if it doesn't already exist
-                            if not self._relationship_exists(powerbi_project.data_model, new_rel):
-                                powerbi_project.data_model.relationships.append(new_rel)
+                            key = self._relationship_key(new_rel)
+                            if key not in relationship_keys:
+                                relationship_keys.add(key)
+                                data_model.relationships.append(new_rel)
                                 self.logger.info(f"Added relationship: {table.name}.{source_cols[0]} -> {target_table.name}.{target_cols[0]}")
             
             # Add M-query context to the project for later use
@@ -112,19 +125,6 @@ class CPFMetadataEnhancer:
         
         return cardinality_mapping.get(cardinality, 'ManyToOne')  # Default to ManyToOne if unknown
     
-    def _find_table_by_name(self, data_model, table_name: str):
-        """Find a table in the data model by name"""
-        for table in data_model.tables:
-            if table.name == table_name:
-                return table
-        return None
-    
-    def _relationship_exists(self, data_model, new_rel: Relationship) -> bool:
-        """Check if a relationship already exists in the data model"""
-        for rel in data_model.relationships:
-            if (rel.from_table == new_rel.from_table and 
-                rel.from_column == new_rel.from_column and 
-                rel.to_table == new_rel.to_table and 
-                rel.to_column == new_rel.to_column):
-                return True
-        return False
+    def _relationship_key(self, rel: Relationship) -> tuple:
+        """Columns a relationship joins; relationships with the same key are duplicates"""
+        return (rel.from_table, rel.from_column, rel.to_table, rel.to_column)
@@ -7,6 +7,7 @@ filters, and layout information.
 """
 
 from .base_extractor import BaseExtractor
+from .report_spec_index import ReportSpecIndex
 from .query_extractor import QueryExtractor
 from .data_item_extractor import DataItemExtractor
 from .expression_extractor import ExpressionExtractor
@@ -16,6 +17,7 @@ from .layout_extractor import LayoutExtractor
 
 __all__ = [
     'BaseExtractor',
+    'ReportSpecIndex',
     'QueryExtractor',
     'DataItemExtractor',
     'ExpressionExtractor',
@@ -7,6 +7,8 @@ This module provides a base class with common functionality for all extractors.
 import logging
 import xml.etree.ElementTree as ET
 
+from .report_spec_index import ReportSpecIndex
+
 
 class BaseExtractor:
     """Base class for all Cognos XML extractors."""
@@ -22,6 +24,12 @@ class BaseExtractor:
             return {"ns": ns['ns']}
         return None
     
+    def get_spec_index(self, root, ns=None, spec_index=None):
+        """Get the report specification index for root, building it if not supplied."""
+        if spec_index is not None and spec_index.root is root:
+            return spec_index
+        return ReportSpecIndex(root, ns, logger=self.logger)
+    
     def find_element(self, parent, element_name, ns=None):
         """Find an element with namespace handling."""
         if ns and 'ns' in ns:
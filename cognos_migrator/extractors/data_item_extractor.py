@@ -111,15 +111,16 @@ class DataItemExtractor(BaseExtractor):
         self.logger.debug(f"Expression '{expression}' doesn't match source column pattern, classified as calculation")
         return False
     
-    def extract_data_items(self, root, ns=None):
+    def extract_data_items(self, root, ns=None, spec_index=None):
         """Extract data items from report specification XML using two passes"""
         data_items = []
         try:
             # Register namespace if present
             namespace = self.register_namespace(ns)
+            index = self.get_spec_index(root, ns, spec_index)
             
             # Find all data items in the report
-            data_item_elements = self.findall_elements(root, "dataItem", ns)
+            data_item_elements = index.findall(root, "dataItem")
             
             # First pass: Process source columns and build column-table mapping
             for item_elem in data_item_elements:
@@ -127,7 +128,7 @@ class DataItemExtractor(BaseExtractor):
                 name = item_elem.get("name", "")
                 
                 # Extract expression
-                expr_elem = self.find_element(item_elem, "expression", ns)
+                expr_elem = index.find(item_elem, "expression")
                 expression = self.get_element_text(expr_elem) if expr_elem is not None else ""
                 
                 # Extract table name and build mapping
@@ -167,7 +168,7 @@ class DataItemExtractor(BaseExtractor):
                 }
                 
                 # Extract expression
-                expr_elem = self.find_element(item_elem, "expression", ns)
+                expr_elem = index.find(item_elem, "expression")
                 expression = ""
                 if expr_elem is not None:
                     expression = self.get_element_text(expr_elem)
@@ -195,7 +196,7 @@ class DataItemExtractor(BaseExtractor):
                     data_item["table_name"] = table_name
                 
                 # Extract XML attributes for data type and usage
-                xml_attrs = self.find_element(item_elem, "XMLAttributes", ns)
+                xml_attrs = index.find(item_elem, "XMLAttributes")
                     
                 if xml_attrs is not None:
                     data_type_attr = self.find_element(xml_attrs, "XMLAttribute[@name='RS_dataType']", ns)
@@ -209,25 +210,10 @@ class DataItemExtractor(BaseExtractor):
                     if format_attr is not None:
                         data_item["formatProperties"] = format_attr.get("value", "")
                 
-                # Try to determine the source query by looking at the context
-                query_elements = self.findall_elements(root, "query", ns)
-                    
-                for query_elem in query_elements:
-                    query_name = query_elem.get("name", "")
-                    
-                    # Look for this data item in the query's selection
-                    selection_elem = self.find_element(query_elem, "selection", ns)
-                        
-                    if selection_elem is not None:
-                        query_data_items = self.findall_elements(
-                            selection_elem, 
-                            f"dataItem[@name='{data_item['name']}']", 
-                            ns
-                        )
-                            
-                        if query_data_items:
-                            data_item["queryName"] = query_name
-                            break
+                # Determine the source query from the first query selecting this data item
+                query_name = index.query_name_for_data_item(data_item['name'])
+                if query_name is not None:
+                    data_item["queryName"] = query_name
                 
                 # Log the classification for debugging
                 self.logger.debug(f"Classified data item '{data_item['name']}' as {data_item['type']} in table '{table_name}'")
@@ -79,15 +79,17 @@ class ExpressionExtractor(BaseExtractor):
         self.logger.debug(f"Expression '{expression}' doesn't match source column pattern, classified as calculation")
         return False
     
-    def extract_expressions(self, root, ns=None):
+    def extract_expressions(self, root, ns=None, spec_index=None):
         """Extract expressions from report specification XML, including those within query dataItem elements"""
         expressions = []
+        seen_expressions = set()
         try:
             # Register namespace if present
             namespace = self.register_namespace(ns)
+            index = self.get_spec_index(root, ns, spec_index)
             
             # Method 1: Find standalone expressions in the report
-            expr_elements = self.findall_elements(root, "expression", ns)
+            expr_elements = index.findall(root, "expression")
                 
             for expr_elem in expr_elements:
                 # Extract the expression text
@@ -100,30 +102,18 @@ class ExpressionExtractor(BaseExtractor):
                     self.logger.debug(f"Skipping source column expression: {expr_text}")
                     continue
                     
-                # Try to determine context by looking at parent elements
+                # Determine context from the dataItem or filter carrying the same expression text
                 context = "unknown"
                 name = ""
                 
-                # Since we can't directly get parent, we'll search for dataItems and check if this expression is inside
-                data_items = self.findall_elements(root, "dataItem", ns)
-                    
-                for data_item in data_items:
-                    item_expr = self.find_element(data_item, "expression", ns)
-                        
-                    if item_expr is not None and self.get_element_text(item_expr) == expr_text:
-                        context = "dataItem"
-                        name = data_item.get("name", "")
-                        break
-                
-                # If not found in dataItems, check filters
-                if context == "unknown":
-                    filters = self.findall_elements(root, "filterExpression", ns)
-                        
-                    for filter_expr in filters:
-                        if self.get_element_text(filter_expr) == expr_text:
-                            context = "filter"
-                            break
+                data_item = index.data_item_by_expression_text(expr_text)
+                if data_item is not None:
+                    context = "dataItem"
+                    name = data_item.get("name", "")
+                elif index.is_filter_expression_text(expr_text):
+                    context = "filter"
                 
+                seen_expressions.add(expr_text)
                 expressions.append({
                     "context": context,
                     "name": name,
@@ -132,18 +122,18 @@ class ExpressionExtractor(BaseExtractor):
             
             # Method 2: Look for expressions within query dataItem elements
             # This is where calculations like LOC_1 and LOC_2 are found in report queries
-            queries = self.findall_elements(root, "query", ns)
+            queries = index.findall(root, "query")
             
             for query in queries:
                 query_name = query.get("name", "")
-                selection = self.find_element(query, "selection", ns)
+                selection = index.find(query, "selection")
                 
                 if selection is not None:
-                    data_items = self.findall_elements(selection, "dataItem", ns)
+                    data_items = index.findall(selection, "dataItem")
                     
                     for data_item in data_items:
                         item_name = data_item.get("name", "")
-                        item_expr = self.find_element(data_item, "expression", ns)
+                        item_expr = index.find(data_item, "expression")
                         
                         if item_expr is not None:
                             expr_text = self.get_element_text(item_expr)
@@ -152,8 +142,8 @@ class ExpressionExtractor(BaseExtractor):
                                 self.logger.debug(f"Found calculation in query '{query_name}': {item_name} = {expr_text}")
                                 
                                 # Check if we already have this expression
-                                existing = next((e for e in expressions if e["expression"] == expr_text), None)
-                                if not existing:
+                                if expr_text not in seen_expressions:
+                                    seen_expressions.add(expr_text)
                                     expressions.append({
                                         "context": "dataItem",
                                         "name": item_name,
@@ -233,7 +223,9 @@ class ExpressionExtractor(BaseExtractor):
         
         # Try batch conversion with dependency resolution first
         calculations = []
-        if self.expression_converter and len(calc_dict) > 1:  # Only use batch if we have multiple calculations
+        # Only use batch if we have multiple calculations and the converter resolves dependencies
+        if (self.expression_converter and len(calc_dict) > 1
+                and hasattr(self.expression_converter, 'resolve_dependencies')):
             self.logger.info(f"Attempting batch conversion with dependency resolution for {len(calc_dict)} expressions")
             try:
                 batch_result = self.expression_converter.resolve_dependencies(
@@ -278,55 +270,27 @@ class ExpressionExtractor(BaseExtractor):
                 self.logger.error(f"Error in batch conversion: {str(e)}")
                 # Continue with individual conversion for remaining calculations
         
-        # Process remaining expressions individually
-        for name, calc_data in calc_dict.items():
+        # Convert remaining expressions in de-duplicated batches
+        pending = list(calc_dict.items())
+        try:
+            conversion_results = self.expression_converter.convert_expressions([
+                {
+                    "cognos_formula": calc_data['cognos_expression'],
+                    "table_name": calc_data['table_name'],
+                    "column_mappings": column_mappings,
+                    "query_data": query_data
+                }
+                for name, calc_data in pending
+            ]) if pending else []
+        except Exception as e:
+            self.logger.error(f"Error converting expressions: {str(e)}")
+            conversion_results = [e] * len(pending)
+        
+        for (name, calc_data), conversion_result in zip(pending, conversion_results):
             cognos_expr = calc_data['cognos_expression']
             table_name = calc_data['table_name']
             
-            try:
-                self.logger.info(f"Converting expression '{name}' individually: {cognos_expr}")
-                
-                # Convert the expression
-                conversion_result = self.expression_converter.convert_expression(
-                    cognos_formula=cognos_expr,
-                    table_name=table_name,
-                    column_mappings=column_mappings,
-                    query_data=query_data
-                )
-                
-                if conversion_result is None:
-                    self.logger.warning(f"Expression converter returned None for '{name}'")
-                    # Use original expression as fallback
-                    dax_expression = cognos_expr
-                    confidence = 0.0
-                    notes = "Conversion service failed"
-                    status = "needs_review"
-                else:
-                    dax_expression = conversion_result.get("dax_expression", cognos_expr)
-                    confidence = conversion_result.get("confidence", 0.0)
-                    notes = conversion_result.get("notes", "")
-                    
-                    # Determine status based on confidence
-                    if confidence >= 0.8:
-                        status = "converted"
-                    else:
-                        status = "needs_review"
-                        
-                # Add to calculations list
-                calculations.append({
-                    "TableName": table_name,
-                    "FormulaCaptionCognos": name,
-                    "CognosName": name,
-                    "FormulaCognos": cognos_expr,
-                    "FormulaTypeCognos": calc_data['type'],
-                    "PowerBIName": name,
-                    "FormulaDax": dax_expression,
-                    "Status": status,
-                    "Notes": notes
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Error converting expression '{name}': {str(e)}")
+            if isinstance(conversion_result, Exception):
                 # Add to calculations list with error
                 calculations.append({
                     "TableName": table_name,
@@ -337,8 +301,40 @@ class ExpressionExtractor(BaseExtractor):
                     "PowerBIName": name,
                     "FormulaDax": cognos_expr,
                     "Status": "needs_review",
-                    "Notes": f"Error during conversion: {str(e)}"
+                    "Notes": f"Error during conversion: {str(conversion_result)}"
                 })
+                continue
+            
+            if conversion_result is None:
+                self.logger.warning(f"Expression converter returned None for '{name}'")
+                # Use original expression as fallback
+                dax_expression = cognos_expr
+                confidence = 0.0
+                notes = "Conversion service failed"
+                status = "needs_review"
+            else:
+                dax_expression = conversion_result.get("dax_expression", cognos_expr)
+                confidence = conversion_result.get("confidence", 0.0)
+                notes = conversion_result.get("notes", "")
+                
+                # Determine status based on confidence
+                if confidence >= 0.8:
+                    status = "converted"
+                else:
+                    status = "needs_review"
+                    
+            # Add to calculations list
+            calculations.append({
+                "TableName": table_name,
+                "FormulaCaptionCognos": name,
+                "CognosName": name,
+                "FormulaCognos": cognos_expr,
+                "FormulaTypeCognos": calc_data['type'],
+                "PowerBIName": name,
+                "FormulaDax": dax_expression,
+                "Status": status,
+                "Notes": notes
+            })
         
         self.logger.info(f"Converted {len(calculations)} expressions, found {len([c for c in calculations if c['Status'] == 'converted'])} successful conversions")
         return {"calculations": calculations}
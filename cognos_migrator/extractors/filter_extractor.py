@@ -15,31 +15,32 @@ class FilterExtractor(BaseExtractor):
         """Initialize the filter extractor with optional logger."""
         super().__init__(logger)
     
-    def extract_filters(self, root, ns=None):
+    def extract_filters(self, root, ns=None, spec_index=None):
         """Extract filters from report specification XML"""
         filters = []
         try:
             # Register namespace if present
             namespace = self.register_namespace(ns)
+            index = self.get_spec_index(root, ns, spec_index)
             
             # Find the queries section
-            queries_section = self.find_element(root, "queries", ns)
+            queries_section = index.find(root, "queries")
                 
             if queries_section is None:
                 self.logger.warning("No queries section found in report specification")
                 return filters
                 
             # Process each query
-            query_elements = self.findall_elements(queries_section, "query", ns)
+            query_elements = index.findall(queries_section, "query")
                 
             for query_idx, query_elem in enumerate(query_elements):
                 query_name = query_elem.get("name", f"Query {query_idx}")
                 
                 # Extract detail filters
-                detail_filters_elem = self.find_element(query_elem, "detailFilters", ns)
+                detail_filters_elem = index.find(query_elem, "detailFilters")
                     
                 if detail_filters_elem is not None:
-                    filter_elements = self.findall_elements(detail_filters_elem, "detailFilter", ns)
+                    filter_elements = index.findall(detail_filters_elem, "detailFilter")
                         
                     for i, filter_elem in enumerate(filter_elements):
                         filter_data = {
@@ -49,7 +50,7 @@ class FilterExtractor(BaseExtractor):
                         }
                         
                         # Extract filter expression
-                        expr_elem = self.find_element(filter_elem, "filterExpression", ns)
+                        expr_elem = index.find(filter_elem, "filterExpression")
                             
                         if expr_elem is not None:
                             filter_data["expression"] = self.get_element_text(expr_elem)
@@ -57,10 +58,10 @@ class FilterExtractor(BaseExtractor):
                         filters.append(filter_data)
                 
                 # Extract summary filters
-                summary_filters_elem = self.find_element(query_elem, "summaryFilters", ns)
+                summary_filters_elem = index.find(query_elem, "summaryFilters")
                     
                 if summary_filters_elem is not None:
-                    filter_elements = self.findall_elements(summary_filters_elem, "summaryFilter", ns)
+                    filter_elements = index.findall(summary_filters_elem, "summaryFilter")
                         
                     for i, filter_elem in enumerate(filter_elements):
                         filter_data = {
@@ -70,7 +71,7 @@ class FilterExtractor(BaseExtractor):
                         }
                         
                         # Extract filter expression
-                        expr_elem = self.find_element(filter_elem, "filterExpression", ns)
+                        expr_elem = index.find(filter_elem, "filterExpression")
                             
                         if expr_elem is not None:
                             filter_data["expression"] = self.get_element_text(expr_elem)
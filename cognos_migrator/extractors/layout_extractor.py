@@ -15,7 +15,7 @@ class LayoutExtractor(BaseExtractor):
         """Initialize the layout extractor with optional logger."""
         super().__init__(logger)
     
-    def extract_layout(self, root, ns=None):
+    def extract_layout(self, root, ns=None, spec_index=None):
         """Extract layout information from report specification XML"""
         layout = {
             "pages": [],
@@ -25,14 +25,15 @@ class LayoutExtractor(BaseExtractor):
         try:
             # Register namespace if present
             namespace = self.register_namespace(ns)
+            index = self.get_spec_index(root, ns, spec_index)
             
             # Find layout section
-            layout_section = self.find_element(root, "layout", ns)
+            layout_section = index.find(root, "layout")
             if layout_section is None:
                 # Try to find layout in other locations
-                layouts_section = self.find_element(root, "layouts", ns)
+                layouts_section = index.find(root, "layouts")
                 if layouts_section is not None:
-                    layout_section = self.find_element(layouts_section, "layout", ns)
+                    layout_section = index.find(layouts_section, "layout")
                     
             if layout_section is None:
                 self.logger.warning("No layout section found in report specification")
@@ -40,7 +41,7 @@ class LayoutExtractor(BaseExtractor):
             
             # Extract page information
             pages = []
-            page_elements = self.findall_elements(layout_section, "page", ns)
+            page_elements = index.findall(layout_section, "page")
                 
             for page_elem in page_elements:
                 page = {
@@ -53,8 +54,8 @@ class LayoutExtractor(BaseExtractor):
             
             # Extract container information (blocks, tables, etc.)
             containers = []
-            block_elements = self.findall_elements(layout_section, "block", ns)
-            table_elements = self.findall_elements(layout_section, "table", ns)
+            block_elements = index.findall(layout_section, "block")
+            table_elements = index.findall(layout_section, "table")
                 
             for container_elem in block_elements + table_elements:
                 container = {
@@ -67,9 +68,9 @@ class LayoutExtractor(BaseExtractor):
             
             # Extract visualization information (charts, crosstabs, lists, etc.)
             visualizations = []
-            chart_elements = self.findall_elements(layout_section, "chart", ns)
-            crosstab_elements = self.findall_elements(layout_section, "crosstab", ns)
-            list_elements = self.findall_elements(layout_section, "list", ns)
+            chart_elements = index.findall(layout_section, "chart")
+            crosstab_elements = index.findall(layout_section, "crosstab")
+            list_elements = index.findall(layout_section, "list")
             
             for viz_elem in chart_elements + crosstab_elements + list_elements:
                 viz = {
@@ -2,6 +2,7 @@
 Module extractors for Cognos to Power BI migration
 """
 
+from .module_document import ModuleDocument
 from .module_extractor import ModuleExtractor
 from .module_structure_extractor import ModuleStructureExtractor
 from .module_query_extractor import ModuleQueryExtractor
@@ -11,6 +12,7 @@ from .module_relationship_extractor import ModuleRelationshipExtractor
 from .module_hierarchy_extractor import ModuleHierarchyExtractor
 
 __all__ = [
+    'ModuleDocument',
     'ModuleExtractor',
     'ModuleStructureExtractor',
     'ModuleQueryExtractor',
@@ -4,11 +4,12 @@ Module data item extractor for Cognos to Power BI migration
 
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import xml.etree.ElementTree as ET
 import os
 
 from .module_extractor import ModuleExtractor
+from .module_document import ModuleDocument
 
 
 class ModuleDataItemExtractor(ModuleExtractor):
@@ -22,16 +23,22 @@ class ModuleDataItemExtractor(ModuleExtractor):
         """
         super().__init__(logger)
     
-    def extract_and_save(self, module_content: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, module_content: Union[str, ModuleDocument], output_dir: str) -> Dict[str, Any]:
         """Extract data items and calculated items and save to JSON
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             output_dir: Directory to save extracted data
             
         Returns:
             Dictionary with extracted data items
         """
+        # Parse once for both extractions; invalid JSON is reported by each of them
+        try:
+            module_content = ModuleDocument.of(module_content)
+        except ValueError:
+            pass
+        
         # Extract data items and calculated items
         data_items = self.extract_data_items(module_content)
         calculated_items = self.extract_calculated_items(module_content)
@@ -49,54 +56,53 @@ class ModuleDataItemExtractor(ModuleExtractor):
         
         return all_items
     
-    def extract_data_items(self, module_content: str) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_data_items(self, module_content: Union[str, ModuleDocument]) -> Dict[str, List[Dict[str, Any]]]:
         """Extract data items from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             Dictionary mapping query subject identifiers to lists of data items
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             data_items_by_subject = {}
             
             # Extract data items for each query subject
             if "querySubject" in module_data:
-                for query_subject in module_data.get("querySubject", []):
+                for query_subject, query_items in document.iter_query_subjects():
                     subject_id = query_subject.get("identifier", "")
                     data_items = []
                     
                     # Extract query items
-                    for item in query_subject.get("item", []):
-                        if "queryItem" in item:
-                            query_item = item["queryItem"]
-                            data_item = {
-                                "identifier": query_item.get("identifier", ""),
-                                "label": query_item.get("label", ""),
-                                "description": query_item.get("description", ""),
-                                "comment": query_item.get("comment", ""),
-                                "expression": query_item.get("expression", ""),
-                                "datatype": query_item.get("datatype", ""),
-                                "usage": query_item.get("usage", ""),
-                                "hidden": query_item.get("hidden", False),
-                                "nullable": query_item.get("nullable", True),
-                                "regularAggregate": query_item.get("regularAggregate", ""),
-                                "datatypeCategory": query_item.get("datatypeCategory", ""),
-                                "highlevelDatatype": query_item.get("highlevelDatatype", ""),
-                                "idForExpression": query_item.get("idForExpression", ""),
-                                "powerbi_datatype": self.map_cognos_to_powerbi_datatypes(query_item.get("datatype", "")),
-                                "powerbi_format": self.determine_powerbi_format(query_item)
-                            }
+                    for query_item in query_items:
+                        data_item = {
+                            "identifier": query_item.get("identifier", ""),
+                            "label": query_item.get("label", ""),
+                            "description": query_item.get("description", ""),
+                            "comment": query_item.get("comment", ""),
+                            "expression": query_item.get("expression", ""),
+                            "datatype": query_item.get("datatype", ""),
+                            "usage": query_item.get("usage", ""),
+                            "hidden": query_item.get("hidden", False),
+                            "nullable": query_item.get("nullable", True),
+                            "regularAggregate": query_item.get("regularAggregate", ""),
+                            "datatypeCategory": query_item.get("datatypeCategory", ""),
+                            "highlevelDatatype": query_item.get("highlevelDatatype", ""),
+                            "idForExpression": query_item.get("idForExpression", ""),
+                            "powerbi_datatype": self.map_cognos_to_powerbi_datatypes(query_item.get("datatype", "")),
+                            "powerbi_format": self.determine_powerbi_format(query_item)
+                        }
                             
-                            # Extract facet definition if available
-                            if "facetDefinition" in query_item:
-                                data_item["facetDefinition"] = query_item.get("facetDefinition", {})
+                        # Extract facet definition if available
+                        if "facetDefinition" in query_item:
+                            data_item["facetDefinition"] = query_item.get("facetDefinition", {})
                             
-                            data_items.append(data_item)
+                        data_items.append(data_item)
                     
                     if subject_id:
                         data_items_by_subject[subject_id] = data_items
@@ -199,47 +205,46 @@ class ModuleDataItemExtractor(ModuleExtractor):
         # No specific format for strings and other types
         return ""
     
-    def extract_calculated_items(self, module_content: str) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_calculated_items(self, module_content: Union[str, ModuleDocument]) -> Dict[str, List[Dict[str, Any]]]:
         """Extract calculated items from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             Dictionary mapping query subject identifiers to lists of calculated items
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             calculated_items_by_subject = {}
             
             # Extract calculated items for each query subject
             if "querySubject" in module_data:
-                for query_subject in module_data.get("querySubject", []):
+                for query_subject, query_items in document.iter_query_subjects():
                     subject_id = query_subject.get("identifier", "")
                     calculated_items = []
                     
                     # Extract query items that have expressions different from their identifiers
-                    for item in query_subject.get("item", []):
-                        if "queryItem" in item:
-                            query_item = item["queryItem"]
-                            identifier = query_item.get("identifier", "")
-                            expression = query_item.get("expression", "")
+                    for query_item in query_items:
+                        identifier = query_item.get("identifier", "")
+                        expression = query_item.get("expression", "")
                             
-                            # If expression is different from identifier, it's likely a calculated item
-                            if expression and expression != identifier:
-                                calculated_item = {
-                                    "identifier": identifier,
-                                    "label": query_item.get("label", ""),
-                                    "expression": expression,
-                                    "datatype": query_item.get("datatype", ""),
-                                    "usage": query_item.get("usage", ""),
-                                    "regularAggregate": query_item.get("regularAggregate", ""),
-                                    "idForExpression": query_item.get("idForExpression", "")
-                                }
+                        # If expression is different from identifier, it's likely a calculated item
+                        if expression and expression != identifier:
+                            calculated_item = {
+                                "identifier": identifier,
+                                "label": query_item.get("label", ""),
+                                "expression": expression,
+                                "datatype": query_item.get("datatype", ""),
+                                "usage": query_item.get("usage", ""),
+                                "regularAggregate": query_item.get("regularAggregate", ""),
+                                "idForExpression": query_item.get("idForExpression", "")
+                            }
                                 
-                                calculated_items.append(calculated_item)
+                            calculated_items.append(calculated_item)
                     
                     if subject_id and calculated_items:
                         calculated_items_by_subject[subject_id] = calculated_items
@@ -0,0 +1,59 @@
+"""
+Parsed module metadata shared by the module extractors.
+
+The module migration used to serialize the module metadata to a JSON string
+and every module extractor parsed it again, some of them twice. A
+ModuleDocument is built once from the parsed metadata and passed to all
+extractors, together with the query items of each query subject, which they
+would otherwise each collect again.
+Extractors still accept the JSON string and parse it into a document.
+"""
+
+import json
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple, Union
+
+
+class ModuleDocument:
+    """Read-only view of a module's metadata with its query items collected once
+
+    The top level of the metadata is exposed through a read-only mapping.
+    Nested objects are shared with the original metadata and must not be
+    modified by extractors; they copy what they return.
+    """
+
+    def __init__(self, module_data: Mapping[str, Any]):
+        """Wrap parsed module metadata
+
+        Args:
+            module_data: Module metadata as returned by the Cognos modules API
+        """
+        # Metadata that is not an object has nothing to extract, as before
+        self.data: Mapping[str, Any] = MappingProxyType(dict(module_data) if isinstance(module_data, Mapping) else {})
+        self.query_subjects: Tuple[Dict[str, Any], ...] = tuple(self.data.get("querySubject") or ())
+        self._query_items: List[Tuple[Dict[str, Any], ...]] = [
+            tuple(item["queryItem"] for item in query_subject.get("item", []) if "queryItem" in item)
+            for query_subject in self.query_subjects
+        ]
+
+    @classmethod
+    def from_json(cls, module_content: str) -> 'ModuleDocument':
+        """Parse module metadata from its JSON representation
+
+        Raises:
+            json.JSONDecodeError: If the content is not valid JSON
+        """
+        return cls(json.loads(module_content))
+
+    @classmethod
+    def of(cls, module_content: Union[str, Mapping[str, Any], 'ModuleDocument']) -> 'ModuleDocument':
+        """Get a document for extractor input: a document, parsed metadata or its JSON string"""
+        if isinstance(module_content, ModuleDocument):
+            return module_content
+        if isinstance(module_content, (str, bytes, bytearray)):
+            return cls.from_json(module_content)
+        return cls(module_content)
+
+    def iter_query_subjects(self):
+        """Iterate over (query subject, its query items) in document order"""
+        return zip(self.query_subjects, self._query_items)
@@ -7,6 +7,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from cognos_migrator.common.artifact_policy import write_json_artifact
+
 from .module_extractor import ModuleExtractor
 
 
@@ -59,8 +61,7 @@ class ModuleExpressionExtractor(ModuleExtractor):
             combined_calculations['calculations'] = processed_calculations
             
             # Save the combined calculations to calculations.json
-            with open(Path(output_dir) / "calculations.json", 'w', encoding='utf-8') as f:
-                json.dump(combined_calculations, f, indent=2)
+            write_json_artifact(Path(output_dir) / "calculations.json", combined_calculations)
             
             self.logger.info(f"Saved {len(combined_calculations['calculations'])} calculations from reports")
             return combined_calculations
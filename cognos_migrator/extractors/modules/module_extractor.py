@@ -3,12 +3,13 @@ Base module extractor for Cognos to Power BI migration
 """
 
 import logging
-import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 import xml.etree.ElementTree as ET
 
+from cognos_migrator.common.artifact_policy import write_json_artifact
+
 
 class ModuleExtractor:
     """Base class for extracting module components from Cognos modules"""
@@ -132,7 +133,8 @@ class ModuleExtractor:
             filename: Output filename
             
         Returns:
-            Path to the saved file
+            Path to the saved file, or an empty string if it was not saved
+            because of an error or the artifact policy
         """
         try:
             # Ensure output directory exists
@@ -144,9 +146,9 @@ class ModuleExtractor:
             # Create file path
             file_path = output_dir / filename
             
-            # Save data to JSON file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # Save data to JSON file, unless the artifact policy skips it
+            if not write_json_artifact(file_path, data):
+                return ""
             
             self.logger.info(f"Saved data to {file_path}")
             return str(file_path)
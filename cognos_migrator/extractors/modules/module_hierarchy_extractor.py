@@ -4,11 +4,12 @@ Module hierarchy extractor for Cognos to Power BI migration
 
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import xml.etree.ElementTree as ET
 import os
 
 from .module_extractor import ModuleExtractor
+from .module_document import ModuleDocument
 
 
 class ModuleHierarchyExtractor(ModuleExtractor):
@@ -22,11 +23,11 @@ class ModuleHierarchyExtractor(ModuleExtractor):
         """
         super().__init__(logger)
     
-    def extract_and_save(self, module_content: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, module_content: Union[str, ModuleDocument], output_dir: str) -> Dict[str, Any]:
         """Extract hierarchies and save to JSON
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             output_dir: Directory to save extracted data
             
         Returns:
@@ -49,18 +50,19 @@ class ModuleHierarchyExtractor(ModuleExtractor):
         
         return hierarchy_data
     
-    def extract_hierarchies(self, module_content: str) -> List[Dict[str, Any]]:
+    def extract_hierarchies(self, module_content: Union[str, ModuleDocument]) -> List[Dict[str, Any]]:
         """Extract hierarchies (drill groups) from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             List of hierarchies with their properties
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             hierarchies = []
             
@@ -143,18 +145,19 @@ class ModuleHierarchyExtractor(ModuleExtractor):
         
         return powerbi_hierarchies
     
-    def extract_metadata_tree(self, module_content: str) -> List[Dict[str, Any]]:
+    def extract_metadata_tree(self, module_content: Union[str, ModuleDocument]) -> List[Dict[str, Any]]:
         """Extract metadata tree view from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             List of metadata tree items
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             tree_items = []
             
@@ -4,10 +4,11 @@ Module query extractor for Cognos to Power BI migration
 
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import xml.etree.ElementTree as ET
 
 from .module_extractor import ModuleExtractor
+from .module_document import ModuleDocument
 
 
 class ModuleQueryExtractor(ModuleExtractor):
@@ -21,16 +22,22 @@ class ModuleQueryExtractor(ModuleExtractor):
         """
         super().__init__(logger)
         
-    def extract_and_save(self, module_content: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, module_content: Union[str, ModuleDocument], output_dir: str) -> Dict[str, Any]:
         """Extract query subjects and items and save to JSON
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             output_dir: Directory to save extracted data
             
         Returns:
             Dictionary with extracted query data
         """
+        # Parse once for both extractions; invalid JSON is reported by each of them
+        try:
+            module_content = ModuleDocument.of(module_content)
+        except ValueError:
+            pass
+        
         # Extract query subjects and items
         query_subjects = self.extract_query_subjects(module_content)
         query_items = self.extract_query_items(module_content)
@@ -48,18 +55,19 @@ class ModuleQueryExtractor(ModuleExtractor):
         
         return query_data
     
-    def extract_query_subjects(self, module_content: str) -> List[Dict[str, Any]]:
+    def extract_query_subjects(self, module_content: Union[str, ModuleDocument]) -> List[Dict[str, Any]]:
         """Extract query subjects (tables) from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             List of query subjects with their properties
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             query_subjects = []
             
@@ -93,55 +101,54 @@ class ModuleQueryExtractor(ModuleExtractor):
             self.logger.error(f"Error extracting query subjects: {e}")
             return []
     
-    def extract_query_items(self, module_content: str) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_query_items(self, module_content: Union[str, ModuleDocument]) -> Dict[str, List[Dict[str, Any]]]:
         """Extract query items (columns) from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             Dictionary mapping query subject identifiers to lists of query items
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             query_items_by_subject = {}
             
             # Extract query items for each query subject
             if "querySubject" in module_data:
-                for query_subject in module_data.get("querySubject", []):
+                for query_subject, query_items in document.iter_query_subjects():
                     subject_id = query_subject.get("identifier", "")
-                    query_items = []
+                    columns = []
                     
                     # Extract query items
-                    for item in query_subject.get("item", []):
-                        if "queryItem" in item:
-                            query_item = item["queryItem"]
-                            column = {
-                                "identifier": query_item.get("identifier", ""),
-                                "label": query_item.get("label", ""),
-                                "description": query_item.get("description", ""),
-                                "comment": query_item.get("comment", ""),
-                                "expression": query_item.get("expression", ""),
-                                "datatype": query_item.get("datatype", ""),
-                                "usage": query_item.get("usage", ""),
-                                "hidden": query_item.get("hidden", False),
-                                "nullable": query_item.get("nullable", True),
-                                "regularAggregate": query_item.get("regularAggregate", ""),
-                                "datatypeCategory": query_item.get("datatypeCategory", ""),
-                                "highlevelDatatype": query_item.get("highlevelDatatype", ""),
-                                "idForExpression": query_item.get("idForExpression", "")
-                            }
+                    for query_item in query_items:
+                        column = {
+                            "identifier": query_item.get("identifier", ""),
+                            "label": query_item.get("label", ""),
+                            "description": query_item.get("description", ""),
+                            "comment": query_item.get("comment", ""),
+                            "expression": query_item.get("expression", ""),
+                            "datatype": query_item.get("datatype", ""),
+                            "usage": query_item.get("usage", ""),
+                            "hidden": query_item.get("hidden", False),
+                            "nullable": query_item.get("nullable", True),
+                            "regularAggregate": query_item.get("regularAggregate", ""),
+                            "datatypeCategory": query_item.get("datatypeCategory", ""),
+                            "highlevelDatatype": query_item.get("highlevelDatatype", ""),
+                            "idForExpression": query_item.get("idForExpression", "")
+                        }
                             
-                            # Extract facet definition if available
-                            if "facetDefinition" in query_item:
-                                column["facetDefinition"] = query_item.get("facetDefinition", {})
+                        # Extract facet definition if available
+                        if "facetDefinition" in query_item:
+                            column["facetDefinition"] = query_item.get("facetDefinition", {})
                             
-                            query_items.append(column)
+                        columns.append(column)
                     
                     if subject_id:
-                        query_items_by_subject[subject_id] = query_items
+                        query_items_by_subject[subject_id] = columns
             
             return query_items_by_subject
             
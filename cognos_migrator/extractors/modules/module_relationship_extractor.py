@@ -5,10 +5,11 @@ Module relationship extractor for Cognos to Power BI migration
 import os
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import xml.etree.ElementTree as ET
 
 from .module_extractor import ModuleExtractor
+from .module_document import ModuleDocument
 
 
 class ModuleRelationshipExtractor(ModuleExtractor):
@@ -22,11 +23,11 @@ class ModuleRelationshipExtractor(ModuleExtractor):
         """
         super().__init__(logger)
         
-    def extract_and_save(self, module_content: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, module_content: Union[str, ModuleDocument], output_dir: str) -> Dict[str, Any]:
         """Extract relationships and save to JSON
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             output_dir: Directory to save extracted data
             
         Returns:
@@ -54,18 +55,19 @@ class ModuleRelationshipExtractor(ModuleExtractor):
             'powerbi_relationships': powerbi_relationships
         }
     
-    def extract_relationships(self, module_content: str) -> List[Dict[str, Any]]:
+    def extract_relationships(self, module_content: Union[str, ModuleDocument]) -> List[Dict[str, Any]]:
         """Extract relationships from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             List of relationships with their properties
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             relationships = []
             
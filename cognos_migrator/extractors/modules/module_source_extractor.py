@@ -3,11 +3,14 @@ Module source extractor for Cognos to Power BI migration
 """
 
 import logging
-import json
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
+
+from cognos_migrator.common.artifact_policy import write_json_artifact
+
+from .module_document import ModuleDocument
 
 class ModuleSourceExtractor:
     """Extracts source data information from Cognos module metadata"""
@@ -20,29 +23,28 @@ class ModuleSourceExtractor:
         """
         self.logger = logger or logging.getLogger(__name__)
     
-    def extract_and_save(self, module_content: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, module_content: Union[str, ModuleDocument], output_dir: str) -> Dict[str, Any]:
         """Extract source data information from module metadata and save to file
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             output_dir: Directory to save extracted data
             
         Returns:
             Dictionary with source data information
         """
         try:
-            # Parse module content
-            module_data = json.loads(module_content)
+            # Parse module content, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             # Extract source data information
             source_data = self._extract_source_data(module_data)
             
             # Save to file
             output_path = Path(output_dir) / "source_data.json"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(source_data, f, indent=2)
-            
-            self.logger.info(f"Saved data to {output_path}")
+            if write_json_artifact(output_path, source_data):
+                self.logger.info(f"Saved data to {output_path}")
             return source_data
             
         except Exception as e:
@@ -4,10 +4,11 @@ Module structure extractor for Cognos to Power BI migration
 
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import xml.etree.ElementTree as ET
 
 from .module_extractor import ModuleExtractor
+from .module_document import ModuleDocument
 
 
 class ModuleStructureExtractor(ModuleExtractor):
@@ -21,11 +22,11 @@ class ModuleStructureExtractor(ModuleExtractor):
         """
         super().__init__(logger)
         
-    def extract_and_save(self, module_content: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, module_content: Union[str, ModuleDocument], output_dir: str) -> Dict[str, Any]:
         """Extract module structure and save to JSON
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             output_dir: Directory to save extracted data
             
         Returns:
@@ -39,18 +40,19 @@ class ModuleStructureExtractor(ModuleExtractor):
         
         return structure
     
-    def extract_module_structure(self, module_content: str) -> Dict[str, Any]:
+    def extract_module_structure(self, module_content: Union[str, ModuleDocument]) -> Dict[str, Any]:
         """Extract the overall structure from a module
         
         Args:
-            module_content: JSON content of the module
+            module_content: JSON content of the module, or the parsed ModuleDocument
             
         Returns:
             Dictionary with extracted module structure
         """
         try:
-            # Parse the module content as JSON
-            module_data = json.loads(module_content)
+            # Parse the module content as JSON, unless it is already parsed
+            document = ModuleDocument.of(module_content)
+            module_data = document.data
             
             # Extract basic module information
             structure = {
@@ -83,7 +85,7 @@ class ModuleStructureExtractor(ModuleExtractor):
             # Extract query subjects (tables)
             if "querySubject" in module_data:
                 tables = []
-                for query_subject in module_data.get("querySubject", []):
+                for query_subject, query_items in document.iter_query_subjects():
                     table = {
                         "ref": query_subject.get("ref", []),
                         "identifier": query_subject.get("identifier", ""),
@@ -93,18 +95,16 @@ class ModuleStructureExtractor(ModuleExtractor):
                     }
                     
                     # Extract columns (query items)
-                    for item in query_subject.get("item", []):
-                        if "queryItem" in item:
-                            query_item = item["queryItem"]
-                            column = {
-                                "identifier": query_item.get("identifier", ""),
-                                "label": query_item.get("label", ""),
-                                "expression": query_item.get("expression", ""),
-                                "datatype": query_item.get("datatype", ""),
-                                "usage": query_item.get("usage", ""),
-                                "hidden": query_item.get("hidden", False)
-                            }
-                            table["columns"].append(column)
+                    for query_item in query_items:
+                        column = {
+                            "identifier": query_item.get("identifier", ""),
+                            "label": query_item.get("label", ""),
+                            "expression": query_item.get("expression", ""),
+                            "datatype": query_item.get("datatype", ""),
+                            "usage": query_item.get("usage", ""),
+                            "hidden": query_item.get("hidden", False)
+                        }
+                        table["columns"].append(column)
                     
                     tables.append(table)
                 
@@ -8,18 +8,24 @@ from .package_extractor import PackageExtractor
 from .base_package_extractor import BasePackageExtractor
 from .package_structure_extractor import PackageStructureExtractor
 from .package_query_subject_extractor import PackageQuerySubjectExtractor
+from .streaming_query_subject_extractor import StreamingQuerySubjectExtractor
 from .package_relationship_extractor import PackageRelationshipExtractor
 from .package_calculation_extractor import PackageCalculationExtractor
 from .package_filter_extractor import PackageFilterExtractor
 from .consolidated_package_extractor import ConsolidatedPackageExtractor
+from .parsed_package import ParsedPackage
+from .package_traversal import FMModelTraversal
 
 __all__ = [
     'PackageExtractor',  # Legacy extractor (for backward compatibility)
     'BasePackageExtractor',
     'PackageStructureExtractor',
     'PackageQuerySubjectExtractor',
+    'StreamingQuerySubjectExtractor',
     'PackageRelationshipExtractor',
     'PackageCalculationExtractor',
     'PackageFilterExtractor',
     'ConsolidatedPackageExtractor',
+    'ParsedPackage',
+    'FMModelTraversal',
 ]
@@ -8,9 +8,12 @@ Cognos Framework Manager (FM) package files.
 import logging
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 import os
-import json
+
+from cognos_migrator.common.artifact_policy import write_json_artifact
+
+from .package_traversal import FMModelTraversal
 
 
 class BasePackageExtractor:
@@ -40,6 +43,62 @@ class BasePackageExtractor:
             'http://www.developer.cognos.com/schemas/bmt/60/11': 'ns11',
             'http://www.w3.org/2001/XMLSchema-instance': 'xsi'
         }
+        
+        # Shared parsed package, set when the caller has already parsed the file
+        self.parsed_package = None
+    
+    def use_parsed_package(self, parsed_package) -> None:
+        """Use an already parsed package for subsequent extraction
+        
+        Args:
+            parsed_package: ParsedPackage instance shared between extractors
+        """
+        self.parsed_package = parsed_package
+        self.namespaces.update(parsed_package.namespaces)
+    
+    def get_package_root(self, package_file_path: str, parsed_package=None) -> ET.Element:
+        """Get the package root, reusing an already parsed package when given
+        
+        Args:
+            package_file_path: Path to the FM package file
+            parsed_package: Optional ParsedPackage for the same file
+            
+        Returns:
+            XML root element of the package
+        """
+        if parsed_package is not None:
+            self.use_parsed_package(parsed_package)
+            return parsed_package.root
+        
+        tree = ET.parse(package_file_path)
+        return tree.getroot()
+    
+    def get_model_traversal(self, root: ET.Element) -> FMModelTraversal:
+        """Get the model elements of a package, traversing it once
+        
+        Args:
+            root: XML root element of the package
+            
+        Returns:
+            FMModelTraversal of the package, shared through the parsed package if there is one
+        """
+        if self.parsed_package is not None and root is self.parsed_package.root:
+            return self.parsed_package.model_traversal(self.namespaces)
+        return FMModelTraversal(root, self.namespaces, logger=self.logger)
+    
+    def iter_query_items(self, qs_elem: ET.Element) -> Iterator[ET.Element]:
+        """Iterate over the query items below a query subject
+        
+        Args:
+            qs_elem: Query subject XML element
+            
+        Yields:
+            Each query item element once, in document order, including items in folders
+        """
+        tags = {f"{{{self.namespaces[prefix]}}}queryItem" for prefix in ['bmt', 'ns'] if prefix in self.namespaces}
+        for elem in qs_elem.iter():
+            if elem.tag in tags:
+                yield elem
     
     def extract_from_package(self, package_content: ET.Element) -> Dict[str, Any]:
         """Extract data from package content
@@ -67,6 +126,10 @@ class BasePackageExtractor:
             Found element or None
         """
         try:
+            if self.parsed_package is not None:
+                indexed = self.parsed_package.find_descendants(element, path, self.namespaces)
+                if indexed is not None:
+                    return indexed[0] if indexed else None
             return element.find(path, self.namespaces)
         except Exception as e:
             self.logger.warning(f"Error finding element at path {path}: {e}")
@@ -83,6 +146,10 @@ class BasePackageExtractor:
             List of found elements
         """
         try:
+            if self.parsed_package is not None:
+                indexed = self.parsed_package.find_descendants(element, path, self.namespaces)
+                if indexed is not None:
+                    return indexed
             return element.findall(path, self.namespaces)
         except Exception as e:
             self.logger.warning(f"Error finding elements at path {path}: {e}")
@@ -157,7 +224,8 @@ class BasePackageExtractor:
             filename: Output filename
             
         Returns:
-            Path to the saved file
+            Path to the saved file, or an empty string if it was not saved
+            because of an error or the artifact policy
         """
         try:
             # Ensure output directory exists
@@ -169,9 +237,9 @@ class BasePackageExtractor:
             # Create file path
             file_path = output_dir / filename
             
-            # Save data to JSON file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # Save data to JSON file, unless the artifact policy skips it
+            if not write_json_artifact(file_path, data):
+                return ""
             
             self.logger.info(f"Saved data to {file_path}")
             return str(file_path)
@@ -12,11 +12,11 @@ import os
 import shutil
 import uuid
 from pathlib import Path
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
 from typing import Dict, List, Optional, Any
 
 from cognos_migrator.models import DataType, DataModel, Table, Column, Relationship, Measure
+from cognos_migrator.common.artifact_policy import should_write_artifact, write_json_artifact
+from cognos_migrator.common.xml_document import XmlDocument
 
 from .base_package_extractor import BasePackageExtractor
 from .package_structure_extractor import PackageStructureExtractor
@@ -24,6 +24,8 @@ from .package_query_subject_extractor import PackageQuerySubjectExtractor
 from .package_relationship_extractor import PackageRelationshipExtractor
 from .package_calculation_extractor import PackageCalculationExtractor
 from .package_filter_extractor import PackageFilterExtractor
+from .parsed_package import ParsedPackage
+from .streaming_query_subject_extractor import StreamingQuerySubjectExtractor
 
 
 class ConsolidatedPackageExtractor:
@@ -41,22 +43,50 @@ class ConsolidatedPackageExtractor:
         
         # Initialize specialized extractors
         self.structure_extractor = PackageStructureExtractor(logger)
-        self.query_subject_extractor = PackageQuerySubjectExtractor(logger)
+        # Query subjects can be extracted from the shared tree or streamed from the
+        # file with iterparse, which keeps memory flat on very large FM exports
+        extraction_settings = self.config.get('package_extraction', {}) if isinstance(self.config, dict) else {}
+        qs_engine = extraction_settings.get('query_subject_engine', 'tree')
+        self.stream_query_subjects = qs_engine == 'streaming'
+        if self.stream_query_subjects:
+            self.query_subject_extractor = StreamingQuerySubjectExtractor(logger)
+        else:
+            self.query_subject_extractor = PackageQuerySubjectExtractor(logger)
         self.relationship_extractor = PackageRelationshipExtractor(logger)
         self.calculation_extractor = PackageCalculationExtractor(logger)
         self.filter_extractor = PackageFilterExtractor(logger)
+        
+        # Package parsed by the last extract_package call, shared with later extractors
+        self.parsed_package: Optional[ParsedPackage] = None
+
+    def _extractors(self) -> List[BasePackageExtractor]:
+        """Get the specialized extractors coordinated by this extractor"""
+        return [self.structure_extractor, self.query_subject_extractor,
+                self.relationship_extractor, self.calculation_extractor,
+                self.filter_extractor]
+
+    def release_parsed_package(self):
+        """Drop references to the shared parsed package so its tree can be freed"""
+        for extractor in self._extractors():
+            extractor.parsed_package = None
+        self.parsed_package = None
 
     def _save_json(self, data: Dict[str, Any], file_path: str):
         """Saves dictionary data to a JSON file."""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            self.logger.info(f"Saved data to {file_path}")
+            if write_json_artifact(file_path, data):
+                self.logger.info(f"Saved data to {file_path}")
         except Exception as e:
             self.logger.error(f"Failed to save data to {file_path}: {e}")
 
-    def extract_package(self, package_file_path: str, output_dir: str, required_tables: Optional[set] = None) -> Dict[str, Any]:
-        """Extracts and consolidates information from a package XML file."""
+    def extract_package(self, package_file_path: str, output_dir: str, required_tables: Optional[set] = None,
+                        parsed_package: Optional[ParsedPackage] = None) -> Dict[str, Any]:
+        """Extracts and consolidates information from a package XML file.
+
+        The package is parsed once and the resulting ParsedPackage is shared by all
+        specialized extractors. It stays available as ``self.parsed_package`` so
+        callers such as SQLRelationshipExtractor can reuse it.
+        """
         try:
             self.logger.info(f"Extracting package from {package_file_path}")
             
@@ -69,37 +99,49 @@ class ConsolidatedPackageExtractor:
             else:
                 output_path = None
             
+            # Stream query subjects before the tree is built, so the iterparse pass
+            # never runs while the whole package is in memory
+            if self.stream_query_subjects:
+                if output_path:
+                    query_subjects_result = self.query_subject_extractor.extract_and_save(package_file_path, output_path)
+                    query_subjects = query_subjects_result.get("query_subjects", [])
+                else:
+                    query_subjects = self.query_subject_extractor.extract_query_subjects_from_file(package_file_path)
+            
             # Parse the XML file once
-            tree = ET.parse(package_file_path)
-            root = tree.getroot()
-            
-            # Update namespaces on all extractors from the root element
-            self.structure_extractor.update_namespaces_from_root(root)
-            self.query_subject_extractor.update_namespaces_from_root(root)
-            self.relationship_extractor.update_namespaces_from_root(root)
-            self.calculation_extractor.update_namespaces_from_root(root)
+            if parsed_package is None:
+                parsed_package = ParsedPackage.from_file(package_file_path, logger=self.logger)
+            self.parsed_package = parsed_package
+            root = parsed_package.root
+            
+            # Share the parsed package and its namespaces with all tree-based extractors
+            for extractor in self._extractors():
+                if extractor is self.query_subject_extractor and self.stream_query_subjects:
+                    continue
+                extractor.use_parsed_package(parsed_package)
             self.logger.info(f"Updated namespaces on all extractors from {package_file_path}")
             
             # Save a formatted version of the XML file if output directory is specified
             if output_path:
-                self._save_formatted_xml(package_file_path, output_path)
+                self._save_formatted_xml(package_file_path, output_path, parsed_package)
             
             # Extract package structure
             if output_path:
-                structure = self.structure_extractor.extract_and_save(package_file_path, output_path)
+                structure = self.structure_extractor.extract_and_save(package_file_path, output_path, parsed_package)
             else:
                 structure = self.structure_extractor.extract_package_structure(root)
             
-            # Extract query subjects
-            if output_path:
-                query_subjects_result = self.query_subject_extractor.extract_and_save(package_file_path, output_path)
-                query_subjects = query_subjects_result.get("query_subjects", [])
-            else:
-                query_subjects = self.query_subject_extractor.extract_query_subjects(root)
+            # Extract query subjects, unless they were streamed above
+            if not self.stream_query_subjects:
+                if output_path:
+                    query_subjects_result = self.query_subject_extractor.extract_and_save(package_file_path, output_path, parsed_package)
+                    query_subjects = query_subjects_result.get("query_subjects", [])
+                else:
+                    query_subjects = self.query_subject_extractor.extract_query_subjects(root)
             
             # Extract relationships
             if output_path:
-                relationships_result = self.relationship_extractor.extract_and_save(package_file_path, output_path)
+                relationships_result = self.relationship_extractor.extract_and_save(package_file_path, output_path, parsed_package)
                 relationships = relationships_result.get("relationships", [])
             else:
                 relationships = self.relationship_extractor.extract_relationships(root)
@@ -118,14 +160,14 @@ class ConsolidatedPackageExtractor:
                         self.logger.error(f"Error loading existing calculations: {e}")
                         calculations = {"calculations": {}}
                 else:
-                    calculations_result = self.calculation_extractor.extract_and_save(package_file_path, output_path)
+                    calculations_result = self.calculation_extractor.extract_and_save(package_file_path, output_path, parsed_package)
                     calculations = {"calculations": calculations_result.get("calculations", {})}
             else:
                 calculations = {"calculations": self.calculation_extractor.extract_calculations(root)}
                 
             # Extract filters
             if output_path:
-                filters_result = self.filter_extractor.extract_and_save(package_file_path, output_path)
+                filters_result = self.filter_extractor.extract_and_save(package_file_path, output_path, parsed_package)
                 filters = filters_result.get("filters", {})
             else:
                 filters = self.filter_extractor.extract_filters(root)
@@ -238,36 +280,31 @@ class ConsolidatedPackageExtractor:
             self.logger.error(f"Failed to extract package from {package_file_path}: {e}")
             raise
     
-    def _save_formatted_xml(self, package_file_path: str, output_path: Path) -> None:
+    def _save_formatted_xml(self, package_file_path: str, output_path: Path,
+                            parsed_package: ParsedPackage) -> None:
         """Save a formatted version of the XML file
         
+        The copy is written from the already parsed package tree rather than
+        by parsing the file again.
+        
         Args:
             package_file_path: Path to the original XML file
             output_path: Directory to save the formatted XML file
+            parsed_package: The package parsed from package_file_path
         """
         try:
             # Get the original filename
             original_filename = os.path.basename(package_file_path)
             formatted_filename = f"{os.path.splitext(original_filename)[0]}_formatted.xml"
             formatted_file_path = output_path / formatted_filename
+            if not should_write_artifact(formatted_file_path):
+                return
             
             self.logger.info(f"Creating formatted XML file: {formatted_file_path}")
             
-            # Parse the XML file
-            with open(package_file_path, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
-            
-            # Parse and format the XML using minidom
-            dom = minidom.parseString(xml_content)
-            formatted_xml = dom.toprettyxml(indent="  ")
-            
-            # Remove extra blank lines that minidom sometimes adds
-            lines = [line for line in formatted_xml.split('\n') if line.strip()]
-            formatted_xml = '\n'.join(lines)
-            
-            # Write the formatted XML to file
-            with open(formatted_file_path, 'w', encoding='utf-8') as f:
-                f.write(formatted_xml)
+            # Write the shared tree with the namespace prefixes of the original file
+            document = XmlDocument.from_parsed_file(parsed_package.root, package_file_path)
+            document.write(formatted_file_path)
             
             # Also save a copy with the original filename for easier reference
             original_formatted_path = output_path / original_filename
@@ -680,10 +717,6 @@ class ConsolidatedPackageExtractor:
             self.logger.error(f"Failed to read DateTableTemplate.tmdl: {e}")
             return
         
-        # Initialize date_tables attribute if it doesn't exist
-        if not hasattr(data_model, 'date_tables'):
-            data_model.date_tables = []
-        
         # Create the central date table
         date_table_name = "CentralDateTable"
         
@@ -23,20 +23,21 @@ class PackageFilterExtractor(BasePackageExtractor):
         """
         super().__init__(logger)
     
-    def extract_and_save(self, package_file_path: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, package_file_path: str, output_dir: str,
+                         parsed_package=None) -> Dict[str, Any]:
         """Extract filters and save to JSON
         
         Args:
             package_file_path: Path to the FM package file
             output_dir: Directory to save extracted data
+            parsed_package: Optional ParsedPackage to reuse instead of parsing the file again
             
         Returns:
             Dictionary with extracted filters
         """
         try:
-            # Parse the XML file
-            tree = ET.parse(package_file_path)
-            root = tree.getroot()
+            # Parse the XML file unless it has already been parsed
+            root = self.get_package_root(package_file_path, parsed_package)
             
             # Extract filters
             filters = self.extract_filters(root)
@@ -66,7 +67,7 @@ class PackageFilterExtractor(BasePackageExtractor):
             namespace_elements = []
             for ns_prefix in ['bmt', 'ns']:
                 # Find root namespace
-                ns_elems = root.findall(f'.//{ns_prefix}:namespace', self.namespaces)
+                ns_elems = self.find_all_elements_with_ns(root, f'.//{ns_prefix}:namespace')
                 if ns_elems:
                     namespace_elements.extend(ns_elems)
             
@@ -23,20 +23,21 @@ class PackageRelationshipExtractor(BasePackageExtractor):
         """
         super().__init__(logger)
     
-    def extract_and_save(self, package_file_path: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, package_file_path: str, output_dir: str,
+                         parsed_package=None) -> Dict[str, Any]:
         """Extract relationships and save to JSON
         
         Args:
             package_file_path: Path to the FM package file
             output_dir: Directory to save extracted data
+            parsed_package: Optional ParsedPackage to reuse instead of parsing the file again
             
         Returns:
             Dictionary with extracted relationships
         """
         try:
-            # Parse the XML file
-            tree = ET.parse(package_file_path)
-            root = tree.getroot()
+            # Parse the XML file unless it has already been parsed
+            root = self.get_package_root(package_file_path, parsed_package)
             
             # Extract relationships
             relationships = self.extract_relationships(root)
@@ -62,97 +63,18 @@ class PackageRelationshipExtractor(BasePackageExtractor):
         relationships = []
         
         try:
-            # First approach: Find all namespaces (Database Layer, Presentation Layer, etc.)
-            namespace_elements = []
-            for ns_prefix in ['bmt', 'ns']:
-                # Find root namespace
-                ns_elems = root.findall(f'.//{ns_prefix}:namespace', self.namespaces)
-                if ns_elems:
-                    namespace_elements.extend(ns_elems)
+            # Visit every relationship once, whatever the nesting of namespaces and folders
+            traversal = self.get_model_traversal(root)
             
-            # If no namespaces found, try searching from root
-            if not namespace_elements:
-                namespace_elements = [root]
+            # If no namespaces found, relationships anywhere below the root are used
+            if not traversal.namespace_count:
                 self.logger.info("No explicit namespace elements found, using root as namespace")
             
-            # Process each namespace to find relationships
-            for namespace in namespace_elements:
-                # Try to find relationships in this namespace with different prefixes
-                for ns_prefix in ['bmt', 'ns']:
-                    # Try multiple paths to find relationships
-                    search_paths = [
-                        f'.//{ns_prefix}:relationship',
-                        f'./{ns_prefix}:relationship',
-                        f'./{ns_prefix}:content//{ns_prefix}:relationship',
-                        f'./{ns_prefix}:folder//{ns_prefix}:relationship'
-                    ]
-                    
-                    for search_path in search_paths:
-                        rel_elements = namespace.findall(search_path, self.namespaces)
-                        
-                        if not rel_elements:
-                            continue
-                            
-                        self.logger.info(f"Found {len(rel_elements)} relationships using path {search_path}")
-                        
-                        for rel_elem in rel_elements:
-                            # Extract relationship name - try different paths
-                            rel_name = None
-                            
-                            # Try name/n path
-                            for path_prefix in ['bmt', 'ns']:
-                                name_elem = rel_elem.find(f'.//{path_prefix}:name/{path_prefix}:n', self.namespaces)
-                                if name_elem is not None and name_elem.text:
-                                    rel_name = name_elem.text.strip()
-                                    break
-                            
-                            # Try direct n element
-                            if not rel_name:
-                                for path_prefix in ['bmt', 'ns']:
-                                    name_elem = rel_elem.find(f'.//{path_prefix}:n', self.namespaces)
-                                    if name_elem is not None and name_elem.text:
-                                        rel_name = name_elem.text.strip()
-                                        break
-                            
-                            # Try name element with text directly
-                            if not rel_name:
-                                for path_prefix in ['bmt', 'ns']:
-                                    name_elem = rel_elem.find(f'.//{path_prefix}:name', self.namespaces)
-                                    if name_elem is not None and name_elem.text:
-                                        rel_name = name_elem.text.strip()
-                                        break
-                            
-                            # Try name attribute
-                            if not rel_name:
-                                if rel_elem.get('name'):
-                                    rel_name = rel_elem.get('name')
-                            
-                            # Skip if no name found
-                            if not rel_name:
-                                rel_name = f"Relationship_{rel_elem.get('id', 'unknown')}"
-                            
-                            # Extract left and right sides
-                            left_info = self._extract_relationship_side(rel_elem, 'left')
-                            right_info = self._extract_relationship_side(rel_elem, 'right')
-                            
-                            # Extract join expression
-                            join_expression = self._extract_join_expression(rel_elem)
-                            
-                            # Create relationship info
-                            relationship = {
-                                'name': rel_name,
-                                'id': rel_elem.get('id', ''),
-                                'left': left_info,
-                                'right': right_info,
-                                'join_expression': join_expression
-                            }
-                            
-                            # Extract determinants (join columns)
-                            determinants = self._extract_determinants(rel_elem)
-                            if determinants:
-                                relationship['determinants'] = determinants
-                            
-                            relationships.append(relationship)
+            for namespace, count in traversal.count_by_namespace('relationship').items():
+                self.logger.info(f"Found {count} relationships in namespace '{namespace}'")
+            
+            for model_element in traversal.elements('relationship'):
+                relationships.append(self._build_relationship(model_element.element))
             
             return relationships
             
@@ -160,6 +82,73 @@ class PackageRelationshipExtractor(BasePackageExtractor):
             self.logger.error(f"Failed to extract relationships: {e}")
             return []
     
+    def _build_relationship(self, rel_elem: ET.Element) -> Dict[str, Any]:
+        """Build the relationship record for a relationship element
+        
+        Args:
+            rel_elem: Relationship XML element
+            
+        Returns:
+            Dictionary with the relationship name, sides, join expression and determinants
+        """
+        # Extract relationship name - try different paths
+        rel_name = None
+        
+        # Try name/n path
+        for path_prefix in ['bmt', 'ns']:
+            name_elem = rel_elem.find(f'.//{path_prefix}:name/{path_prefix}:n', self.namespaces)
+            if name_elem is not None and name_elem.text:
+                rel_name = name_elem.text.strip()
+                break
+        
+        # Try direct n element
+        if not rel_name:
+            for path_prefix in ['bmt', 'ns']:
+                name_elem = rel_elem.find(f'.//{path_prefix}:n', self.namespaces)
+                if name_elem is not None and name_elem.text:
+                    rel_name = name_elem.text.strip()
+                    break
+        
+        # Try name element with text directly
+        if not rel_name:
+            for path_prefix in ['bmt', 'ns']:
+                name_elem = rel_elem.find(f'.//{path_prefix}:name', self.namespaces)
+                if name_elem is not None and name_elem.text:
+                    rel_name = name_elem.text.strip()
+                    break
+        
+        # Try name attribute
+        if not rel_name:
+            if rel_elem.get('name'):
+                rel_name = rel_elem.get('name')
+        
+        # Skip if no name found
+        if not rel_name:
+            rel_name = f"Relationship_{rel_elem.get('id', 'unknown')}"
+        
+        # Extract left and right sides
+        left_info = self._extract_relationship_side(rel_elem, 'left')
+        right_info = self._extract_relationship_side(rel_elem, 'right')
+        
+        # Extract join expression
+        join_expression = self._extract_join_expression(rel_elem)
+        
+        # Create relationship info
+        relationship = {
+            'name': rel_name,
+            'id': rel_elem.get('id', ''),
+            'left': left_info,
+            'right': right_info,
+            'join_expression': join_expression
+        }
+        
+        # Extract determinants (join columns)
+        determinants = self._extract_determinants(rel_elem)
+        if determinants:
+            relationship['determinants'] = determinants
+        
+        return relationship
+    
     def _extract_relationship_side(self, rel_elem: ET.Element, side: str) -> Dict[str, Any]:
         """Extract information about one side of a relationship
         
@@ -23,20 +23,21 @@ class PackageStructureExtractor(BasePackageExtractor):
         """
         super().__init__(logger)
     
-    def extract_and_save(self, package_file_path: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, package_file_path: str, output_dir: str,
+                         parsed_package=None) -> Dict[str, Any]:
         """Extract package structure and save to JSON
         
         Args:
             package_file_path: Path to the FM package file
             output_dir: Directory to save extracted data
+            parsed_package: Optional ParsedPackage to reuse instead of parsing the file again
             
         Returns:
             Dictionary with extracted package structure
         """
         try:
-            # Parse the XML file
-            tree = ET.parse(package_file_path)
-            root = tree.getroot()
+            # Parse the XML file unless it has already been parsed
+            root = self.get_package_root(package_file_path, parsed_package)
             
             # Extract package structure
             structure = self.extract_package_structure(root)
@@ -90,18 +91,18 @@ class PackageStructureExtractor(BasePackageExtractor):
             # Try to find the name element with different namespace prefixes and paths
             for ns_prefix in ['bmt', 'ns']:
                 # Try direct child name element
-                name_elem = root.find(f'.//{ns_prefix}:n', self.namespaces)
+                name_elem = self.find_element_with_ns(root, f'.//{ns_prefix}:n')
                 if name_elem is not None and name_elem.text:
                     return name_elem.text.strip()
                 
                 # Try project name attribute
-                project_elem = root.find(f'.//{ns_prefix}:project', self.namespaces)
+                project_elem = self.find_element_with_ns(root, f'.//{ns_prefix}:project')
                 if project_elem is not None and project_elem.get('name'):
                     return project_elem.get('name')
             
             # If still not found, look for name in other formats
             for ns_prefix in ['bmt', 'ns']:
-                name_elem = root.find(f'.//{ns_prefix}:name', self.namespaces)
+                name_elem = self.find_element_with_ns(root, f'.//{ns_prefix}:name')
                 if name_elem is not None and name_elem.text:
                     return name_elem.text.strip()
                 
@@ -124,7 +125,7 @@ class PackageStructureExtractor(BasePackageExtractor):
         try:
             # Find all namespace elements
             for ns_prefix in ['bmt', 'ns']:
-                ns_elements = root.findall(f'.//{ns_prefix}:namespace', self.namespaces)
+                ns_elements = self.find_all_elements_with_ns(root, f'.//{ns_prefix}:namespace')
                 
                 for ns_elem in ns_elements:
                     # Extract namespace name
@@ -0,0 +1,114 @@
+"""
+Single-pass traversal of the model elements of Cognos Framework Manager packages.
+
+FM models nest namespaces (Database Layer, Presentation Layer, ...) and folders
+inside each other. Searching every namespace for './/querySubject' finds an
+element once for each of its ancestor namespaces; this module instead walks the
+tree once and records each query subject and relationship together with the
+namespace and folders it is defined in.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+# Namespace prefixes the package extractors search model elements with
+MODEL_PREFIXES = ('bmt', 'ns')
+
+# Model elements recorded by the traversal
+MODEL_ELEMENTS = ('querySubject', 'relationship')
+
+
+@dataclass(frozen=True)
+class ModelElement:
+    """A model element and where it is defined in the FM model"""
+    element: ET.Element
+    # Name of the innermost namespace containing the element, None outside any namespace
+    namespace: Optional[str]
+    # Names of the namespaces and folders containing the element, outermost first
+    folder_path: Tuple[str, ...]
+
+
+class FMModelTraversal:
+    """Visits every element of an FM package once and indexes its model elements
+
+    Model elements are kept in document order. A query subject nested three
+    namespaces deep is recorded once, with its namespace and folder path,
+    instead of once per enclosing namespace.
+    """
+
+    def __init__(self, root: ET.Element, namespaces: Mapping[str, str],
+                 local_names: Iterable[str] = MODEL_ELEMENTS, logger=None):
+        """Traverse the package
+
+        Args:
+            root: XML root element of the package
+            namespaces: Prefix map of the extractors; the 'bmt' and 'ns' prefixes are used
+            local_names: Local names of the model elements to record
+            logger: Optional logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.namespace_urls = tuple(dict.fromkeys(
+            namespaces[prefix] for prefix in MODEL_PREFIXES if prefix in namespaces))
+        self.namespace_count = 0
+        self._elements: Dict[str, List[ModelElement]] = {name: [] for name in local_names}
+        self._traverse(root)
+
+    def _traverse(self, root: ET.Element) -> None:
+        recorded = {f'{{{url}}}{name}': name for url in self.namespace_urls for name in self._elements}
+        namespace_tags = {f'{{{url}}}namespace' for url in self.namespace_urls}
+        folder_tags = {f'{{{url}}}folder' for url in self.namespace_urls}
+
+        # Depth-first in document order; the root itself is never a model element
+        stack = [(child, (), None) for child in reversed(root)]
+        while stack:
+            elem, folder_path, namespace = stack.pop()
+            tag = elem.tag
+            name = recorded.get(tag)
+            if name is not None:
+                self._elements[name].append(ModelElement(elem, namespace, folder_path))
+            elif tag in namespace_tags:
+                self.namespace_count += 1
+                namespace = self._container_name(elem)
+                folder_path = folder_path + (namespace,)
+            elif tag in folder_tags:
+                folder_path = folder_path + (self._container_name(elem),)
+            if len(elem):
+                stack.extend((child, folder_path, namespace) for child in reversed(elem))
+
+        self.logger.debug(f"Traversed {self.namespace_count} namespaces: " +
+                          ", ".join(f"{len(found)} {name} elements" for name, found in self._elements.items()))
+
+    def _container_name(self, elem: ET.Element) -> str:
+        """Name of a namespace or folder from its own name element or attribute"""
+        for url in self.namespace_urls:
+            name_elem = elem.find(f'{{{url}}}name')
+            if name_elem is not None and name_elem.text and name_elem.text.strip():
+                return name_elem.text.strip()
+        return elem.get('name', '')
+
+    def elements(self, local_name: str) -> List[ModelElement]:
+        """Get the model elements the package extractors work on
+
+        These are the elements below a namespace or, if the package has no
+        namespace elements at all, every element below the root.
+
+        Args:
+            local_name: Local name of the model elements, e.g. 'querySubject'
+
+        Returns:
+            List of model elements in document order
+        """
+        found = self._elements[local_name]
+        if not self.namespace_count:
+            return list(found)
+        return [model_element for model_element in found if model_element.namespace is not None]
+
+    def count_by_namespace(self, local_name: str) -> Dict[str, int]:
+        """Count the model elements of each namespace, in document order of the namespaces"""
+        counts: Dict[str, int] = {}
+        for model_element in self.elements(local_name):
+            counts[model_element.namespace or ''] = counts.get(model_element.namespace or '', 0) + 1
+        return counts
@@ -0,0 +1,139 @@
+"""
+Shared parsed package document for Cognos Framework Manager packages.
+
+This module provides a parse-once representation of an FM package file that
+can be handed to every package extractor, so the same XML document is not
+rebuilt by each extractor in turn.
+"""
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+from .base_package_extractor import BasePackageExtractor
+from .package_traversal import FMModelTraversal, MODEL_PREFIXES
+
+
+# Matches the simple descendant searches used throughout the package
+# extractors, e.g. './/bmt:querySubject'
+_DESCENDANT_PATH = re.compile(r'^\.//(\w+):(\w+)$')
+
+
+class ParsedPackage:
+    """A Framework Manager package parsed once and shared between extractors
+
+    Holds the XML root, the namespaces resolved from that root and a tag index
+    of every element below the root. The index is built lazily in a single
+    pass over the tree and answers './/prefix:tag' searches from the root
+    without walking the document again. Likewise the FMModelTraversal of the
+    model elements is built once and shared by the extractors.
+    """
+
+    def __init__(self, root: ET.Element, file_path: Optional[str] = None, logger=None):
+        """Initialize the parsed package
+
+        Args:
+            root: XML root element of the package
+            file_path: Optional path of the file the package was parsed from
+            logger: Optional logger instance
+        """
+        self.root = root
+        self.file_path = file_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.namespaces = self._resolve_namespaces(root)
+        self._tag_index: Optional[Dict[str, List[ET.Element]]] = None
+        self._traversals: Dict[Tuple[Optional[str], ...], FMModelTraversal] = {}
+
+    @classmethod
+    def from_file(cls, package_file_path: str, logger=None) -> 'ParsedPackage':
+        """Parse an FM package file
+
+        Args:
+            package_file_path: Path to the FM package file
+            logger: Optional logger instance
+
+        Returns:
+            ParsedPackage instance
+        """
+        tree = ET.parse(package_file_path)
+        return cls(tree.getroot(), file_path=str(package_file_path), logger=logger)
+
+    def _resolve_namespaces(self, root: ET.Element) -> Dict[str, str]:
+        """Resolve the package namespaces the same way the extractors do
+
+        Args:
+            root: XML root element
+
+        Returns:
+            Dictionary mapping namespace prefixes to namespace URLs
+        """
+        resolver = BasePackageExtractor(self.logger)
+        resolver.update_namespaces_from_root(root)
+        return dict(resolver.namespaces)
+
+    @property
+    def tag_index(self) -> Dict[str, List[ET.Element]]:
+        """Elements below the root grouped by qualified tag, in document order"""
+        if self._tag_index is None:
+            index: Dict[str, List[ET.Element]] = {}
+            iterator = self.root.iter()
+            next(iterator)  # './/' searches never match the root itself
+            for elem in iterator:
+                index.setdefault(elem.tag, []).append(elem)
+            self._tag_index = index
+            self.logger.debug(f"Indexed {sum(len(v) for v in index.values())} package elements")
+        return self._tag_index
+
+    def elements(self, local_name: str, prefix: str = 'bmt',
+                 namespaces: Optional[Dict[str, str]] = None) -> List[ET.Element]:
+        """Get every element below the root with the given tag
+
+        Args:
+            local_name: Local tag name, e.g. 'querySubject'
+            prefix: Namespace prefix to resolve the tag with
+            namespaces: Optional prefix map, defaults to the resolved namespaces
+
+        Returns:
+            List of elements in document order
+        """
+        ns_url = (namespaces or self.namespaces).get(prefix)
+        if ns_url is None:
+            return []
+        return list(self.tag_index.get(f'{{{ns_url}}}{local_name}', ()))
+
+    def model_traversal(self, namespaces: Optional[Dict[str, str]] = None) -> FMModelTraversal:
+        """Get the traversal of the package's model elements, traversing the tree on first use
+
+        Args:
+            namespaces: Optional prefix map, defaults to the resolved namespaces
+
+        Returns:
+            FMModelTraversal of the package
+        """
+        namespaces = namespaces or self.namespaces
+        key = tuple(namespaces.get(prefix) for prefix in MODEL_PREFIXES)
+        traversal = self._traversals.get(key)
+        if traversal is None:
+            traversal = FMModelTraversal(self.root, namespaces, logger=self.logger)
+            self._traversals[key] = traversal
+        return traversal
+
+    def find_descendants(self, element: ET.Element, path: str,
+                         namespaces: Dict[str, str]) -> Optional[List[ET.Element]]:
+        """Answer a './/prefix:tag' search from the root using the tag index
+
+        Args:
+            element: Element the search starts from
+            path: XPath being searched
+            namespaces: Prefix map the search is resolved against
+
+        Returns:
+            List of matching elements, or None if the index cannot answer the search
+        """
+        if element is not self.root:
+            return None
+        match = _DESCENDANT_PATH.match(path)
+        if not match or match.group(1) not in namespaces:
+            return None
+        return self.elements(match.group(2), match.group(1), namespaces)
@@ -8,10 +8,11 @@ Cognos Framework Manager (FM) package files and generate SQL with appropriate jo
 import logging
 import os
 import csv
-import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+from cognos_migrator.common.artifact_policy import should_write_artifact
+
 from .package_relationship_extractor import PackageRelationshipExtractor
 
 
@@ -29,23 +30,25 @@ class SQLRelationshipExtractor:
         self.relationship_extractor = PackageRelationshipExtractor(logger)
         self.model_tables = model_tables or []
     
-    def extract_and_save(self, package_file_path: str, output_dir: str) -> Dict[str, Any]:
+    def extract_and_save(self, package_file_path: str, output_dir: str,
+                         parsed_package=None) -> Dict[str, Any]:
         """Extract relationships, generate SQL, and save to output files
         
         Args:
             package_file_path: Path to the FM package file
             output_dir: Directory to save extracted data
+            parsed_package: Optional ParsedPackage to reuse instead of parsing the file again
             
         Returns:
             Dictionary with extracted relationships and SQL
         """
         try:
-            # Parse the XML file
-            tree = ET.parse(package_file_path)
-            root = tree.getroot()
+            # Parse the XML file unless it has already been parsed
+            root = self.relationship_extractor.get_package_root(package_file_path, parsed_package)
             
             # Update namespaces on the relationship extractor
-            self.relationship_extractor.update_namespaces_from_root(root)
+            if parsed_package is None:
+                self.relationship_extractor.update_namespaces_from_root(root)
             
             # Extract relationships using the existing extractor
             relationships = self.relationship_extractor.extract_relationships(root)
@@ -80,6 +83,9 @@ class SQLRelationshipExtractor:
         except Exception as e:
             self.logger.error(f"Failed to extract SQL relationships from {package_file_path}: {e}")
             return {"error": str(e)}
+        finally:
+            # The shared parsed package is owned by the caller
+            self.relationship_extractor.parsed_package = None
     
     def _process_relationships(self, relationships: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process relationships to determine join types and generate SQL
@@ -456,7 +462,9 @@ class SQLRelationshipExtractor:
                 self.logger.info(f"Identified complex relationship with composite key: "
                                f"{table_a}.{', '.join(rel['keys_a'])} -> {table_b}.{', '.join(rel['keys_b'])}")
         
-        # Second pass: Add relationships where tables have multiple relationships between them
+        # Second pass: Add relationships where tables have multiple relationships between them.
+        # Each FM relationship is extracted once, so a pair with a single relationship
+        # does not qualify, however many namespaces enclose it
         for rel in model_relationships:
             table_a = rel['table_a_one_side']
             table_b = rel['table_b_many_side']
@@ -477,6 +485,8 @@ class SQLRelationshipExtractor:
             relationships: List of relationships to save
             csv_path: Path to save CSV file
         """
+        if not should_write_artifact(csv_path):
+            return
         try:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(csv_path), exist_ok=True)
@@ -517,7 +527,8 @@ class SQLRelationshipExtractor:
             self.logger.error(f"Failed to save relationships to CSV: {e}")
 
 
-def extract_sql_relationships(package_file_path: str, output_dir: str, logger=None, model_tables=None) -> Dict[str, Any]:
+def extract_sql_relationships(package_file_path: str, output_dir: str, logger=None, model_tables=None,
+                              parsed_package=None) -> Dict[str, Any]:
     """Extract SQL relationships from a package file
     
     Args:
@@ -525,9 +536,10 @@ def extract_sql_relationships(package_file_path: str, output_dir: str, logger=No
         output_dir: Directory to save extracted data
         logger: Optional logger instance
         model_tables: Optional list of table names in the current semantic model
+        parsed_package: Optional ParsedPackage to reuse instead of parsing the file again
         
     Returns:
         Dictionary with extracted relationships and SQL
     """
     extractor = SQLRelationshipExtractor(logger, model_tables)
-    return extractor.extract_and_save(package_file_path, output_dir)
+    return extractor.extract_and_save(package_file_path, output_dir, parsed_package=parsed_package)
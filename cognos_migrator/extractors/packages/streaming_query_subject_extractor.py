@@ -0,0 +1,201 @@
+"""
+Streaming query subject extractor for Cognos Framework Manager packages.
+
+This module provides an iterparse-based alternative to the tree-based
+PackageQuerySubjectExtractor for very large FM exports. Query subjects are
+emitted one at a time and every processed subtree is released, so peak memory
+stays flat regardless of the package size.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Optional, Union
+
+from cognos_migrator.common.artifact_policy import get_artifact_policy, json_dump_options, should_write_artifact
+
+from .package_query_subject_extractor import PackageQuerySubjectExtractor
+
+
+class StreamingQuerySubjectExtractor(PackageQuerySubjectExtractor):
+    """Extracts query subjects from an FM package file with ET.iterparse
+
+    Produces the same records, in the same order, as
+    PackageQuerySubjectExtractor.extract_query_subjects: query subjects below
+    any namespace element in document order, de-duplicated by name with the
+    first occurrence winning. When the package has no namespace elements at
+    all, query subjects anywhere below the root are used instead.
+    """
+
+    def __init__(self, logger=None):
+        """Initialize the streaming query subject extractor
+
+        Args:
+            logger: Optional logger instance
+        """
+        super().__init__(logger)
+
+    def extract_and_save(self, package_file_path: str, output_dir: str,
+                         parsed_package=None) -> Dict[str, Any]:
+        """Extract query subjects and save to JSON
+
+        Args:
+            package_file_path: Path to the FM package file
+            output_dir: Directory to save extracted data
+            parsed_package: Optional ParsedPackage; when given the tree is already in
+                memory and the tree-based extraction is used instead of streaming
+
+        Returns:
+            Dictionary with extracted query subjects
+        """
+        if parsed_package is not None:
+            return super().extract_and_save(package_file_path, output_dir, parsed_package)
+
+        try:
+            # Write each query subject as it is parsed, keeping only the records
+            query_subjects: List[Dict[str, Any]] = []
+            self.stream_to_json(package_file_path, output_dir, "query_subjects.json", records=query_subjects)
+
+            return {"query_subjects": query_subjects}
+
+        except Exception as e:
+            self.logger.error(f"Failed to extract query subjects from {package_file_path}: {e}")
+            return {"error": str(e)}
+
+    def extract_query_subjects_from_file(self, package_file_path: str) -> List[Dict[str, Any]]:
+        """Extract all query subjects from a package file
+
+        Args:
+            package_file_path: Path to the FM package file
+
+        Returns:
+            List of query subjects
+        """
+        return list(self.iter_query_subjects(package_file_path))
+
+    def stream_to_json(self, package_file_path: str, output_dir: Union[str, Path],
+                       filename: str = "query_subjects.json",
+                       records: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Stream query subjects straight into a JSON file
+
+        The file is byte-identical to the one written by save_to_json, but no
+        more than one query subject is held in memory at a time unless records
+        is given. Like save_to_json, it is written without indentation in lean
+        artifact mode and not at all when the artifact policy skips it.
+
+        Args:
+            package_file_path: Path to the FM package file
+            output_dir: Output directory
+            filename: Output filename
+            records: Optional list the query subjects are appended to as they are written
+
+        Returns:
+            Number of query subjects written
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_path = output_dir / filename
+
+        if not should_write_artifact(file_path):
+            count = 0
+            for query_subject in self.iter_query_subjects(package_file_path):
+                if records is not None:
+                    records.append(query_subject)
+                count += 1
+            return count
+
+        compact = get_artifact_policy().lean
+        count = 0
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for query_subject in self.iter_query_subjects(package_file_path):
+                if records is not None:
+                    records.append(query_subject)
+                if compact:
+                    f.write("[" if count == 0 else ",")
+                    f.write(json.dumps(query_subject, **json_dump_options()))
+                else:
+                    # Match json.dump(indent=2) of the whole list: each record is
+                    # indented one level inside the array
+                    f.write("[\n  " if count == 0 else ",\n  ")
+                    f.write(json.dumps(query_subject, indent=2).replace("\n", "\n  "))
+                count += 1
+            if compact:
+                f.write("]" if count else "[]")
+            else:
+                f.write("\n]" if count else "[]")
+
+        self.logger.info(f"Streamed {count} query subjects to {file_path}")
+        return count
+
+    def iter_query_subjects(self, package_file_path: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the query subjects of a package file
+
+        Args:
+            package_file_path: Path to the FM package file
+
+        Yields:
+            Query subject dictionaries with their items and SQL definition
+        """
+        seen: Dict[str, bool] = {}
+        namespace_tags = set()
+        query_subject_tags = set()
+
+        stack: List[ET.Element] = []
+        namespace_depth = 0
+        namespace_seen = False
+        qs_depth = 0
+        # Query subjects of the current outermost query subject, in start order
+        pending: List[ET.Element] = []
+        pending_in_namespace = False
+        # Query subjects outside any namespace, only used if the package has none
+        orphans: Dict[str, Dict[str, Any]] = {}
+
+        for event, elem in ET.iterparse(package_file_path, events=('start', 'end')):
+            if event == 'start':
+                if not stack:
+                    # Resolve namespaces from the root before any query subject is seen
+                    self.update_namespaces_from_root(elem)
+                    for prefix in ['bmt', 'ns']:
+                        namespace_tags.add(f"{{{self.namespaces[prefix]}}}namespace")
+                        query_subject_tags.add(f"{{{self.namespaces[prefix]}}}querySubject")
+                stack.append(elem)
+
+                if elem.tag in namespace_tags:
+                    namespace_depth += 1
+                    if not namespace_seen:
+                        namespace_seen = True
+                        orphans = {}
+                elif elem.tag in query_subject_tags:
+                    if qs_depth == 0:
+                        pending_in_namespace = namespace_depth > 0
+                    qs_depth += 1
+                    pending.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag in namespace_tags:
+                namespace_depth -= 1
+            elif elem.tag in query_subject_tags:
+                qs_depth -= 1
+                if qs_depth == 0:
+                    for qs_elem in pending:
+                        qs_name = self._extract_query_subject_name(qs_elem)
+                        if not qs_name:
+                            continue
+                        if pending_in_namespace:
+                            if qs_name not in seen:
+                                seen[qs_name] = True
+                                yield self._build_query_subject(qs_elem, qs_name)
+                        elif not namespace_seen and qs_name not in orphans:
+                            orphans[qs_name] = self._build_query_subject(qs_elem, qs_name)
+                    pending = []
+
+            # Release every completed subtree that is not part of a pending query subject
+            if qs_depth == 0:
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+
+        if not namespace_seen:
+            self.logger.info("No explicit namespace elements found, using root as namespace")
+            yield from orphans.values()
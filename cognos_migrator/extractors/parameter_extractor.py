@@ -15,25 +15,26 @@ class ParameterExtractor(BaseExtractor):
         """Initialize the parameter extractor with optional logger."""
         super().__init__(logger)
     
-    def extract_parameters(self, root, ns=None):
+    def extract_parameters(self, root, ns=None, spec_index=None):
         """Extract parameters from report specification XML"""
         parameters = []
         try:
             # Register namespace if present
             namespace = self.register_namespace(ns)
+            index = self.get_spec_index(root, ns, spec_index)
             
             # Find the parameters section
-            params_section = self.find_element(root, "parameters", ns)
+            params_section = index.find(root, "parameters")
             if params_section is None:
                 # Try to find parameters in other locations
-                params_section = self.find_element(root, "parameterList", ns)
+                params_section = index.find(root, "parameterList")
                     
             if params_section is None:
                 self.logger.warning("No parameters section found in report specification")
                 return parameters
             
             # Process each parameter
-            param_elements = self.findall_elements(params_section, "parameter", ns)
+            param_elements = index.findall(params_section, "parameter")
                 
             for i, param_elem in enumerate(param_elements):
                 param = {
@@ -45,10 +46,10 @@ class ParameterExtractor(BaseExtractor):
                 }
                 
                 # Extract default values if present
-                default_elem = self.find_element(param_elem, "defaultValues", ns)
+                default_elem = index.find(param_elem, "defaultValues")
                 if default_elem is not None:
                     default_values = []
-                    value_elements = self.findall_elements(default_elem, "item", ns)
+                    value_elements = index.findall(default_elem, "item")
                     for value_elem in value_elements:
                         value = self.get_element_text(value_elem)
                         if value:
@@ -58,18 +59,18 @@ class ParameterExtractor(BaseExtractor):
                         param["defaultValues"] = default_values
                 
                 # Extract parameter properties
-                properties_elem = self.find_element(param_elem, "parameterProperties", ns)
+                properties_elem = index.find(param_elem, "parameterProperties")
                 if properties_elem is not None:
                     properties = {}
                     
                     # Extract prompt text
-                    prompt_elem = self.find_element(properties_elem, "promptText", ns)
+                    prompt_elem = index.find(properties_elem, "promptText")
                     if prompt_elem is not None:
                         properties["promptText"] = self.get_element_text(prompt_elem)
                     
                     # Extract other properties
                     for prop_name in ["hidden", "selectAll", "selectAllTitle", "autoSubmit"]:
-                        prop_elem = self.find_element(properties_elem, prop_name, ns)
+                        prop_elem = index.find(properties_elem, prop_name)
                         if prop_elem is not None:
                             properties[prop_name] = self.get_element_text(prop_elem)
                     
@@ -15,22 +15,23 @@ class QueryExtractor(BaseExtractor):
         """Initialize the query extractor with optional logger."""
         super().__init__(logger)
     
-    def extract_queries(self, root, ns=None):
+    def extract_queries(self, root, ns=None, spec_index=None):
         """Extract queries from report specification XML"""
         queries = []
         try:
             # Register namespace if present
             namespace = self.register_namespace(ns)
+            index = self.get_spec_index(root, ns, spec_index)
             
             # Find the queries section directly under the root
-            queries_section = self.find_element(root, "queries", ns)
+            queries_section = index.find(root, "queries")
                 
             if queries_section is None:
                 self.logger.warning("No queries section found in report specification")
                 return queries
                 
             # Find all query elements
-            query_elements = self.findall_elements(queries_section, "query", ns)
+            query_elements = index.findall(queries_section, "query")
                 
             for i, query_elem in enumerate(query_elements):
                 query = {
@@ -39,9 +40,9 @@ class QueryExtractor(BaseExtractor):
                 }
                 
                 # Find source element
-                source_elem = self.find_element(query_elem, "source", ns)
+                source_elem = index.find(query_elem, "source")
                 if source_elem is not None:
-                    model_elem = self.find_element(source_elem, "model", ns)
+                    model_elem = index.find(source_elem, "model")
                     if model_elem is not None:
                         query["source"] = "model"
                     else:
@@ -49,10 +50,10 @@ class QueryExtractor(BaseExtractor):
                         
                 # Extract data items
                 data_items = []
-                selection_elem = self.find_element(query_elem, "selection", ns)
+                selection_elem = index.find(query_elem, "selection")
                     
                 if selection_elem is not None:
-                    item_elements = self.findall_elements(selection_elem, "dataItem", ns)
+                    item_elements = index.findall(selection_elem, "dataItem")
                         
                     for item in item_elements:
                         data_item = {
@@ -60,12 +61,12 @@ class QueryExtractor(BaseExtractor):
                             "aggregate": item.get("aggregate", "none"),
                         }
                         
-                        expr_elem = self.find_element(item, "expression", ns)
+                        expr_elem = index.find(item, "expression")
                         if expr_elem is not None:
                             data_item["expression"] = self.get_element_text(expr_elem)
                         
                         # Extract XML attributes for data type and usage
-                        xml_attrs = self.find_element(item, "XMLAttributes", ns)
+                        xml_attrs = index.find(item, "XMLAttributes")
                             
                         if xml_attrs is not None:
                             data_type_attr = self.find_element(xml_attrs, "XMLAttribute[@name='RS_dataType']", ns)
@@ -83,13 +84,13 @@ class QueryExtractor(BaseExtractor):
                 filters = []
                 
                 # Detail filters
-                detail_filters = self.find_element(query_elem, "detailFilters", ns)
+                detail_filters = index.find(query_elem, "detailFilters")
                     
                 if detail_filters is not None:
-                    filter_elements = self.findall_elements(detail_filters, "detailFilter", ns)
+                    filter_elements = index.findall(detail_filters, "detailFilter")
                         
                     for filter_elem in filter_elements:
-                        filter_expr = self.find_element(filter_elem, "filterExpression", ns)
+                        filter_expr = index.find(filter_elem, "filterExpression")
                             
                         if filter_expr is not None:
                             filters.append({
@@ -98,13 +99,13 @@ class QueryExtractor(BaseExtractor):
                             })
                 
                 # Summary filters
-                summary_filters_elem = self.find_element(query_elem, "summaryFilters", ns)
+                summary_filters_elem = index.find(query_elem, "summaryFilters")
                     
                 if summary_filters_elem is not None:
-                    filter_elements = self.findall_elements(summary_filters_elem, "summaryFilter", ns)
+                    filter_elements = index.findall(summary_filters_elem, "summaryFilter")
                         
                     for filter_elem in filter_elements:
-                        filter_expr = self.find_element(filter_elem, "filterExpression", ns)
+                        filter_expr = index.find(filter_elem, "filterExpression")
                             
                         if filter_expr is not None:
                             filters.append({
@@ -0,0 +1,193 @@
+"""
+Report Specification Index for Cognos XML report specifications.
+
+This module provides a single-pass index over a parsed report specification so
+that the report extractors can answer descendant and context lookups without
+re-walking the tree for every element they process.
+"""
+
+import logging
+from bisect import bisect_right
+
+
+class ReportSpecIndex:
+    """Index over a Cognos report specification built in one traversal.
+
+    Keeps, for every element below the root, its parent and its position in
+    document order, plus per-tag element lists. Descendant searches such as
+    ``.//dataItem`` from any indexed element are answered from the per-tag
+    lists, and expression elements can be mapped back to the dataItem, query
+    and filter they belong to.
+    """
+
+    def __init__(self, root, ns=None, logger=None):
+        """Build the index for a report specification root element.
+
+        Args:
+            root: Root element of the parsed report specification
+            ns: Optional namespace dictionary with an 'ns' entry, as used by the extractors
+            logger: Optional logger instance
+        """
+        self.root = root
+        self.ns = ns
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._parent = {}
+        self._position = {root: 0}
+        self._last_descendant = {}
+        self._elements_by_tag = {}
+        self._positions_by_tag = {}
+
+        # Derived lookups, built on first use
+        self._data_item_by_expression_text = None
+        self._filter_expression_texts = None
+        self._query_name_by_data_item_name = None
+        self._elements_by_attribute_value = None
+
+        self._build()
+
+    def _build(self):
+        """Walk the tree once, recording parents, positions and tag lists."""
+        position = 1
+        stack = [(self.root, iter(self.root))]
+        while stack:
+            elem, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                self._last_descendant[elem] = position - 1
+                continue
+
+            self._parent[child] = elem
+            self._position[child] = position
+            self._elements_by_tag.setdefault(child.tag, []).append(child)
+            self._positions_by_tag.setdefault(child.tag, []).append(position)
+            position += 1
+            stack.append((child, iter(child)))
+
+        self.logger.debug(f"Indexed {position - 1} report specification elements")
+
+    def qualify(self, element_name):
+        """Get the tag an element name resolves to, with namespace handling."""
+        if self.ns and 'ns' in self.ns:
+            return "{{{0}}}{1}".format(self.ns['ns'], element_name)
+        return element_name
+
+    def local_name(self, element):
+        """Get the tag name of an element without namespace."""
+        tag = element.tag
+        if '}' in tag:
+            return tag.split('}', 1)[1]
+        return tag
+
+    def findall(self, parent, element_name):
+        """Find all descendants of an indexed element with the given name.
+
+        Equivalent to BaseExtractor.findall_elements for a plain element name.
+        """
+        tag = self.qualify(element_name)
+        start = self._position[parent]
+        positions = self._positions_by_tag.get(tag, [])
+        lo = bisect_right(positions, start)
+        hi = bisect_right(positions, self._last_descendant[parent], lo)
+        return self._elements_by_tag[tag][lo:hi] if lo < hi else []
+
+    def find(self, parent, element_name):
+        """Find the first descendant of an indexed element with the given name.
+
+        Equivalent to BaseExtractor.find_element for a plain element name.
+        """
+        tag = self.qualify(element_name)
+        positions = self._positions_by_tag.get(tag)
+        if not positions:
+            return None
+        i = bisect_right(positions, self._position[parent])
+        if i < len(positions) and positions[i] <= self._last_descendant[parent]:
+            return self._elements_by_tag[tag][i]
+        return None
+
+    def elements(self, element_name):
+        """Get every element below the root with the given name, in document order."""
+        return list(self._elements_by_tag.get(self.qualify(element_name), []))
+
+    def elements_with_attribute_value(self, value):
+        """Get every element with an attribute of exactly the given value, in document order.
+
+        For example the query named after a table, and the lists and charts
+        whose refQuery is that query.
+        """
+        if self._elements_by_attribute_value is None:
+            mapping = {}
+            for elem in self._position:
+                for attribute_value in dict.fromkeys(elem.attrib.values()):
+                    mapping.setdefault(attribute_value, []).append(elem)
+            self._elements_by_attribute_value = mapping
+        return list(self._elements_by_attribute_value.get(value, []))
+
+    def contains(self, ancestor, element):
+        """Check whether an element is a descendant of another indexed element."""
+        return self._position[ancestor] < self._position[element] <= self._last_descendant[ancestor]
+
+    def parent(self, element):
+        """Get the parent of an indexed element, or None for the root."""
+        return self._parent.get(element)
+
+    def ancestor(self, element, element_name):
+        """Get the nearest ancestor of an element with the given name."""
+        tag = self.qualify(element_name)
+        current = self._parent.get(element)
+        while current is not None:
+            if current.tag == tag:
+                return current
+            current = self._parent.get(current)
+        return None
+
+    def data_item_for(self, element):
+        """Get the dataItem an element (typically an expression) belongs to."""
+        return self.ancestor(element, "dataItem")
+
+    def query_for(self, element):
+        """Get the query an element belongs to."""
+        return self.ancestor(element, "query")
+
+    def filter_for(self, element):
+        """Get the detail or summary filter an element belongs to."""
+        return self.ancestor(element, "detailFilter") or self.ancestor(element, "summaryFilter")
+
+    def data_item_by_expression_text(self, expression_text):
+        """Get the first dataItem whose expression has exactly the given text.
+
+        Matches the first dataItem in document order whose first descendant
+        expression element carries this text.
+        """
+        if self._data_item_by_expression_text is None:
+            mapping = {}
+            for data_item in self.elements("dataItem"):
+                expr_elem = self.find(data_item, "expression")
+                if expr_elem is None:
+                    continue
+                mapping.setdefault(expr_elem.text or "", data_item)
+            self._data_item_by_expression_text = mapping
+        return self._data_item_by_expression_text.get(expression_text)
+
+    def is_filter_expression_text(self, expression_text):
+        """Check whether any filterExpression in the report has exactly the given text."""
+        if self._filter_expression_texts is None:
+            self._filter_expression_texts = {
+                elem.text or "" for elem in self.elements("filterExpression")
+            }
+        return expression_text in self._filter_expression_texts
+
+    def query_name_for_data_item(self, data_item_name):
+        """Get the name of the first query whose selection contains a dataItem with this name."""
+        if self._query_name_by_data_item_name is None:
+            mapping = {}
+            for query_elem in self.elements("query"):
+                selection_elem = self.find(query_elem, "selection")
+                if selection_elem is None:
+                    continue
+                query_name = query_elem.get("name", "")
+                for item in self.findall(selection_elem, "dataItem"):
+                    mapping.setdefault(item.get("name"), query_name)
+            self._query_name_by_data_item_name = mapping
+        return self._query_name_by_data_item_name.get(data_item_name)
@@ -30,17 +30,20 @@ from ..report_parser import CognosReportStructure, CognosVisual
 class PowerBIProjectOrchestrator:
     """Orchestrates the generation of Power BI project files using specialized generators"""
     
-    def __init__(self, config: MigrationConfig):
+    def __init__(self, config: MigrationConfig, template_engine: Optional[TemplateEngine] = None,
+                 llm_service: Optional[LLMServiceClient] = None):
         """Initialize the Power BI project orchestrator
         
         Args:
             config: Migration configuration
+            template_engine: Already loaded template engine to reuse instead of loading the templates again
+            llm_service: Already initialized LLM service client to reuse
         """
         self.config = config
         self.logger = logging.getLogger(__name__)
         
         # Initialize template engine
-        self.template_engine = TemplateEngine(config.template_directory)
+        self.template_engine = template_engine or TemplateEngine(config.template_directory)
         
         # Initialize specialized generators
         self.project_file_generator = ProjectFileGenerator(self.template_engine)
@@ -54,7 +57,7 @@ class PowerBIProjectOrchestrator:
             self.logger.info("LLM service is enabled for M-query generation")
             
             # Initialize LLM service client
-            self.llm_service = LLMServiceClient(
+            self.llm_service = llm_service or LLMServiceClient(
                 base_url=config.llm_service_url,
                 api_key=getattr(config, 'llm_service_api_key', None)
             )
@@ -98,7 +101,7 @@ class PowerBIProjectOrchestrator:
                     self.logger.info(f"FILTERING DEBUG: Config has table_filtering attribute: {self.config.table_filtering}")
                     
                     # Add table filtering settings to data_model if not present
-                    if not hasattr(project.data_model, 'table_filtering'):
+                    if project.data_model.table_filtering is None:
                         project.data_model.table_filtering = self.config.table_filtering
                         self.logger.info(f"FILTERING DEBUG: Added table_filtering to data_model: {self.config.table_filtering}")
             
@@ -9,6 +9,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
 from .utils import get_extracted_dir, save_json_to_extracted_dir
+from ..common.artifact_store import json_exists, load_json, save_json
+from ..common.artifact_policy import write_json_artifact
+from ..common.tracing import span
 
 from ..models import DataModel, Table, Relationship
 from ..converters import MQueryConverter
@@ -55,7 +58,7 @@ class ModelFileGenerator:
         self.logger.info(f"FILTERING DEBUG: Table names at start of generation: {table_names}")
         
         # Check if table filtering settings are available in data_model
-        if hasattr(data_model, 'table_filtering'):
+        if getattr(data_model, 'table_filtering', None) is not None:
             self.logger.info(f"FILTERING DEBUG: Data model has table_filtering attribute: {data_model.table_filtering}")
         
         # Get extracted directory if applicable
@@ -162,8 +165,7 @@ class ModelFileGenerator:
             data_items_file = extracted_dir / "report_data_items.json"
             if data_items_file.exists():
                 try:
-                    with open(data_items_file, 'r', encoding='utf-8') as f:
-                        all_data_items = json.load(f)
+                    all_data_items = load_json(data_items_file)
                 except Exception as e:
                     self.logger.warning(f"Error loading data items from {data_items_file}: {e}")
 
@@ -190,7 +192,7 @@ class ModelFileGenerator:
             
             # Check if JSON file already exists
             table_json_file = extracted_dir / f"table_{table_name}.json"
-            if table_json_file.exists():
+            if json_exists(table_json_file):
                 self.logger.info(f"Report table JSON file already exists, skipping generation: {table_json_file}")
                 continue
             
@@ -272,13 +274,12 @@ class ModelFileGenerator:
         # Load calculations if available to update source_column for calculated fields
         calculations_map = {}
         calculations_file = extracted_dir / "calculations.json"
-        if calculations_file.exists():
+        if json_exists(calculations_file):
             try:
-                with open(calculations_file, 'r', encoding='utf-8') as f:
-                    calculations_data = json.load(f)
-                    for calc in calculations_data.get('calculations', []):
-                        if calc.get('TableName') == table.name and calc.get('FormulaDax'):
-                            calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
+                calculations_data = load_json(calculations_file)
+                for calc in calculations_data.get('calculations', []):
+                    if calc.get('TableName') == table.name and calc.get('FormulaDax'):
+                        calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
                 self.logger.info(f"Loaded {len(calculations_map)} calculations for table {table.name} from {calculations_file}")
             except Exception as e:
                 self.logger.warning(f"Failed to load calculations from {calculations_file}: {e}")
@@ -400,8 +401,8 @@ class ModelFileGenerator:
             
             self.logger.info(f"Added M-query partition information to table {table.name} JSON")
         
-        # Save as table_[TableName].json using the renamed table name
-        save_json_to_extracted_dir(extracted_dir, f"table_{table_name}.json", table_json)
+        # Save as table_[TableName].json using the renamed table name; Phase 2 reads it from the artifact store
+        save_json(extracted_dir / f"table_{table_name}.json", table_json)
         self.logger.info(f"Generated report table JSON file: table_{table_name}.json")
     
     def _generate_report_tmdl_from_json(self, tables: List[Table], tables_dir: Path, extracted_dir: Path, report_name: Optional[str] = None):
@@ -424,27 +425,22 @@ class ModelFileGenerator:
             try:
                 # Read finalized table JSON
                 table_json_file = extracted_dir / f"table_{table_name}.json"
-                if not table_json_file.exists():
+                table_json = load_json(table_json_file, None)
+                if table_json is None:
                     self.logger.warning(f"Report table JSON file not found: {table_json_file}, skipping TMDL generation")
                     continue
                 
-                with open(table_json_file, 'r', encoding='utf-8') as f:
-                    table_json = json.load(f)
-                
                 # Build context from JSON data
                 context = self._build_report_table_context_from_json(table_json, table_name)
                 
-                # Render table template
-                content = self.template_engine.render('table', context)
-
                 # Log the M-query being written to the TMDL file
                 if 'm_expression' in context and context['m_expression']:
                     self.logger.info(f"[MQUERY_TRACKING] M-query being written to TMDL for table {table_name}: {context['m_expression'][:200]}...")
                 
-                # Write table file
+                # Render the table template straight into the table file
                 table_file = tables_dir / f"{table_name}.tmdl"
-                with open(table_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                with span('render_table', table=table_name):
+                    self.template_engine.render_to_file('table', context, table_file)
                 
                 self.logger.info(f"Generated report TMDL file from JSON: {table_file}")
                 
@@ -552,13 +548,12 @@ class ModelFileGenerator:
         calculations_map = {}
         if extracted_dir and extracted_dir.exists():
             calculations_file = extracted_dir / "calculations.json"
-            if calculations_file.exists():
+            if json_exists(calculations_file):
                 try:
-                    with open(calculations_file, 'r', encoding='utf-8') as f:
-                        calculations_data = json.load(f)
-                        for calc in calculations_data.get('calculations', []):
-                            if calc.get('TableName') == table.name and calc.get('FormulaDax'):
-                                calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
+                    calculations_data = load_json(calculations_file)
+                    for calc in calculations_data.get('calculations', []):
+                        if calc.get('TableName') == table.name and calc.get('FormulaDax'):
+                            calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
                     self.logger.info(f"Loaded {len(calculations_map)} calculations for table {table.name} from {calculations_file}")
                 except Exception as e:
                     self.logger.warning(f"Error loading calculations for table {table.name} from {calculations_file}: {e}")
@@ -573,8 +568,7 @@ class ModelFileGenerator:
                 data_items_file = extracted_dir / "report_data_items.json"
                 if data_items_file.exists():
                     try:
-                        with open(data_items_file, 'r', encoding='utf-8') as f:
-                            data_items = json.load(f)
+                        data_items = load_json(data_items_file)
                         self.logger.info(f"Loaded {len(data_items)} data items for table context from {data_items_file}")
                     except Exception as e:
                         self.logger.warning(f"Error loading data items for table context from {data_items_file}: {e}")
@@ -795,7 +789,8 @@ in
         
         # Use the MQueryConverter to generate the M-query
         self.logger.info(f"[MQUERY_TRACKING] Generating optimized M-query for table {table.name} using M-query converter")
-        m_query = self.mquery_converter.convert_to_m_query(table, report_spec)
+        with span('convert_mquery', table=table.name):
+            m_query = self.mquery_converter.convert_to_m_query(table, report_spec)
         self.logger.info(f"[MQUERY_TRACKING] Generated M-query for table {table.name}: {m_query[:200]}...")
         return m_query
     
@@ -976,8 +971,7 @@ in
                     
                 relationships_json.append(rel_json)
                 
-            with open(extracted_dir / 'relationships.json', 'w', encoding='utf-8') as f:
-                json.dump(relationships_json, f, indent=2)
+            write_json_artifact(extracted_dir / 'relationships.json', relationships_json)
             
         self.logger.info(f"Generated relationships file: {relationships_file}")
     
@@ -1143,7 +1137,7 @@ in
                 }
                 
                 # Save as table_[TableName].json
-                save_json_to_extracted_dir(extracted_dir, f"table_{date_table_name}.json", date_table_json)
+                save_json(extracted_dir / f"table_{date_table_name}.json", date_table_json)
                 self.logger.info(f"Saved date table JSON to extracted directory: table_{date_table_name}.json")
                 
                 # Also save the date table definition as a separate JSON file
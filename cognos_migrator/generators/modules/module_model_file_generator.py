@@ -11,6 +11,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from cognos_migrator.common.websocket_client import logging_helper
 
 from cognos_migrator.generators.utils import get_extracted_dir, save_json_to_extracted_dir
+from cognos_migrator.common.artifact_store import json_exists, load_json, save_json
+from cognos_migrator.common.tracing import span
 
 from cognos_migrator.models import DataModel, Table, Relationship
 from cognos_migrator.converters import MQueryConverter
@@ -130,8 +132,7 @@ class ModuleModelFileGenerator:
                     data_items_file = extracted_dir / "report_data_items.json"
                     if data_items_file.exists():
                         try:
-                            with open(data_items_file, 'r', encoding='utf-8') as f:
-                                data_items = json.load(f)
+                            data_items = load_json(data_items_file)
                             self.logger.info(f"Loaded {len(data_items)} data items for table {table.name} from {data_items_file}")
                         except Exception as e:
                             self.logger.warning(f"Error loading data items from {data_items_file}: {e}")
@@ -173,13 +174,10 @@ class ModuleModelFileGenerator:
                 # Build table context with the data items
                 context = self._build_table_context(table, report_spec, data_items, extracted_dir, m_query)
                 
-                # Render table template
-                content = self.template_engine.render('table', context)
-
-                # Write table file using the table name (which is already properly set)
+                # Render table template into the table file using the table name (which is already properly set)
                 table_file = tables_dir / f"{table.name}.tmdl"
-                with open(table_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                with span('render_table', table=table.name):
+                    self.template_engine.render_to_file('table', context, table_file)
                 
                 # Save table information as JSON in extracted directory
                 if extracted_dir:
@@ -187,13 +185,12 @@ class ModuleModelFileGenerator:
                     # Load calculations if available to update source_column for calculated fields
                     calculations_map = {}
                     calculations_file = extracted_dir / "calculations.json"
-                    if calculations_file.exists():
+                    if json_exists(calculations_file):
                         try:
-                            with open(calculations_file, 'r', encoding='utf-8') as f:
-                                calculations_data = json.load(f)
-                                for calc in calculations_data.get('calculations', []):
-                                    if calc.get('TableName') == table.name and calc.get('FormulaDax'):
-                                        calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
+                            calculations_data = load_json(calculations_file)
+                            for calc in calculations_data.get('calculations', []):
+                                if calc.get('TableName') == table.name and calc.get('FormulaDax'):
+                                    calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
                             self.logger.info(f"Loaded {len(calculations_map)} calculations for table {table.name} from {calculations_file}")
                         except Exception as e:
                             self.logger.warning(f"Failed to load calculations from {calculations_file}: {e}")
@@ -309,7 +306,7 @@ class ModuleModelFileGenerator:
                         self.logger.info(f"Added M-query partition information to table {table.name} JSON")
                     
                     # Save as table_[TableName].json using the renamed table name
-                    save_json_to_extracted_dir(extracted_dir, f"table_{table_name}.json", table_json)
+                    save_json(extracted_dir / f"table_{table_name}.json", table_json)
                 
                 self.logger.info(f"Generated table file: {table_file}")
                 
@@ -370,13 +367,12 @@ class ModuleModelFileGenerator:
         calculations_map = {}
         if extracted_dir and extracted_dir.exists():
             calculations_file = extracted_dir / "calculations.json"
-            if calculations_file.exists():
+            if json_exists(calculations_file):
                 try:
-                    with open(calculations_file, 'r', encoding='utf-8') as f:
-                        calculations_data = json.load(f)
-                        for calc in calculations_data.get('calculations', []):
-                            if calc.get('TableName') == table.name and calc.get('FormulaDax'):
-                                calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
+                    calculations_data = load_json(calculations_file)
+                    for calc in calculations_data.get('calculations', []):
+                        if calc.get('TableName') == table.name and calc.get('FormulaDax'):
+                            calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
                     self.logger.info(f"Loaded {len(calculations_map)} calculations for table {table.name} from {calculations_file}")
                 except Exception as e:
                     self.logger.warning(f"Error loading calculations for table {table.name} from {calculations_file}: {e}")
@@ -391,8 +387,7 @@ class ModuleModelFileGenerator:
                 data_items_file = extracted_dir / "report_data_items.json"
                 if data_items_file.exists():
                     try:
-                        with open(data_items_file, 'r', encoding='utf-8') as f:
-                            data_items = json.load(f)
+                        data_items = load_json(data_items_file)
                         self.logger.info(f"Loaded {len(data_items)} data items for table context from {data_items_file}")
                     except Exception as e:
                         self.logger.warning(f"Error loading data items for table context from {data_items_file}: {e}")
@@ -513,7 +508,8 @@ class ModuleModelFileGenerator:
         
         # Use the MQueryConverter to generate the M-query
         self.logger.info(f"Generating optimized M-query for table {table.name} using M-query converter")
-        return self.mquery_converter.convert_to_m_query(table, report_spec)
+        with span('convert_mquery', table=table.name):
+            return self.mquery_converter.convert_to_m_query(table, report_spec)
     
     def _generate_relationships_file(self, relationships: List[Relationship], model_dir: Path):
         """Generate relationships.tmdl file"""
@@ -15,6 +15,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
 from .utils import get_extracted_dir, save_json_to_extracted_dir
+from ..common.artifact_store import delete_json, json_exists, load_json, save_json
+from ..common.tracing import span
 from ..models import DataModel, Table, Relationship
 from ..converters import MQueryConverter
 from ..utils.datatype_mapper import map_cognos_to_powerbi_datatype
@@ -94,8 +96,8 @@ class PackageModelFileGenerator:
                 for table in data_model.tables:
                     if not table.name.startswith('Dim_'):  # Only remove fact tables
                         json_file = extracted_dir / f"table_{table.name}.json"
-                        if json_file.exists():
-                            json_file.unlink()
+                        if json_exists(json_file):
+                            delete_json(json_file)
                             self.logger.info(f"Removed existing JSON file to force regeneration: {json_file}")
             
 
@@ -194,7 +196,7 @@ class PackageModelFileGenerator:
             
             # Check if JSON file already exists
             table_json_file = extracted_dir / f"table_{table_name}.json"
-            if table_json_file.exists():
+            if json_exists(table_json_file):
                 self.logger.info(f"Package table JSON file already exists, skipping generation: {table_json_file}")
                 continue
             
@@ -228,13 +230,12 @@ class PackageModelFileGenerator:
         # Load calculations if available (packages can have calculated columns too)
         calculations_map = {}
         calculations_file = extracted_dir / "calculations.json"
-        if calculations_file.exists():
+        if json_exists(calculations_file):
             try:
-                with open(calculations_file, 'r', encoding='utf-8') as f:
-                    calculations_data = json.load(f)
-                    for calc in calculations_data.get('calculations', []):
-                        if calc.get('TableName') == table.name and calc.get('FormulaDax'):
-                            calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
+                calculations_data = load_json(calculations_file)
+                for calc in calculations_data.get('calculations', []):
+                    if calc.get('TableName') == table.name and calc.get('FormulaDax'):
+                        calculations_map[calc.get('CognosName')] = calc.get('FormulaDax')
                 self.logger.info(f"Loaded {len(calculations_map)} calculations for package table {table.name}")
             except Exception as e:
                 self.logger.warning(f"Failed to load calculations for package table {table.name}: {e}")
@@ -314,8 +315,8 @@ class PackageModelFileGenerator:
             
             self.logger.info(f"Added M-query partition information to package table {table.name} JSON")
         
-        # Save as table_[TableName].json
-        save_json_to_extracted_dir(extracted_dir, f"table_{table_name}.json", table_json)
+        # Save as table_[TableName].json; Phase 2 reads it from the artifact store
+        save_json(extracted_dir / f"table_{table_name}.json", table_json)
         self.logger.info(f"Generated package table JSON file: table_{table_name}.json")
     
     def _generate_package_tmdl_from_json(self, tables: List[Table], tables_dir: Path, extracted_dir: Path):
@@ -332,27 +333,22 @@ class PackageModelFileGenerator:
             try:
                 # Read finalized table JSON
                 table_json_file = extracted_dir / f"table_{table_name}.json"
-                if not table_json_file.exists():
+                table_json = load_json(table_json_file, None)
+                if table_json is None:
                     self.logger.warning(f"Package table JSON file not found: {table_json_file}, skipping TMDL generation")
                     continue
                 
-                with open(table_json_file, 'r', encoding='utf-8') as f:
-                    table_json = json.load(f)
-                
                 # Build context from JSON data
                 context = self._build_package_table_context_from_json(table_json, table_name)
                 
-                # Render table template
-                content = self.template_engine.render('table', context)
-
                 # Log the M-query being written to the TMDL file
                 if 'm_expression' in context and context['m_expression']:
                     self.logger.info(f"[PACKAGE MQUERY] M-query being written to TMDL for table {table_name}: {context['m_expression'][:200]}...")
                 
-                # Write table file
+                # Render the table template straight into the table file
                 table_file = tables_dir / f"{table_name}.tmdl"
-                with open(table_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                with span('render_table', table=table_name):
+                    self.template_engine.render_to_file('table', context, table_file)
                 
                 self.logger.info(f"Generated package TMDL file from JSON: {table_file}")
                 
@@ -468,7 +464,8 @@ class PackageModelFileGenerator:
         
         # Use the PackageMQueryConverter to generate the M-query
         self.logger.info(f"[PACKAGE MQUERY] Generating M-query for package table {table.name} using package M-query converter")
-        m_query = self.mquery_converter.convert_to_m_query(table)
+        with span('convert_mquery', table=table.name):
+            m_query = self.mquery_converter.convert_to_m_query(table)
         self.logger.info(f"[PACKAGE MQUERY] Generated M-query for package table {table.name}: {m_query[:200]}...")
         return m_query
     
@@ -9,6 +9,7 @@ from typing import Dict, List, Any, Optional, Set
 from dataclasses import dataclass
 
 from cognos_migrator.models import DataModel, Table, Column, Relationship, DataType
+from cognos_migrator.common.artifact_store import json_exists, load_json, save_json
 
 
 class BaseHandler:
@@ -214,10 +215,9 @@ class BaseHandler:
         table_json["visual_type"] = None
         table_json["column_settings"] = None
         
-        # Save to file
+        # Save to the artifact store, written to extracted/ when the migration ends
         json_file = extracted_dir / f"table_{table.name}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(table_json, f, indent=2, ensure_ascii=False)
+        save_json(json_file, table_json, ensure_ascii=False)
         
         self.logger.info(f"Saved table JSON file: {json_file}")
     
@@ -235,13 +235,12 @@ class BaseHandler:
             return None
             
         json_file = self.extracted_dir / f"table_{table_name}.json"
-        if not json_file.exists():
+        if not json_exists(json_file):
             self.logger.warning(f"JSON file not found for table {table_name}: {json_file}")
             return None
         
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                table_data = json.load(f)
+            table_data = load_json(json_file)
             
             # Get M-query from partitions
             partitions = table_data.get('partitions', [])
@@ -2,6 +2,7 @@
 Merged Tables handler for creating staging tables merged with original tables.
 """
 
+from dataclasses import fields
 from typing import Dict, List, Any, Optional, Set
 from pathlib import Path
 
@@ -92,9 +93,9 @@ class MergedTablesHandler(BaseHandler):
         )
         
         # Copy any additional attributes from the original data model
-        for attr, value in vars(data_model).items():
-            if attr not in ['name', 'tables', 'relationships', 'compatibility_level']:
-                setattr(new_data_model, attr, value)
+        for model_field in fields(data_model):
+            if model_field.name not in ['name', 'tables', 'relationships', 'compatibility_level']:
+                setattr(new_data_model, model_field.name, getattr(data_model, model_field.name))
         
         self.logger.info(f"Processed data model with 'merged_tables' C_table approach: "
                          f"{len(new_tables)} tables ({len(combination_tables)} combination tables), "
@@ -2,6 +2,7 @@
 Star Schema handler for creating dimension tables in a star schema design.
 """
 
+from dataclasses import fields
 from typing import Dict, List, Any, Optional, Tuple, Set
 from pathlib import Path
 import uuid
@@ -138,9 +139,9 @@ class StarSchemaHandler(BaseHandler):
             )
         
         # Copy any additional attributes from the original data model
-        for attr, value in vars(data_model).items():
-            if attr not in ['name', 'tables', 'relationships', 'compatibility_level']:
-                setattr(new_data_model, attr, value)
+        for model_field in fields(data_model):
+            if model_field.name not in ['name', 'tables', 'relationships', 'compatibility_level']:
+                setattr(new_data_model, model_field.name, getattr(data_model, model_field.name))
         
         # Save dimension tables as JSON files
         if self.extracted_dir:
@@ -622,9 +623,9 @@ class StarSchemaHandler(BaseHandler):
         )
         
         # Copy any additional attributes
-        for attr, value in vars(data_model).items():
-            if attr not in ['name', 'tables', 'relationships', 'compatibility_level']:
-                setattr(updated_data_model, attr, value)
+        for model_field in fields(data_model):
+            if model_field.name not in ['name', 'tables', 'relationships', 'compatibility_level']:
+                setattr(updated_data_model, model_field.name, getattr(data_model, model_field.name))
         
         return updated_data_model
     
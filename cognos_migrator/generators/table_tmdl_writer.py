@@ -0,0 +1,187 @@
+"""
+Streaming writer for table TMDL files.
+
+Table.tmdl is the only handlebars template and is rendered once per table.
+pybars resolves every value through generic scope objects and joins the
+whole file into one string before it is written, which adds up for models
+with hundreds of tables and wide fact tables. write_table_tmdl produces the
+same output as the stock Table.tmdl, following pybars' rules for missing
+values, booleans and HTML escaping, and writes each line to the output file
+as it goes.
+
+The writer only matches the stock template, so TemplateEngine uses it only
+when the Table.tmdl in the template directory has STOCK_TABLE_TEMPLATE_SHA256.
+A customized Table.tmdl is rendered with pybars as before.
+"""
+
+import re
+from typing import Any, Dict, TextIO
+
+# SHA-256 of the Table.tmdl this writer reproduces
+STOCK_TABLE_TEMPLATE_SHA256 = '59318bb7501e84007aabe3ddd960f4183a4d0f0431f1582fe74851c3358256a0'
+
+_ESCAPE_MAP = {
+    '&': '&amp;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    '`': '&#x60;',
+    '<': '&lt;',
+    '>': '&gt;',
+}
+_escape_re = re.compile(r"&|\"|'|`|<|>")
+
+
+def _pick(context: Any, name: str) -> Any:
+    """Look up name in context like pybars: item, then attribute, then get()"""
+    try:
+        return context[name]
+    except (KeyError, TypeError, AttributeError):
+        if hasattr(context, name):
+            return getattr(context, name)
+        if hasattr(context, 'get'):
+            return context.get(name)
+        return None
+
+
+def _resolve(context: Any, *path: str) -> Any:
+    for name in path:
+        if context is None:
+            return None
+        context = _pick(context, name)
+    return context
+
+
+def _raw(value: Any) -> str:
+    """Value as pybars prints it with {{{triple braces}}}"""
+    if value is None:
+        return ''
+    if type(value) is str:
+        return value
+    if type(value) is bool:
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _text(value: Any) -> str:
+    """Value as pybars prints it with {{double braces}}, HTML-escaped"""
+    return _escape_re.sub(lambda match: _ESCAPE_MAP[match.group(0)], _raw(value))
+
+
+def _items(value: Any) -> list:
+    """Items {{#each}} iterates over: list items, or dictionary values"""
+    if not value:
+        return []
+    try:
+        if len(value) == 0:
+            return []
+    except TypeError:
+        return []
+    if hasattr(value, 'keys'):
+        return [value[key] for key in value]
+    return list(value)
+
+
+def write_table_tmdl(context: Dict[str, Any], out: TextIO) -> None:
+    """Write the TMDL of one table, as rendered by the stock Table.tmdl template
+
+    Args:
+        context: Table template context, see the generators' table context builders
+        out: Text file to write to
+    """
+    write = out.write
+    get = _pick
+
+    if get(context, 'has_spaces_or_special_chars'):
+        write(f"table '{_text(get(context, 'source_name'))}'\n")
+    else:
+        write(f"table {_text(get(context, 'source_name'))}\n")
+    write('\n')
+    if get(context, 'is_hidden'):
+        write('    isHidden\n')
+    write('\n')
+
+    for column in _items(get(context, 'columns')):
+        if get(column, 'is_calculated'):
+            write(f"    column '{_text(get(column, 'source_name'))}' = ```\n"
+                  f"            {_raw(get(column, 'source_column'))}\n"
+                  f"    ```\n"
+                  f"        dataType: {_text(get(column, 'datatype'))}\n")
+            if get(column, 'summarize_by'):
+                write(f"        summarizeBy: {_text(get(column, 'summarize_by'))}\n")
+        else:
+            write(f"    column '{_text(get(column, 'source_name'))}'\n"
+                  f"        dataType: {_text(get(column, 'datatype'))}\n")
+            if get(column, 'summarize_by'):
+                write(f"        summarizeBy: {_text(get(column, 'summarize_by'))}\n")
+            if get(column, 'source_column'):
+                write(f"        sourceColumn: {_raw(get(column, 'source_column'))}\n")
+        if get(column, 'format_string'):
+            write(f"        formatString: {_text(get(column, 'format_string'))}\n")
+        write('\n')
+        if get(column, 'is_hidden'):
+            write('        isHidden\n')
+        if get(column, 'data_category'):
+            write(f"        dataCategory: {_text(get(column, 'data_category'))}\n")
+        if get(column, 'is_data_type_inferred'):
+            write(f"        isDataTypeInferred: {_text(get(column, 'is_data_type_inferred'))}\n")
+        write('        \n')
+        relationship_info = get(column, 'relationship_info')
+        if relationship_info:
+            write(f"        variation Variation\n"
+                  f"            isDefault\n"
+                  f"            relationship: {_text(_resolve(relationship_info, 'id'))}\n"
+                  f"            defaultHierarchy: {_raw(_resolve(relationship_info, 'hierarchy'))}\n")
+        write('\n')
+        summarization_set_by = _resolve(column, 'annotations', 'SummarizationSetBy')
+        if summarization_set_by:
+            write(f"        annotation SummarizationSetBy = {_text(summarization_set_by)}\n")
+        else:
+            write('        annotation SummarizationSetBy = Automatic\n')
+        write('\n')
+        if _resolve(column, 'annotations', 'PBI_FormatHint'):
+            write('        annotation PBI_FormatHint = {"isGeneralNumber":true}\n')
+        write('        \n')
+    write('\n')
+
+    for measure in _items(get(context, 'measures')):
+        write(f"    measure '{_text(get(measure, 'name'))}' = ```\n"
+              f"            {_raw(get(measure, 'expression'))}\n"
+              f"    ```\n")
+        if get(measure, 'format_string'):
+            write(f"        formatString: {_text(get(measure, 'format_string'))}\n")
+        write('\n')
+        if get(measure, 'is_hidden'):
+            write('        isHidden\n')
+        write('\n'
+              '        annotation PBI_FormatHint = {"isGeneralNumber":true}\n'
+              '        \n')
+    write('\n')
+
+    for hierarchy in _items(get(context, 'hierarchies')):
+        write(f"    hierarchy {_text(get(hierarchy, 'name'))}\n\n")
+        if get(hierarchy, 'is_hidden'):
+            write('        isHidden\n')
+        for level in _items(get(hierarchy, 'levels')):
+            write(f"        level {_text(get(level, 'name'))}\n"
+                  f"            column: {_text(get(level, 'column_name'))}\n")
+            if get(level, 'ordinal'):
+                write(f"            ordinal: {_text(get(level, 'ordinal'))}\n")
+    write('\n')
+
+    for partition in _items(get(context, 'partitions')):
+        write(f"    partition '{_text(get(partition, 'name'))}' = {_text(get(partition, 'source_type'))}\n"
+              f"        mode: {_text(get(partition, 'mode'))}\n"
+              f"        source = \n"
+              f"            {_raw(get(partition, 'expression'))}\n"
+              f"        \n"
+              f"\n")
+    write('\n')
+
+    if get(context, 'has_widget_serialization'):
+        write(f"    annotation TableWidgetSerialization =\n"
+              f"        {{\n"
+              f"          \"VisualType\": {_text(get(context, 'visual_type'))},\n"
+              f"          \"Columns\": {_text(get(context, 'column_settings'))}\n"
+              f"        }}\n")
+    write('\n'
+          '    annotation PBI_ResultType = Table')
@@ -1,24 +1,128 @@
 """
 Template engine for rendering Power BI project templates.
 """
+import io
 import os
 import re
+import threading
+import time
+from bisect import bisect_left
 from pathlib import Path
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import json
 
 from cognos_migrator.utils.json_encoder import ModelJSONEncoder, model_to_dict
 
-from pybars import Compiler
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Template
+
+from .template_registry import HANDLEBARS, JINJA, get_template_registry
+from .table_tmdl_writer import STOCK_TABLE_TEMPLATE_SHA256, write_table_tmdl
+
+# Templates rendered with handlebars; all others use Jinja2
+HANDLEBARS_TEMPLATES = ('table',)
+
+TEMPLATE_FILES = {
+    # Model templates
+    'database': {'filename': 'database.tmdl', 'path': 'Model', 'target_filename': 'database.tmdl'},
+    'table': {'filename': 'Table.tmdl', 'path': 'Model/tables', 'target_filename': '{table_name}.tmdl'},
+    'relationship': {'filename': 'relationship.tmdl', 'path': 'Model', 'target_filename': 'relationships.tmdl'},
+    'model': {'filename': 'model.tmdl', 'path': 'Model', 'target_filename': 'model.tmdl'},
+    'culture': {'filename': 'culture.tmdl', 'path': 'Model/cultures', 'target_filename': '{culture_name}.tmdl'},
+    'expressions': {'filename': 'expressions.tmdl', 'path': 'Model', 'target_filename': 'expressions.tmdl'},
+    
+    # Project templates
+    'pbixproj': {'filename': 'pbixproj.json', 'path': '', 'target_filename': '.pbixproj.json'},
+    
+    # Report templates
+    'report': {'filename': 'report.json', 'path': 'Report', 'target_filename': 'report.json'},
+    'report_config': {'filename': 'report.config.json', 'path': 'Report', 'target_filename': 'report.config.json'},  # Legacy name
+    'config': {'filename': 'report.config.json', 'path': 'Report', 'target_filename': 'config.json'},  # New name
+    'report_metadata': {'filename': 'report.metadata.json', 'path': '', 'target_filename': 'ReportMetadata.json'},
+    'report_settings': {'filename': 'report.settings.json', 'path': '', 'target_filename': 'ReportSettings.json'},
+    'report_section': {'filename': 'report.section.json', 'path': 'Report/sections', 'target_filename': '{section_id}.json'},
+    
+    # Slicer visual templates
+    'slicer_visual_container': {'filename': 'slicer.visualContainer.json', 'path': 'Report/sections', 'target_filename': 'visualContainer.json'},
+    'slicer_config': {'filename': 'slicer.config.json', 'path': 'Report/sections', 'target_filename': 'config.json'},
+    'slicer_query': {'filename': 'slicer.query.json', 'path': 'Report/sections', 'target_filename': 'query.json'},
+    'slicer_data_transforms': {'filename': 'slicer.dataTransforms.json', 'path': 'Report/sections', 'target_filename': 'dataTransforms.json'},
+    
+    'diagram_layout': {'filename': 'diagram.layout.json', 'path': '', 'target_filename': 'DiagramLayout.json'},
+    
+    # Metadata templates
+    'version': {'filename': 'version.txt', 'path': '', 'target_filename': 'Version.txt'}
+}
+
+# Upper bounds of the render time histogram buckets in milliseconds
+RENDER_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class RenderMetrics:
+    """Thread-safe render counts and render time histograms per template"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, template_name: str, duration_s: float) -> None:
+        """Record one render of a template"""
+        duration_ms = duration_s * 1000
+        with self._lock:
+            stats = self._templates.get(template_name)
+            if stats is None:
+                stats = self._templates[template_name] = {
+                    'renders': 0, 'ms_sum': 0.0, 'buckets': [0] * (len(RENDER_BUCKETS_MS) + 1)
+                }
+            stats['renders'] += 1
+            stats['ms_sum'] += duration_ms
+            stats['buckets'][bisect_left(RENDER_BUCKETS_MS, duration_ms)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the metrics
+
+        Returns:
+            Dictionary keyed by template name with render count, total and mean time in
+            milliseconds and the histogram, keyed by bucket upper bound ("+Inf" for the last)
+        """
+        bucket_labels = [str(bound) for bound in RENDER_BUCKETS_MS] + ['+Inf']
+        with self._lock:
+            return {
+                name: {
+                    'renders': stats['renders'],
+                    'ms_sum': round(stats['ms_sum'], 3),
+                    'ms_mean': round(stats['ms_sum'] / stats['renders'], 3),
+                    'buckets': dict(zip(bucket_labels, stats['buckets'])),
+                }
+                for name, stats in self._templates.items()
+            }
+
+    def reset(self) -> None:
+        """Clear all recorded renders"""
+        with self._lock:
+            self._templates.clear()
+
+
+_render_metrics = RenderMetrics()
+
+
+def get_render_metrics() -> RenderMetrics:
+    """Get the render metrics shared by all template engines"""
+    return _render_metrics
 
 
 class TemplateEngine:
     """Template engine for rendering Power BI project templates"""
     
-    def __init__(self, template_directory: str):
-        """Initialize template engine with template directory"""
+    def __init__(self, template_directory: str, lazy_context: bool = True):
+        """Initialize template engine with template directory
+        
+        Args:
+            template_directory: Directory containing the templates
+            lazy_context: Only pass the context variables a Jinja2 template references, and
+                build *_json keys only when referenced. False passes every variable and
+                its JSON string, as the engine used to.
+        """
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"Template directory passed to TemplateEngine: {template_directory}")
         
@@ -30,84 +134,39 @@ class TemplateEngine:
             
         self.logger.info(f"Using template directory: {self.template_directory}")
         
-        # Initialize template cache
+        # Compiled templates are shared by all engines through the registry
         self.templates = {}
         self.template_info = {}
-        self.handlebars_compiler = Compiler()
-        
-        # Initialize Jinja2 environment
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.template_directory)),
-            autoescape=False,  # Don't escape HTML by default
-            trim_blocks=True,  # Remove first newline after a block
-            lstrip_blocks=True  # Strip tabs and spaces from the beginning of a line to the start of a block
-        )
-        
-        # Add custom filters
-        self.jinja_env.filters['safe'] = lambda x: x  # 'safe' filter to prevent escaping
+        self.template_variables = {}
+        self.lazy_context = lazy_context
+        self.table_writer = None
+        self.render_metrics = get_render_metrics()
+        self.registry = get_template_registry()
+        self.jinja_env = self.registry.environment(self.template_directory)
         
         # Load all templates
         self._load_templates()
     
     def _load_templates(self):
-        """Load all template files"""
+        """Load all template files, compiling only those not compiled yet in this process"""
         if not self.template_directory.exists():
             raise FileNotFoundError(f"Template directory not found: {self.template_directory}")
         
-        # Define which templates use which engine
-        handlebars_templates = ['table']
-        
-        template_files = {
-            # Model templates
-            'database': {'filename': 'database.tmdl', 'path': 'Model', 'target_filename': 'database.tmdl'},
-            'table': {'filename': 'Table.tmdl', 'path': 'Model/tables', 'target_filename': '{table_name}.tmdl'},
-            'relationship': {'filename': 'relationship.tmdl', 'path': 'Model', 'target_filename': 'relationships.tmdl'},
-            'model': {'filename': 'model.tmdl', 'path': 'Model', 'target_filename': 'model.tmdl'},
-            'culture': {'filename': 'culture.tmdl', 'path': 'Model/cultures', 'target_filename': '{culture_name}.tmdl'},
-            'expressions': {'filename': 'expressions.tmdl', 'path': 'Model', 'target_filename': 'expressions.tmdl'},
-            
-            # Project templates
-            'pbixproj': {'filename': 'pbixproj.json', 'path': '', 'target_filename': '.pbixproj.json'},
-            
-            # Report templates
-            'report': {'filename': 'report.json', 'path': 'Report', 'target_filename': 'report.json'},
-            'report_config': {'filename': 'report.config.json', 'path': 'Report', 'target_filename': 'report.config.json'},  # Legacy name
-            'config': {'filename': 'report.config.json', 'path': 'Report', 'target_filename': 'config.json'},  # New name
-            'report_metadata': {'filename': 'report.metadata.json', 'path': '', 'target_filename': 'ReportMetadata.json'},
-            'report_settings': {'filename': 'report.settings.json', 'path': '', 'target_filename': 'ReportSettings.json'},
-            'report_section': {'filename': 'report.section.json', 'path': 'Report/sections', 'target_filename': '{section_id}.json'},
-            
-            # Slicer visual templates
-            'slicer_visual_container': {'filename': 'slicer.visualContainer.json', 'path': 'Report/sections', 'target_filename': 'visualContainer.json'},
-            'slicer_config': {'filename': 'slicer.config.json', 'path': 'Report/sections', 'target_filename': 'config.json'},
-            'slicer_query': {'filename': 'slicer.query.json', 'path': 'Report/sections', 'target_filename': 'query.json'},
-            'slicer_data_transforms': {'filename': 'slicer.dataTransforms.json', 'path': 'Report/sections', 'target_filename': 'dataTransforms.json'},
-            
-            'diagram_layout': {'filename': 'diagram.layout.json', 'path': '', 'target_filename': 'DiagramLayout.json'},
-            
-            # Metadata templates
-            'version': {'filename': 'version.txt', 'path': '', 'target_filename': 'Version.txt'}
-        }
-        
         # Load each template
-        for template_name, template_info in template_files.items():
-            template_path = self.template_directory / template_info['filename']
-            if not template_path.exists():
-                self.logger.warning(f"Template file not found: {template_path}")
+        for template_name, template_info in TEMPLATE_FILES.items():
+            engine = HANDLEBARS if template_name in HANDLEBARS_TEMPLATES else JINJA
+            compiled = self.registry.get_compiled(self.template_directory, template_info['filename'], engine)
+            if compiled is None:
+                self.logger.warning(f"Template file not found: {self.template_directory / template_info['filename']}")
                 continue
-                
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-                
-            if template_name in handlebars_templates:
-                # Compile handlebars template
-                self.templates[template_name] = self.handlebars_compiler.compile(template_content)
-            else:
-                # Compile Jinja2 template
-                self.templates[template_name] = self.jinja_env.from_string(template_content)
+            self.templates[template_name] = compiled.template
+            self.template_variables[template_name] = compiled.variables
+            if template_name == 'table' and compiled.sha256 == STOCK_TABLE_TEMPLATE_SHA256:
+                # The stock table template has a streaming writer with identical output
+                self.table_writer = write_table_tmdl
                 
         # Store the template info for later use
-        self.template_info = template_files
+        self.template_info = TEMPLATE_FILES
     
     def get_template_info(self, template_name: str) -> Dict[str, Any]:
         """Get information about a template
@@ -134,32 +193,68 @@ class TemplateEngine:
         self.logger.debug(f"Rendering template: {template_name}")
         self.logger.debug(f"Context keys: {list(context.keys())}")
         
-        if template_name == 'table':
-            # Use handlebars for table template
-            result = template(context)
-            return result
-        else:
-            # Use Jinja2 for other templates
+        start = time.perf_counter()
+        try:
+            if template_name == 'table':
+                if self.table_writer is not None:
+                    buffer = io.StringIO()
+                    self.table_writer(context, buffer)
+                    return buffer.getvalue()
+                # Use handlebars for table template
+                return template(context)
+            else:
+                # Use Jinja2 for other templates
+                try:
+                    return self._render_jinja_template(template, context, self.template_variables.get(template_name))
+                except Exception as e:
+                    self.logger.error(f"Error rendering template {template_name}: {e}")
+                    raise
+        finally:
+            self.render_metrics.record(template_name, time.perf_counter() - start)
+    
+    def render_to_file(self, template_name: str, context: Dict[str, Any], path: Union[str, Path]) -> None:
+        """Render a template into a file
+        
+        Table TMDL from the stock template is streamed to the file as it is
+        generated instead of being built as one string first.
+        """
+        if template_name == 'table' and self.table_writer is not None:
+            start = time.perf_counter()
             try:
-                return self._render_jinja_template(template, context)
-            except Exception as e:
-                self.logger.error(f"Error rendering template {template_name}: {e}")
-                raise
+                with open(path, 'w', encoding='utf-8') as f:
+                    self.table_writer(context, f)
+            finally:
+                self.render_metrics.record(template_name, time.perf_counter() - start)
+            return
+        content = self.render(template_name, context)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
     
-    def _render_jinja_template(self, template: Template, context: Dict[str, Any]) -> str:
-        """Render a Jinja2 template with the given context"""
+    def _render_jinja_template(self, template: Template, context: Dict[str, Any],
+                               variables: Optional[frozenset] = None) -> str:
+        """Render a Jinja2 template with the given context
+        
+        Args:
+            template: Compiled Jinja2 template
+            context: Template context
+            variables: Variables the template references; when given (and lazy_context is on),
+                other context values are skipped and *_json keys are only built if referenced
+        """
         try:
             # Process context to ensure JSON serializable values for complex structures
             processed_context = {}
+            lazy = self.lazy_context and variables is not None
             
             # First convert any non-serializable objects to dictionaries
             serializable_context = {}
             for key, value in context.items():
+                if lazy and key not in variables and key + '_json' not in variables:
+                    continue
                 serializable_context[key] = model_to_dict(value)
             
             # Then process for template rendering
             for key, value in serializable_context.items():
-                if isinstance(value, (dict, list)):
+                if isinstance(value, (dict, list)) and (not lazy or key + '_json' in variables):
                     # Convert to JSON string if needed by the template
                     processed_context[key + '_json'] = json.dumps(value, cls=ModelJSONEncoder)
                 processed_context[key] = value
@@ -0,0 +1,198 @@
+"""
+Process-wide registry of compiled templates.
+
+Every TemplateEngine used to read and compile all templates when it was
+created, and one is created per migrator, per project generator and per
+package migration. The registry compiles each template file once per
+process and hands the compiled template to every engine using the same
+template directory. Entries are keyed by file path and validated against
+the file's modification time and size, so an edited template is recompiled
+on the next engine construction.
+
+Jinja2 bytecode can also be written to disk, so new processes skip most of
+the compile work. It is configured with an environment variable:
+    COGNOS_MIGRATOR_TEMPLATE_CACHE_DIR: Directory for Jinja2 bytecode (default: off)
+Compiled handlebars templates cannot be serialized and are only kept in memory.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Tuple, Union
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, meta
+from pybars import Compiler
+
+ENV_TEMPLATE_CACHE_DIR = 'COGNOS_MIGRATOR_TEMPLATE_CACHE_DIR'
+
+HANDLEBARS = 'handlebars'
+JINJA = 'jinja'
+
+# pybars keeps compiler state at class level, so concurrent compiles (e.g. one
+# TemplateEngine per parallel report migration) must be serialized
+_handlebars_compile_lock = threading.Lock()
+
+
+class CompiledTemplate(NamedTuple):
+    """A compiled template and what is known about its source"""
+    template: Any
+    # SHA-256 of the template source
+    sha256: str
+    # Context variables a Jinja2 template references; None for handlebars templates
+    variables: Optional[FrozenSet[str]]
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TemplateRegistry:
+    """Compiled templates shared by all TemplateEngine instances
+
+    Thread-safe. Compiled templates are shared between engines and threads,
+    which is safe because rendering does not modify them.
+    """
+
+    def __init__(self, bytecode_cache_dir: Optional[Union[str, Path]] = None):
+        """Initialize an empty registry
+
+        Args:
+            bytecode_cache_dir: Optional directory where Jinja2 bytecode is cached across processes
+        """
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._templates: Dict[Tuple[Path, str], Tuple[Tuple[int, int], CompiledTemplate]] = {}
+        self._environments: Dict[Path, Environment] = {}
+        self._handlebars_compiler = Compiler()
+        self._bytecode_cache = None
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            self._bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        self.hits = 0
+        self.compiles = 0
+        self.invalidations = 0
+        self.compile_time_s = 0.0
+
+    def environment(self, template_directory: Union[str, Path]) -> Environment:
+        """Get the Jinja2 environment of a template directory, creating it on first use"""
+        directory = Path(os.path.abspath(template_directory))
+        with self._lock:
+            env = self._environments.get(directory)
+            if env is None:
+                env = Environment(
+                    loader=FileSystemLoader(str(directory)),
+                    autoescape=False,  # Don't escape HTML by default
+                    trim_blocks=True,  # Remove first newline after a block
+                    lstrip_blocks=True,  # Strip tabs and spaces from the beginning of a line to the start of a block
+                    bytecode_cache=self._bytecode_cache
+                )
+                # Add custom filters
+                env.filters['safe'] = lambda x: x  # 'safe' filter to prevent escaping
+                self._environments[directory] = env
+            return env
+
+    def get(self, template_directory: Union[str, Path], filename: str, engine: str) -> Optional[Any]:
+        """Get a compiled template, compiling it if it is new or changed on disk
+
+        Args:
+            template_directory: Directory containing the template
+            filename: Template file name relative to the directory
+            engine: HANDLEBARS or JINJA
+
+        Returns:
+            The compiled template, or None if the file does not exist
+        """
+        compiled = self.get_compiled(template_directory, filename, engine)
+        return compiled.template if compiled is not None else None
+
+    def get_compiled(self, template_directory: Union[str, Path], filename: str,
+                     engine: str) -> Optional[CompiledTemplate]:
+        """Like get(), but also returns the source digest and referenced variables"""
+        path = Path(os.path.abspath(template_directory)) / filename
+        stamp = _file_stamp(path)
+        key = (path, engine)
+        with self._lock:
+            if stamp is None:
+                self._templates.pop(key, None)
+                return None
+            entry = self._templates.get(key)
+            if entry is not None:
+                if entry[0] == stamp:
+                    self.hits += 1
+                    return entry[1]
+                self.invalidations += 1
+
+            start = time.perf_counter()
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            if engine == HANDLEBARS:
+                with _handlebars_compile_lock:
+                    template = self._handlebars_compiler.compile(source)
+                variables = None
+            else:
+                env = self.environment(template_directory)
+                # Goes through the bytecode cache, unlike Environment.from_string
+                template = env.loader.load(env, filename, env.make_globals(None))
+                variables = frozenset(meta.find_undeclared_variables(env.parse(source)))
+            compiled = CompiledTemplate(template, hashlib.sha256(source.encode('utf-8')).hexdigest(), variables)
+            self.compile_time_s += time.perf_counter() - start
+            self.compiles += 1
+            self._templates[key] = (stamp, compiled)
+            return compiled
+
+    def invalidate(self, template_directory: Optional[Union[str, Path]] = None) -> int:
+        """Drop compiled templates so they are compiled again on next use
+
+        Args:
+            template_directory: Only drop the templates of this directory; all if None
+
+        Returns:
+            Number of templates dropped
+        """
+        directory = Path(os.path.abspath(template_directory)) if template_directory else None
+        with self._lock:
+            keys = [key for key in self._templates if directory is None or key[0].parent == directory]
+            for key in keys:
+                del self._templates[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache counters
+
+        Returns:
+            Dictionary with hits, compiles, invalidations, total compile time and cached template count
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'compiles': self.compiles,
+                'invalidations': self.invalidations,
+                'compile_ms': round(self.compile_time_s * 1000, 3),
+                'templates': len(self._templates),
+            }
+
+
+_default_registry: Optional[TemplateRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get the process-wide template registry
+
+    Returns:
+        The shared TemplateRegistry, configured by the environment on first use
+    """
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = TemplateRegistry(bytecode_cache_dir=os.environ.get(ENV_TEMPLATE_CACHE_DIR) or None)
+    return _default_registry
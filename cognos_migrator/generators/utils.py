@@ -1,13 +1,15 @@
 """
 Utility functions for generators.
 """
-import json
 import logging
-import xml.dom.minidom as minidom
 import re
+import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, Any, Optional, Union, Tuple
 
+from cognos_migrator.common.artifact_policy import should_write_artifact, write_json_artifact
+from cognos_migrator.common.xml_document import XmlDocument
+
 
 def get_extracted_dir(dir_path: Path) -> Optional[Path]:
     """
@@ -38,9 +40,48 @@ def save_json_to_extracted_dir(extracted_dir: Path, filename: str, data: Dict[st
         filename: Name of the file to save
         data: JSON data to save
     """
-    json_file = extracted_dir / filename
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    write_json_artifact(extracted_dir / filename, data)
+
+
+# Top-level sections of a report specification in its layout and query components
+_LAYOUT_SECTIONS = ('drillBehavior', 'layouts')
+_QUERY_SECTIONS = ('drillBehavior', 'queries', 'parameterList')
+
+
+def save_report_specification_artifacts(specification: Union[str, XmlDocument], extracted_dir: Path) -> XmlDocument:
+    """
+    Save the formatted report specification and its layout and query components.
+    
+    The specification is parsed once and all three files are written from
+    the same tree, unless the artifact policy skips them. The returned
+    document's root can be passed on to the extractors instead of parsing
+    the specification again.
+    
+    Args:
+        specification: Report specification XML, or the already parsed document
+        extracted_dir: Path to the extracted directory
+        
+    Returns:
+        The parsed report specification
+        
+    Raises:
+        ET.ParseError: If the specification is not well-formed XML
+    """
+    logger = logging.getLogger(__name__)
+    
+    document = specification if isinstance(specification, XmlDocument) else XmlDocument.from_string(specification)
+    
+    artifacts = [
+        (document, "report_specification_formatted.xml"),
+        (document.section(_LAYOUT_SECTIONS), "report_layout_specification.xml"),
+        (document.section(_QUERY_SECTIONS), "report_query_specification.xml"),
+    ]
+    for artifact, filename in artifacts:
+        if should_write_artifact(extracted_dir / filename):
+            artifact.write(extracted_dir / filename)
+    
+    logger.info("Saved formatted report specification with its layout and query components")
+    return document
 
 
 def split_report_specification(xml_path: Path) -> Tuple[str, str]:
@@ -58,101 +99,15 @@ def split_report_specification(xml_path: Path) -> Tuple[str, str]:
     try:
         # Read the original XML file
         with open(xml_path, 'r', encoding='utf-8') as f:
-            xml_content = f.read()
-        
-        # Parse the XML content
-        dom = minidom.parseString(xml_content)
-        root = dom.documentElement
-        
-        # Get the namespace if present
-        namespace = ''
-        xmlns = root.getAttribute('xmlns')
-        if xmlns:
-            logger.info(f"Detected XML namespace: {xmlns}")
-            namespace = xmlns
-        
-        # Create new XML documents for layout and query
-        impl = minidom.getDOMImplementation()
-        
-        # Create layout document with the same structure as the original
-        layout_doc = impl.createDocument(namespace, 'report', None)
-        layout_root = layout_doc.documentElement
-        
-        # Copy attributes from original root to layout root
-        for i in range(root.attributes.length):
-            attr = root.attributes.item(i)
-            layout_root.setAttribute(attr.name, attr.value)
-        
-        # Create query document with the same structure as the original
-        query_doc = impl.createDocument(namespace, 'report', None)
-        query_root = query_doc.documentElement
-        
-        # Copy attributes from original root to query root
-        for i in range(root.attributes.length):
-            attr = root.attributes.item(i)
-            query_root.setAttribute(attr.name, attr.value)
-        
-        # Copy comments from original document to both new documents
-        for child in root.childNodes:
-            if child.nodeType == minidom.Node.COMMENT_NODE:
-                layout_root.appendChild(child.cloneNode(True))
-                query_root.appendChild(child.cloneNode(True))
-        
-        # Helper function to clean whitespace nodes
-        def clean_whitespace(node):
-            # Remove text nodes that are just whitespace
-            children_to_remove = []
-            for child in node.childNodes:
-                if child.nodeType == minidom.Node.TEXT_NODE and child.nodeValue.strip() == '':
-                    children_to_remove.append(child)
-                elif child.hasChildNodes():
-                    clean_whitespace(child)
-            
-            for child in children_to_remove:
-                node.removeChild(child)
-        
-        # Copy drillBehavior to both documents (if present)
-        drill_behavior = root.getElementsByTagName('drillBehavior')
-        if drill_behavior and drill_behavior.length > 0:
-            drill_node = drill_behavior[0].cloneNode(True)
-            clean_whitespace(drill_node)
-            layout_root.appendChild(drill_node)
-            query_root.appendChild(drill_node.cloneNode(True))
-        
-        # Copy layouts section to layout document
-        layouts = root.getElementsByTagName('layouts')
-        if layouts and layouts.length > 0:
-            layouts_node = layouts[0].cloneNode(True)
-            clean_whitespace(layouts_node)
-            layout_root.appendChild(layouts_node)
-        
-        # Copy queries section to query document
-        queries = root.getElementsByTagName('queries')
-        if queries and queries.length > 0:
-            queries_node = queries[0].cloneNode(True)
-            clean_whitespace(queries_node)
-            query_root.appendChild(queries_node)
-        
-        # Copy parameterList to query document (if present)
-        param_list = root.getElementsByTagName('parameterList')
-        if param_list and param_list.length > 0:
-            param_node = param_list[0].cloneNode(True)
-            clean_whitespace(param_node)
-            query_root.appendChild(param_node)
-        
-        # Generate XML strings
-        layout_xml = layout_doc.toprettyxml(indent='  ')
-        query_xml = query_doc.toprettyxml(indent='  ')
+            document = XmlDocument.from_string(f.read())
         
-        return layout_xml, query_xml
+        return document.section(_LAYOUT_SECTIONS).to_string(), document.section(_QUERY_SECTIONS).to_string()
         
     except Exception as e:
         logger.error(f"Error splitting report specification: {e}")
         # Return empty documents in case of error
-        impl = minidom.getDOMImplementation()
-        layout_doc = impl.createDocument(None, 'report', None)
-        query_doc = impl.createDocument(None, 'report', None)
-        return layout_doc.toprettyxml(indent='  '), query_doc.toprettyxml(indent='  ')
+        empty = XmlDocument(ET.Element('report')).to_string()
+        return empty, empty
 
 
 def save_split_report_specification(xml_path: Path, extracted_dir: Path) -> None:
@@ -0,0 +1,265 @@
+"""
+Pooled HTTP transport for the LLM / DAX API.
+
+Every call to the DAX API used to go through module-level requests.post,
+which opens a new connection per request. This module provides one shared
+transport with per-host connection pooling and keep-alive, retries with
+jittered exponential backoff, default timeouts, and request counters and
+latency histograms for monitoring.
+
+The default transport is configured with environment variables:
+    COGNOS_MIGRATOR_HTTP_POOL_SIZE: Connections kept per host (default: 16)
+    COGNOS_MIGRATOR_HTTP_RETRIES: Retries after a failed request (default: 2)
+    COGNOS_MIGRATOR_HTTP_TIMEOUT: Default request timeout in seconds (default: 30)
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cognos_migrator.common.tracing import count_http_request
+
+# Environment variables for transport configuration
+ENV_HTTP_POOL_SIZE = 'COGNOS_MIGRATOR_HTTP_POOL_SIZE'
+ENV_HTTP_RETRIES = 'COGNOS_MIGRATOR_HTTP_RETRIES'
+ENV_HTTP_TIMEOUT = 'COGNOS_MIGRATOR_HTTP_TIMEOUT'
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_RETRIES = 2
+DEFAULT_TIMEOUT = 30
+
+# Upper bounds of the latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Responses worth retrying: the service is restarting or overloaded
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Methods retried after a read timeout. A timed out POST may still be running
+# on the service (e.g. a slow M-query generation), so sending it again would
+# only repeat the work; other methods are retried only when the request never
+# reached the service.
+READ_TIMEOUT_RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class TransportMetrics:
+    """Thread-safe request counters and latency histograms per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, endpoint: str, status: Optional[int], latency_s: float, retries: int) -> None:
+        """Record one finished request, including its retries
+
+        Args:
+            endpoint: Endpoint label, e.g. "POST /api/dax/convert"
+            status: Final HTTP status code, or None if no response was received
+            latency_s: Total time spent on the request, including retries
+            retries: Number of retries that were needed
+        """
+        latency_ms = latency_s * 1000
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    'requests': 0, 'errors': 0, 'retries': 0, 'status_codes': {},
+                    'latency_ms_sum': 0.0, 'latency_buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                }
+            stats['requests'] += 1
+            stats['retries'] += retries
+            if status is None or status >= 400:
+                stats['errors'] += 1
+            status_key = str(status) if status is not None else 'connection_error'
+            stats['status_codes'][status_key] = stats['status_codes'].get(status_key, 0) + 1
+            stats['latency_ms_sum'] += latency_ms
+            stats['latency_buckets'][bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the metrics
+
+        Returns:
+            Dictionary with totals and per-endpoint counters and latency histograms.
+            Histogram buckets are keyed by their upper bound in milliseconds ("+Inf" for the last).
+        """
+        bucket_labels = [str(bound) for bound in LATENCY_BUCKETS_MS] + ['+Inf']
+        endpoints = {}
+        totals = {'requests': 0, 'errors': 0, 'retries': 0}
+        with self._lock:
+            for endpoint, stats in self._endpoints.items():
+                endpoints[endpoint] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'status_codes': dict(stats['status_codes']),
+                    'latency_ms': {
+                        'sum': round(stats['latency_ms_sum'], 3),
+                        'mean': round(stats['latency_ms_sum'] / stats['requests'], 3),
+                        'buckets': dict(zip(bucket_labels, stats['latency_buckets'])),
+                    },
+                }
+                for name in totals:
+                    totals[name] += stats[name]
+        return {**totals, 'endpoints': endpoints}
+
+    def reset(self) -> None:
+        """Clear all counters"""
+        with self._lock:
+            self._endpoints.clear()
+
+
+class HTTPTransport:
+    """Shared HTTP client with connection pooling, retries and metrics
+
+    Has the same post/get call signature as requests, so it can be used
+    wherever requests.post or a requests.Session was used before.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, backoff_factor: float = 0.1,
+                 backoff_max: float = 2.0, logger=None):
+        """Initialize the transport
+
+        Args:
+            pool_size: Maximum number of kept-alive connections per host
+            max_retries: Retries after a connection error, retryable status or, for GET,
+                a read timeout
+            timeout: Default request timeout in seconds
+            backoff_factor: Base delay in seconds; retry n waits up to backoff_factor * 2**n
+            backoff_max: Maximum delay between retries in seconds
+            logger: Optional logger instance
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.logger = logger or logging.getLogger(__name__)
+        self.metrics = TransportMetrics()
+
+        self._session: Optional[requests.Session] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled session, recreated in a forked child process"""
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    session = requests.Session()
+                    # Retries are handled by request() so they can be jittered and counted
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                          max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                    self._pid = os.getpid()
+        return self._session
+
+    def backoff_delay(self, retry: int) -> float:
+        """Get the delay before a retry, using full jitter
+
+        Args:
+            retry: Zero-based retry number
+
+        Returns:
+            Delay in seconds, random between 0 and the capped exponential backoff
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** retry)))
+
+    def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """Send a request over the pooled session
+
+        Args:
+            method: HTTP method
+            url: Full URL
+            retries: Retries for this request, defaults to max_retries
+            **kwargs: Further arguments for requests (headers, json, timeout, ...)
+
+        Returns:
+            The final response; a retryable status is returned once retries are exhausted
+
+        Raises:
+            requests.exceptions.RequestException: If no response was received after all retries
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        retries = self.max_retries if retries is None else retries
+        endpoint = f"{method.upper()} {urlsplit(url).path or '/'}"
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # ConnectTimeout is a ConnectionError: the request was never sent
+                retryable = (isinstance(e, requests.exceptions.ConnectionError)
+                             or method.upper() in READ_TIMEOUT_RETRY_METHODS)
+                if not retryable or attempt >= retries:
+                    self.metrics.record(endpoint, None, time.perf_counter() - start, attempt)
+                    count_http_request('llm', None, attempt)
+                    raise
+                self.logger.debug(f"{endpoint} failed ({e}), retry {attempt + 1}/{retries}")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                    self.metrics.record(endpoint, response.status_code, time.perf_counter() - start, attempt)
+                    count_http_request('llm', response, attempt)
+                    return response
+                self.logger.debug(f"{endpoint} returned {response.status_code}, retry {attempt + 1}/{retries}")
+                response.close()
+
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request, see request()"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request, see request()"""
+        return self.request('POST', url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            if self._session is not None and self._pid == os.getpid():
+                self._session.close()
+            self._session = None
+
+
+_default_transport: Optional[HTTPTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def _env_number(name: str, default, cast=int):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        logging.getLogger(__name__).warning(f"Invalid value for {name}, using {default}")
+        return default
+
+
+def get_transport() -> HTTPTransport:
+    """Get the process-wide transport used for all LLM / DAX API traffic
+
+    Returns:
+        The shared HTTPTransport, configured by the environment on first use
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = HTTPTransport(
+                    pool_size=_env_number(ENV_HTTP_POOL_SIZE, DEFAULT_POOL_SIZE),
+                    max_retries=_env_number(ENV_HTTP_RETRIES, DEFAULT_RETRIES),
+                    timeout=_env_number(ENV_HTTP_TIMEOUT, DEFAULT_TIMEOUT, float),
+                )
+    return _default_transport
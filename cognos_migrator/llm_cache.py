@@ -0,0 +1,372 @@
+"""
+Persistent cache for LLM service responses.
+
+The M-query converters and the LLM service client call the DAX API for every
+table on every run, even when the table name, columns and source SQL are
+identical to a previous migration. This module keeps successful responses in
+a SQLite database keyed by a stable hash of the service (scheme, host and
+port) and the normalized request, with a size cap, an age limit and
+least-recently-used eviction, so repeat migrations make no network calls for
+unchanged tables. The key does not depend on any state of the process, such
+as whether a health check has run; responses of an upgraded service are
+retired by the age limit, or at once by bumping CACHE_FORMAT_VERSION.
+
+The default cache is configured with environment variables:
+    COGNOS_MIGRATOR_LLM_CACHE: Path of the cache database, or "off" to disable
+        (default: ~/.cache/cognos_migrator/llm_cache.sqlite)
+    COGNOS_MIGRATOR_LLM_CACHE_MAX_MB: Maximum size of the cached responses (default: 256)
+    COGNOS_MIGRATOR_LLM_CACHE_TTL_HOURS: Hours a response is reused, 0 for no limit (default: 168)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+from urllib.parse import urlsplit
+
+from cognos_migrator.http_transport import HTTPTransport, get_transport
+
+# Environment variables for cache control
+ENV_LLM_CACHE_PATH = 'COGNOS_MIGRATOR_LLM_CACHE'
+ENV_LLM_CACHE_MAX_MB = 'COGNOS_MIGRATOR_LLM_CACHE_MAX_MB'
+ENV_LLM_CACHE_TTL_HOURS = 'COGNOS_MIGRATOR_LLM_CACHE_TTL_HOURS'
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'cognos_migrator' / 'llm_cache.sqlite'
+DEFAULT_MAX_MB = 256
+DEFAULT_TTL_HOURS = 168
+
+# Bump when the key derivation or stored format changes
+CACHE_FORMAT_VERSION = 3
+
+_DISABLED_VALUES = {'', '0', 'off', 'false', 'no', 'none', 'disabled'}
+_OBJECT_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+class CachedResponse:
+    """Response returned for a cache hit, mirroring the parts of requests.Response in use"""
+
+    status_code = 200
+    from_cache = True
+
+    def __init__(self, data: Any):
+        self._data = data
+
+    def json(self) -> Any:
+        return self._data
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize a request payload so equivalent requests hash the same.
+
+    Line endings and trailing whitespace are unified, and object addresses
+    from default reprs (which change on every run) are removed.
+    """
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        value = _OBJECT_ADDRESS.sub('', value.replace('\r\n', '\n'))
+        return '\n'.join(line.rstrip() for line in value.split('\n')).strip()
+    return value
+
+
+def _service_origin(url: str) -> str:
+    """Scheme, host and port of the service a URL points to"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    port = port or {'http': 80, 'https': 443}.get(scheme)
+    return f"{scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+def is_successful_result(endpoint: str, data: Any) -> bool:
+    """Check whether a response body is a successful result worth caching
+
+    A 200 response can still carry an error document or an empty result, which
+    must not be replayed on later runs.
+
+    Args:
+        endpoint: API endpoint path, e.g. /api/mquery/validate
+        data: Parsed JSON response body
+    """
+    if not isinstance(data, dict) or data.get('error') or str(data.get('status', '')).lower() in ('error', 'failed'):
+        return False
+    if endpoint.endswith('/api/mquery/validate'):
+        return isinstance(data.get('is_valid'), bool)
+    if '/api/mquery/' in endpoint:
+        return isinstance(data.get('m_query'), str) and bool(data['m_query'].strip())
+    if endpoint.endswith('/api/dax/convert'):
+        return isinstance(data.get('dax_expression'), str) and bool(data['dax_expression'].strip())
+    return False
+
+
+class LLMResponseCache:
+    """SQLite-backed LRU cache of LLM service responses
+
+    Safe to share between threads and processes: access is serialized with a
+    lock and SQLite handles concurrent processes. Only HTTP 200 responses whose
+    body is a successful result (see is_successful_result) are stored.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+                 max_entries: Optional[int] = None, max_age: Optional[float] = DEFAULT_TTL_HOURS * 3600,
+                 logger=None):
+        """Open or create a cache database
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Maximum total size of the cached responses
+            max_entries: Optional maximum number of cached responses
+            max_age: Seconds a response is reused after it was stored, None for no limit
+            logger: Optional logger instance
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the database connection, reopening it in a forked child process"""
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, value TEXT NOT NULL,'
+            ' size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)')
+        connection.execute('CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def make_key(endpoint: str, payload: Any, service: str = '') -> str:
+        """Build the cache key for a request
+
+        Args:
+            endpoint: API endpoint path, e.g. /api/mquery/validate
+            payload: JSON request payload
+            service: Scheme, host and port of the service, e.g. http://localhost:8080
+
+        Returns:
+            Hex digest identifying the normalized request
+        """
+        material = json.dumps(
+            {'version': CACHE_FORMAT_VERSION, 'service': service, 'endpoint': endpoint,
+             'payload': _normalize(payload)},
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached response and mark it as recently used
+
+        Returns:
+            The cached response data, or None on a miss or for an expired response
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute('SELECT value, created_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.max_age is not None and now - row[1] > self.max_age:
+                connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                self._bump_stat(connection, 'misses')
+                return None
+            connection.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            self._bump_stat(connection, 'hits')
+        return json.loads(row[0])
+
+    def put(self, key: str, endpoint: str, value: Any) -> None:
+        """Store a response and evict least recently used entries beyond the size cap"""
+        serialized = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, endpoint, value, size, created_at, last_access)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (key, endpoint, serialized, len(serialized), now, now)
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Remove least recently used entries until the cache is within its limits"""
+        count, total = connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        evicted = 0
+        if total > self.max_bytes or (self.max_entries is not None and count > self.max_entries):
+            for key, size in connection.execute(
+                    'SELECT key, size FROM responses ORDER BY last_access ASC').fetchall():
+                if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+                    break
+                connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+                total -= size
+                count -= 1
+                evicted += 1
+        if evicted:
+            self.evictions += evicted
+            self._bump_stat(connection, 'evictions', evicted)
+            self.logger.debug(f"Evicted {evicted} LLM cache entries")
+
+    def _bump_stat(self, connection: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        connection.execute(
+            'INSERT INTO stats (name, value) VALUES (?, ?)'
+            ' ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+            (name, amount)
+        )
+
+    def post(self, url: str, json: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+             timeout: int = 30, transport: Optional[HTTPTransport] = None):
+        """POST a JSON request, answering it from the cache when possible
+
+        Args:
+            url: Full URL of the API endpoint
+            json: JSON request payload
+            headers: Optional request headers
+            timeout: Request timeout in seconds
+            transport: Transport to send the request with, defaults to the shared transport
+
+        Returns:
+            A CachedResponse on a hit, otherwise the requests.Response
+        """
+        endpoint = urlsplit(url).path
+        key = self.make_key(endpoint, json, _service_origin(url))
+        try:
+            cached = self.get(key)
+        except sqlite3.Error as e:
+            self.logger.warning(f"LLM cache lookup failed, calling the service: {e}")
+            cached = None
+        if cached is not None:
+            self.logger.info(f"LLM cache hit for {endpoint}")
+            return CachedResponse(cached)
+
+        response = (transport or get_transport()).post(url, headers=headers, json=json, timeout=timeout)
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                if is_successful_result(endpoint, data):
+                    self.put(key, endpoint, data)
+                else:
+                    self.logger.debug(f"Not caching unsuccessful LLM response for {endpoint}")
+            except (ValueError, sqlite3.Error) as e:
+                self.logger.warning(f"Could not cache LLM response for {endpoint}: {e}")
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics
+
+        Returns:
+            Dictionary with this process's hits, misses and evictions, the
+            lifetime counters stored in the database, and the current size
+        """
+        with self._lock:
+            connection = self._connect()
+            count, total = connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            lifetime = dict(connection.execute('SELECT name, value FROM stats').fetchall())
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': count,
+            'size_bytes': total,
+            'lifetime': {name: lifetime.get(name, 0) for name in ('hits', 'misses', 'evictions')},
+        }
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            self._connect().execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide LLM response cache
+
+    Returns:
+        The cache configured by the environment, or None when caching is disabled
+    """
+    global _default_cache
+    configured = os.environ.get(ENV_LLM_CACHE_PATH)
+    if configured is not None and configured.strip().lower() in _DISABLED_VALUES:
+        return None
+
+    path = Path(configured).expanduser() if configured else DEFAULT_CACHE_PATH
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != path:
+            try:
+                max_mb = int(os.environ.get(ENV_LLM_CACHE_MAX_MB, DEFAULT_MAX_MB))
+            except ValueError:
+                max_mb = DEFAULT_MAX_MB
+            try:
+                ttl_hours = float(os.environ.get(ENV_LLM_CACHE_TTL_HOURS, DEFAULT_TTL_HOURS))
+            except ValueError:
+                ttl_hours = DEFAULT_TTL_HOURS
+            _default_cache = LLMResponseCache(path, max_bytes=max_mb * 1024 * 1024,
+                                              max_age=ttl_hours * 3600 if ttl_hours > 0 else None)
+        return _default_cache
+
+
+def post_llm_request(url: str, headers: Optional[Dict[str, str]] = None, json: Optional[Dict[str, Any]] = None,
+                     timeout: int = 30, cache: Optional[LLMResponseCache] = None,
+                     transport: Optional[HTTPTransport] = None):
+    """POST a request to the LLM service through the cache when one is available
+
+    Takes the same arguments as requests.post. Requests that reach the
+    network use the pooled HTTP transport.
+
+    Args:
+        url: Full URL of the API endpoint
+        headers: Optional request headers
+        json: JSON request payload
+        timeout: Request timeout in seconds
+        cache: Cache to use; None sends the request directly
+        transport: Transport to send the request with, defaults to the shared transport
+
+    Returns:
+        A CachedResponse on a cache hit, otherwise the requests.Response
+    """
+    if cache is not None:
+        return cache.post(url, json=json, headers=headers, timeout=timeout, transport=transport)
+    return (transport or get_transport()).post(url, headers=headers, json=json, timeout=timeout)
@@ -5,10 +5,15 @@ LLM Service Client for M-Query Generation
 import json
 import logging
 import os
+import threading
+import time
 import requests
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
+from cognos_migrator.http_transport import HTTPTransport, get_transport
+from cognos_migrator.llm_cache import LLMResponseCache, get_llm_cache, post_llm_request
+
 
 @dataclass
 class ColumnInfo:
@@ -46,40 +51,115 @@ class TableRelationship:
     join_type: str  # "LeftOuter", "Inner", etc.
 
 
+class _HealthRequest:
+    """A health request in flight, whose result concurrent checks wait for"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Dict[str, Any] = {"status": "unhealthy", "message": "Health check did not complete"}
+
+
 class LLMServiceClient:
     """Client for communicating with the LLM FastAPI service"""
     
-    def __init__(self, base_url = None, api_key: Optional[str] = None):
+    # Seconds a health check result is reused before the service is asked again
+    HEALTH_CHECK_TTL = 60.0
+    # Seconds an unhealthy result is reused, so a service that comes back is noticed quickly
+    UNHEALTHY_CHECK_TTL = 5.0
+    
+    # Health check results by service URL, shared by every client in the process
+    # so each report migration does not re-check the same service
+    _health_by_url: Dict[str, Any] = {}
+    # Health requests in flight by service URL; concurrent checks wait for them
+    _health_requests: Dict[str, '_HealthRequest'] = {}
+    _health_lock = threading.Lock()
+    
+    def __init__(self, base_url = None, api_key: Optional[str] = None,
+                 cache: Optional[LLMResponseCache] = None, health_ttl: Optional[float] = None,
+                 transport: Optional[HTTPTransport] = None):
         """
         Initialize the LLM service client
         
         Args:
             base_url: Base URL of the FastAPI service, defaults to http://localhost:8080
             api_key: Optional API key for authentication (not needed in Docker network)
+            cache: Optional response cache, defaults to the cache configured by the environment
+            health_ttl: Seconds to reuse a health check result, defaults to HEALTH_CHECK_TTL
+            transport: Optional HTTP transport, defaults to the shared pooled transport
         """
         if not base_url:
             base_url = os.environ.get('DAX_API_URL', 'http://localhost:8080')
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.health_ttl = self.HEALTH_CHECK_TTL if health_ttl is None else health_ttl
+        
+        # Keep-alive connections shared by all clients and converters in the process
+        self.transport = transport or get_transport()
         
-    def check_health(self) -> Dict[str, Any]:
+        
+    def check_health(self, force: bool = False) -> Dict[str, Any]:
         """
         Check if the LLM service is healthy
         
+        A healthy result is reused for health_ttl seconds, so converting many
+        expressions costs one health request instead of one per expression.
+        An unhealthy result is reused for at most UNHEALTHY_CHECK_TTL seconds.
+        Only one request per service is in flight at a time: concurrent
+        checks wait for it and share its result, without holding the lock
+        while the service is asked.
+        
+        Args:
+            force: Ask the service even if a recent result is available
+        
         Returns:
             Dictionary with health status information
         """
+        with self._health_lock:
+            cached = self._health_by_url.get(self.base_url)
+            if not force and cached is not None and time.monotonic() - cached[0] < self._health_ttl_for(cached[1]):
+                return cached[1]
+            request = self._health_requests.get(self.base_url)
+            if request is None:
+                request = self._health_requests[self.base_url] = _HealthRequest()
+                owner = True
+            else:
+                owner = False
+        
+        if not owner:
+            request.done.wait()
+            return request.result
+        
+        try:
+            request.result = self._request_health()
+        finally:
+            with self._health_lock:
+                self._health_by_url[self.base_url] = (time.monotonic(), request.result)
+                del self._health_requests[self.base_url]
+            request.done.set()
+        return request.result
+    
+    def _health_ttl_for(self, health: Dict[str, Any]) -> float:
+        """Seconds a health check result is reused"""
+        if isinstance(health, dict) and health.get("status") == "healthy":
+            return self.health_ttl
+        return min(self.health_ttl, self.UNHEALTHY_CHECK_TTL)
+    
+    def _request_health(self) -> Dict[str, Any]:
+        """Ask the service for its health status"""
         try:
             headers = {}
             if self.api_key:
                 headers['Authorization'] = f'Bearer {self.api_key}'
                 
             # Try the health endpoint
-            response = requests.get(
+            # No retries: an unavailable service should be reported quickly
+            response = self.transport.get(
                 f'{self.base_url}/health',
                 headers=headers,
-                timeout=10  # 10 second timeout
+                timeout=10,  # 10 second timeout
+                retries=0
             )
             
             if response.status_code == 200:
@@ -274,11 +354,13 @@ class LLMServiceClient:
         try:
             # Try the enhanced endpoint first for comprehensive analytics
             self.logger.info(f"Calling enhanced M-query endpoint for analytics and monitoring (table: {table_name})")
-            response = requests.post(
+            response = post_llm_request(
                 f'{self.base_url}/api/mquery/complete',
                 headers=headers,
                 json=payload,
-                timeout=30  # Optimized timeout for analytics calls
+                timeout=30,  # Optimized timeout for analytics calls
+                cache=self.cache,
+                transport=self.transport
             )
             
             if response.status_code == 200:
@@ -298,11 +380,13 @@ class LLMServiceClient:
             else:
                 # Try basic endpoint as fallback for analytics
                 self.logger.info(f"Enhanced endpoint unavailable, using basic endpoint for analytics (table: {table_name})")
-                response = requests.post(
+                response = post_llm_request(
                     f'{self.base_url}/api/mquery/generate',
                     headers=headers,
                     json=payload,
-                    timeout=30
+                    timeout=30,
+                    cache=self.cache,
+                    transport=self.transport
                 )
                 if response.status_code == 200:
                     self.logger.info(f"Basic M-query API call successful for table {table_name}")
@@ -319,11 +403,13 @@ class LLMServiceClient:
             }
             
             self.logger.info(f"Calling validation API for quality assurance (table: {table_name})")
-            response = requests.post(
+            response = post_llm_request(
                 f'{self.base_url}/api/mquery/validate',
                 headers={'Content-Type': 'application/json'},
                 json=validation_payload,
-                timeout=30
+                timeout=30,
+                cache=self.cache,
+                transport=self.transport
             )
             
             if response.status_code == 200:
@@ -9,17 +9,22 @@ import logging
 import os
 import uuid
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from datetime import datetime
 
 from cognos_migrator.config import MigrationConfig, CognosConfig
 from cognos_migrator.common.logging import configure_logging, log_info, log_warning, log_error, log_debug
 from cognos_migrator.client import CognosClient, CognosAPIError
 from cognos_migrator.common.websocket_client import logging_helper, set_task_info
+from cognos_migrator.common.tracing import span, traced_migration
 from ..consolidation import consolidate_model_tables
 from ..models import PowerBIProject
 
+if TYPE_CHECKING:
+    from cognos_migrator.runtime import MigrationRuntime
 
+
+@traced_migration('module_migration')
 def migrate_module_with_explicit_session(module_id: str,
                                        output_path: str,
                                        cognos_url: str, session_key: str,
@@ -27,11 +32,12 @@ def migrate_module_with_explicit_session(module_id: str,
                                        cpf_file_path: str = None,
                                        task_id: Optional[str] = None,
                                        auth_key: str = "IBM-BA-Authorization",
-                                       settings: Optional[Dict[str, Any]] = None) -> bool:
+                                       settings: Optional[Dict[str, Any]] = None,
+                                       runtime: Optional['MigrationRuntime'] = None) -> bool:
     """Migrate a Cognos module with explicit session credentials
     
     This function does not use environment variables and will raise an exception
-    if the session key is expired.
+    if the session key is expired. Step timings are written to timings.json in output_path.
     
     Args:
         module_id: ID of the Cognos module to migrate
@@ -43,6 +49,8 @@ def migrate_module_with_explicit_session(module_id: str,
         task_id: Optional task ID for tracking (default: auto-generated)
         auth_key: The authentication header key (default: IBM-BA-Authorization)
         settings: Optional settings dictionary to override default settings.json
+        runtime: Optional long-lived MigrationRuntime whose logging, verified session and
+            migrator are reused; its own CPF file and settings apply
         
     Returns:
         bool: True if migration was successful, False otherwise
@@ -51,7 +59,8 @@ def migrate_module_with_explicit_session(module_id: str,
         CognosAPIError: If session is expired or invalid
     """
     # Configure logging for this module
-    configure_logging("cognos_module_migration")
+    if runtime is None:
+        configure_logging("cognos_module_migration")
     
     # Generate task_id if not provided
     if task_id is None:
@@ -60,9 +69,21 @@ def migrate_module_with_explicit_session(module_id: str,
     # Initialize WebSocket logging with task ID and total steps (12 steps in the migration process)
     set_task_info(task_id, total_steps=12)
     
+    if runtime is not None:
+        runtime.verify_session()
+        log_info(f"Starting explicit session migration for module: {module_id}")
+        logging_helper(
+            message=f"Starting explicit session migration for module: {module_id}",
+            progress=0,
+            message_type="info"
+        )
+        return _run_module_migration(runtime.migrator, module_id, output_path, folder_id, cpf_file_path)
+    
     # First verify the session is valid
     log_info(f"Testing connection to Cognos at {cognos_url}")
-    if not CognosClient.test_connection_with_session(cognos_url, session_key):
+    with span('verify_session'):
+        session_valid = CognosClient.test_connection_with_session(cognos_url, session_key)
+    if not session_valid:
         log_error("Session key is expired or invalid")
         raise CognosAPIError("Session key is expired or invalid")
     
@@ -104,16 +125,23 @@ def migrate_module_with_explicit_session(module_id: str,
     
     from ..migrator import CognosModuleMigratorExplicit
     
-    migrator = CognosModuleMigratorExplicit(
-        migration_config=migration_config,
-        cognos_config=cognos_config,
-        cognos_url=cognos_url,
-        session_key=session_key,
-        logger=logger,
-        cpf_file_path=cpf_file_path,
-        settings=settings
-    )
+    with span('setup'):
+        migrator = CognosModuleMigratorExplicit(
+            migration_config=migration_config,
+            cognos_config=cognos_config,
+            cognos_url=cognos_url,
+            session_key=session_key,
+            logger=logger,
+            cpf_file_path=cpf_file_path,
+            settings=settings
+        )
     
+    return _run_module_migration(migrator, module_id, output_path, folder_id, cpf_file_path)
+
+
+def _run_module_migration(migrator, module_id: str, output_path: str, folder_id: Optional[str],
+                          cpf_file_path: Optional[str]) -> bool:
+    """Migrate a module with an initialized migrator and report the outcome"""
     log_info("Migrator initialized successfully")
     
     # Also send to WebSocket for frontend updates
@@ -148,6 +176,7 @@ def migrate_module_with_explicit_session(module_id: str,
     return result
 
 
+@traced_migration('module_migration')
 def migrate_module_with_reports_explicit_session(module_id: str,
                                        output_path: str,
                                        cognos_url: str, session_key: str,
@@ -189,7 +218,9 @@ def migrate_module_with_reports_explicit_session(module_id: str,
     
     # First verify the session is valid
     log_info(f"Testing connection to Cognos at {cognos_url}")
-    if not CognosClient.test_connection_with_session(cognos_url, session_key):
+    with span('verify_session'):
+        session_valid = CognosClient.test_connection_with_session(cognos_url, session_key)
+    if not session_valid:
         log_error("Session key is expired or invalid")
         raise CognosAPIError("Session key is expired or invalid")
     
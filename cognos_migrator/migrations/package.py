@@ -11,7 +11,7 @@ import re
 import shutil
 import uuid
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Set, Tuple, Union
 from collections import defaultdict
 from datetime import datetime
 import shutil
@@ -20,6 +20,11 @@ from cognos_migrator.config import MigrationConfig, CognosConfig
 from cognos_migrator.common.logging import configure_logging, log_info, log_warning, log_error, log_debug
 from cognos_migrator.client import CognosClient, CognosAPIError
 from cognos_migrator.common.websocket_client import logging_helper, set_task_info
+from cognos_migrator.common.parallel import run_ordered, resolve_max_workers
+from cognos_migrator.common.artifact_store import artifact_scope, glob_json, load_json, save_json
+from cognos_migrator.common.artifact_policy import artifact_policy_from, write_json_artifact
+from cognos_migrator.common.tracing import add_count, span, traced_migration
+from cognos_migrator.common.incremental import MigrationManifest
 from cognos_migrator.extractors.packages import PackageExtractor, ConsolidatedPackageExtractor
 from cognos_migrator.extractors.packages.sql_relationship_extractor import SQLRelationshipExtractor
 from ..models import PowerBIProject, DataModel, Report, ReportPage, Table
@@ -27,11 +32,15 @@ from ..generators import PowerBIProjectGenerator
 from ..extractors.packages import ConsolidatedPackageExtractor
 from .report import migrate_single_report_with_explicit_session
 from ..consolidation import consolidate_model_tables
-from .report import migrate_single_report
-from ..migrator import CognosModuleMigratorExplicit
 from ..converters.consolidated_mquery_converter import ConsolidatedMQueryConverter
 
+if TYPE_CHECKING:
+    from cognos_migrator.runtime import MigrationRuntime
 
+
+@traced_migration('package_migration')
+@artifact_policy_from('settings')
+@artifact_scope()
 def migrate_package_with_explicit_session(package_file_path: str,
                                           output_path: str,
                                           cognos_url: str, session_key: str,
@@ -39,11 +48,12 @@ def migrate_package_with_explicit_session(package_file_path: str,
                                           cpf_file_path: str = None,
                                           task_id: Optional[str] = None,
                                           auth_key: str = "IBM-BA-Authorization",
-                                          settings: Optional[Dict[str, Any]] = None) -> bool:
+                                          settings: Optional[Dict[str, Any]] = None,
+                                          runtime: Optional['MigrationRuntime'] = None) -> bool:
     """Migrate a Cognos Framework Manager package file to Power BI with explicit session credentials
     
     This function does not use environment variables and will raise an exception
-    if the session key is expired.
+    if the session key is expired. Step timings are written to timings.json in output_path.
     
     Args:
         package_file_path: Path to the FM package file
@@ -54,6 +64,8 @@ def migrate_package_with_explicit_session(package_file_path: str,
         cpf_file_path: Optional path to CPF file for enhanced metadata
         task_id: Optional task ID for tracking (default: auto-generated)
         auth_key: The authentication header key (default: IBM-BA-Authorization)
+        runtime: Optional long-lived MigrationRuntime whose logging configuration,
+            loaded templates and LLM client are reused
         
     Returns:
         bool: True if migration was successful, False otherwise
@@ -66,7 +78,8 @@ def migrate_package_with_explicit_session(package_file_path: str,
         task_id = str(uuid.uuid4())
 
     # Configure logging
-    configure_logging()
+    if runtime is None:
+        configure_logging()
 
     # Set task info for WebSocket updates
     set_task_info(task_id, total_steps=8)
@@ -114,14 +127,15 @@ def migrate_package_with_explicit_session(package_file_path: str,
         )
 
         # Create package extractor using the new modular architecture
-        package_extractor = ConsolidatedPackageExtractor(logger=logging.getLogger(__name__))
+        package_extractor = ConsolidatedPackageExtractor(config=load_settings(settings),
+                                                         logger=logging.getLogger(__name__))
 
         # Extract package information
-        package_info = package_extractor.extract_package(package_file_path, str(extracted_dir))
+        with span('extract'):
+            package_info = package_extractor.extract_package(package_file_path, str(extracted_dir))
 
         # Save extracted information
-        with open(extracted_dir / "package_info.json", 'w', encoding='utf-8') as f:
-            json.dump(package_info, f, indent=2)
+        write_json_artifact(extracted_dir / "package_info.json", package_info)
 
         log_info(f"Extracted package information: {package_info['name']}")
 
@@ -133,10 +147,11 @@ def migrate_package_with_explicit_session(package_file_path: str,
         )
 
         # Convert to data model
-        data_model = package_extractor.convert_to_data_model(package_info)
+        with span('convert'):
+            data_model = package_extractor.convert_to_data_model(package_info)
 
-        # Consolidate tables if needed
-        consolidate_model_tables(str(extracted_dir))
+            # Consolidate tables if needed
+            consolidate_model_tables(str(extracted_dir))
 
         log_info(f"Converted to data model with {len(data_model.tables)} tables")
 
@@ -177,12 +192,19 @@ def migrate_package_with_explicit_session(package_file_path: str,
 
         # Create generator
         # Initialize with config instead of logger
-        config = MigrationConfig(
-            template_directory=str(Path(__file__).parent.parent / 'templates'),
-            llm_service_url=os.environ.get('DAX_API_URL', 'http://localhost:8080'),  # Enable DAX service
-            llm_service_enabled=True
-        )
-        generator = PowerBIProjectGenerator(config=config)
+        if runtime is not None:
+            config = runtime.migration_config
+            template_engine = runtime.template_engine
+            generator = PowerBIProjectGenerator(config=config, template_engine=template_engine,
+                                                llm_service=runtime.llm_service_client)
+        else:
+            config = MigrationConfig(
+                template_directory=str(Path(__file__).parent.parent / 'templates'),
+                llm_service_url=os.environ.get('DAX_API_URL', 'http://localhost:8080'),  # Enable DAX service
+                llm_service_enabled=True
+            )
+            generator = PowerBIProjectGenerator(config=config)
+            template_engine = None
 
         # Use the package-specific M-query converter and generator for package migrations
         from cognos_migrator.converters import PackageMQueryConverter
@@ -190,7 +212,7 @@ def migrate_package_with_explicit_session(package_file_path: str,
         from cognos_migrator.generators.template_engine import TemplateEngine
 
         # Initialize template engine and package M-query converter
-        template_engine = TemplateEngine(template_directory=config.template_directory)
+        template_engine = template_engine or TemplateEngine(template_directory=config.template_directory)
         package_mquery_converter = PackageMQueryConverter(output_path=str(output_dir))
 
         # Set up the package-specific model file generator
@@ -206,7 +228,8 @@ def migrate_package_with_explicit_session(package_file_path: str,
         log_info(f"Settings being passed to PackageModelFileGenerator: {settings}")
 
         # Generate Power BI project files
-        success = generator.generate_project(pbi_project, pbit_dir)
+        with span('generate_tmdl', tables=len(data_model.tables)):
+            success = generator.generate_project(pbi_project, pbit_dir)
         pbit_path = pbit_dir if success else None
 
         log_info(f"Generated PBIT file: {pbit_path}")
@@ -498,6 +521,9 @@ def filter_data_model_tables(data_model: DataModel, table_references: Set[str])
     return filtered_model
 
 
+@traced_migration('shared_model_migration')
+@artifact_policy_from('config')
+@artifact_scope()
 def _migrate_shared_model(
         package_file: str,
         reports: List[str],
@@ -508,8 +534,42 @@ def _migrate_shared_model(
         llm_service: Optional[Dict[str, Any]] = None,
         config: Optional[Dict[str, Any]] = None,
         task_id: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        incremental: Optional[bool] = None,
+        runtime: Optional['MigrationRuntime'] = None,
 ) -> bool:
-    """Helper function to orchestrate the shared model migration."""
+    """Helper function to orchestrate the shared model migration.
+
+    The intermediate report migrations of Step 1 run on up to max_workers
+    threads; when not given, ``report_migration.max_workers`` from the
+    settings is used and reports are migrated one at a time by default.
+
+    All reports and the model steps share one MigrationRuntime, so logging is
+    configured, the session verified and the templates loaded once. A runtime
+    passed in is reused and left open; its own settings apply to the
+    intermediate reports, while config applies to the shared model.
+
+    In incremental mode (``incremental.enabled`` in the settings when not
+    given) the output of the previous run in output_path is reused: local
+    reports whose spec, settings and converter version are unchanged are not
+    migrated again, and the model steps are skipped entirely when neither
+    the package nor any report changed. See common/incremental.py.
+    """
+    if runtime is not None:
+        return _run_shared_model_migration(package_file, reports, output_path, reports_are_ids, config,
+                                           task_id, max_workers, incremental, runtime)
+
+    from cognos_migrator.runtime import MigrationRuntime
+    with MigrationRuntime(cognos_url, session_key, log_name="cognos_report_migration") as runtime:
+        return _run_shared_model_migration(package_file, reports, output_path, reports_are_ids, config,
+                                           task_id, max_workers, incremental, runtime)
+
+
+def _run_shared_model_migration(package_file: str, reports: List[str], output_path: str, reports_are_ids: bool,
+                                config: Optional[Dict[str, Any]], task_id: Optional[str],
+                                max_workers: Optional[int], incremental: Optional[bool],
+                                runtime: 'MigrationRuntime') -> bool:
+    """Run the steps of a shared model migration with the given runtime, see _migrate_shared_model"""
 
     # Generate task ID if not provided
     if task_id is None:
@@ -527,33 +587,95 @@ def _migrate_shared_model(
 
     # --- Step 1: Intermediate migration for each report ---
     intermediate_dir = Path(output_path) / "intermediate_reports"
-    shutil.rmtree(intermediate_dir, ignore_errors=True)
+    if incremental is None and config:
+        incremental = config.get("incremental", {}).get("enabled", False)
+    manifest = MigrationManifest(output_path, package_file, config) if incremental else None
+    if manifest is None:
+        shutil.rmtree(intermediate_dir, ignore_errors=True)
     intermediate_dir.mkdir(parents=True, exist_ok=True)
 
-    successful_migrations_paths = []
-    for report_item in reports:
+    if max_workers is None and config:
+        max_workers = config.get("report_migration", {}).get("max_workers", 1)
+    workers = resolve_max_workers(max_workers, len(reports or []))
+    if workers > 1:
+        logging.info(f"Migrating {len(reports)} intermediate reports with {workers} parallel workers")
+
+    def intermediate_report_name(report_item):
         if reports_are_ids:
             # Sanitize report ID for use as a directory name
-            report_name = re.sub(r'[\\/*?:"<>|]', "_", report_item)
-        else:
-            report_name = Path(report_item).stem
+            return re.sub(r'[\\/*?:"<>|]', "_", report_item)
+        return Path(report_item).stem
+
+    report_fingerprints: Dict[str, Optional[str]] = {}
+    if manifest is not None:
+        removed = manifest.remove_stale_reports(intermediate_dir, map(intermediate_report_name, reports or []))
+        if removed:
+            logging.info(f"Removed intermediate reports that are no longer migrated: {removed}")
 
+    def migrate_intermediate_report(report_item):
+        report_name = intermediate_report_name(report_item)
         report_output_path = intermediate_dir / report_name
 
-        migration_args = {
-            "output_path": str(report_output_path),
-            "cognos_url": cognos_url,
-            "session_key": session_key,
-        }
+        fingerprint = None
+        if manifest is not None:
+            # Reports fetched by ID cannot be fingerprinted before they are fetched
+            if not reports_are_ids:
+                fingerprint = manifest.report_fingerprint(report_item)
+            report_fingerprints[report_name] = fingerprint
+            if manifest.is_report_current(report_name, fingerprint, report_output_path):
+                logging.info(f"Reusing unchanged intermediate report {report_name}")
+                add_count('reports_reused')
+                return report_output_path
+            # Drop the output of a previous, changed or failed migration of the report
+            shutil.rmtree(report_output_path, ignore_errors=True)
+
+        migration_args = {"output_path": str(report_output_path)}
         if reports_are_ids:
             migration_args["report_id"] = report_item
         else:
             migration_args["report_file_path"] = report_item
 
-        success = migrate_single_report(**migration_args)
-
-        if success:
-            successful_migrations_paths.append(report_output_path)
+        try:
+            # Workers share the runtime rather than setting up logging and a migrator per report
+            with span('report', report=str(report_item)):
+                success = runtime.migrate_report(**migration_args)
+        except CognosAPIError:
+            # Session expiry cancels the remaining reports
+            raise
+        except Exception as e:
+            logging.error(f"Error migrating intermediate report {report_item}: {e}")
+            success = False
+
+        if manifest is not None:
+            manifest.record_report(report_name, fingerprint, success, source=str(report_item))
+        return report_output_path if success else None
+
+    # Results come back in input order, so the consolidation below is deterministic
+    with span('migrate_reports', reports=len(reports or []), workers=workers):
+        successful_migrations_paths = [
+            path for path in run_ordered(reports or [], migrate_intermediate_report, workers)
+            if path is not None
+        ]
+
+    if manifest is not None:
+        model_fingerprint = manifest.model_fingerprint(
+            {path.name: report_fingerprints.get(path.name) for path in successful_migrations_paths})
+        if manifest.is_model_current(model_fingerprint, output_path):
+            manifest.save()
+            logging.info("Package, settings and reports are unchanged; reusing the model of the previous run")
+            logging_helper(
+                message=f"Shared model for package {Path(package_file).name} is up to date",
+                progress=100,
+                message_type="success"
+            )
+            return True, str(output_path)
+        # Not current until the model steps below complete
+        manifest.record_model(None)
+        manifest.save()
+        # Tables the changed inputs no longer produce must not survive from the previous run
+        removed = manifest.remove_model_artifacts(output_path)
+        if removed:
+            logging.info(f"Removed the model of the previous run before rebuilding it: {removed}")
 
     # --- Step 2: Analyze intermediate files and consolidate table schemas ---
     logging_helper(
@@ -565,42 +687,34 @@ def _migrate_shared_model(
     consolidated_tables: Dict[str, Table] = {}
     required_tables = set()
 
-    # Initialize the CognosModuleMigratorExplicit once
-    from cognos_migrator.config import MigrationConfig, CognosConfig
-    migration_config = MigrationConfig(output_directory=Path(output_path),
-                                       template_directory=str(Path(__file__).parent.parent / "templates"))
-    cognos_config = CognosConfig(base_url=cognos_url, auth_key="session_key", auth_value=session_key)
-    migrator = CognosModuleMigratorExplicit(
-        migration_config=migration_config,
-        cognos_config=cognos_config,
-        cognos_url=cognos_url,
-        session_key=session_key
-    )
+    # The runtime's migrator builds the intermediate data models
+    migrator = runtime.migrator
 
-    for report_path in successful_migrations_paths:
-        intermediate_model_path = report_path / "extracted"
-        if not intermediate_model_path.exists():
-            logging.warning(f"Intermediate model path does not exist, skipping: {intermediate_model_path}")
-            continue
+    with span('consolidate_tables'):
+        for report_path in successful_migrations_paths:
+            intermediate_model_path = report_path / "extracted"
+            if not intermediate_model_path.exists():
+                logging.warning(f"Intermediate model path does not exist, skipping: {intermediate_model_path}")
+                continue
 
-        intermediate_model = migrator._create_data_model_from_report(intermediate_model_path)
-        if not intermediate_model:
-            logging.warning(f"Could not create intermediate data model from {report_path.name}, skipping.")
-            continue
+            intermediate_model = migrator._create_data_model_from_report(intermediate_model_path)
+            if not intermediate_model:
+                logging.warning(f"Could not create intermediate data model from {report_path.name}, skipping.")
+                continue
 
-        for table in intermediate_model.tables:
-            # This is now the single source for collecting required tables
-            required_tables.add(table.name)
+            for table in intermediate_model.tables:
+                # This is now the single source for collecting required tables
+                required_tables.add(table.name)
 
-            if table.name not in consolidated_tables:
-                consolidated_tables[table.name] = table
-            else:
-                # Merge columns from the same source table used in different reports
-                existing_table = consolidated_tables[table.name]
-                existing_column_names = {c.name.lower() for c in existing_table.columns}
-                for new_column in table.columns:
-                    if new_column.name.lower() not in existing_column_names:
-                        existing_table.columns.append(new_column)
+                if table.name not in consolidated_tables:
+                    consolidated_tables[table.name] = table
+                else:
+                    # Merge columns from the same source table used in different reports
+                    existing_table = consolidated_tables[table.name]
+                    existing_column_names = {c.name.lower() for c in existing_table.columns}
+                    for new_column in table.columns:
+                        if new_column.name.lower() not in existing_column_names:
+                            existing_table.columns.append(new_column)
 
     # Add any "always_include" tables from the configuration
     if config:
@@ -641,16 +755,17 @@ def _migrate_shared_model(
     logging.info("Merging calculations from intermediate reports")
     # Get the paths to the intermediate reports directory
     intermediate_reports_dir = Path(output_path) / "intermediate_reports"
-    if intermediate_reports_dir.exists() and intermediate_reports_dir.is_dir():
-        # Get all subdirectories in the intermediate_reports directory
-        intermediate_report_paths = [p for p in intermediate_reports_dir.iterdir() if p.is_dir()]
-        logging.info(f"Found {len(intermediate_report_paths)} intermediate report directories")
-        _merge_calculations_from_intermediate_reports(intermediate_report_paths, Path(output_path))
-    else:
-        logging.warning(f"Intermediate reports directory not found at {intermediate_reports_dir}")
-        # Fall back to using successful_migrations_paths
-        logging.info(f"Falling back to using successful_migrations_paths with {len(successful_migrations_paths)} paths")
-        _merge_calculations_from_intermediate_reports(successful_migrations_paths, Path(output_path))
+    with span('merge_calculations'):
+        if intermediate_reports_dir.exists() and intermediate_reports_dir.is_dir():
+            # Get all subdirectories in the intermediate_reports directory
+            intermediate_report_paths = [p for p in intermediate_reports_dir.iterdir() if p.is_dir()]
+            logging.info(f"Found {len(intermediate_report_paths)} intermediate report directories")
+            _merge_calculations_from_intermediate_reports(intermediate_report_paths, Path(output_path))
+        else:
+            logging.warning(f"Intermediate reports directory not found at {intermediate_reports_dir}")
+            # Fall back to using successful_migrations_paths
+            logging.info(f"Falling back to using successful_migrations_paths with {len(successful_migrations_paths)} paths")
+            _merge_calculations_from_intermediate_reports(successful_migrations_paths, Path(output_path))
 
     # --- Step 3: Package Extraction based on REQUIRED tables ---
     logging_helper(
@@ -663,11 +778,12 @@ def _migrate_shared_model(
         config=config,
         logger=logging.getLogger(__name__)
     )
-    package_info = package_extractor.extract_package(
-        package_file,
-        os.path.join(output_path, "extracted"),
-        required_tables=required_tables
-    )
+    with span('extract', required_tables=len(required_tables)):
+        package_info = package_extractor.extract_package(
+            package_file,
+            os.path.join(output_path, "extracted"),
+            required_tables=required_tables
+        )
 
     # --- Step 3.5: Extract SQL relationships and save to extracted folder ---
     extracted_dir = os.path.join(output_path, "extracted")
@@ -679,7 +795,8 @@ def _migrate_shared_model(
         message_type="info"
     )
 
-    data_model = package_extractor.convert_to_data_model(package_info)
+    with span('convert'):
+        data_model = package_extractor.convert_to_data_model(package_info)
 
     # Get table names from the data model for filtering SQL relationships
     model_table_names = [table.name for table in data_model.tables]
@@ -688,7 +805,11 @@ def _migrate_shared_model(
     # Extract SQL relationships with model table names for filtering
     sql_relationship_extractor = SQLRelationshipExtractor(logger=logging.getLogger(__name__),
                                                           model_tables=model_table_names)
-    sql_relationship_extractor.extract_and_save(package_file, extracted_dir)
+    with span('extract_relationships'):
+        sql_relationship_extractor.extract_and_save(package_file, extracted_dir,
+                                                    parsed_package=package_extractor.parsed_package)
+    # The parsed package is no longer needed; release the tree before generation
+    package_extractor.release_parsed_package()
     logging.info(f"Extracted SQL relationships and saved to {extracted_dir}")
 
     # Log the query subjects that were returned after filtering
@@ -721,7 +842,8 @@ def _migrate_shared_model(
     # We will use our new, specialized converter for this.
     consolidated_converter = ConsolidatedMQueryConverter(output_path=output_path)
     for table in data_model.tables:
-        table.m_query = consolidated_converter.convert_to_m_query(table)
+        with span('convert_mquery', table=table.name):
+            table.m_query = consolidated_converter.convert_to_m_query(table)
 
     logging.info(
         f"Data model has {len(data_model.tables)} tables before generation: {[t.name for t in data_model.tables]}")
@@ -737,15 +859,15 @@ def _migrate_shared_model(
     from ..processors.tmdl_post_processor import TMDLPostProcessor
     migration_config = MigrationConfig(output_directory=Path(output_path),
                                        template_directory=str(Path(__file__).parent.parent / "templates"))
-    generator = PowerBIProjectGenerator(migration_config)
+    # The templates were loaded by the runtime
+    template_engine = runtime.template_engine
+    generator = PowerBIProjectGenerator(migration_config, template_engine=template_engine)
 
     # Use the package-specific M-query converter and generator for shared model migrations
     from cognos_migrator.converters import PackageMQueryConverter
     from cognos_migrator.generators.package_model_file_generator import PackageModelFileGenerator
-    from cognos_migrator.generators.template_engine import TemplateEngine
 
-    # Initialize template engine and package M-query converter for shared models
-    template_engine = TemplateEngine(template_directory=migration_config.template_directory)
+    # Initialize the package M-query converter for shared models
     package_mquery_converter = PackageMQueryConverter(output_path=str(Path(output_path)))
 
     # Set up the package-specific model file generator for shared models
@@ -767,21 +889,25 @@ def _migrate_shared_model(
 
     pbit_dir = Path(output_path) / "pbit"
     pbit_dir.mkdir(parents=True, exist_ok=True)
-    generator.generate_project(final_pbi_project, str(pbit_dir))
+    with span('generate_tmdl', tables=len(data_model.tables)):
+        generator.generate_project(final_pbi_project, str(pbit_dir))
 
     # --- Step 5.5: Merge calculations into table JSON files ---
     logging.info("Merging calculations into table JSON files")
-    _merge_calculations_into_table_json(Path(output_path))
+    with span('merge_table_calculations'):
+        _merge_calculations_into_table_json(Path(output_path))
 
     # --- Step 6.5: Consolidate intermediate report pages and slicers into final report ---
     logging.info("Consolidating intermediate report pages and slicers into final unified report")
-    _consolidate_intermediate_reports_into_final(output_path, successful_migrations_paths)
+    with span('consolidate_reports'):
+        _consolidate_intermediate_reports_into_final(output_path, successful_migrations_paths)
 
     # --- Step 7: Post-process the generated TMDL to fix relationships ---
     tmdl_relationships_file = pbit_dir / "Model" / "relationships.tmdl"
     if tmdl_relationships_file.exists():
-        post_processor = TMDLPostProcessor(logger=logging.getLogger(__name__))
-        post_processor.fix_relationships(str(tmdl_relationships_file))
+        with span('post_process'):
+            post_processor = TMDLPostProcessor(logger=logging.getLogger(__name__))
+            post_processor.fix_relationships(str(tmdl_relationships_file))
     else:
         logging.warning(f"Could not find relationships file to post-process: {tmdl_relationships_file}")
 
@@ -796,6 +922,10 @@ def _migrate_shared_model(
     )
     log_info(f"Shared model migration completed successfully with task ID: {task_id}")
 
+    if manifest is not None:
+        manifest.record_model(model_fingerprint)
+        manifest.save()
+
     return True, str(output_path)
 
 
@@ -806,9 +936,13 @@ def migrate_package_with_local_reports(
         cognos_url: str,
         session_key: str,
         task_id: Optional[str] = None,
-        settings: str = None
+        settings: str = None,
+        runtime: Optional['MigrationRuntime'] = None
 ) -> bool:
-    """Orchestrates shared model creation for a package and local report files."""
+    """Orchestrates shared model creation for a package and local report files.
+
+    A long-lived MigrationRuntime can be passed to migrate the reports with, see _migrate_shared_model.
+    """
     settings = load_settings(custom_settings=settings)
     logging.info(f"In migrate_package_with_local_reports, loaded settings: {settings}")
     return _migrate_shared_model(
@@ -820,6 +954,7 @@ def migrate_package_with_local_reports(
         config=settings,
         reports_are_ids=False,
         task_id=task_id,
+        runtime=runtime,
     )
 
 
@@ -831,8 +966,12 @@ def migrate_package_with_reports_explicit_session(package_file_path: str,
                                                   task_id: Optional[str] = None,
                                                   auth_key: str = "IBM-BA-Authorization",
                                                   dry_run: bool = False,
-                                                  settings: Optional[Dict[str, Any]] = None) -> bool:
-    """Orchestrates shared model creation for a package and live report IDs."""
+                                                  settings: Optional[Dict[str, Any]] = None,
+                                                  runtime: Optional['MigrationRuntime'] = None) -> bool:
+    """Orchestrates shared model creation for a package and live report IDs.
+
+    A long-lived MigrationRuntime can be passed to migrate the reports with, see _migrate_shared_model.
+    """
     # Use provided settings or fall back to file-based settings
     if settings:
         config = settings
@@ -850,6 +989,7 @@ def migrate_package_with_reports_explicit_session(package_file_path: str,
         config=config,
         reports_are_ids=True,
         task_id=task_id,
+        runtime=runtime,
     )
 
 
@@ -978,8 +1118,7 @@ def _merge_calculations_from_intermediate_reports(
 
     # Save the consolidated calculations
     try:
-        with open(consolidated_path, 'w', encoding='utf-8') as f:
-            json.dump(consolidated_calculations, f, indent=2)
+        write_json_artifact(consolidated_path, consolidated_calculations)
         logger.info(
             f"Saved {len(consolidated_calculations['calculations'])} consolidated calculations to {consolidated_path}")
     except Exception as e:
@@ -1039,8 +1178,8 @@ def _merge_calculations_into_table_json(
         logger.error(f"Error loading calculations from {calculations_file}: {e}")
         return
 
-    # Find all table JSON files
-    table_files = list(extracted_dir.glob("table_*.json"))
+    # Find all table JSON files, including those not yet flushed from the artifact store
+    table_files = glob_json(extracted_dir, "table_*.json")
     logger.info(f"Found {len(table_files)} table JSON files")
 
     # Process each table file
@@ -1055,8 +1194,7 @@ def _merge_calculations_into_table_json(
 
         # Load table JSON
         try:
-            with open(table_file, 'r', encoding='utf-8') as f:
-                table_data = json.load(f)
+            table_data = load_json(table_file)
         except Exception as e:
             logger.error(f"Error loading table data from {table_file}: {e}")
             continue
@@ -1125,8 +1263,7 @@ def _merge_calculations_into_table_json(
 
         # Save updated table JSON
         try:
-            with open(table_file, 'w', encoding='utf-8') as f:
-                json.dump(table_data, f, indent=2)
+            save_json(table_file, table_data)
             logger.info(f"Added {added_count} calculated columns to {table_file}")
         except Exception as e:
             logger.error(f"Error saving updated table data to {table_file}: {e}")
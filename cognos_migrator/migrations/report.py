@@ -9,15 +9,20 @@ import logging
 import os
 import uuid
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from datetime import datetime
 
 from cognos_migrator.config import MigrationConfig, CognosConfig
 from cognos_migrator.common.logging import configure_logging, log_info, log_warning, log_error, log_debug
 from cognos_migrator.client import CognosClient, CognosAPIError
 from cognos_migrator.common.websocket_client import logging_helper, set_task_info
+from cognos_migrator.common.tracing import span, traced_migration
 
+if TYPE_CHECKING:
+    from cognos_migrator.runtime import MigrationRuntime
 
+
+@traced_migration('report_migration')
 def migrate_single_report(
     output_path: str,
     cognos_url: str,
@@ -26,7 +31,8 @@ def migrate_single_report(
     report_file_path: Optional[str] = None,
     task_id: Optional[str] = None,
     auth_key: str = "IBM-BA-Authorization",
-    settings: Optional[Dict[str, Any]] = None
+    settings: Optional[Dict[str, Any]] = None,
+    runtime: Optional['MigrationRuntime'] = None
 ) -> bool:
     """Orchestrates the migration of a single Cognos report, supporting both report ID and local file.
     
@@ -38,59 +44,41 @@ def migrate_single_report(
         report_file_path (Optional[str]): The file path of the local report XML to migrate.
         task_id (Optional[str]): Optional task ID for tracking.
         auth_key (str): The authentication header key.
+        settings (Optional[Dict[str, Any]]): Settings overriding settings.json. Not allowed with a
+            runtime, whose migrator was created with the runtime's own settings.
+        runtime (Optional[MigrationRuntime]): Long-lived runtime to migrate with. Its logging,
+            verified session, templates and migrator are reused instead of being set up for this report.
+        
+    Step timings are written to timings.json in output_path.
         
     Returns:
         bool: True if migration was successful, False otherwise.
         
     Raises:
-        ValueError: If neither report_id nor report_file_path is provided.
+        ValueError: If neither report_id nor report_file_path is provided, or if settings
+            other than the runtime's are given together with a runtime.
         CognosAPIError: If the session is expired or invalid.
     """
     if not report_id and not report_file_path:
         raise ValueError("Either report_id or report_file_path must be provided.")
+    if runtime is not None and settings is not None and settings != runtime.settings:
+        raise ValueError("settings cannot be combined with a runtime; create the runtime with these settings instead.")
 
-    configure_logging("cognos_report_migration")
+    if runtime is None:
+        configure_logging("cognos_report_migration")
     
     if task_id is None:
         task_id = str(uuid.uuid4())
 
     set_task_info(task_id, total_steps=8)
     
-    if report_id:
-        log_info(f"Testing connection to Cognos at {cognos_url}")
-        if not CognosClient.test_connection_with_session(cognos_url, session_key):
-            log_error("Session key is expired or invalid")
-            raise CognosAPIError("Session key is expired or invalid")
-
-    migration_config = MigrationConfig(
-        output_directory=output_path,
-        preserve_structure=True,
-        include_metadata=True,
-        generate_documentation=True,
-        template_directory=str(Path(__file__).parent.parent / "templates"),
-        llm_service_url=os.environ.get('DAX_API_URL', 'http://localhost:8080'),
-        llm_service_enabled=True
-    )
-    
-    cognos_config = CognosConfig(
-        base_url=cognos_url,
-        auth_key=auth_key,
-        auth_value=session_key,
-        session_timeout=3600,
-        max_retries=3,
-        request_timeout=30
-    )
-    
-    from ..migrator import CognosModuleMigratorExplicit
-    
-    migrator = CognosModuleMigratorExplicit(
-        migration_config=migration_config,
-        cognos_config=cognos_config,
-        cognos_url=cognos_url,
-        session_key=session_key,
-        logger=logging.getLogger(__name__),
-        settings=settings
-    )
+    with span('setup'):
+        if runtime is not None:
+            if report_id:
+                runtime.verify_session()
+            migrator = runtime.migrator
+        else:
+            migrator = _create_report_migrator(output_path, cognos_url, session_key, report_id, auth_key, settings)
     
     log_info("Migrator initialized successfully")
     logging_helper(
@@ -131,6 +119,46 @@ def migrate_single_report(
         return False
 
 
+def _create_report_migrator(output_path: str, cognos_url: str, session_key: str, report_id: Optional[str],
+                            auth_key: str, settings: Optional[Dict[str, Any]]):
+    """Verify the session and create a migrator for a single report migration"""
+    if report_id:
+        log_info(f"Testing connection to Cognos at {cognos_url}")
+        if not CognosClient.test_connection_with_session(cognos_url, session_key):
+            log_error("Session key is expired or invalid")
+            raise CognosAPIError("Session key is expired or invalid")
+
+    migration_config = MigrationConfig(
+        output_directory=output_path,
+        preserve_structure=True,
+        include_metadata=True,
+        generate_documentation=True,
+        template_directory=str(Path(__file__).parent.parent / "templates"),
+        llm_service_url=os.environ.get('DAX_API_URL', 'http://localhost:8080'),
+        llm_service_enabled=True
+    )
+    
+    cognos_config = CognosConfig(
+        base_url=cognos_url,
+        auth_key=auth_key,
+        auth_value=session_key,
+        session_timeout=3600,
+        max_retries=3,
+        request_timeout=30
+    )
+    
+    from ..migrator import CognosModuleMigratorExplicit
+    
+    return CognosModuleMigratorExplicit(
+        migration_config=migration_config,
+        cognos_config=cognos_config,
+        cognos_url=cognos_url,
+        session_key=session_key,
+        logger=logging.getLogger(__name__),
+        settings=settings
+    )
+
+
 def migrate_single_report_with_explicit_session(report_id: str,
                                                 output_path: str,
                                                 cognos_url: str, session_key: str,
@@ -7,9 +7,9 @@ environment variables or .env files.
 """
 
 import os
-import json
 import logging
 import uuid
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple, Union
@@ -20,9 +20,15 @@ from cognos_migrator.config import MigrationConfig, CognosConfig
 from cognos_migrator.common.logging import configure_logging, log_info, log_warning, log_error, log_debug
 from cognos_migrator.client import CognosClient, CognosAPIError
 from cognos_migrator.common.websocket_client import logging_helper, set_task_info
+from cognos_migrator.common.parallel import run_ordered, resolve_max_workers
+from cognos_migrator.common.artifact_store import artifact_scope
+from cognos_migrator.common.artifact_policy import (
+    ArtifactPolicy, applies_artifact_policy, should_write_artifact, write_json_artifact
+)
+from cognos_migrator.common.tracing import span
 from cognos_migrator.extractors.modules import (
     ModuleStructureExtractor, ModuleQueryExtractor, ModuleDataItemExtractor, 
-    ModuleExpressionExtractor, ModuleRelationshipExtractor, ModuleHierarchyExtractor
+    ModuleExpressionExtractor, ModuleRelationshipExtractor, ModuleHierarchyExtractor, ModuleDocument
 )
 from cognos_migrator.extractors.modules.module_source_extractor import ModuleSourceExtractor
 from cognos_migrator.enhancers import CPFMetadataEnhancer
@@ -43,13 +49,23 @@ class CognosModuleMigratorExplicit:
     
     def __init__(self, migration_config: MigrationConfig, cognos_config: CognosConfig,
                  cognos_url: str, session_key: str, logger=None, cpf_file_path: str = None,
-                 settings: Optional[Dict[str, Any]] = None):
+                 settings: Optional[Dict[str, Any]] = None, cognos_client: Optional[CognosClient] = None,
+                 template_engine=None, llm_service_client=None):
         self.config = migration_config
         self.logger = logger or logging.getLogger(__name__)
         self.settings = settings  # Store frontend settings
+        # Intermediate artifacts written by this migrator's migrations. Without settings of its
+        # own, e.g. for the reports of a shared model, it follows the migration it runs in.
+        self.artifact_policy = (ArtifactPolicy.from_settings(settings, migration_config)
+                                if settings is not None or migration_config.artifact_mode else None)
+        
+        # Keep connection details so worker migrators can be created for parallel batches
+        self.cognos_config = cognos_config
+        self.cognos_url = cognos_url
+        self.session_key = session_key
         
-        # Initialize client with explicit credentials
-        self.cognos_client = CognosClient(cognos_config, base_url=cognos_url, session_key=session_key)
+        # Initialize client with explicit credentials, reusing an already verified client if given
+        self.cognos_client = cognos_client or CognosClient(cognos_config, base_url=cognos_url, session_key=session_key)
         self.module_parser = CognosModuleParser(client=self.cognos_client)
         
         # Initialize generators with LLM service enabled
@@ -57,16 +73,16 @@ class CognosModuleMigratorExplicit:
         from cognos_migrator.llm_service import LLMServiceClient
         from cognos_migrator.converters import ReportMQueryConverter, PackageMQueryConverter
         
-        template_engine = TemplateEngine(template_directory=migration_config.template_directory)
+        # Templates and the LLM client can be shared, e.g. by worker migrators or a MigrationRuntime
+        template_engine = template_engine or TemplateEngine(template_directory=migration_config.template_directory)
+        self.template_engine = template_engine
         
         # Initialize M-query converters for different migration types
         report_mquery_converter = ReportMQueryConverter()
         package_mquery_converter = PackageMQueryConverter()
 
         # Initialize LLM service client
-        llm_service_client = None
-        
-        if migration_config.llm_service_enabled and migration_config.llm_service_url:
+        if llm_service_client is None and migration_config.llm_service_enabled and migration_config.llm_service_url:
             try:
                 llm_service_client = LLMServiceClient(
                     base_url=migration_config.llm_service_url,
@@ -75,9 +91,11 @@ class CognosModuleMigratorExplicit:
                 self.logger.info(f"LLM service client initialized with URL: {migration_config.llm_service_url}")
             except Exception as e:
                 self.logger.warning(f"Failed to initialize LLM service: {e}")
+        self.llm_service_client = llm_service_client
         
         # Create project generator
-        self.project_generator = PowerBIProjectGenerator(migration_config)
+        self.project_generator = PowerBIProjectGenerator(migration_config, template_engine=template_engine,
+                                                         llm_service=llm_service_client)
         
         # Initialize module-specific model file generator with appropriate M-query converter
         if hasattr(self.project_generator, 'model_file_generator'):
@@ -122,6 +140,8 @@ class CognosModuleMigratorExplicit:
         # Initialize summary generator
         self.summary_generator = MigrationSummaryGenerator(logger=self.logger)
     
+    @applies_artifact_policy
+    @artifact_scope()
     def migrate_module(self, module_id: str, output_path: str, folder_id: str = None, cpf_file_path: str = None) -> bool:
         """Migrate module - uses the same logic as CognosModuleMigrator.migrate_module"""
         # Copy the entire migrate_module method from CognosModuleMigrator
@@ -153,7 +173,8 @@ class CognosModuleMigratorExplicit:
             successful_report_ids = []
             if folder_id:
                 self.logger.info(f"Step 2: Migrating reports from folder {folder_id}")
-                folder_results = self.migrate_folder(folder_id, str(reports_dir))
+                with span('migrate_reports', folder_id=folder_id):
+                    folder_results = self.migrate_folder(folder_id, str(reports_dir))
                 # Extract report IDs that were successfully migrated
                 successful_report_ids = [report_id for report_id, success in folder_results.items() if success]
                 self.logger.info(f"Successfully migrated {len(successful_report_ids)} reports: {successful_report_ids}")
@@ -168,7 +189,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             
-            module_info = self.cognos_client.get_module(module_id)
+            with span('fetch', resource='module'):
+                module_info = self.cognos_client.get_module(module_id)
             if not module_info:
                 self.logger.error(f"Failed to fetch Cognos module info: {module_id}")
                 logging_helper(
@@ -185,7 +207,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             
-            module_metadata = self.cognos_client.get_module_metadata(module_id)
+            with span('fetch', resource='module_metadata'):
+                module_metadata = self.cognos_client.get_module_metadata(module_id)
             if not module_metadata:
                 self.logger.error(f"Failed to fetch Cognos module metadata: {module_id}")
                 logging_helper(
@@ -196,26 +219,22 @@ class CognosModuleMigratorExplicit:
                 return False
             
             # Save module information
-            with open(extracted_dir / "module_info.json", 'w', encoding='utf-8') as f:
-                json.dump(module_info, f, indent=2)
-                
-            with open(extracted_dir / "module_metadata.json", 'w', encoding='utf-8') as f:
-                json.dump(module_metadata, f, indent=2)
+            write_json_artifact(extracted_dir / "module_info.json", module_info)
+            write_json_artifact(extracted_dir / "module_metadata.json", module_metadata)
                 
             if successful_report_ids:
-                with open(extracted_dir / "associated_reports.json", 'w', encoding='utf-8') as f:
-                    json.dump({"report_ids": successful_report_ids}, f, indent=2)
+                write_json_artifact(extracted_dir / "associated_reports.json", {"report_ids": successful_report_ids})
             
             # Step 3: Extract module components using specialized extractors
             # Each extractor will save its output to JSON files in the extracted directory
-            # Convert module_metadata to JSON string for extractors
+            # The metadata is indexed once and shared by all extractors
             logging_helper(
                 message="Starting module component extraction",
                 progress=40,
                 message_type="info"
             )
             
-            module_metadata_json = json.dumps(module_metadata)
+            module_document = ModuleDocument(module_metadata)
             
             self.logger.info("Extracting module structure")
             logging_helper(
@@ -224,7 +243,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             try:
-                module_structure = self.module_structure_extractor.extract_and_save(module_metadata_json, extracted_dir)
+                with span('extract', extractor='module_structure'):
+                    module_structure = self.module_structure_extractor.extract_and_save(module_document, extracted_dir)
             except Exception as e:
                 self.logger.error(f"Error extracting module structure: {e}")
                 module_structure = {}
@@ -236,7 +256,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             try:
-                query_data = self.module_query_extractor.extract_and_save(module_metadata_json, extracted_dir)
+                with span('extract', extractor='query_subjects'):
+                    query_data = self.module_query_extractor.extract_and_save(module_document, extracted_dir)
             except Exception as e:
                 self.logger.error(f"Error extracting query subjects: {e}")
                 query_data = {}
@@ -248,7 +269,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             try:
-                data_items = self.module_data_item_extractor.extract_and_save(module_metadata_json, extracted_dir)
+                with span('extract', extractor='data_items'):
+                    data_items = self.module_data_item_extractor.extract_and_save(module_document, extracted_dir)
             except Exception as e:
                 self.logger.error(f"Error extracting data items: {e}")
                 data_items = {}
@@ -260,7 +282,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             try:
-                relationships = self.module_relationship_extractor.extract_and_save(module_metadata_json, extracted_dir)
+                with span('extract', extractor='relationships'):
+                    relationships = self.module_relationship_extractor.extract_and_save(module_document, extracted_dir)
             except Exception as e:
                 self.logger.error(f"Error extracting relationships: {e}")
                 relationships = {}
@@ -272,7 +295,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             try:
-                hierarchies = self.module_hierarchy_extractor.extract_and_save(module_metadata_json, extracted_dir)
+                with span('extract', extractor='hierarchies'):
+                    hierarchies = self.module_hierarchy_extractor.extract_and_save(module_document, extracted_dir)
             except Exception as e:
                 self.logger.error(f"Error extracting hierarchies: {e}")
                 hierarchies = {}
@@ -284,7 +308,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             try:
-                source_data = self.module_source_extractor.extract_and_save(module_metadata_json, extracted_dir)
+                with span('extract', extractor='source_data'):
+                    source_data = self.module_source_extractor.extract_and_save(module_document, extracted_dir)
             except Exception as e:
                 self.logger.error(f"Error extracting source data: {e}")
                 source_data = {}
@@ -298,9 +323,10 @@ class CognosModuleMigratorExplicit:
             try:
                 if successful_report_ids:
                     # Use the new method to collect calculations from reports
-                    calculations = self.module_expression_extractor.collect_report_calculations(
-                        successful_report_ids, output_path, extracted_dir
-                    )
+                    with span('extract', extractor='calculations'):
+                        calculations = self.module_expression_extractor.collect_report_calculations(
+                            successful_report_ids, output_path, extracted_dir
+                        )
                 else:
                     self.logger.warning("No report IDs provided, skipping calculation collection")
                     calculations = {"calculations": []}
@@ -332,10 +358,9 @@ class CognosModuleMigratorExplicit:
             
             # Save the combined parsed module
             parsed_module_path = extracted_dir / "parsed_module.json"
-            with open(parsed_module_path, 'w', encoding='utf-8') as f:
-                # Remove raw_module from the saved JSON to avoid duplication
-                parsed_module_to_save = {k: v for k, v in parsed_module.items() if k != 'raw_module'}
-                json.dump(parsed_module_to_save, f, indent=2)
+            # Remove raw_module from the saved JSON to avoid duplication
+            parsed_module_to_save = {k: v for k, v in parsed_module.items() if k != 'raw_module'}
+            write_json_artifact(parsed_module_path, parsed_module_to_save)
             
             # Step 3: Convert to Power BI structures
             logging_helper(
@@ -343,7 +368,8 @@ class CognosModuleMigratorExplicit:
                 progress=78,
                 message_type="info"
             )
-            powerbi_project = self._convert_cognos_to_powerbi(parsed_module)
+            with span('convert'):
+                powerbi_project = self._convert_cognos_to_powerbi(parsed_module)
             if not powerbi_project:
                 self.logger.error(f"Failed to convert module: {module_id}")
                 logging_helper(
@@ -360,7 +386,8 @@ class CognosModuleMigratorExplicit:
                     progress=82,
                     message_type="info"
                 )
-                self.cpf_metadata_enhancer.enhance_project(powerbi_project)
+                with span('enhance_cpf'):
+                    self.cpf_metadata_enhancer.enhance_project(powerbi_project)
             
             # Step 4: Generate Power BI project files
             self.logger.info("Generating Power BI project files")
@@ -370,7 +397,8 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             
-            success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
+            with span('generate_tmdl'):
+                success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
             if not success:
                 self.logger.error(f"Failed to generate Power BI project files")
                 logging_helper(
@@ -386,7 +414,8 @@ class CognosModuleMigratorExplicit:
                 progress=92,
                 message_type="info"
             )
-            self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
+            with span('documentation'):
+                self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
             
             # If CPF metadata is available, save it to the extracted folder
             if self.cpf_extractor:
@@ -637,13 +666,16 @@ class CognosModuleMigratorExplicit:
         report.sections.append(page)
         return report
     
-    def migrate_folder(self, folder_id: str, output_path: str, recursive: bool = True) -> Dict[str, bool]:
+    def migrate_folder(self, folder_id: str, output_path: str, recursive: bool = True,
+                       max_workers: Optional[int] = None) -> Dict[str, bool]:
         """Migrate all reports in a Cognos folder without using environment variables
         
         Args:
             folder_id: ID of the Cognos folder to migrate
             output_path: Path where migration output will be saved
             recursive: Whether to include reports in subfolders (default: True)
+            max_workers: Number of reports to migrate concurrently
+                (default: MigrationConfig.max_workers)
             
         Returns:
             Dict[str, bool]: Dictionary mapping report IDs to migration success status
@@ -662,8 +694,78 @@ class CognosModuleMigratorExplicit:
                 message_type="info"
             )
             
-            # Get all reports in folder using the client with explicit session
-            reports = self.cognos_client.list_reports_in_folder(folder_id, recursive)
+            # Reports are streamed from a concurrent crawl of the folder tree, so the
+            # first reports are migrated while the rest of the tree is discovered
+            if hasattr(self.cognos_client, 'iter_reports_in_folder'):
+                report_stream = self.cognos_client.iter_reports_in_folder(folder_id, recursive)
+            else:
+                report_stream = iter(self.cognos_client.list_reports_in_folder(folder_id, recursive))
+            reports = []
+            
+            def discovered_reports():
+                for report in report_stream:
+                    reports.append(report)
+                    yield len(reports) - 1, report
+            
+            completed = [0]
+            # Highest progress reported so far. The total grows while the folder is
+            # crawled, so the fraction of reports found so far can drop; the
+            # reported progress never does
+            progress_mark = [75]
+            progress_lock = threading.Lock()
+            
+            workers = resolve_max_workers(self.config.max_workers if max_workers is None else max_workers, None)
+            if workers > 1:
+                self.logger.info(f"Migrating reports with {workers} parallel workers")
+            worker_state = threading.local()
+            
+            def migrate_one(indexed_report):
+                i, report = indexed_report
+                report_output_path = Path(output_path) / f"report_{report.id}"
+                self.logger.info(f"Migrating report {i+1}: {report.name}")
+                
+                with progress_lock:
+                    found = len(reports)
+                    progress_mark[0] = max(progress_mark[0], int(75 + 20 * completed[0] / found))
+                    logging_helper(
+                        message=f"Migrating report {i+1}: {report.name} ({completed[0]} migrated / {found} found)",
+                        progress=progress_mark[0],
+                        message_type="info"
+                    )
+                
+                # Parallel workers each get their own migrator, see _create_worker_migrator
+                migrator = self
+                if workers > 1:
+                    migrator = getattr(worker_state, 'migrator', None)
+                    if migrator is None:
+                        migrator = worker_state.migrator = self._create_worker_migrator()
+                
+                try:
+                    # Migrate report directly without using CognosMigrator
+                    with span('report', report_id=report.id):
+                        return migrator.migrate_report(report.id, str(report_output_path))
+                except CognosAPIError as e:
+                    # Re-raise API errors to propagate session expiry and cancel the batch
+                    raise e
+                except Exception as e:
+                    self.logger.error(f"Error migrating report {report.id}: {e}")
+                    return False
+            
+            def report_done(index, indexed_report, success, completed_count):
+                report = indexed_report[1]
+                completed[0] = completed_count
+                if success:
+                    self.logger.info(f"Successfully migrated: {report.name}")
+                else:
+                    self.logger.error(f"Failed to migrate: {report.name}")
+            
+            # Migrate each report using the explicit session
+            try:
+                outcomes = run_ordered(discovered_reports(), migrate_one, workers, on_complete=report_done)
+            finally:
+                # Stops the crawl early when the batch is cancelled
+                if hasattr(report_stream, 'close'):
+                    report_stream.close()
             self.logger.info(f"Found {len(reports)} reports in folder")
             
             if not reports:
@@ -675,45 +777,8 @@ class CognosModuleMigratorExplicit:
                 )
                 return {}
             
-            logging_helper(
-                message=f"Starting migration of {len(reports)} reports",
-                progress=75,
-                message_type="info"
-            )
-            
-            # Calculate progress increment per report
-            progress_per_report = 20 / len(reports) if reports else 0
-            current_progress = 75
-            
-            # Migrate each report using the explicit session
-            for i, report in enumerate(reports):
-                report_output_path = Path(output_path) / f"report_{report.id}"
-                self.logger.info(f"Migrating report {i+1}/{len(reports)}: {report.name}")
-                
-                logging_helper(
-                    message=f"Migrating report {i+1}/{len(reports)}: {report.name}",
-                    progress=int(current_progress),
-                    message_type="info"
-                )
-                
-                try:
-                    # Migrate report directly without using CognosMigrator
-                    success = self.migrate_report(report.id, str(report_output_path))
-                    results[report.id] = success
-                    
-                    if success:
-                        self.logger.info(f"Successfully migrated: {report.name}")
-                    else:
-                        self.logger.error(f"Failed to migrate: {report.name}")
-                        
-                except CognosAPIError as e:
-                    # Re-raise API errors to propagate session expiry
-                    raise e
-                except Exception as e:
-                    self.logger.error(f"Error migrating report {report.id}: {e}")
-                    results[report.id] = False
-                
-                current_progress += progress_per_report
+            for report, success in zip(reports, outcomes):
+                results[report.id] = success
             
             # Generate migration summary
             self.summary_generator.generate_migration_summary(results, output_path)
@@ -740,6 +805,37 @@ class CognosModuleMigratorExplicit:
     
 
     
+    def _create_worker_migrator(self) -> 'CognosModuleMigratorExplicit':
+        """Create a migrator for a parallel worker thread
+        
+        Report migration swaps the M-query converter on the project generator,
+        so concurrently migrated reports need their own generators. The Cognos
+        client, loaded templates, LLM client and CPF metadata are only read
+        during report migration and are shared with the worker, as is the
+        expression converter so formulas repeated across reports are converted
+        once.
+        
+        Returns:
+            CognosModuleMigratorExplicit: Migrator for use by a single worker thread
+        """
+        worker = CognosModuleMigratorExplicit(
+            migration_config=self.config,
+            cognos_config=self.cognos_config,
+            cognos_url=self.cognos_url,
+            session_key=self.session_key,
+            logger=self.logger,
+            settings=self.settings,
+            cognos_client=self.cognos_client,
+            template_engine=self.template_engine,
+            llm_service_client=self.llm_service_client
+        )
+        worker.cpf_extractor = self.cpf_extractor
+        worker.cpf_metadata_enhancer = self.cpf_metadata_enhancer
+        worker.expression_converter = self.expression_converter
+        return worker
+    
+    @applies_artifact_policy
+    @artifact_scope()
     def migrate_single_report_with_session_key(self, report_id: str, output_path: str) -> bool:
         """Migrate a single Cognos report using explicit session credentials
         
@@ -772,16 +868,19 @@ class CognosModuleMigratorExplicit:
             pbit_dir.mkdir(exist_ok=True)
             
             # Step 1: Fetch Cognos report
-            cognos_report = self.cognos_client.get_report(report_id)
+            with span('fetch', report_id=report_id):
+                cognos_report = self.cognos_client.get_report(report_id)
             if not cognos_report:
                 self.logger.error(f"Failed to fetch Cognos report: {report_id}")
                 return False
             
             # Save raw Cognos report data to extracted folder
-            self._save_extracted_report_data(cognos_report, extracted_dir)
+            with span('extract'):
+                self._save_extracted_report_data(cognos_report, extracted_dir)
             
             # Step 2: Convert to Power BI structures
-            powerbi_project = self._convert_cognos_report_to_powerbi(cognos_report, extracted_dir)
+            with span('convert'):
+                powerbi_project = self._convert_cognos_report_to_powerbi(cognos_report, extracted_dir)
             if not powerbi_project:
                 self.logger.error(f"Failed to convert report: {report_id}")
                 return False
@@ -791,13 +890,15 @@ class CognosModuleMigratorExplicit:
                 self.cpf_metadata_enhancer.enhance_project(powerbi_project)
             
             # Step 3: Generate Power BI project files
-            success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
+            with span('generate_tmdl'):
+                success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
             if not success:
                 self.logger.error(f"Failed to generate Power BI project files")
                 return False
             
             # Step 4: Generate documentation
-            self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
+            with span('documentation'):
+                self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
             
             # If CPF metadata is available, save it to the extracted folder
             if self.cpf_extractor:
@@ -815,6 +916,8 @@ class CognosModuleMigratorExplicit:
             self.logger.error(f"Migration failed for report {report_id}: {e}")
             return False
 
+    @applies_artifact_policy
+    @artifact_scope()
     def migrate_report(self, report_id: str, output_path: str) -> bool:
         """Migrate a single Cognos report to Power BI without using environment variables
         
@@ -844,7 +947,8 @@ class CognosModuleMigratorExplicit:
             pbit_dir.mkdir(exist_ok=True)
             
             # Step 1: Fetch Cognos report
-            cognos_report = self.cognos_client.get_report(report_id)
+            with span('fetch', report_id=report_id):
+                cognos_report = self.cognos_client.get_report(report_id)
             if not cognos_report:
                 self.logger.error(f"Failed to fetch Cognos report: {report_id}")
                 return False
@@ -856,10 +960,12 @@ class CognosModuleMigratorExplicit:
                 self.project_generator.model_file_generator.mquery_converter = self.report_mquery_converter
                 
             # Save raw Cognos report data to extracted folder
-            self._save_extracted_report_data(cognos_report, extracted_dir)
+            with span('extract'):
+                self._save_extracted_report_data(cognos_report, extracted_dir)
 
             # Step 2: Convert to Power BI structures
-            powerbi_project = self._convert_cognos_report_to_powerbi(cognos_report, extracted_dir)
+            with span('convert'):
+                powerbi_project = self._convert_cognos_report_to_powerbi(cognos_report, extracted_dir)
             if not powerbi_project:
                 self.logger.error(f"Failed to convert report: {report_id}")
                 return False
@@ -869,13 +975,15 @@ class CognosModuleMigratorExplicit:
                 self.cpf_metadata_enhancer.enhance_project(powerbi_project)
             
             # Step 3: Generate Power BI project files
-            success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
+            with span('generate_tmdl'):
+                success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
             if not success:
                 self.logger.error(f"Failed to generate Power BI project files")
                 return False
             
             # Step 4: Generate documentation
-            self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
+            with span('documentation'):
+                self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
             
             # If CPF metadata is available, save it to the extracted folder
             if self.cpf_extractor:
@@ -893,6 +1001,8 @@ class CognosModuleMigratorExplicit:
             self.logger.error(f"Migration failed for report {report_id}: {e}")
             return False
     
+    @applies_artifact_policy
+    @artifact_scope()
     def migrate_report_from_file(self, report_file_path: str, output_path: str) -> bool:
         """Migrate a single Cognos report from a local XML file
         
@@ -917,8 +1027,9 @@ class CognosModuleMigratorExplicit:
             pbit_dir.mkdir(exist_ok=True)
             
             # Step 1: Read report specification from the local file
-            with open(report_file_path, 'r', encoding='utf-8') as f:
-                report_spec = f.read()
+            with span('fetch', report_file=str(report_file_path)):
+                with open(report_file_path, 'r', encoding='utf-8') as f:
+                    report_spec = f.read()
             
             # Create a CognosReport object from the file content
             from cognos_migrator.models import CognosReport
@@ -936,10 +1047,12 @@ class CognosModuleMigratorExplicit:
                 self.report_mquery_converter = ReportMQueryConverter(output_path=str(output_dir))
                 self.project_generator.model_file_generator.mquery_converter = self.report_mquery_converter
             # Save raw Cognos report data to extracted folder
-            self._save_extracted_report_data(cognos_report, extracted_dir)
+            with span('extract'):
+                self._save_extracted_report_data(cognos_report, extracted_dir)
             
             # Step 2: Convert to Power BI structures
-            powerbi_project = self._convert_cognos_report_to_powerbi(cognos_report, extracted_dir)
+            with span('convert'):
+                powerbi_project = self._convert_cognos_report_to_powerbi(cognos_report, extracted_dir)
             if not powerbi_project:
                 self.logger.error(f"Failed to convert report from file: {report_file_path}")
                 return False
@@ -949,13 +1062,15 @@ class CognosModuleMigratorExplicit:
                 self.cpf_metadata_enhancer.enhance_project(powerbi_project)
             
             # Step 3: Generate Power BI project files
-            success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
+            with span('generate_tmdl'):
+                success = self.project_generator.generate_project(powerbi_project, str(pbit_dir))
             if not success:
                 self.logger.error(f"Failed to generate Power BI project files")
                 return False
             
             # Step 4: Generate documentation
-            self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
+            with span('documentation'):
+                self.doc_generator.generate_migration_report(powerbi_project, extracted_dir)
             
             self.logger.info(f"Successfully migrated report from file {report_file_path} to {output_path}")
             return True
@@ -975,7 +1090,7 @@ class CognosModuleMigratorExplicit:
             from cognos_migrator.extractors import (
                 BaseExtractor, QueryExtractor, DataItemExtractor, 
                 ExpressionExtractor, ParameterExtractor, FilterExtractor, 
-                LayoutExtractor
+                LayoutExtractor, ReportSpecIndex
             )
             
             # Initialize extractors locally without LLM dependencies
@@ -992,50 +1107,39 @@ class CognosModuleMigratorExplicit:
             with open(spec_path, "w", encoding="utf-8") as f:
                 f.write(cognos_report.specification)
                 
-            # Save formatted report specification XML for better readability
+            # Save formatted report specification XML for better readability, and split it into
+            # layout and query components; the parsed specification is reused by the extractors
+            spec_document = None
             try:
-                import xml.dom.minidom as minidom
-                formatted_spec_path = extracted_dir / "report_specification_formatted.xml"
-                # Parse the XML string
-                dom = minidom.parseString(cognos_report.specification)
-                # Pretty print with 2-space indentation
-                formatted_xml = dom.toprettyxml(indent='  ')
-                with open(formatted_spec_path, "w", encoding="utf-8") as f:
-                    f.write(formatted_xml)
-                self.logger.info(f"Saved formatted XML to {formatted_spec_path}")
-                
-                # Split report specification into layout and query components
-                from cognos_migrator.generators.utils import save_split_report_specification
-                save_split_report_specification(formatted_spec_path, extracted_dir)
-                self.logger.info(f"Split report specification into layout and query components")
+                from cognos_migrator.generators.utils import save_report_specification_artifacts
+                spec_document = save_report_specification_artifacts(cognos_report.specification, extracted_dir)
+                self.logger.info(f"Saved formatted XML and its layout and query components to {extracted_dir}")
             except Exception as e:
                 self.logger.warning(f"Failed to save formatted XML: {e}")
             
             # Save report metadata as JSON
             metadata_path = extracted_dir / "report_metadata.json"
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(cognos_report.metadata, f, indent=2)
+            write_json_artifact(metadata_path, cognos_report.metadata)
             
             # Save report details as JSON
             details_path = extracted_dir / "report_details.json"
-            with open(details_path, "w", encoding="utf-8") as f:
-                details = {
-                    "id": cognos_report.id,
-                    "name": cognos_report.name,
-                    "extractionTime": str(datetime.now())
-                }
+            details = {
+                "id": cognos_report.id,
+                "name": cognos_report.name,
+                "extractionTime": str(datetime.now())
+            }
+            
+            # Add optional attributes if they exist
+            if hasattr(cognos_report, 'path'):
+                details["path"] = cognos_report.path
+            if hasattr(cognos_report, 'type'):
+                details["type"] = cognos_report.type
                 
-                # Add optional attributes if they exist
-                if hasattr(cognos_report, 'path'):
-                    details["path"] = cognos_report.path
-                if hasattr(cognos_report, 'type'):
-                    details["type"] = cognos_report.type
-                    
-                json.dump(details, f, indent=2)
+            write_json_artifact(details_path, details)
             
             # Save serialized CognosReport object
             report_obj_path = extracted_dir / "cognos_report.json"
-            with open(report_obj_path, "w", encoding="utf-8") as f:
+            if should_write_artifact(report_obj_path):
                 report_dict = {
                     "id": cognos_report.id,
                     "name": cognos_report.name,
@@ -1048,14 +1152,14 @@ class CognosModuleMigratorExplicit:
                 if hasattr(cognos_report, 'type'):
                     report_dict["type"] = cognos_report.type
                     
-                json.dump(report_dict, f, indent=2)
+                write_json_artifact(report_obj_path, report_dict)
             
             # Extract and save additional intermediate files for detailed investigation
             try:
                 import xml.etree.ElementTree as ET
                 import re
-                # Parse the XML for additional extractions
-                root = ET.fromstring(cognos_report.specification)
+                # Parse the XML for additional extractions, unless it was parsed above
+                root = spec_document.root if spec_document is not None else ET.fromstring(cognos_report.specification)
                 
                 # Register the namespace - Cognos XML uses namespaces
                 ns = {}
@@ -1064,20 +1168,21 @@ class CognosModuleMigratorExplicit:
                     ns['ns'] = ns_uri
                     self.logger.info(f"Detected XML namespace: {ns_uri}")
                 
+                # Index the specification once and share it between all extractors
+                spec_index = ReportSpecIndex(root, ns, logger=self.logger)
+                
                 # Extract and save queries
-                queries = query_extractor.extract_queries(root, ns)
+                queries = query_extractor.extract_queries(root, ns, spec_index=spec_index)
                 queries_path = extracted_dir / "report_queries.json"
-                with open(queries_path, "w", encoding="utf-8") as f:
-                    json.dump(queries, f, indent=2)
+                write_json_artifact(queries_path, queries)
                 
                 # Extract and save data items/columns
-                data_items = data_item_extractor.extract_data_items(root, ns)
+                data_items = data_item_extractor.extract_data_items(root, ns, spec_index=spec_index)
                 data_items_path = extracted_dir / "report_data_items.json"
-                with open(data_items_path, "w", encoding="utf-8") as f:
-                    json.dump(data_items, f, indent=2)
+                write_json_artifact(data_items_path, data_items)
                 
                 # Extract and save expressions
-                expressions = expression_extractor.extract_expressions(root, ns)
+                expressions = expression_extractor.extract_expressions(root, ns, spec_index=spec_index)
                 
                 # Convert expressions to DAX if expression converter is available
                 if self.expression_converter:
@@ -1109,26 +1214,22 @@ class CognosModuleMigratorExplicit:
                 
                 # Save calculations in the Cognos format
                 calculations_path = extracted_dir / "calculations.json"
-                with open(calculations_path, "w", encoding="utf-8") as f:
-                    json.dump(calculations, f, indent=2, ensure_ascii=False)
+                write_json_artifact(calculations_path, calculations, ensure_ascii=False)
                 
                 # Extract and save parameters
-                parameters = parameter_extractor.extract_parameters(root, ns)
+                parameters = parameter_extractor.extract_parameters(root, ns, spec_index=spec_index)
                 parameters_path = extracted_dir / "report_parameters.json"
-                with open(parameters_path, "w", encoding="utf-8") as f:
-                    json.dump(parameters, f, indent=2)
+                write_json_artifact(parameters_path, parameters)
                 
                 # Extract and save filters
-                filters = filter_extractor.extract_filters(root, ns)
+                filters = filter_extractor.extract_filters(root, ns, spec_index=spec_index)
                 filters_path = extracted_dir / "report_filters.json"
-                with open(filters_path, "w", encoding="utf-8") as f:
-                    json.dump(filters, f, indent=2)
+                write_json_artifact(filters_path, filters)
                 
                 # Extract and save layout
-                layout = layout_extractor.extract_layout(root, ns)
+                layout = layout_extractor.extract_layout(root, ns, spec_index=spec_index)
                 layout_path = extracted_dir / "report_layout.json"
-                with open(layout_path, "w", encoding="utf-8") as f:
-                    json.dump(layout, f, indent=2)
+                write_json_artifact(layout_path, layout)
                 
                 self.logger.info(f"Saved additional extracted data files to {extracted_dir}")
                 
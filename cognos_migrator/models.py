@@ -66,7 +66,38 @@ class DataSource:
     capabilities: List[str] = field(default_factory=list)
 
 
-@dataclass
+def _dicts_on_access(*names: str):
+    """Class decorator for dict slots left None by default; each dict is created when first accessed
+
+    Most columns never get annotations or metadata, so they share the None default
+    instead of each holding an empty dict. Reading or writing the attributes works
+    as for plain dict fields, and copies and pickles keep the unset ones unset.
+    """
+    def decorator(cls):
+        slots = {name: getattr(cls, name) for name in names}
+
+        def wrap(slot) -> property:
+            def get(self) -> Dict[str, Any]:
+                value = slot.__get__(self)
+                if value is None:
+                    value = {}
+                    slot.__set__(self, value)
+                return value
+            return property(get, slot.__set__, doc=slot.__doc__)
+
+        def __getstate__(self):
+            return None, {name: slots[name].__get__(self) if name in slots else getattr(self, name)
+                          for name in cls.__slots__}
+
+        for name, slot in slots.items():
+            setattr(cls, name, wrap(slot))
+        cls.__getstate__ = __getstate__
+        return cls
+    return decorator
+
+
+@_dicts_on_access('annotations', 'metadata')
+@dataclass(slots=True)
 class Column:
     """Table column definition"""
     name: str
@@ -77,10 +108,12 @@ class Column:
     is_key: bool = False
     is_nullable: bool = True
     description: Optional[str] = None
-    annotations: Dict[str, Any] = field(default_factory=dict)
+    annotations: Dict[str, Any] = None
+    # Migration details of the column, e.g. the relationship_info of the primary date variation
+    metadata: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Table:
     """Table definition"""
     name: str
@@ -94,7 +127,7 @@ class Table:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     """Table relationship definition"""
     from_table: str
@@ -118,7 +151,7 @@ class Relationship:
         return self.id
 
 
-@dataclass
+@dataclass(slots=True)
 class Measure:
     """Calculated measure definition"""
     name: str
@@ -129,7 +162,7 @@ class Measure:
     is_hidden: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class DataModel:
     """Power BI data model"""
     name: str
@@ -141,6 +174,10 @@ class DataModel:
     compatibility_level: int = 1550
     culture: str = "en-US"
     annotations: Dict[str, Any] = field(default_factory=dict)
+    # Date tables created for the model's date columns, as dictionaries with id, name and template_content
+    date_tables: List[Dict[str, Any]] = field(default_factory=list)
+    # table_filtering settings of the migration, if the generator was given any
+    table_filtering: Optional[Dict[str, Any]] = None
 
 
 @dataclass
@@ -6,7 +6,7 @@ Fetches module data from Cognos Analytics REST API and maps it to Power BI Table
 import json
 import logging
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -16,6 +16,26 @@ from .expressions import CognosExpressionConverter
 from .time_intelligence import CognosTimeIntelligenceConverter, create_standard_date_dimension, TimeIntelligenceMeasure
 
 
+# Common foreign key patterns; group 1 is the referenced table
+_FK_COLUMN_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'(.+)_id$',           # customer_id -> customer.id
+    r'(.+)id$',            # customerid -> customer.id
+    r'fk_(.+)',            # fk_customer -> customer.id
+    r'(.+)_key$',          # customer_key -> customer.key
+    r'(.+)_ref$',          # customer_ref -> customer.id
+))
+
+# Common primary key patterns
+_PK_COLUMN_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'^id$',
+    r'^(.+)_id$',
+    r'^(.+)id$',
+    r'^pk_(.+)',
+    r'^(.+)_key$',
+    r'^key$'
+))
+
+
 @dataclass
 class ModuleColumn:
     """Represents a column from a Cognos module"""
@@ -194,12 +214,15 @@ class CognosModuleParser:
         
         return columns
     
-    def detect_relationships(self, modules_metadata: List[Dict]) -> List[Relationship]:
+    def detect_relationships(self, modules_metadata: List[Dict],
+                             module_tables: Optional[List[ModuleTable]] = None) -> List[Relationship]:
         """
         Detect relationships between modules/tables
         
         Args:
             modules_metadata: List of module metadata from Cognos
+            module_tables: Tables already parsed from the modules, in the same
+                order, whose columns are reused instead of parsing them again
             
         Returns:
             List of detected relationships
@@ -208,7 +231,7 @@ class CognosModuleParser:
         
         try:
             # Method 1: Detect by column name patterns (FK conventions)
-            relationships.extend(self._detect_relationships_by_naming(modules_metadata))
+            relationships.extend(self._detect_relationships_by_naming(modules_metadata, module_tables))
             
             # Method 2: Detect by data lineage if available
             relationships.extend(self._detect_relationships_by_lineage(modules_metadata))
@@ -223,57 +246,83 @@ class CognosModuleParser:
         
         return relationships
     
-    def _detect_relationships_by_naming(self, modules_metadata: List[Dict]) -> List[Relationship]:
+    def _detect_relationships_by_naming(self, modules_metadata: List[Dict],
+                                        module_tables: Optional[List[ModuleTable]] = None) -> List[Relationship]:
         """Detect relationships based on column naming conventions"""
-        relationships = []
-        
-        # Build table-column mapping
+        # Build table-column mapping, reusing the columns of already parsed tables
         table_columns = {}
-        for module in modules_metadata:
-            table_name = self._get_table_name(module)
-            columns = self._parse_columns(module)
+        for index, module in enumerate(modules_metadata):
+            if module_tables is not None:
+                table_name, columns = module_tables[index].name, module_tables[index].columns
+            else:
+                table_name, columns = self._extract_table_name(module), self._parse_columns(module)
             table_columns[table_name] = [col.name for col in columns]
         
-        # Common foreign key patterns
-        fk_patterns = [
-            r'(.+)_id$',           # customer_id -> customer.id
-            r'(.+)id$',            # customerid -> customer.id  
-            r'fk_(.+)',            # fk_customer -> customer.id
-            r'(.+)_key$',          # customer_key -> customer.key
-            r'(.+)_ref$',          # customer_ref -> customer.id
-        ]
+        return self.infer_foreign_keys(table_columns)
+    
+    def infer_foreign_keys(self, table_columns: Mapping[str, Sequence[str]]) -> List[Relationship]:
+        """
+        Infer many-to-one relationships from foreign key column names
+        
+        A column such as customer_id refers to the first table named customer
+        or customers (or customer for customers_id), and is related to that
+        table's primary key column. Tables are looked up by lowercase name, so the
+        inference scales with the total number of columns.
         
-        for table_name, columns in table_columns.items():
+        Args:
+            table_columns: Column names by table name, in table order
+            
+        Returns:
+            List of inferred relationships
+        """
+        tables = list(table_columns.items())
+        
+        # Table positions by lowercase name; the first table with a name wins
+        table_positions: Dict[str, int] = {}
+        for position, (table_name, _) in enumerate(tables):
+            table_positions.setdefault(table_name.lower(), position)
+        
+        # Tables matching a referenced name, in table order, and primary keys by table position
+        referenced_tables: Dict[str, List[int]] = {}
+        primary_keys: Dict[int, Optional[str]] = {}
+        
+        relationships = []
+        for table_name, columns in tables:
             for column in columns:
                 column_lower = column.lower()
                 
-                for pattern in fk_patterns:
-                    match = re.match(pattern, column_lower)
-                    if match:
-                        referenced_table = match.group(1)
+                for pattern in _FK_COLUMN_PATTERNS:
+                    match = pattern.match(column_lower)
+                    if not match:
+                        continue
+                    referenced_table = match.group(1)
+                    
+                    if referenced_table not in referenced_tables:
+                        variants = (referenced_table, referenced_table + 's', referenced_table.rstrip('s'))
+                        referenced_tables[referenced_table] = sorted(
+                            {table_positions[name] for name in variants if name in table_positions})
+                    
+                    # The first matching table with a primary key column
+                    for position in referenced_tables[referenced_table]:
+                        if position not in primary_keys:
+                            primary_keys[position] = self._find_primary_key_column(tables[position][1])
+                        pk_column = primary_keys[position]
                         
-                        # Look for matching table
-                        for other_table, other_columns in table_columns.items():
-                            if (other_table.lower() == referenced_table or 
-                                other_table.lower() == referenced_table + 's' or
-                                other_table.lower() == referenced_table.rstrip('s')):
-                                
-                                # Find primary key column in referenced table
-                                pk_column = self._find_primary_key_column(other_columns)
-                                
-                                if pk_column:
-                                    relationship = Relationship(
-                                        from_table=table_name,
-                                        from_column=column,
-                                        to_table=other_table,
-                                        to_column=pk_column,
-                                        id=f"{table_name}_{column}_to_{other_table}_{pk_column}",
-                                        cardinality="many_to_one",
-                                        cross_filter_behavior="single",
-                                        is_active=True
-                                    )
-                                    relationships.append(relationship)
-                                    break
+                        if pk_column:
+                            other_table = tables[position][0]
+                            relationship = Relationship(
+                                from_table=table_name,
+                                from_column=column,
+                                to_table=other_table,
+                                to_column=pk_column,
+                                id=f"{table_name}_{column}_to_{other_table}_{pk_column}",
+                                from_cardinality="many",
+                                to_cardinality="one",
+                                cross_filtering_behavior="OneDirection",
+                                is_active=True
+                            )
+                            relationships.append(relationship)
+                            break
         
         return relationships
     
@@ -322,20 +371,10 @@ class CognosModuleParser:
     
     def _find_primary_key_column(self, columns: List[str]) -> Optional[str]:
         """Find the primary key column in a list of columns"""
-        # Common primary key patterns
-        pk_patterns = [
-            r'^id$',
-            r'^(.+)_id$',
-            r'^(.+)id$', 
-            r'^pk_(.+)',
-            r'^(.+)_key$',
-            r'^key$'
-        ]
-        
         for column in columns:
             column_lower = column.lower()
-            for pattern in pk_patterns:
-                if re.match(pattern, column_lower):
+            for pattern in _PK_COLUMN_PATTERNS:
+                if pattern.match(column_lower):
                     return column
         
         # If no pattern matches, return first column (assumption)
@@ -6,7 +6,7 @@ overwriting the file with a clean version.
 import logging
 import re
 from collections import deque
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Set
 
 class Graph:
     """A simple graph class to detect cycles in relationships."""
@@ -27,12 +27,10 @@ class Graph:
         if start_node not in self.graph or end_node not in self.graph:
             return False
         
-        if nodes_to_ignore is None:
-            nodes_to_ignore = []
+        ignored = {ign.lower() for ign in nodes_to_ignore or []}
 
-        visited = {node: False for node in self.graph}
+        visited = {start_node}
         queue = deque([start_node])
-        visited[start_node] = True
 
         while queue:
             u = queue.popleft()
@@ -40,13 +38,86 @@ class Graph:
                 return True
             for v in self.graph.get(u, []):
                 # Ignore specified nodes
-                if v.lower() in [ign.lower() for ign in nodes_to_ignore]:
+                if v in visited or v.lower() in ignored:
                     continue
-                if not visited[v]:
-                    visited[v] = True
-                    queue.append(v)
+                visited.add(v)
+                queue.append(v)
         return False
 
+
+class ConnectivityIndex:
+    """Incremental connectivity of a growing graph, backed by a disjoint-set forest.
+
+    Answers the same question as Graph.path_exists with a fixed set of
+    ignored nodes, in near-constant time per edge and query instead of a
+    breadth-first search over the whole graph. Paths never pass through an
+    ignored node, but a path may start at one: an ignored node reaches every
+    component it has an edge to, while no path leads to it.
+    """
+
+    def __init__(self, nodes: Iterable[str], nodes_to_ignore: Iterable[str] | None = None):
+        """Initialize the index with unconnected nodes."""
+        ignore_lower = {ign.lower() for ign in nodes_to_ignore or []}
+        self.parent: Dict[str, str] = {}
+        self.size: Dict[str, int] = {}
+        self.ignored: Set[str] = set()
+        for node in nodes:
+            if node.lower() in ignore_lower:
+                self.ignored.add(node)
+            else:
+                self.parent[node] = node
+                self.size[node] = 1
+        # Ignored nodes with an edge into each component, keyed by component root
+        self.ignored_neighbors: Dict[str, Set[str]] = {}
+
+    def find(self, node: str) -> str:
+        """Get the root of a node's component, compressing the path to it."""
+        parent = self.parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def add_edge(self, u: str, v: str):
+        """Add an edge between two nodes; edges to unknown nodes are ignored like in Graph."""
+        u_known = u in self.parent or u in self.ignored
+        v_known = v in self.parent or v in self.ignored
+        if not (u_known and v_known):
+            return
+        if u in self.ignored or v in self.ignored:
+            if u in self.parent:
+                self.ignored_neighbors.setdefault(self.find(u), set()).add(v)
+            elif v in self.parent:
+                self.ignored_neighbors.setdefault(self.find(v), set()).add(u)
+            return
+
+        root_u, root_v = self.find(u), self.find(v)
+        if root_u == root_v:
+            return
+        # Union by size, keeping the ignored neighbors of both components
+        if self.size[root_u] < self.size[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        self.size[root_u] += self.size[root_v]
+        merged = self.ignored_neighbors.pop(root_v, None)
+        if merged:
+            self.ignored_neighbors.setdefault(root_u, set()).update(merged)
+
+    def path_exists(self, start_node: str, end_node: str) -> bool:
+        """Check if a path exists between two nodes, not passing through ignored nodes."""
+        if start_node == end_node:
+            return start_node in self.parent or start_node in self.ignored
+        if end_node not in self.parent:
+            # Unknown, or ignored and therefore never reached
+            return False
+        if start_node in self.ignored:
+            return start_node in self.ignored_neighbors.get(self.find(end_node), ())
+        if start_node not in self.parent:
+            return False
+        return self.find(start_node) == self.find(end_node)
+
 class TMDLPostProcessor:
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(__name__)
@@ -162,13 +233,13 @@ class TMDLPostProcessor:
         self.logger.info(f"Prioritized {len(prioritized_list)} relationships for processing based on key strength and centrality.")
 
         final_relationships = []
-        model_graph = Graph(nodes=[t.lower() for t in all_tables])
+        model_graph = ConnectivityIndex(nodes=[t.lower() for t in all_tables], nodes_to_ignore=['centraldatetable'])
 
         for rel in prioritized_list:
             from_table = rel['from_table'].lower()
             to_table = rel['to_table'].lower()
 
-            if model_graph.path_exists(from_table, to_table, nodes_to_ignore=['centraldatetable']):
+            if model_graph.path_exists(from_table, to_table):
                 self.logger.warning(
                     f"DISCARDED: Ambiguous relationship from '{rel['from_table']}' to '{rel['to_table']}' "
                     f"on column '{rel['from_column']}'. A path already exists."
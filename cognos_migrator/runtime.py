@@ -0,0 +1,216 @@
+"""
+Long-lived runtime for migrating many reports, modules and packages.
+
+Each call to migrate_single_report and the other migration functions sets up
+everything from scratch: it reconfigures logging (opening a new log file),
+tests the Cognos session, and builds a CognosModuleMigratorExplicit, which
+verifies the session again, loads and compiles every template and creates
+the LLM client, converters and extractors. For a batch of small reports that
+setup costs far more than the migrations themselves.
+
+A MigrationRuntime does the setup once and keeps it: the Cognos client,
+template engine, LLM client, converters and extractors are shared by every
+migration submitted to it, and the session is verified only once.
+
+Example:
+    with MigrationRuntime(cognos_url, session_key) as runtime:
+        for path in report_files:
+            runtime.migrate_report(output_path=f"./output/{Path(path).stem}", report_file_path=path)
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from cognos_migrator.config import MigrationConfig, CognosConfig
+from cognos_migrator.common.logging import configure_logging, log_info, log_error
+from cognos_migrator.client import CognosClient, CognosAPIError
+from cognos_migrator.common.parallel import run_ordered
+from cognos_migrator.common.websocket_client import flush_websocket_data
+
+
+class MigrationRuntime:
+    """Shared migration setup that report, module and package migrations can be submitted to
+
+    Safe to use from several threads: each thread migrates with its own
+    migrator, created from the runtime's one on first use. Worker migrators
+    share the client, templates, LLM client and expression converter, so
+    creating them is cheap.
+    """
+
+    def __init__(self, cognos_url: str, session_key: str, auth_key: str = "IBM-BA-Authorization",
+                 settings: Optional[Dict[str, Any]] = None, cpf_file_path: Optional[str] = None,
+                 migration_config: Optional[MigrationConfig] = None, logger=None,
+                 log_name: Optional[str] = "cognos_migration"):
+        """Set up logging, the Cognos client and the migration components once
+
+        Args:
+            cognos_url: The Cognos base URL
+            session_key: The session key for authentication
+            auth_key: The authentication header key
+            settings: Optional settings dictionary to override default settings.json
+            cpf_file_path: Optional path to CPF file for enhanced metadata
+            migration_config: Migration configuration; defaults to the one used by
+                migrate_single_report, with the package templates and the DAX API
+            logger: Logger for the migrators
+            log_name: Name of the log file configure_logging opens for the runtime,
+                or None to leave the logging configuration alone
+        """
+        if log_name is not None:
+            configure_logging(log_name)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.cognos_url = cognos_url
+        self.session_key = session_key
+        self.settings = settings
+        self.migration_config = migration_config or MigrationConfig(
+            preserve_structure=True,
+            include_metadata=True,
+            generate_documentation=True,
+            template_directory=str(Path(__file__).parent / "templates"),
+            llm_service_url=os.environ.get('DAX_API_URL', 'http://localhost:8080'),
+            llm_service_enabled=True
+        )
+        self.cognos_config = CognosConfig(
+            base_url=cognos_url,
+            auth_key=auth_key,
+            auth_value=session_key,
+            session_timeout=3600,
+            max_retries=3,
+            request_timeout=30
+        )
+
+        from cognos_migrator.migrator import CognosModuleMigratorExplicit
+
+        self._migrator = CognosModuleMigratorExplicit(
+            migration_config=self.migration_config,
+            cognos_config=self.cognos_config,
+            cognos_url=cognos_url,
+            session_key=session_key,
+            logger=self.logger,
+            cpf_file_path=cpf_file_path,
+            settings=settings
+        )
+        self._thread_state = threading.local()
+        self._thread_state.migrator = self._migrator
+        self._session_valid: Optional[bool] = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def cognos_client(self) -> CognosClient:
+        return self._migrator.cognos_client
+
+    @property
+    def template_engine(self):
+        return self._migrator.template_engine
+
+    @property
+    def llm_service_client(self):
+        return self._migrator.llm_service_client
+
+    @property
+    def migrator(self):
+        """Migrator for the calling thread"""
+        migrator = getattr(self._thread_state, 'migrator', None)
+        if migrator is None:
+            migrator = self._thread_state.migrator = self._migrator._create_worker_migrator()
+        return migrator
+
+    def verify_session(self) -> None:
+        """Check the Cognos session once for the lifetime of the runtime
+
+        Raises:
+            CognosAPIError: If the session is expired or invalid
+        """
+        with self._session_lock:
+            if self._session_valid is None:
+                log_info(f"Testing connection to Cognos at {self.cognos_url}")
+                self._session_valid = CognosClient.test_connection_with_session(self.cognos_url, self.session_key)
+        if not self._session_valid:
+            log_error("Session key is expired or invalid")
+            raise CognosAPIError("Session key is expired or invalid")
+
+    def migrate_report(self, output_path: str, report_id: Optional[str] = None,
+                       report_file_path: Optional[str] = None, task_id: Optional[str] = None) -> bool:
+        """Migrate a single report by ID or from a local XML file, see migrate_single_report"""
+        from cognos_migrator.migrations.report import migrate_single_report
+
+        return migrate_single_report(
+            output_path=output_path,
+            cognos_url=self.cognos_url,
+            session_key=self.session_key,
+            report_id=report_id,
+            report_file_path=report_file_path,
+            task_id=task_id,
+            settings=self.settings,
+            runtime=self
+        )
+
+    def migrate_module(self, module_id: str, output_path: str, folder_id: Optional[str] = None,
+                       task_id: Optional[str] = None) -> bool:
+        """Migrate a Cognos module, see migrate_module_with_explicit_session"""
+        from cognos_migrator.migrations.module import migrate_module_with_explicit_session
+
+        return migrate_module_with_explicit_session(
+            module_id=module_id,
+            output_path=output_path,
+            cognos_url=self.cognos_url,
+            session_key=self.session_key,
+            folder_id=folder_id,
+            task_id=task_id,
+            settings=self.settings,
+            runtime=self
+        )
+
+    def migrate_package(self, package_file_path: str, output_path: str,
+                        task_id: Optional[str] = None) -> bool:
+        """Migrate a Framework Manager package file, see migrate_package_with_explicit_session"""
+        from cognos_migrator.migrations.package import migrate_package_with_explicit_session
+
+        return migrate_package_with_explicit_session(
+            package_file_path=package_file_path,
+            output_path=output_path,
+            cognos_url=self.cognos_url,
+            session_key=self.session_key,
+            task_id=task_id,
+            settings=self.settings,
+            runtime=self
+        )
+
+    def migrate_report_files(self, report_file_paths: Iterable[str], output_path: str,
+                             max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """Migrate a batch of local report XML files, each into output_path/<file stem>
+
+        Args:
+            report_file_paths: Report XML files to migrate
+            output_path: Directory receiving one output folder per report
+            max_workers: Number of reports migrated concurrently; defaults to
+                the max_workers of the migration configuration
+
+        Returns:
+            Dictionary mapping each report file path to its migration result
+        """
+        paths = [str(path) for path in report_file_paths]
+        workers = max_workers if max_workers is not None else self.migration_config.max_workers
+
+        def migrate_one(path):
+            try:
+                return self.migrator.migrate_report_from_file(path, str(Path(output_path) / Path(path).stem))
+            except Exception as e:
+                self.logger.error(f"Error migrating report file {path}: {e}")
+                return False
+
+        return dict(zip(paths, run_ordered(paths, migrate_one, workers)))
+
+    def close(self) -> None:
+        """Deliver queued progress messages and close the Cognos client's HTTP connections"""
+        flush_websocket_data()
+        self.cognos_client.session.close()
+
+    def __enter__(self) -> 'MigrationRuntime':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -42,10 +42,6 @@ def create_central_date_table(data_model: DataModel, logger=None) -> None:
         logger.error(f"Failed to read DateTableTemplate.tmdl: {e}")
         return
     
-    # Initialize date_tables attribute if it doesn't exist
-    if not hasattr(data_model, 'date_tables'):
-        data_model.date_tables = []
-    
     # Create the central date table
     date_table_name = "CentralDateTable"
     
@@ -0,0 +1,108 @@
+"""
+Mock Cognos Analytics REST server for tests.
+
+Serves a generated content store of nested folders and reports over
+/api/v1/session, /api/v1/content and /api/v1/content/{id}/items, with an
+optional per-request latency. It records every request path, the fields
+requested, and the peak number of requests in flight, so tests can check
+how and when a client walks the tree.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class MockCognosServer:
+    """Content store with `depth` levels of `folders_per_folder` folders, each holding `reports_per_folder` reports
+
+    Use as a context manager; base_url points at the /api/v1 root.
+    """
+
+    ROOT_FOLDER_ID = "root"
+
+    def __init__(self, depth=3, folders_per_folder=3, reports_per_folder=2, latency=0.0):
+        self.latency = latency
+        self.children = {}
+        self.requests = []
+        self.request_times = []
+        self.fields_seen = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._build(self.ROOT_FOLDER_ID, depth, folders_per_folder, reports_per_folder)
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}/api/v1"
+
+    def _build(self, folder_id, depth, folders_per_folder, reports_per_folder):
+        items = [
+            {"id": f"{folder_id}.r{i}", "type": "report", "defaultName": f"Report {folder_id}.r{i}",
+             "modificationTime": "2024-01-01T00:00:00.000Z", "owner": [{"defaultName": "Admin"}]}
+            for i in range(reports_per_folder)
+        ]
+        if depth > 0:
+            for i in range(folders_per_folder):
+                child_id = f"{folder_id}.f{i}"
+                items.insert(i, {"id": child_id, "type": "folder", "defaultName": f"Folder {child_id}"})
+                self._build(child_id, depth - 1, folders_per_folder, reports_per_folder)
+        self.children[folder_id] = items
+
+    @property
+    def report_ids(self):
+        return {item["id"] for items in self.children.values() for item in items if item["type"] == "report"}
+
+    def _handle(self, handler):
+        url = urlsplit(handler.path)
+        params = parse_qs(url.query)
+        with self._lock:
+            self.requests.append(url.path)
+            self.request_times.append(time.perf_counter())
+            self.fields_seen.update(params.get('fields', []))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            parts = url.path.split('/')
+            if url.path == '/api/v1/session':
+                self._send(handler, 200, {"isAnonymous": False})
+            elif url.path == '/api/v1/content':
+                self._send(handler, 200, {"content": self.children[self.ROOT_FOLDER_ID]})
+            elif len(parts) == 6 and parts[5] == 'items' and parts[4] in self.children:
+                self._send(handler, 200, {"content": self.children[parts[4]]})
+            else:
+                self._send(handler, 404, {"message": "not found"})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _send(handler, status, data):
+        body = json.dumps(data).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Test script to verify the lean artifact policy leaves out investigation-only
+intermediate files and writes JSON compactly, without changing the migrated
+Power BI project.
+"""
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.common.artifact_policy import (
+    ArtifactPolicy, artifact_policy_scope, get_artifact_policy, write_json_artifact
+)
+from cognos_migrator.common.artifact_store import artifact_scope, load_json, save_json
+from cognos_migrator.common.tracing import TIMINGS_FILE_NAME
+from cognos_migrator.config import MigrationConfig
+from cognos_migrator.migrations.package import migrate_package_with_local_reports
+
+from mock_cognos_server import MockCognosServer
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+PACKAGE_FILE = EXAMPLES / "packages" / "ELECTRIC_GENERATION_MAT.xml"
+REPORT_FILES = [EXAMPLES / "Report XMLs DE" / name for name in ("PartNumbers_UC013.xml", "MaterialInquiryDetail_UC012.xml")]
+
+# Relationship, section and visual IDs and timestamps are generated anew for every migration
+GENERATED_ID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\b[0-9a-f]{20}\b|_[0-9a-f]{5}(?=/)'
+                          r'|\d{4}-\d\d-\d\dT[\d:.]+(\+00:00|Z)?')
+
+SETTINGS = {
+    "table_filtering": {"mode": "direct", "always_include": []},
+    "staging_tables": {"enabled": False},
+}
+
+
+@pytest.fixture
+def offline_services(monkeypatch):
+    """No DAX API and no LLM response cache, so reports are migrated without the service."""
+    monkeypatch.setenv("DAX_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("COGNOS_MIGRATOR_LLM_CACHE", "off")
+
+
+def test_policy_from_settings():
+    """Lean mode skips debug artifacts unless kept; the migration configuration overrides the settings."""
+    policy = ArtifactPolicy.from_settings({"artifacts": {"mode": "lean", "keep": ["cognos_report.json"]}})
+    assert not policy.should_write("/out/extracted/report_specification_formatted.xml")
+    assert not policy.should_write("ELECTRIC_GENERATION_MAT_consolidated.json")
+    assert policy.should_write("cognos_report.json")
+    assert policy.should_write("report_queries.json") and policy.should_write("table_Sales.json")
+    assert policy.json_dump_options() == {'separators': (',', ':')}
+
+    full = ArtifactPolicy.from_settings({"artifacts": {"mode": "lean", "skip": ["report_layout.json"]}},
+                                        MigrationConfig(artifact_mode="full"))
+    assert full.should_write("report_specification_formatted.xml")
+    assert not full.should_write("report_layout.json")
+    assert full.json_dump_options() == {'indent': 2}
+
+    assert ArtifactPolicy.from_settings({"artifacts": {"mode": "tiny"}}).mode == 'full'
+    with pytest.raises(ValueError):
+        ArtifactPolicy("tiny")
+
+
+def test_writes_follow_the_current_policy(tmp_path):
+    """Direct and deferred JSON writes are skipped or compacted inside a lean scope only."""
+    data = {"name": "Sales", "columns": [1, 2]}
+    with artifact_policy_scope(ArtifactPolicy("lean")):
+        assert not write_json_artifact(tmp_path / "cognos_report.json", data)
+        assert write_json_artifact(tmp_path / "report_queries.json", data)
+        with artifact_scope():
+            save_json(tmp_path / "table_Sales.json", data)
+            save_json(tmp_path / "model.json", data)
+            assert load_json(tmp_path / "table_Sales.json") == data
+    assert get_artifact_policy().mode == 'full'
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["report_queries.json", "table_Sales.json"]
+    assert (tmp_path / "table_Sales.json").read_text(encoding='utf-8') == '{"name":"Sales","columns":[1,2]}'
+
+    write_json_artifact(tmp_path / "cognos_report.json", data)
+    assert (tmp_path / "cognos_report.json").read_text(encoding='utf-8') == json.dumps(data, indent=2)
+
+
+def migrate(server, output_path, mode):
+    settings = {**SETTINGS, "artifacts": {"mode": mode}}
+    success, _ = migrate_package_with_local_reports(str(PACKAGE_FILE), str(output_path), [str(r) for r in REPORT_FILES],
+                                                    server.base_url, "session", settings=settings)
+    assert success
+    return json.loads((output_path / TIMINGS_FILE_NAME).read_text(encoding='utf-8'))['counters']
+
+
+def files(directory: Path) -> dict:
+    return {GENERATED_ID.sub('', str(p.relative_to(directory))): p for p in sorted(directory.rglob('*')) if p.is_file()}
+
+
+def without_generated_ids(path: Path) -> str:
+    return GENERATED_ID.sub('', path.read_text(encoding='utf-8'))
+
+
+def test_lean_migration_writes_the_same_project(tmp_path, offline_services):
+    """A lean shared model migration writes fewer, smaller files and the same pbit project."""
+    with MockCognosServer(depth=0) as server:
+        full_counters = migrate(server, tmp_path / "full", "full")
+        lean_counters = migrate(server, tmp_path / "lean", "lean")
+
+    assert lean_counters['artifacts_skipped'] > 0 and 'artifacts_skipped' not in full_counters
+    assert lean_counters['files_written'] < full_counters['files_written']
+    assert lean_counters['bytes_written'] < full_counters['bytes_written'] / 2
+
+    full_files, lean_files = files(tmp_path / "full"), files(tmp_path / "lean")
+    skipped = set(full_files) - set(lean_files)
+    assert not set(lean_files) - set(full_files) - {TIMINGS_FILE_NAME}
+    assert {Path(name).name for name in skipped} >= {
+        "report_specification_formatted.xml", "report_layout_specification.xml", "cognos_report.json",
+        "ELECTRIC_GENERATION_MAT_formatted.xml", "ELECTRIC_GENERATION_MAT_consolidated.json",
+        "sql_relationship_joins.csv",
+    }
+    # The copy of the formatted package XML goes with it
+    assert not any(ArtifactPolicy("lean").should_write(name) for name in skipped if Path(name) != Path("extracted", PACKAGE_FILE.name))
+
+    # Files the migration reads back are still written, compactly
+    report_queries = lean_files["intermediate_reports/PartNumbers_UC013/extracted/report_queries.json"]
+    assert json.loads(report_queries.read_text(encoding='utf-8'))
+    assert "\n" not in report_queries.read_text(encoding='utf-8')
+
+    pbit_files = [name for name in full_files if name.startswith("pbit/")]
+    assert pbit_files and pbit_files == [name for name in lean_files if name.startswith("pbit/")]
+    for name in pbit_files:
+        assert without_generated_ids(lean_files[name]) == without_generated_ids(full_files[name]), name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
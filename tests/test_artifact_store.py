@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Test script to verify extracted JSON documents are held in memory during a
+migration, read back without touching the disk, and written once at the end.
+"""
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.common.artifact_store import (
+    artifact_scope, get_artifact_store, glob_json, json_exists, load_json, save_json
+)
+from cognos_migrator.generators.model_file_generator import ModelFileGenerator
+from cognos_migrator.generators.template_engine import TemplateEngine
+from cognos_migrator.migrations.package import _merge_calculations_into_table_json
+from cognos_migrator.models import Column, DataModel, DataType, Table
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "cognos_migrator" / "templates"
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def test_documents_are_written_once_at_scope_end(tmp_path):
+    """Saved documents stay in memory until the scope ends, then hit the disk once."""
+    path = tmp_path / "extracted" / "table_Sales.json"
+    with artifact_scope() as store:
+        save_json(path, {"name": "Sales", "columns": []})
+        assert not path.exists()
+        assert json_exists(path)
+
+        document = load_json(path)
+        document["columns"].append({"source_name": "Amount"})
+        save_json(path, document)
+        assert glob_json(tmp_path / "extracted", "table_*.json") == [path]
+        assert store.loads == 0
+
+    assert get_artifact_store() is None
+    assert store.writes == 1
+    assert json.loads(path.read_text(encoding='utf-8'))["columns"] == [{"source_name": "Amount"}]
+
+
+def test_files_on_disk_are_parsed_once_and_outside_writes_are_noticed(tmp_path):
+    """Shared inputs are parsed once per migration, but a rewritten file is reloaded."""
+    path = tmp_path / "calculations.json"
+    write_json(path, {"calculations": []})
+    with artifact_scope() as store:
+        for _ in range(5):
+            assert load_json(path) == {"calculations": []}
+        assert store.loads == 1
+
+        write_json(path, {"calculations": [{"CognosName": "Margin"}]})
+        assert load_json(path)["calculations"][0]["CognosName"] == "Margin"
+        assert store.loads == 2
+        assert load_json(tmp_path / "missing.json", None) is None
+
+
+def test_model_generation_reads_table_json_from_memory(tmp_path):
+    """Generating TMDL and merging calculations never re-reads the table JSON files."""
+    extracted_dir = tmp_path / "extracted"
+    write_json(extracted_dir / "report_data_items.json", [
+        {"name": "Amount", "queryName": "Sales", "type": "dataItem"},
+        {"name": "Region", "queryName": "Sales", "type": "dataItem"},
+    ])
+    write_json(extracted_dir / "calculations.json", {"calculations": [
+        {"TableName": "Sales", "CognosName": "Double Amount", "FormulaDax": "[Amount] * 2"},
+    ]})
+
+    tables = [
+        Table(name=name, columns=[Column(name="Amount", data_type=DataType.DECIMAL, source_column="Amount")],
+              m_query='let\n    Source = Table.FromRows({})\nin\n    Source')
+        for name in ("Sales", "Returns", "Targets")
+    ]
+    generator = ModelFileGenerator(TemplateEngine(template_directory=str(TEMPLATE_DIR)))
+    (tmp_path / "pbit").mkdir()
+
+    with artifact_scope() as store:
+        generator.generate_model_files(DataModel(name="Sales", tables=tables), tmp_path / "pbit")
+        _merge_calculations_into_table_json(tmp_path)
+        assert not (extracted_dir / "table_Sales.json").exists()
+        # report_data_items.json and calculations.json, parsed once each for all tables
+        assert store.loads == 2
+
+    sales = json.loads((extracted_dir / "table_Sales.json").read_text(encoding='utf-8'))
+    assert [c["source_name"] for c in sales["columns"]] == ["Amount", "Region", "Double Amount"]
+    assert (tmp_path / "pbit" / "Model" / "tables" / "Targets.tmdl").exists()
+    assert "Source = Table.FromRows" in (tmp_path / "pbit" / "Model" / "tables" / "Sales.tmdl").read_text()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
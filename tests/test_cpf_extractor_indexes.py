@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Test script to verify CPFExtractor serves lookups from indexes with the same
+results as scanning the metadata, and scales to 10,000 query subjects.
+"""
+import logging
+import sys
+import time
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.cpf_extractor import CPFExtractor
+from cognos_migrator.enhancers.cpf_metadata_enhancer import CPFMetadataEnhancer
+from cognos_migrator.models import Column, DataModel, DataType, PowerBIProject, Table
+
+COLUMNS_PER_SUBJECT = 8
+
+
+def synthetic_metadata(query_subjects: int) -> dict:
+    """CPF metadata shaped like CPFParser.extract_all(), each subject related to the next two."""
+    subjects = []
+    for i in range(query_subjects):
+        subjects.append({
+            'id': f"qs{i}",
+            'name': f"Subject {i}",
+            'type': 'modelQuery',
+            'dataSourceId': f"ds{i % 5}",
+            'tableName': f"TABLE_{i}",
+            'columns': [{'id': f"qs{i}.c{c}", 'name': f"COLUMN_{c}", 'dataType': 'xs:integer' if c == 0 else 'xs:string',
+                         'nullable': True, 'expression': f"[TABLE_{i}].[COLUMN_{c}]"}
+                        for c in range(COLUMNS_PER_SUBJECT)],
+            'relationships': [{'id': f"rel{i}_{t}", 'name': '', 'cardinality': 'manyToOne',
+                               'sourceQuerySubjectId': f"qs{i}", 'targetQuerySubjectId': f"qs{t}",
+                               'sourceColumns': [f"qs{i}.c0"], 'targetColumns': [f"qs{t}.c0"]}
+                              for t in ((i + 1) % query_subjects, (i + 2) % query_subjects)],
+        })
+    return {
+        'dataSources': [{'id': f"ds{d}", 'name': f"Source {d}", 'type': 'relational'} for d in range(5)],
+        'querySubjects': subjects,
+        'namespaces': [],
+    }
+
+
+def test_lookups_match_scans():
+    """Indexed lookups return what the first matching entry of a scan would."""
+    extractor = CPFExtractor()
+    extractor.metadata = synthetic_metadata(50)
+    duplicate = dict(extractor.metadata['querySubjects'][3], name='Duplicate')
+    extractor.metadata['querySubjects'].append(duplicate)
+    subjects = extractor.metadata['querySubjects']
+
+    assert extractor.get_query_subject_by_name('Subject 7') is subjects[7]
+    assert extractor.get_query_subject_by_id('qs3') is subjects[3]
+    assert extractor.get_table_schema('TABLE_3')['name'] == 'Subject 3'
+    assert extractor.get_column_name_by_id('qs9.c2') == 'COLUMN_2'
+    assert extractor.get_data_source_by_name('Source 2')['id'] == 'ds2'
+    # A related query subject is listed once for every subject with its ID
+    assert [qs['name'] for qs in extractor.get_related_query_subjects('qs1')] == ['Subject 2', 'Subject 3', 'Duplicate']
+    assert extractor.get_query_subject_by_name('missing') == {}
+    assert extractor.get_column_name_by_id('missing') == ''
+    assert extractor.get_related_query_subjects('missing') == []
+
+    # Replacing the metadata rebuilds the indexes
+    extractor.metadata = synthetic_metadata(2)
+    assert extractor.get_query_subject_by_name('Subject 7') == {}
+    assert CPFExtractor().get_query_subject_by_id('qs1') == {}
+
+
+def test_lookups_scale_to_10000_query_subjects():
+    """The per-table and per-relationship lookups of the CPF enhancer take seconds, not minutes."""
+    query_subjects = 10000
+    extractor = CPFExtractor()
+    extractor.metadata = synthetic_metadata(query_subjects)
+
+    start = time.perf_counter()
+    contexts = [extractor.generate_m_query_context(f"Subject {i}") for i in range(query_subjects)]
+    related = [extractor.get_related_query_subjects(f"qs{i}") for i in range(query_subjects)]
+    elapsed = time.perf_counter() - start
+
+    assert contexts[10]['relationships'][0] == {'targetTable': 'Subject 11', 'cardinality': 'manyToOne',
+                                                'sourceColumns': ['COLUMN_0'], 'targetColumns': ['COLUMN_0']}
+    assert [c['name'] for c in contexts[-1]['columns']] == [f"COLUMN_{c}" for c in range(COLUMNS_PER_SUBJECT)]
+    assert [qs['id'] for qs in related[-1]] == ['qs0', 'qs1']
+    assert elapsed < 10, f"Looking up 10,000 query subjects took {elapsed:.2f}s"
+
+
+def test_enhancer_matches_columns_by_name():
+    """The enhancer updates the columns of a table from its CPF query subject."""
+    extractor = CPFExtractor()
+    extractor.metadata = synthetic_metadata(3)
+    for qs in extractor.metadata['querySubjects']:
+        qs['relationships'] = []
+    table = Table(name='Subject 1', columns=[Column(name=f"COLUMN_{c}", data_type=DataType.STRING,
+                                                    source_column=f"COLUMN_{c}") for c in (1, 0)])
+    project = PowerBIProject(name='Model', data_model=DataModel(name='Model', tables=[table]))
+
+    CPFMetadataEnhancer(extractor).enhance_project(project)
+
+    assert [c.data_type for c in table.columns] == ['Text', 'Int64']
+    assert table.columns[0].description == "Expression: [TABLE_1].[COLUMN_1]"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Test script to verify Cognos-to-DAX conversion de-duplicates formulas, checks
+the LLM service health once, and reuses results across reports.
+"""
+import json
+import logging
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.converters import ExpressionConverter
+from cognos_migrator.converters.expression_converter import normalize_formula
+from cognos_migrator.extractors import ExpressionExtractor
+from cognos_migrator.llm_cache import LLMResponseCache
+from cognos_migrator.llm_service import LLMServiceClient
+
+
+class StubDaxApiHandler(BaseHTTPRequestHandler):
+    """Healthy DAX API stub that wraps every formula in a DAX comment."""
+
+    requests_seen = []
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StubDaxApiHandler.requests_seen.append(self.path)
+        self._send_json({"status": "healthy"})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        StubDaxApiHandler.requests_seen.append(self.path)
+        self._send_json({
+            "dax_expression": f"/* {payload['cognos_expression']} */",
+            "confidence": 0.9,
+            "notes": ""
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def dax_api(tmp_path):
+    """Run the stub service and return its URL and a fresh response cache."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubDaxApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubDaxApiHandler.requests_seen = []
+    cache = LLMResponseCache(tmp_path / 'llm_cache.sqlite')
+    yield f'http://127.0.0.1:{server.server_address[1]}', cache
+    cache.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_duplicate_formulas_are_converted_once(dax_api):
+    """Formulas differing only in layout share one request and one health check."""
+    url, cache = dax_api
+    converter = ExpressionConverter(LLMServiceClient(base_url=url, cache=cache, health_ttl=60), batch_size=3)
+
+    formulas = ["total([Sales] + 1)", "total([Sales]  +\n 1)", "[Qty] * 2", "total([Sales] + 1)", "'a  b' || [Name]"]
+    results = converter.convert_expressions([{"cognos_formula": f, "table_name": "Sales"} for f in formulas])
+
+    assert [r["dax_expression"] for r in results] == [
+        "/* total([Sales] + 1) */", "/* total([Sales] + 1) */", "/* [Qty] * 2 */",
+        "/* total([Sales] + 1) */", "/* 'a  b' || [Name] */"
+    ]
+    assert StubDaxApiHandler.requests_seen.count('/health') == 1
+    assert StubDaxApiHandler.requests_seen.count('/api/dax/convert') == 3
+
+    # A second report with the same converter makes no requests at all
+    StubDaxApiHandler.requests_seen = []
+    assert converter.convert_expression("total([Sales] + 1)", table_name="Sales")["confidence"] == 0.9
+    assert StubDaxApiHandler.requests_seen == []
+
+
+def test_results_are_reused_across_migrators(dax_api):
+    """A new converter and client, as created per report, reuse health and cached conversions."""
+    url, cache = dax_api
+    expressions = [
+        {"name": "Revenue", "expression": "[Price] * [Qty]", "query_name": "Query1"},
+        {"name": "Cost", "expression": "[Unit Cost] * [Qty]", "query_name": "Query1"},
+    ]
+
+    first = ExpressionExtractor(
+        expression_converter=ExpressionConverter(LLMServiceClient(base_url=url, cache=cache))
+    ).convert_to_dax(expressions)
+    StubDaxApiHandler.requests_seen = []
+    second = ExpressionExtractor(
+        expression_converter=ExpressionConverter(LLMServiceClient(base_url=url, cache=cache))
+    ).convert_to_dax(expressions)
+
+    assert second == first
+    assert [c["Status"] for c in first["calculations"]] == ["converted", "converted"]
+    assert StubDaxApiHandler.requests_seen == []
+
+
+def test_normalize_formula_keeps_string_literals():
+    assert normalize_formula("  if ([A]  >  1)\n then ('x  y') ") == "if ([A] > 1) then ('x  y')"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
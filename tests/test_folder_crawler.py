@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Test script to verify the concurrent folder crawler finds the same reports as
+a recursive walk, lists sibling folders concurrently within its limit, and
+streams reports to folder migration while the crawl continues, without
+moving the reported progress backwards.
+"""
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.client import CognosClient, CRAWL_FIELDS
+from cognos_migrator.config import MigrationConfig, CognosConfig
+from cognos_migrator import migrator as migrator_module
+from cognos_migrator.migrator import CognosModuleMigratorExplicit
+
+from mock_cognos_server import MockCognosServer
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "cognos_migrator" / "templates"
+
+
+def create_client(server, crawl_concurrency=4):
+    config = CognosConfig(base_url=server.base_url, auth_key="IBM-BA-Authorization",
+                          crawl_concurrency=crawl_concurrency)
+    return CognosClient(config, base_url=server.base_url, session_key="session")
+
+
+def recursive_report_ids(server, folder_id):
+    """Report IDs in the order of the previous depth-first recursive walk."""
+    ids = []
+    for item in server.children[folder_id]:
+        if item["type"] == "report":
+            ids.append(item["id"])
+        elif item["type"] == "folder":
+            ids.extend(recursive_report_ids(server, item["id"]))
+    return ids
+
+
+def test_list_reports_matches_recursive_walk():
+    """All reports are found, in depth-first order, requesting only the crawl fields."""
+    with MockCognosServer(depth=3, folders_per_folder=3, reports_per_folder=2) as server:
+        client = create_client(server)
+        reports = client.list_reports_in_folder(MockCognosServer.ROOT_FOLDER_ID)
+
+        assert [r.id for r in reports] == recursive_report_ids(server, MockCognosServer.ROOT_FOLDER_ID)
+        assert reports[0].owner == "Admin"
+        assert server.fields_seen == {CRAWL_FIELDS}
+
+        top_level = client.list_reports_in_folder(MockCognosServer.ROOT_FOLDER_ID, recursive=False)
+        assert [r.id for r in top_level] == ["root.r0", "root.r1"]
+
+
+def test_sibling_folders_are_listed_concurrently_within_limit():
+    """Folder listings overlap, but never exceed the configured concurrency."""
+    with MockCognosServer(depth=2, folders_per_folder=6, reports_per_folder=1, latency=0.02) as server:
+        client = create_client(server, crawl_concurrency=4)
+        start = time.perf_counter()
+        reports = list(client.iter_reports_in_folder(MockCognosServer.ROOT_FOLDER_ID))
+        elapsed = time.perf_counter() - start
+
+        # 43 folder listings at 20 ms each take 0.86 s one at a time
+        assert len(reports) == len(server.report_ids)
+        assert 1 < server.peak_in_flight <= 4
+        assert elapsed < 0.6
+
+
+def test_migrate_folder_starts_before_crawl_finishes(tmp_path, monkeypatch):
+    """The first report is migrated while later folders are still being listed, even without workers."""
+    migrated_at = {}
+    lock = threading.Lock()
+
+    def fake_migrate_report(self, report_id, output_path):
+        with lock:
+            migrated_at[report_id] = time.perf_counter()
+        return True
+
+    monkeypatch.setattr(CognosModuleMigratorExplicit, "migrate_report", fake_migrate_report)
+
+    with MockCognosServer(depth=3, folders_per_folder=2, reports_per_folder=2, latency=0.02) as server:
+        migrator = CognosModuleMigratorExplicit(
+            migration_config=MigrationConfig(output_directory=str(tmp_path),
+                                             template_directory=str(TEMPLATE_DIR), max_workers=1),
+            cognos_config=CognosConfig(base_url=server.base_url, auth_key="IBM-BA-Authorization"),
+            cognos_url=server.base_url,
+            session_key="session",
+            cognos_client=create_client(server, crawl_concurrency=2)
+        )
+        results = migrator.migrate_folder(MockCognosServer.ROOT_FOLDER_ID, str(tmp_path))
+
+        assert set(results) == server.report_ids
+        assert all(results.values())
+        # Deepest folders are listed last, long after the top-level reports were migrated
+        assert min(migrated_at.values()) < server.request_times[-1] - 0.02
+
+
+class BurstyCognosClient:
+    """Finds a few reports slowly, then many at once, like a crawl reaching a large folder."""
+
+    def iter_reports_in_folder(self, folder_id, recursive=True):
+        for i in range(24):
+            if i < 3:
+                time.sleep(0.1)
+            yield SimpleNamespace(id=f"r{i}", name=f"Report {i}")
+
+
+def test_migrate_folder_progress_never_decreases(tmp_path, monkeypatch):
+    """Progress stays monotonic when the crawl suddenly finds many more reports."""
+    progress = []
+
+    def record_progress(message, **kwargs):
+        if message.startswith("Migrating report"):
+            progress.append(kwargs["progress"])
+
+    def fake_migrate_report(self, report_id, output_path):
+        time.sleep(0.01)
+        return True
+
+    monkeypatch.setattr(migrator_module, "logging_helper", record_progress)
+    monkeypatch.setattr(CognosModuleMigratorExplicit, "migrate_report", fake_migrate_report)
+
+    migrator = CognosModuleMigratorExplicit(
+        migration_config=MigrationConfig(output_directory=str(tmp_path),
+                                         template_directory=str(TEMPLATE_DIR), max_workers=4),
+        cognos_config=CognosConfig(base_url="http://cognos.invalid", auth_key="IBM-BA-Authorization"),
+        cognos_url="http://cognos.invalid",
+        session_key="session",
+        cognos_client=BurstyCognosClient()
+    )
+    results = migrator.migrate_folder("folder", str(tmp_path))
+
+    assert len(results) == 24
+    assert len(progress) == 24
+    assert progress == sorted(progress)
+    assert progress[-1] > 75
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
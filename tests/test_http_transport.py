@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+Test script to verify the pooled HTTP transport reuses connections, retries
+transient failures with backoff, and records request metrics.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.http_transport import HTTPTransport, LATENCY_BUCKETS_MS
+from cognos_migrator.llm_service import LLMServiceClient
+
+
+class StubDaxApiHandler(BaseHTTPRequestHandler):
+    """Keep-alive DAX API stub that can fail a number of requests with 503."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    failures_left = 0
+    slow_requests = 0
+    connections = set()
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StubDaxApiHandler.connections.add(self.client_address)
+        self._send_json(200, {"status": "healthy"})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        StubDaxApiHandler.connections.add(self.client_address)
+        if self.path == '/api/mquery/slow':
+            StubDaxApiHandler.slow_requests += 1
+            time.sleep(0.5)
+        if StubDaxApiHandler.failures_left > 0:
+            StubDaxApiHandler.failures_left -= 1
+            self._send_json(503, {"detail": "restarting"})
+            return
+        self._send_json(200, {"dax_expression": "SUM(Sales[Amount])", "confidence": 0.9})
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def dax_api():
+    """Run the stub service and return its URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubDaxApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubDaxApiHandler.failures_left = 0
+    StubDaxApiHandler.slow_requests = 0
+    StubDaxApiHandler.connections = set()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_sequential_requests_reuse_one_connection(dax_api):
+    """Keep-alive sends every sequential request over the same connection."""
+    transport = HTTPTransport(pool_size=2)
+    for _ in range(10):
+        assert transport.post(f'{dax_api}/api/dax/convert', json={"a": 1}).status_code == 200
+    transport.close()
+
+    assert len(StubDaxApiHandler.connections) == 1
+
+
+def test_retryable_status_is_retried_and_counted(dax_api):
+    """A 503 is retried with backoff and the retries show up in the metrics."""
+    StubDaxApiHandler.failures_left = 2
+    transport = HTTPTransport(max_retries=2, backoff_factor=0.001)
+
+    response = transport.post(f'{dax_api}/api/dax/convert', json={"a": 1})
+    assert response.status_code == 200
+
+    stats = transport.metrics.snapshot()
+    assert stats['requests'] == 1
+    assert stats['retries'] == 2
+    assert stats['errors'] == 0
+    endpoint = stats['endpoints']['POST /api/dax/convert']
+    assert endpoint['status_codes'] == {'200': 1}
+    assert sum(endpoint['latency_ms']['buckets'].values()) == 1
+    assert len(endpoint['latency_ms']['buckets']) == len(LATENCY_BUCKETS_MS) + 1
+
+    # Once retries are exhausted the last response is returned to the caller
+    StubDaxApiHandler.failures_left = 5
+    assert transport.post(f'{dax_api}/api/dax/convert', json={"a": 1}, retries=1).status_code == 503
+    assert transport.metrics.snapshot()['errors'] == 1
+    transport.close()
+
+
+def test_connection_errors_raise_after_retries():
+    """A service that is down raises once the retries are used up."""
+    transport = HTTPTransport(max_retries=1, backoff_factor=0.001, timeout=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.get('http://127.0.0.1:9/health')
+
+    stats = transport.metrics.snapshot()
+    assert stats['retries'] == 1
+    assert stats['endpoints']['GET /health']['status_codes'] == {'connection_error': 1}
+
+
+def test_post_read_timeouts_are_not_retried(dax_api):
+    """A POST that times out waiting for the answer is sent to the service once."""
+    transport = HTTPTransport(max_retries=2, backoff_factor=0.001)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        transport.post(f'{dax_api}/api/mquery/slow', json={"a": 1}, timeout=0.1)
+    transport.close()
+
+    assert StubDaxApiHandler.slow_requests == 1
+    assert transport.metrics.snapshot()['retries'] == 0
+
+
+def test_llm_client_uses_shared_transport(dax_api):
+    """Clients created per report share the transport and its connections."""
+    transport = HTTPTransport()
+    for _ in range(3):
+        client = LLMServiceClient(base_url=dax_api, cache=None, transport=transport)
+        assert client.check_health(force=True)["status"] == "healthy"
+
+    assert transport.metrics.snapshot()['endpoints']['GET /health']['requests'] == 3
+    assert len(StubDaxApiHandler.connections) == 1
+    transport.close()
+
+
+class HealthTransport:
+    """Answers health requests with the given statuses, optionally holding each until released."""
+
+    def __init__(self, *statuses, blocking=False):
+        self.statuses = list(statuses)
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+
+    def get(self, url, headers=None, timeout=None, retries=None):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        status = self.statuses.pop(0)
+        return SimpleNamespace(status_code=200 if status == "healthy" else 503, json=lambda: {"status": status})
+
+
+def health_client(transport):
+    return LLMServiceClient(base_url=f"http://health-{uuid.uuid4().hex}", cache=None, transport=transport)
+
+
+def test_concurrent_health_checks_share_one_request():
+    """Checks of a service wait for its request in flight, checks of other services do not."""
+    slow = HealthTransport("healthy", blocking=True)
+    client = health_client(slow)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.check_health())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert slow.started.wait(5)
+
+    # The lock is not held while the slow service is asked
+    assert health_client(HealthTransport("healthy")).check_health()["status"] == "healthy"
+
+    slow.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [{"status": "healthy"}] * 8
+    assert slow.calls == 1
+
+
+def test_unhealthy_results_are_reused_briefly():
+    transport = HealthTransport("unhealthy", "healthy")
+    client = health_client(transport)
+    client.UNHEALTHY_CHECK_TTL = 0.05
+
+    assert client.check_health()["status"] == "unhealthy"
+    assert client.check_health()["status"] == "unhealthy"
+    assert transport.calls == 1
+
+    time.sleep(0.1)
+    assert client.check_health()["status"] == "healthy"
+    time.sleep(0.1)
+    assert client.check_health()["status"] == "healthy"
+    assert transport.calls == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Test script to verify incremental shared model migrations reuse unchanged
+intermediate reports and skip the model steps when nothing changed.
+"""
+import json
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.common.incremental import MANIFEST_FILE_NAME
+from cognos_migrator.common.tracing import TIMINGS_FILE_NAME
+from cognos_migrator.migrations.package import migrate_package_with_local_reports
+
+from mock_cognos_server import MockCognosServer
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+PACKAGE_FILE = EXAMPLES / "packages" / "ELECTRIC_GENERATION_MAT.xml"
+REPORT_FILES = [EXAMPLES / "Report XMLs DE" / name for name in ("PartNumbers_UC013.xml", "MaterialInquiryDetail_UC012.xml")]
+
+SETTINGS = {
+    "table_filtering": {"mode": "direct", "always_include": []},
+    "staging_tables": {"enabled": False},
+    "incremental": {"enabled": True},
+}
+
+
+@pytest.fixture
+def offline_services(monkeypatch):
+    """No DAX API and no LLM response cache, so reports are migrated without the service."""
+    monkeypatch.setenv("DAX_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("COGNOS_MIGRATOR_LLM_CACHE", "off")
+
+
+def migrate(server, output_path, reports, settings=SETTINGS):
+    success, _ = migrate_package_with_local_reports(str(PACKAGE_FILE), str(output_path), [str(r) for r in reports],
+                                                    server.base_url, "session", settings=dict(settings))
+    assert success
+    timings = json.loads((output_path / TIMINGS_FILE_NAME).read_text(encoding='utf-8'))
+    root_id = timings['spans'][0]['id']
+    steps = [s['name'] for s in timings['spans'] if s['parent_id'] == root_id]
+    return steps, timings['counters']
+
+
+def test_incremental_migration_reuses_unchanged_artifacts(tmp_path, offline_services):
+    """A second run reuses everything, a changed report rebuilds only that report and the model."""
+    reports_dir = tmp_path / "reports"
+    reports_dir.mkdir()
+    reports = [Path(shutil.copy(report, reports_dir)) for report in REPORT_FILES]
+    output_path = tmp_path / "output"
+
+    with MockCognosServer(depth=0) as server:
+        steps, counters = migrate(server, output_path, reports)
+        assert 'generate_tmdl' in steps and 'reports_reused' not in counters
+        manifest = json.loads((output_path / MANIFEST_FILE_NAME).read_text(encoding='utf-8'))
+        assert manifest['model']['fingerprint']
+        assert all(entry['succeeded'] for entry in manifest['reports'].values())
+        model_tmdl = output_path / "pbit" / "Model" / "model.tmdl"
+        model_mtime = model_tmdl.stat().st_mtime_ns
+
+        # Nothing changed: no report is migrated and the model steps are skipped
+        steps, counters = migrate(server, output_path, reports)
+        assert counters['reports_reused'] == 2
+        assert 'generate_tmdl' not in steps and 'extract' not in steps
+        assert model_tmdl.stat().st_mtime_ns == model_mtime
+
+        # One report changed: only it is migrated again, and the model is rebuilt
+        with open(reports[0], 'a', encoding='utf-8') as f:
+            f.write("\n<!-- changed -->\n")
+        steps, counters = migrate(server, output_path, reports)
+        assert counters['reports_reused'] == 1
+        assert 'generate_tmdl' in steps
+
+        # Changed settings invalidate every artifact
+        steps, counters = migrate(server, output_path, reports, settings={**SETTINGS, "date_table_mode": "hidden"})
+        assert 'reports_reused' not in counters and 'generate_tmdl' in steps
+
+        # Reports that are no longer migrated are removed from the output
+        steps, counters = migrate(server, output_path, reports[1:])
+        assert [p.name for p in (output_path / "intermediate_reports").iterdir()] == [reports[1].stem]
+
+
+def model_tables(output_path):
+    """Table TMDL files and extracted table JSON files of a migration output."""
+    return ({p.name for p in (output_path / "pbit" / "Model" / "tables").glob("*.tmdl")},
+            {p.name for p in (output_path / "extracted").glob("table_*.json")})
+
+
+def test_rebuilt_model_leaves_no_removed_tables_behind(tmp_path, offline_services):
+    """Tables a changed setting no longer produces are not kept from the previous run."""
+    staging_settings = {**SETTINGS, "staging_tables": {"enabled": True, "naming_prefix": "Dim_",
+                                                       "data_load_mode": "import", "model_handling": "merged_tables"}}
+    output_path = tmp_path / "output"
+    fresh_output_path = tmp_path / "fresh"
+
+    with MockCognosServer(depth=0) as server:
+        migrate(server, output_path, REPORT_FILES, settings=staging_settings)
+        staging_tables = model_tables(output_path)
+
+        steps, _ = migrate(server, output_path, REPORT_FILES)
+        assert 'generate_tmdl' in steps
+        migrate(server, fresh_output_path, REPORT_FILES)
+
+    # The staging run produced tables the plain run does not, and none of them survive
+    assert staging_tables != model_tables(fresh_output_path)
+    assert model_tables(output_path) == model_tables(fresh_output_path)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Test script to verify the persistent LLM response cache answers repeat M-query
+API requests without calling the DAX API again.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.converters import ReportMQueryConverter
+from cognos_migrator.llm_cache import LLMResponseCache, is_successful_result
+from cognos_migrator.llm_service import LLMServiceClient
+from cognos_migrator.models import Table, Column, DataType
+
+
+class StubDaxApiHandler(BaseHTTPRequestHandler):
+    """Answers every M-query endpoint with a small JSON document and counts requests."""
+
+    requests_seen = []
+    response = {"is_valid": True, "m_query": "let Source = 1 in Source"}
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        StubDaxApiHandler.requests_seen.append(self.path)
+        body = json.dumps(StubDaxApiHandler.response).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        StubDaxApiHandler.requests_seen.append(self.path)
+        body = json.dumps({"status": "healthy", "version": "2.1"}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def dax_api(monkeypatch, tmp_path):
+    """Run a stub DAX API and point the converters and cache at temporary locations."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubDaxApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubDaxApiHandler.requests_seen = []
+    monkeypatch.setattr(StubDaxApiHandler, 'response', dict(StubDaxApiHandler.response))
+
+    monkeypatch.setenv('DAX_API_URL', f'http://127.0.0.1:{server.server_address[1]}')
+    monkeypatch.setenv('COGNOS_MIGRATOR_LLM_CACHE', str(tmp_path / 'llm_cache.sqlite'))
+    monkeypatch.setattr(LLMServiceClient, '_health_by_url', {})
+    yield StubDaxApiHandler.requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def make_table(name="Sales"):
+    return Table(
+        name=name,
+        columns=[
+            Column(name="Amount", data_type=DataType.DECIMAL, source_column="Amount"),
+            Column(name="Region", data_type=DataType.STRING, source_column="Region"),
+        ]
+    )
+
+
+def test_repeat_conversion_makes_no_network_calls(dax_api, tmp_path):
+    """A second converter run for identical tables is served entirely from the cache."""
+    first = ReportMQueryConverter(output_path=str(tmp_path)).convert_to_m_query(make_table())
+    calls_after_first_run = len(dax_api)
+    assert calls_after_first_run == 2  # analytics + validation
+
+    converter = ReportMQueryConverter(output_path=str(tmp_path))
+    second = converter.convert_to_m_query(make_table())
+
+    assert second == first
+    assert len(dax_api) == calls_after_first_run
+    assert converter.llm_cache.stats()["lifetime"]["hits"] >= 2
+
+    # A different table is a cache miss
+    converter.convert_to_m_query(make_table("Inventory"))
+    assert len(dax_api) == calls_after_first_run + 2
+
+
+def test_lru_eviction_and_stats(tmp_path):
+    """Least recently used entries are evicted once the size cap is exceeded."""
+    cache = LLMResponseCache(tmp_path / 'cache.sqlite', max_entries=2)
+    keys = [cache.make_key('/api/mquery/validate', {"table_name": name}) for name in "abc"]
+
+    cache.put(keys[0], '/api/mquery/validate', {"n": 0})
+    cache.put(keys[1], '/api/mquery/validate', {"n": 1})
+    assert cache.get(keys[0]) == {"n": 0}  # keys[1] is now least recently used
+    cache.put(keys[2], '/api/mquery/validate', {"n": 2})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == {"n": 0}
+    assert cache.get(keys[2]) == {"n": 2}
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    cache.close()
+
+
+def test_key_ignores_insignificant_differences():
+    """Key order, line endings and trailing whitespace do not change the key."""
+    a = LLMResponseCache.make_key('/api/mquery/complete', {"b": "SELECT *\r\nFROM t  ", "a": 1})
+    b = LLMResponseCache.make_key('/api/mquery/complete', {"a": 1, "b": "SELECT *\nFROM t"})
+    c = LLMResponseCache.make_key('/api/mquery/generate', {"a": 1, "b": "SELECT *\nFROM t"})
+    assert a == b
+    assert a != c
+
+
+def test_key_includes_the_service():
+    """The same request to another host, port or scheme is a different entry."""
+    cache = LLMResponseCache
+    payload = {"m_query": "let Source = 1 in Source"}
+    keys = {cache.make_key('/api/mquery/validate', payload, service)
+            for service in ('http://localhost:8080', 'http://localhost:9090', 'https://localhost:8080',
+                            'http://dax-api:8080')}
+    assert len(keys) == 4
+
+
+def test_key_does_not_depend_on_health_checks(dax_api, tmp_path):
+    """Generating before and after a health check reaches each endpoint once."""
+    cache = LLMResponseCache(tmp_path / 'cache.sqlite')
+    context = {"table_name": "Sales", "columns": [{"name": "Amount", "data_type": "decimal"}]}
+
+    first = LLMServiceClient(cache=cache).generate_m_query(context)
+    assert LLMServiceClient(cache=cache).check_health()["status"] == "healthy"
+    second = LLMServiceClient(cache=cache).generate_m_query(context)
+
+    assert second == first
+    posts = [path for path in dax_api if path != '/health']
+    assert sorted(posts) == ['/api/mquery/complete', '/api/mquery/validate']
+
+
+def test_only_successful_results_are_cached(dax_api, tmp_path):
+    """Error documents and empty M-queries returned with HTTP 200 are not replayed."""
+    converter = ReportMQueryConverter(output_path=str(tmp_path))
+    base_url = os.environ['DAX_API_URL']
+
+    StubDaxApiHandler.response = {"error": "model overloaded"}
+    for _ in range(2):
+        converter._post_llm_api(f'{base_url}/api/mquery/complete', json={"table": "Sales"})
+    StubDaxApiHandler.response = {"m_query": "  "}
+    converter._post_llm_api(f'{base_url}/api/mquery/generate', json={"table": "Sales"})
+    assert len(dax_api) == 3 and converter.llm_cache.stats()["entries"] == 0
+
+    StubDaxApiHandler.response = {"m_query": "let Source = 1 in Source"}
+    for _ in range(2):
+        converter._post_llm_api(f'{base_url}/api/mquery/complete', json={"table": "Sales"})
+    assert len(dax_api) == 4 and converter.llm_cache.stats()["entries"] == 1
+
+    assert is_successful_result('/api/mquery/validate', {"is_valid": False, "issues": ["x"]})
+    assert is_successful_result('/api/dax/convert', {"dax_expression": "SUM(Sales[Amount])"})
+    assert not is_successful_result('/api/dax/convert', {"dax_expression": ""})
+    assert not is_successful_result('/api/other', {"result": 1})
+
+
+def test_expired_responses_are_not_used(tmp_path):
+    cache = LLMResponseCache(tmp_path / 'cache.sqlite', max_age=0.05)
+    key = cache.make_key('/api/mquery/validate', {"table_name": "a"})
+    cache.put(key, '/api/mquery/validate', {"is_valid": True})
+    assert cache.get(key) == {"is_valid": True}
+
+    time.sleep(0.1)
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Test script to verify a MigrationRuntime sets up the Cognos client, templates
+and migrator once and reuses them for every report submitted to it.
+"""
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator import runtime as runtime_module
+from cognos_migrator.generators.template_engine import TemplateEngine
+from cognos_migrator.migrations import report as report_module
+from cognos_migrator.migrations.package import migrate_package_with_local_reports
+from cognos_migrator.migrator import CognosModuleMigratorExplicit
+from cognos_migrator.runtime import MigrationRuntime
+
+from mock_cognos_server import MockCognosServer
+
+REPORT_FILE = Path(__file__).parent.parent / "examples" / "Report XMLs DE" / "PartNumbers_UC013.xml"
+PACKAGE_FILE = Path(__file__).parent.parent / "examples" / "packages" / "ELECTRIC_GENERATION_MAT.xml"
+
+
+@pytest.fixture
+def offline_services(monkeypatch):
+    """No DAX API and no LLM response cache, so reports are migrated without the service."""
+    monkeypatch.setenv("DAX_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("COGNOS_MIGRATOR_LLM_CACHE", "off")
+
+
+@pytest.fixture
+def template_loads(monkeypatch):
+    """Count how often the templates are loaded and compiled."""
+    loads = []
+    original = TemplateEngine._load_templates
+
+    def counting_load(self):
+        loads.append(self)
+        return original(self)
+
+    monkeypatch.setattr(TemplateEngine, "_load_templates", counting_load)
+    return loads
+
+
+def copy_reports(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / "reports" / f"report_{i}.xml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(REPORT_FILE, path)
+        paths.append(path)
+    return paths
+
+
+def test_reports_reuse_one_setup(tmp_path, offline_services, template_loads):
+    """Templates are compiled and the session checked once, not once per report."""
+    with MockCognosServer(depth=0) as server:
+        with MigrationRuntime(server.base_url, "session", log_name=None) as runtime:
+            for path in copy_reports(tmp_path, 3):
+                assert runtime.migrate_report(output_path=str(tmp_path / "out" / path.stem),
+                                              report_file_path=str(path))
+
+        assert len(template_loads) == 1
+        assert server.requests.count("/api/v1/session") == 1
+
+    for i in range(3):
+        assert (tmp_path / "out" / f"report_{i}" / "pbit" / "Model" / "tables").is_dir()
+
+
+def test_session_is_verified_once_for_remote_reports(tmp_path, offline_services, monkeypatch):
+    """Reports fetched from Cognos test the session on first use only."""
+    migrated = []
+    monkeypatch.setattr(CognosModuleMigratorExplicit, "migrate_report",
+                        lambda self, report_id, output_path: migrated.append(report_id) or True)
+
+    with MockCognosServer(depth=0) as server:
+        runtime = MigrationRuntime(server.base_url, "session", log_name=None)
+        for report_id in ("r1", "r2", "r3"):
+            assert runtime.migrate_report(output_path=str(tmp_path / report_id), report_id=report_id)
+
+        # One check by the client on creation, one by the runtime before the first report
+        assert server.requests.count("/api/v1/session") == 2
+        assert migrated == ["r1", "r2", "r3"]
+
+
+def test_parallel_batch_shares_templates(tmp_path, offline_services, template_loads):
+    """Worker threads get their own migrators, built from the runtime's templates and client."""
+    with MockCognosServer(depth=0) as server:
+        runtime = MigrationRuntime(server.base_url, "session", log_name=None)
+        paths = copy_reports(tmp_path, 4)
+        results = runtime.migrate_report_files(paths, str(tmp_path / "out"), max_workers=2)
+
+    assert results == {str(path): True for path in paths}
+    assert len(template_loads) == 1
+    assert (tmp_path / "out" / "report_3" / "pbit" / "Model" / "tables").is_dir()
+
+
+def test_shared_model_reports_share_one_runtime(tmp_path, offline_services, monkeypatch):
+    """Parallel intermediate reports of a shared model configure logging and check the session once."""
+    logging_setups = []
+    for module in (runtime_module, report_module):
+        monkeypatch.setattr(module, "configure_logging", lambda *args, **kwargs: logging_setups.append(args))
+    settings = {"table_filtering": {"mode": "direct", "always_include": []},
+                "staging_tables": {"enabled": False}, "report_migration": {"max_workers": 3}}
+
+    with MockCognosServer(depth=0) as server:
+        success, _ = migrate_package_with_local_reports(str(PACKAGE_FILE), str(tmp_path / "out"),
+                                                        [str(path) for path in copy_reports(tmp_path, 3)],
+                                                        server.base_url, "session", settings=settings)
+        session_checks = server.requests.count("/api/v1/session")
+
+    assert success
+    assert logging_setups == [("cognos_report_migration",)]
+    # Only the runtime's client checks the session, the model steps use its migrator
+    assert session_checks == 1
+    for i in range(3):
+        assert (tmp_path / "out" / "intermediate_reports" / f"report_{i}" / "extracted").is_dir()
+
+
+def test_shared_model_reuses_a_given_runtime(tmp_path, offline_services, template_loads, monkeypatch):
+    """A caller's runtime migrates the reports and generates the model, and stays open."""
+    closed = []
+    monkeypatch.setattr(MigrationRuntime, "close", lambda self: closed.append(self))
+    settings = {"table_filtering": {"mode": "direct", "always_include": []}, "staging_tables": {"enabled": False}}
+
+    with MockCognosServer(depth=0) as server:
+        with MigrationRuntime(server.base_url, "session", log_name=None) as runtime:
+            for run in ("first", "second"):
+                success, _ = migrate_package_with_local_reports(str(PACKAGE_FILE), str(tmp_path / run),
+                                                                [str(path) for path in copy_reports(tmp_path, 2)],
+                                                                server.base_url, "session", settings=settings,
+                                                                runtime=runtime)
+                assert success
+            assert closed == []
+        session_checks = server.requests.count("/api/v1/session")
+
+    assert len(template_loads) == 1
+    assert session_checks == 1
+    assert (tmp_path / "second" / "pbit" / "Model" / "model.tmdl").is_file()
+
+
+def test_runtime_rejects_other_settings(tmp_path, offline_services):
+    with MockCognosServer(depth=0) as server:
+        runtime = MigrationRuntime(server.base_url, "session", settings={"staging_tables": {"enabled": False}},
+                                   log_name=None)
+        with pytest.raises(ValueError):
+            report_module.migrate_single_report(str(tmp_path), server.base_url, "session",
+                                                report_file_path=str(REPORT_FILE),
+                                                settings={"staging_tables": {"enabled": True}}, runtime=runtime)
+        assert report_module.migrate_single_report(str(tmp_path), server.base_url, "session",
+                                                   report_file_path=str(REPORT_FILE),
+                                                   settings={"staging_tables": {"enabled": False}}, runtime=runtime)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Test script to verify migrations record the duration of each step, write them
+to timings.json with HTTP and output size counters, and can push finished
+steps over the WebSocket channel.
+"""
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.common.parallel import run_ordered
+from cognos_migrator.common.tracing import (
+    ENV_TRACE_PUSH, TIMINGS_FILE_NAME, add_count, get_tracer, span, trace_scope
+)
+from cognos_migrator.common.websocket_client import flush_websocket_data, set_websocket_post_function
+from cognos_migrator.migrations.report import migrate_single_report
+
+from mock_cognos_server import MockCognosServer
+
+REPORT_FILE = Path(__file__).parent.parent / "examples" / "Report XMLs DE" / "PartNumbers_UC013.xml"
+
+
+@pytest.fixture
+def offline_services(monkeypatch):
+    """No DAX API and no LLM response cache, so reports are migrated without the service."""
+    monkeypatch.setenv("DAX_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("COGNOS_MIGRATOR_LLM_CACHE", "off")
+
+
+def test_report_migration_writes_timings(tmp_path, offline_services):
+    """Each step of a report migration is a span under the migration, written to timings.json."""
+    output_path = tmp_path / "report"
+    with MockCognosServer(depth=0) as server:
+        assert migrate_single_report(str(output_path), server.base_url, "session",
+                                     report_file_path=str(REPORT_FILE))
+
+    timings = json.loads((output_path / TIMINGS_FILE_NAME).read_text(encoding='utf-8'))
+    assert timings['name'] == 'report_migration'
+    assert timings['status'] == 'ok'
+
+    root = timings['spans'][0]
+    assert root['parent_id'] is None and root['attributes']['succeeded'] is True
+    steps = [s['name'] for s in timings['spans'] if s['parent_id'] == root['id']]
+    assert steps == ['setup', 'fetch', 'extract', 'convert', 'generate_tmdl', 'documentation']
+
+    tables = [s for s in timings['spans'] if s['name'] == 'render_table']
+    assert tables and all(s['attributes']['table'] for s in tables)
+    assert timings['steps']['render_table']['count'] == len(tables)
+    assert timings['counters']['bytes_written'] > 0
+    assert timings['counters']['files_written'] > 0
+
+
+def test_nested_traces_and_worker_threads():
+    """Nested traces become spans of the outer one, and worker threads record into it."""
+    # Outside a trace nothing is recorded
+    with span('ignored') as ignored:
+        add_count('ignored')
+    assert ignored is None and get_tracer() is None
+
+    def task(item):
+        with span('item', item=item):
+            add_count('items')
+        return threading.current_thread().name
+
+    with trace_scope('outer') as outer:
+        with trace_scope('inner'):
+            threads = set(run_ordered(range(6), task, max_workers=3))
+        tracer = get_tracer()
+
+    summary = tracer.summary()
+    assert summary['counters'] == {'items': 6}
+    spans = {s['name']: s for s in summary['spans']}
+    assert spans['inner']['parent_id'] == outer.id
+    items = [s for s in summary['spans'] if s['name'] == 'item']
+    assert len(items) == 6 and all(s['parent_id'] == spans['inner']['id'] for s in items)
+    assert {s['thread'] for s in items} == threads
+
+
+def test_spans_are_pushed_when_enabled(tmp_path, monkeypatch):
+    """Finished step spans are posted as WebSocket messages, deeper spans are not."""
+    messages = []
+    set_websocket_post_function(messages.append)
+    monkeypatch.setenv(ENV_TRACE_PUSH, "1")
+    try:
+        with trace_scope('migration', tmp_path):
+            with span('generate_tmdl'):
+                with span('render_table', table='Sales'):
+                    with span('too_deep'):
+                        pass
+        assert flush_websocket_data(timeout=5)
+    finally:
+        set_websocket_post_function(None)
+
+    pushed = [m['span']['name'] for m in messages if 'span' in m]
+    assert pushed == ['render_table', 'generate_tmdl', 'migration']
+    assert (tmp_path / TIMINGS_FILE_NAME).exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Test script to verify the slotted data model classes keep the attribute API
+of the plain dataclasses they replace: columns share their unset annotations
+and metadata until accessed, and models copy, pickle and compare as before.
+"""
+import copy
+import dataclasses
+import logging
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.extractors.packages import ConsolidatedPackageExtractor
+from cognos_migrator.generators.staging_handlers.merged_tables_handler import MergedTablesHandler
+from cognos_migrator.models import Column, DataModel, DataType, Measure, Relationship, Table
+
+PACKAGE_FILE = Path(__file__).parent.parent / "examples" / "packages" / "ELECTRIC_GENERATION_MAT.xml"
+
+
+def unset_dicts(column: Column) -> list:
+    """Names of the column's dict attributes that were never created"""
+    return [name for name, value in column.__getstate__()[1].items() if name in ('annotations', 'metadata') and value is None]
+
+
+def sample_model() -> DataModel:
+    orders = Table("Orders", [Column("ID", DataType.INTEGER, "ID", is_key=True),
+                              Column("Amount", DataType.DECIMAL, "AMOUNT", annotations={"PBI_FormatHint": "{}"})],
+                   measures=[Measure("Total", "SUM(Orders[Amount])")], metadata={"is_source_table": True})
+    customers = Table("Customers", [Column("ID", DataType.INTEGER, "ID")])
+    return DataModel("Sales", [orders, customers],
+                     relationships=[Relationship("Orders", "ID", "Customers", "ID", id="r1")],
+                     date_tables=[{"id": "d1", "name": "CentralDateTable", "template_content": ""}])
+
+
+def test_models_have_no_instance_dict():
+    model = sample_model()
+    column, table, relationship = model.tables[0].columns[0], model.tables[0], model.relationships[0]
+    for instance in (model, table, column, relationship, table.measures[0]):
+        assert not hasattr(instance, '__dict__')
+    with pytest.raises(AttributeError):
+        column.lineage_tag = "x"
+    assert relationship.name == "r1"
+
+
+def test_column_dicts_are_created_on_access():
+    """Unset annotations and metadata read and write like dicts and are created per column."""
+    first, second = Column("A", DataType.STRING, "A"), Column("B", DataType.STRING, "B")
+    assert unset_dicts(first) == ['annotations', 'metadata']
+
+    first.annotations['format'] = "0.00"
+    first.metadata['relationship_info'] = {"id": "r1"}
+    assert first.annotations == {'format': "0.00"} and unset_dicts(first) == []
+    assert second.annotations == {} and second.metadata == {} and second.annotations is not first.annotations
+
+    given = {"SummarizationSetBy": "Automatic"}
+    assert Column("C", DataType.STRING, "C", annotations=given).annotations is given
+    assert Column("D", DataType.STRING, "D") == Column("D", DataType.STRING, "D", annotations={}, metadata={})
+
+
+def test_copy_pickle_and_asdict():
+    model = sample_model()
+    model.tables[0].columns[1].metadata['relationship_info'] = {"id": "r1"}
+
+    for copied in (copy.deepcopy(model), pickle.loads(pickle.dumps(model))):
+        # Columns without annotations or metadata keep sharing the unset default
+        assert unset_dicts(copied.tables[1].columns[0]) == ['annotations', 'metadata']
+        assert copied == model and copied is not model
+        assert copied.tables[0].columns[1].annotations is not model.tables[0].columns[1].annotations
+    assert copy.copy(model.tables[0]).columns is model.tables[0].columns
+
+    as_dict = dataclasses.asdict(model)
+    assert as_dict['date_tables'][0]['name'] == "CentralDateTable" and as_dict['table_filtering'] is None
+    assert as_dict['tables'][0]['columns'][1]['metadata'] == {'relationship_info': {'id': 'r1'}}
+
+
+def test_staging_handler_copies_model_fields():
+    """The merged tables handler carries the date tables and measures over to the model it creates."""
+    model = sample_model()
+    # A composite key relationship makes the handler create a combination table
+    model.relationships.append(Relationship("Orders", "ID,Amount", "Customers", "ID,Amount", id="r2"))
+    model.measures.append(Measure("Count", "COUNTROWS(Orders)"))
+    model.table_filtering = {"mode": "direct"}
+
+    processed = MergedTablesHandler({"staging_tables": {"enabled": True}}).process_import_mode(model)
+
+    assert processed is not model and len(processed.tables) == 3 and processed.tables[:2] == model.tables
+    assert processed.date_tables == model.date_tables and processed.measures == model.measures
+    assert processed.table_filtering == {"mode": "direct"}
+
+
+def test_package_model_columns_share_unset_dicts(tmp_path):
+    """Columns of a consolidated package model only get the dicts they use."""
+    extractor = ConsolidatedPackageExtractor()
+    model = extractor.convert_to_data_model(extractor.extract_package(str(PACKAGE_FILE), str(tmp_path)))
+
+    columns = [column for table in model.tables for column in table.columns]
+    assert columns and all(unset_dicts(column) == ['annotations', 'metadata'] for column in columns)
+    assert [date_table['name'] for date_table in model.date_tables] == ["CentralDateTable"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
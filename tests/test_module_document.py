@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Test script to verify the module extractors give the same results for a
+parsed ModuleDocument as for the module metadata JSON, without parsing it
+again.
+"""
+import json
+import logging
+import sys
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.extractors.modules import (
+    ModuleDataItemExtractor, ModuleDocument, ModuleHierarchyExtractor, ModuleQueryExtractor,
+    ModuleRelationshipExtractor, ModuleStructureExtractor
+)
+from cognos_migrator.extractors.modules.module_source_extractor import ModuleSourceExtractor
+
+EXTRACTORS = [ModuleStructureExtractor, ModuleQueryExtractor, ModuleDataItemExtractor,
+              ModuleRelationshipExtractor, ModuleHierarchyExtractor, ModuleSourceExtractor]
+
+
+def module_metadata(subjects: int = 3, items: int = 4) -> dict:
+    """Module metadata shaped like the Cognos modules API response."""
+    return {
+        "version": "14.0",
+        "use": ["src"],
+        "useSpec": [{"identifier": "src", "type": "file", "storeID": "i1",
+                     "searchPath": "CAMID(\"x\")/folder[@name='Data']/uploadedFile[@name='Sales.xlsx']"}],
+        "querySubject": [{
+            "identifier": f"Subject_{s}",
+            "label": f"Subject {s}",
+            "ref": [f"src.Subject_{s}"],
+            "property": [{"name": "hidden", "value": "false"}],
+            "item": [{"queryItem": {"identifier": f"Item_{i}", "label": f"Item {i}",
+                                    "expression": f"Item_{i}" if i else "Item_1 * 2",
+                                    "datatype": "INTEGER" if i % 2 else "VARCHAR(20)",
+                                    "usage": "fact" if i % 2 else "attribute",
+                                    "facetDefinition": {"enabled": "automatic"}}}
+                     for i in range(items)] + [{"calculation": {"identifier": "ignored"}}],
+        } for s in range(subjects)],
+        "relationship": [{"identifier": "rel_0_1", "left": {"ref": "Subject_0", "mincard": "one", "maxcard": "many"},
+                          "right": {"ref": "Subject_1", "mincard": "one", "maxcard": "one"},
+                          "link": [{"leftRef": "Item_1", "rightRef": "Item_1", "comparisonOperator": "equalTo"}]}],
+        "drillGroup": [{"identifier": "Time", "segment": [{"ref": "Subject_0.Item_0", "identifier": "Year"}]}],
+    }
+
+
+@pytest.mark.parametrize('extractor_class', EXTRACTORS)
+def test_document_and_json_give_same_results(extractor_class, tmp_path, monkeypatch):
+    """Every extractor returns and saves the same data for a document as for the JSON string."""
+    metadata = module_metadata()
+    extractor = extractor_class()
+    for name in ("json", "document"):
+        (tmp_path / name).mkdir()
+    from_json = extractor.extract_and_save(json.dumps(metadata), str(tmp_path / "json"))
+
+    document = ModuleDocument(metadata)
+
+    def no_parsing(content):
+        raise AssertionError("The module document was parsed again")
+    monkeypatch.setattr(ModuleDocument, 'from_json', staticmethod(no_parsing))
+    from_document = extractor.extract_and_save(document, str(tmp_path / "document"))
+
+    # Relationships get generated IDs, so compare them without the IDs
+    if extractor_class is ModuleRelationshipExtractor:
+        for result in (from_json, from_document):
+            for rel in result['powerbi_relationships']:
+                rel.pop('id', None)
+    assert from_document == from_json
+    saved = sorted(p.name for p in (tmp_path / "json").iterdir())
+    assert saved and saved == sorted(p.name for p in (tmp_path / "document").iterdir())
+
+
+def test_document_query_items_and_read_only_view():
+    """Query items are collected per subject and the top level cannot be changed."""
+    metadata = module_metadata()
+    document = ModuleDocument.of(json.dumps(metadata))
+
+    assert ModuleDocument.of(document) is document
+    assert [len(items) for _, items in document.iter_query_subjects()] == [4, 4, 4]
+    assert [subject["label"] for subject, _ in document.iter_query_subjects()] == [
+        "Subject 0", "Subject 1", "Subject 2"]
+    with pytest.raises(TypeError):
+        document.data["querySubject"] = []
+
+    # Invalid JSON is still reported by the extractors themselves
+    assert ModuleQueryExtractor().extract_query_subjects("not json") == []
+    assert ModuleDocument([]).query_subjects == ()
+
+
+def test_query_items_of_every_subject_are_extracted():
+    """Each query subject keeps all its query items, from JSON and from a document."""
+    metadata = module_metadata(subjects=2, items=3)
+    extractor = ModuleQueryExtractor()
+
+    for content in (json.dumps(metadata), ModuleDocument(metadata)):
+        query_items = extractor.extract_query_items(content)
+        assert {subject: len(items) for subject, items in query_items.items()} == {"Subject_0": 3, "Subject_1": 3}
+        assert [item["identifier"] for item in query_items["Subject_1"]] == ["Item_0", "Item_1", "Item_2"]
+        assert query_items["Subject_0"][1]["facetDefinition"] == {"enabled": "automatic"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Test script to verify CognosModuleParser infers the same foreign key
+relationships from indexed table names as from scanning every table, reuses
+parsed columns, and scales to modules with thousands of tables.
+"""
+import logging
+import random
+import re
+import sys
+import time
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.module_parser import CognosModuleParser
+
+FK_PATTERNS = [r'(.+)_id$', r'(.+)id$', r'fk_(.+)', r'(.+)_key$', r'(.+)_ref$']
+NAMES = ['customer', 'customers', 'Customer', 'order', 'orders', 'product', 'plant', 'status', 'statuss']
+
+
+@pytest.fixture
+def parser():
+    return CognosModuleParser(client=None)
+
+
+def infer_by_scanning(parser, table_columns):
+    """The previous inference: every foreign key pattern is matched against every table."""
+    relationships = []
+    for table_name, columns in table_columns.items():
+        for column in columns:
+            for pattern in FK_PATTERNS:
+                match = re.match(pattern, column.lower())
+                if match:
+                    referenced_table = match.group(1)
+                    for other_table, other_columns in table_columns.items():
+                        if (other_table.lower() == referenced_table or
+                                other_table.lower() == referenced_table + 's' or
+                                other_table.lower() == referenced_table.rstrip('s')):
+                            pk_column = parser._find_primary_key_column(other_columns)
+                            if pk_column:
+                                relationships.append((table_name, column, other_table, pk_column))
+                                break
+    return relationships
+
+
+def synthetic_tables(seed: int):
+    """Tables whose names collide by case, plural and singular, with foreign key style columns."""
+    rng = random.Random(seed)
+    table_columns = {}
+    for i in range(40):
+        table_name = rng.choice(NAMES) if rng.random() < 0.5 else f"{rng.choice(NAMES)}_{i}"
+        columns = [f"{rng.choice(['', 'fk_'])}{rng.choice(NAMES)}{rng.choice(['_id', 'id', '_key', '_ref', ''])}"
+                   for _ in range(rng.randint(0, 6))]
+        table_columns[table_name] = columns
+    return table_columns
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_same_relationships_as_scanning(parser, seed):
+    """Relationships, their order and their primary key columns are unchanged."""
+    table_columns = synthetic_tables(seed)
+    inferred = [(r.from_table, r.from_column, r.to_table, r.to_column) for r in parser.infer_foreign_keys(table_columns)]
+    assert inferred == infer_by_scanning(parser, table_columns)
+
+
+def test_detection_reuses_parsed_tables(parser, monkeypatch):
+    """Columns of already parsed tables are not parsed again."""
+    modules = [
+        {'querySubject': [{'identifier': 'Customer', 'item': [{'queryItem': {'identifier': 'ID'}}]}]},
+        {'querySubject': [{'identifier': 'Orders', 'item': [{'queryItem': {'identifier': 'ORDER_KEY'}},
+                                                              {'queryItem': {'identifier': 'CUSTOMER_ID'}}]}]},
+    ]
+    tables = [parser.parse_module_to_table(module) for module in modules]
+
+    def no_parsing(module_data):
+        raise AssertionError("The module columns were parsed again")
+    monkeypatch.setattr(parser, '_parse_columns', no_parsing)
+    relationships = parser.detect_relationships(modules, module_tables=tables)
+
+    assert [(r.from_table, r.from_column, r.to_table, r.to_column) for r in relationships] == \
+        [('Orders', 'ORDER_KEY', 'Orders', 'ORDER_KEY'), ('Orders', 'CUSTOMER_ID', 'Customer', 'ID')]
+    assert relationships[1].id == "Orders_CUSTOMER_ID_to_Customer_ID"
+    assert (relationships[1].from_cardinality, relationships[1].to_cardinality) == ('many', 'one')
+
+
+def test_inference_scales_to_5000_tables(parser):
+    """5,000 tables each referring to two other tables are related in seconds, not minutes."""
+    tables = 5000
+    table_columns = {f"table{i}": [f"table{i}_id", f"table{(i + 1) % tables}_id", f"fk_table{(i + 7) % tables}",
+                                   "description", "amount"]
+                     for i in range(tables)}
+
+    start = time.perf_counter()
+    relationships = parser.infer_foreign_keys(table_columns)
+    elapsed = time.perf_counter() - start
+
+    # Each table relates to itself and to two others
+    assert len(relationships) == 3 * tables
+    assert {(r.to_table, r.to_column) for r in relationships if r.from_table == 'table9'} == \
+        {('table9', 'table9_id'), ('table10', 'table10_id'), ('table16', 'table16_id')}
+    assert elapsed < 5, f"Inferring foreign keys for 5,000 tables took {elapsed:.2f}s"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Test script to verify MQueryConverter finds the report specification context
+of a table (its spec fragment, filters and calculations) from one structural
+index of the report, without scanning the specification per table.
+"""
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.converters import mquery_converter
+from cognos_migrator.converters.mquery_converter import MQueryConverter
+from cognos_migrator.models import Column, DataType, Table
+
+REPORT_FILE = Path(__file__).parent.parent / "examples" / "Report XMLs DE" / "MaterialInquiryDetail_UC012.xml"
+
+
+def query(name: str) -> str:
+    return f"""<query name="{name}">
+        <source><model/></source>
+        <selection>
+            <dataItem name="AMOUNT"><expression>[Sales].[{name}].[AMOUNT]</expression></dataItem>
+            <calculation><name>Doubled</name><expression>[AMOUNT] * 2</expression>
+                <description>Twice the amount</description></calculation>
+        </selection>
+        <detailFilters>
+            <detailFilter><filterExpression>[Sales].[{name}].[REGION] = 'West'</filterExpression></detailFilter>
+            <detailFilter><filterExpression>[Sales].[{name}].[YEAR] in (2023, 2024)</filterExpression></detailFilter>
+        </detailFilters>
+        <filter><expression>[AMOUNT] between 10 and 20</expression></filter>
+    </query>"""
+
+
+def report_spec(names) -> str:
+    queries = "".join(query(name) for name in names)
+    lists = "".join(f'<list name="List {i}" refQuery="{name}"><listColumns/></list>' for i, name in enumerate(names))
+    return (f'<report xmlns="http://developer.cognos.com/schemas/report/16.2/"><queries>{queries}</queries>'
+            f'<layouts><layout><reportPages><page name="Page1">{lists}</page></reportPages></layout></layouts></report>')
+
+
+def test_table_context_comes_from_its_own_query():
+    """Only the query and list of the table are used, whatever characters its name contains."""
+    converter = MQueryConverter()
+    spec = report_spec(["Orders", "Sales (2024)*", "Returns"])
+
+    relevant = converter._extract_relevant_report_spec(spec, "Sales (2024)*")
+    assert 'name="Sales (2024)*"' in relevant and "Orders" not in relevant and len(relevant) <= 1000
+    assert converter._extract_relevant_report_spec(spec, "Missing") == ""
+
+    assert converter._extract_filters_from_report_spec(spec, "Sales (2024)*") == [
+        {'column_name': 'REGION', 'operator': 'equals', 'values': ['West']},
+        {'column_name': 'YEAR', 'operator': 'in', 'values': ['2023', '2024']},
+        {'column_name': 'AMOUNT', 'operator': 'between', 'values': ['10', '20']},
+    ]
+    assert converter._extract_calculations_from_report_spec(spec, "Returns") == [
+        {'new_column_name': 'Doubled', 'source_expression': '[AMOUNT] * 2', 'description': 'Twice the amount'},
+    ]
+
+    context = converter._build_enhanced_context(Table("Orders", [Column("AMOUNT", DataType.DECIMAL, "AMOUNT")]), spec)
+    assert len(context['report_filters']) == 3 and len(context['report_calculations']) == 1
+
+
+def test_spec_is_indexed_once_per_report(monkeypatch):
+    """The lookups for every table of a report share one parse; a new report gets its own."""
+    indexes = []
+    index_class = mquery_converter.ReportSpecIndex
+    monkeypatch.setattr(mquery_converter, 'ReportSpecIndex', lambda *args, **kwargs: indexes.append(1) or index_class(*args, **kwargs))
+
+    converter = MQueryConverter()
+    names = [f"Query{i}" for i in range(50)]
+    spec = report_spec(names)
+    for name in names:
+        assert converter._extract_filters_from_report_spec(spec, name)
+        assert converter._extract_calculations_from_report_spec(spec, name)
+        assert converter._extract_relevant_report_spec(spec, name)
+    assert len(indexes) == 1
+
+    converter._extract_relevant_report_spec(report_spec(["Other"]), "Other")
+    assert len(indexes) == 2
+
+
+def test_large_spec_lookups_are_fast():
+    """Per-table lookups on a large specification do not rescan it."""
+    names = [f"Query{i}" for i in range(2000)]
+    spec = report_spec(names)
+    converter = MQueryConverter()
+    converter._extract_relevant_report_spec(spec, names[0])
+
+    start = time.perf_counter()
+    for name in names:
+        converter._extract_relevant_report_spec(spec, name)
+        converter._extract_filters_from_report_spec(spec, name)
+        converter._extract_calculations_from_report_spec(spec, name)
+    # Regex scans of the whole specification took seconds per table
+    assert time.perf_counter() - start < 5
+
+
+def test_example_report_and_invalid_spec():
+    converter = MQueryConverter()
+    spec = REPORT_FILE.read_text(encoding='utf-8')
+
+    filters = converter._extract_filters_from_report_spec(spec, "Query1")
+    assert {'column_name': 'SITE_NUMBER', 'operator': 'equals', 'values': ['?SiteNumber?']} in filters
+    relevant = converter._extract_relevant_report_spec(spec, "Query1")
+    assert re.match(r'<(\w+:)?query ', relevant) and 'name="Query1"' in relevant
+
+    assert converter._extract_relevant_report_spec("<report><queries></report>", "Query1") == ""
+    assert converter._extract_filters_from_report_spec("not xml", "Query1") == []
+    assert converter._extract_calculations_from_report_spec("not xml", "Query1") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""
+Test script to verify the package extractors visit every query subject and
+relationship of an FM model once, whatever the nesting of namespaces and
+folders, and record where each one is defined, and that a relationship
+extracted once no longer gets a staging table for "multiple" relationships.
+"""
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.extractors.packages import (
+    FMModelTraversal, PackageCalculationExtractor, PackageQuerySubjectExtractor, PackageRelationshipExtractor,
+    ParsedPackage
+)
+from cognos_migrator.migrations.package import migrate_package_with_local_reports
+
+from mock_cognos_server import MockCognosServer
+
+PACKAGES_DIR = Path(__file__).parent.parent / "examples" / "packages"
+REPORTS_DIR = Path(__file__).parent.parent / "examples" / "Report XMLs DE"
+
+
+def layer(level: int, depth: int) -> str:
+    """A namespace with a query subject, a relationship in a folder and the next namespace nested inside."""
+    nested = layer(level + 1, depth) if level + 1 < depth else ""
+    return f"""<namespace><name locale="en">Layer {level}</name>
+        <querySubject><name locale="en">QS_{level}</name>
+            <queryItem><name locale="en">ID</name><expression><refobj>[Source].[T{level}].[ID]</refobj></expression></queryItem>
+            <queryItemFolder><name locale="en">More</name>
+                <queryItem><name locale="en">TOTAL</name><expression>[Layer {level}].[QS_{level}].[ID] * 2</expression>
+                    <datatype>int32</datatype></queryItem>
+            </queryItemFolder>
+        </querySubject>
+        <folder><name locale="en">Folder {level}</name>
+            <relationship><name locale="en">R_{level}</name>
+                <left><refobj>[Layer {level}].[QS_{level}]</refobj><mincard>one</mincard><maxcard>many</maxcard></left>
+                <right><refobj>[Layer {level}].[QS_{level + 1}]</refobj><mincard>one</mincard><maxcard>one</maxcard></right>
+                <expression><refobj>[Layer {level}].[QS_{level}].[ID]</refobj> = <refobj>[Layer {level}].[QS_{level + 1}].[ID]</refobj></expression>
+            </relationship>
+        </folder>
+        {nested}
+    </namespace>"""
+
+
+def nested_package(tmp_path: Path, depth: int) -> ParsedPackage:
+    package_file = tmp_path / "nested.xml"
+    package_file.write_text(f'<project xmlns="http://www.developer.cognos.com/schemas/bmt/60/12">'
+                            f'<name locale="en">Nested</name>{layer(0, depth)}</project>', encoding='utf-8')
+    return ParsedPackage.from_file(str(package_file))
+
+
+def extractors(parsed_package: ParsedPackage):
+    found = [PackageQuerySubjectExtractor(), PackageRelationshipExtractor(), PackageCalculationExtractor()]
+    for extractor in found:
+        extractor.use_parsed_package(parsed_package)
+    return found
+
+
+def test_traversal_records_namespace_and_folder_path(tmp_path):
+    """Each model element is recorded once with its innermost namespace and enclosing folders."""
+    parsed_package = nested_package(tmp_path, 3)
+    traversal = parsed_package.model_traversal()
+
+    assert traversal.namespace_count == 3
+    assert [(e.element.find('{*}name').text, e.namespace, e.folder_path) for e in traversal.elements('querySubject')] == [
+        ('QS_0', 'Layer 0', ('Layer 0',)),
+        ('QS_1', 'Layer 1', ('Layer 0', 'Layer 1')),
+        ('QS_2', 'Layer 2', ('Layer 0', 'Layer 1', 'Layer 2')),
+    ]
+    assert [e.folder_path for e in traversal.elements('relationship')][-1] == ('Layer 0', 'Layer 1', 'Layer 2', 'Folder 2')
+    assert parsed_package.model_traversal() is traversal
+
+
+def test_nested_elements_are_extracted_once(tmp_path, monkeypatch):
+    """Deeply nested query subjects, items, relationships and calculations come out once each."""
+    depth = 300
+    parsed_package = nested_package(tmp_path, depth)
+    query_subject_extractor, relationship_extractor, calculation_extractor = extractors(parsed_package)
+
+    traversals = []
+    original_init = FMModelTraversal.__init__
+
+    def counting_init(self, *args, **kwargs):
+        traversals.append(self)
+        original_init(self, *args, **kwargs)
+    monkeypatch.setattr(FMModelTraversal, '__init__', counting_init)
+
+    built = []
+    build_relationship = relationship_extractor._build_relationship
+    monkeypatch.setattr(relationship_extractor, '_build_relationship', lambda elem: built.append(elem) or build_relationship(elem))
+
+    query_subjects = query_subject_extractor.extract_query_subjects(parsed_package.root)
+    relationships = relationship_extractor.extract_relationships(parsed_package.root)
+    calculations = calculation_extractor.extract_calculations(parsed_package.root)
+
+    assert [qs['name'] for qs in query_subjects] == [f"QS_{i}" for i in range(depth)]
+    assert all([item['name'] for item in qs['items']] == ['ID', 'TOTAL'] for qs in query_subjects)
+    assert [rel['name'] for rel in relationships] == [f"R_{i}" for i in range(depth)]
+    assert len(built) == depth
+    assert relationships[7]['left'] == {'query_subject': '[Layer 7].[QS_7]', 'mincard': 'one', 'maxcard': 'many'}
+    assert list(calculations) == [f"QS_{i}" for i in range(depth)]
+    assert [calc['name'] for calc in calculations['QS_5']] == ['TOTAL']
+    # The three extractors share one traversal of the package
+    assert len(traversals) == 1
+
+
+def test_root_is_used_without_namespaces(tmp_path):
+    """Packages without namespace elements have their model elements found anywhere below the root."""
+    package_file = tmp_path / "flat.xml"
+    package_file.write_text('<project xmlns="http://www.developer.cognos.com/schemas/bmt/60/7">'
+                            '<folder><name>Tables</name><querySubject><name>A</name></querySubject></folder>'
+                            '<querySubject><name>B</name></querySubject></project>', encoding='utf-8')
+    query_subject_extractor, _, _ = extractors(ParsedPackage.from_file(str(package_file)))
+
+    root = ET.parse(package_file).getroot()
+    assert [qs['name'] for qs in query_subject_extractor.extract_query_subjects(root)] == ['A', 'B']
+
+
+@pytest.mark.parametrize('package_name', ["ELECTRIC_GENERATION_MAT.xml", "Shared_IT_Config_Management.xml"])
+def test_package_relationships_are_not_repeated(package_name):
+    """Every relationship of a real package is extracted once, not once per enclosing namespace."""
+    parsed_package = ParsedPackage.from_file(str(PACKAGES_DIR / package_name))
+    _, relationship_extractor, _ = extractors(parsed_package)
+
+    relationships = relationship_extractor.extract_relationships(parsed_package.root)
+
+    assert relationships and len(relationships) == len(parsed_package.elements('relationship'))
+
+
+def test_shared_model_staging_tables(tmp_path, monkeypatch):
+    """Only composite-key relationships of ELECTRIC_GENERATION_MAT get staging tables.
+
+    While every relationship was extracted three times, each table pair looked
+    like it had multiple relationships, so the single-key
+    ITEM_SITE_EXTRACT <-> MANUFACTURER relationship got a staging table too.
+    """
+    monkeypatch.setenv("DAX_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("COGNOS_MIGRATOR_LLM_CACHE", "off")
+    settings = {
+        "date_table_mode": "visible",
+        "table_filtering": {"mode": "direct", "always_include": ["CentralDateTable"]},
+        "staging_tables": {"enabled": True, "naming_prefix": "Dim_", "data_load_mode": "direct_query",
+                           "model_handling": "merged_tables"},
+    }
+    reports = [str(path) for path in sorted(REPORTS_DIR.glob("*.xml"))]
+
+    with MockCognosServer(depth=0) as server:
+        success, _ = migrate_package_with_local_reports(str(PACKAGES_DIR / "ELECTRIC_GENERATION_MAT.xml"),
+                                                        str(tmp_path), reports, server.base_url, "session",
+                                                        settings=settings)
+    assert success
+
+    tables = {path.stem for path in (tmp_path / "pbit" / "Model" / "tables").glob("*.tmdl")}
+    assert {name for name in tables if name.startswith("Dim_")} == {
+        "Dim_ITEM_SITE_EXTRACT_MATERIAL_CHARGES",
+        "Dim_ITEM_SITE_EXTRACT_PURCHASE_ORDER_LINE",
+        "Dim_ITEM_SITE_EXTRACT_STORAGE_LOCATION",
+        "Dim_PURCHASE_ORDER_DESCRIPTIONS_PURCHASE_ORDER_LINE",
+        "Dim_PURCHASE_ORDER_LINE_MATERIAL_CHARGES",
+        "Dim_PURCHASE_ORDER_LINE_PURCHASE_ORDER_RECEIPT",
+        "Dim_PURCHASE_ORDER_LINE_STORAGE_LOCATION",
+    }
+    assert len(tables) == 14
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
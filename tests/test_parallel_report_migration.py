@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Test script to verify parallel report migration keeps results in order,
+isolates failing reports and cancels the batch on session expiry.
+"""
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.client import CognosAPIError
+from cognos_migrator.common.parallel import run_ordered
+from cognos_migrator.config import MigrationConfig, CognosConfig
+from cognos_migrator.migrator import CognosModuleMigratorExplicit
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "cognos_migrator" / "templates"
+
+
+class FakeCognosClient:
+    """Stands in for CognosClient so no Cognos server is needed."""
+
+    def __init__(self, report_count):
+        self.reports = [SimpleNamespace(id=f"r{i}", name=f"Report {i}") for i in range(report_count)]
+
+    def list_reports_in_folder(self, folder_id, recursive=True):
+        return list(self.reports)
+
+
+def create_migrator(tmp_path, report_count, max_workers):
+    migration_config = MigrationConfig(
+        output_directory=str(tmp_path),
+        template_directory=str(TEMPLATE_DIR),
+        max_workers=max_workers
+    )
+    cognos_config = CognosConfig(base_url="http://cognos.invalid", auth_key="IBM-BA-Authorization")
+    return CognosModuleMigratorExplicit(
+        migration_config=migration_config,
+        cognos_config=cognos_config,
+        cognos_url="http://cognos.invalid",
+        session_key="session",
+        cognos_client=FakeCognosClient(report_count)
+    )
+
+
+def test_run_ordered_keeps_input_order():
+    """Results follow the input order even when later items finish first."""
+    def task(delay):
+        time.sleep(delay)
+        return delay
+
+    delays = [0.05, 0.01, 0.03, 0.0]
+    assert run_ordered(delays, task, max_workers=4) == delays
+
+
+def test_run_ordered_cancels_pending_items_on_error():
+    """An escaping exception stops the batch and items not yet started never run."""
+    started = []
+
+    def task(item):
+        started.append(item)
+        if item == 0:
+            raise CognosAPIError("Session key is expired or invalid")
+        time.sleep(0.05)
+        return item
+
+    with pytest.raises(CognosAPIError):
+        run_ordered(list(range(20)), task, max_workers=2)
+
+    assert len(started) < 20
+
+
+def test_migrate_folder_parallel(tmp_path, monkeypatch):
+    """Folder migration runs reports concurrently and isolates failures."""
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def fake_migrate_report(self, report_id, output_path):
+        with lock:
+            active.append(report_id)
+            peak[0] = max(peak[0], len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(report_id)
+        if report_id == "r3":
+            raise RuntimeError("broken report")
+        return report_id != "r5"
+
+    monkeypatch.setattr(CognosModuleMigratorExplicit, "migrate_report", fake_migrate_report)
+    migrator = create_migrator(tmp_path, report_count=8, max_workers=4)
+
+    results = migrator.migrate_folder("folder", str(tmp_path))
+
+    assert list(results) == [f"r{i}" for i in range(8)]
+    assert results["r3"] is False
+    assert results["r5"] is False
+    assert sum(results.values()) == 6
+    assert peak[0] > 1
+
+
+def test_migrate_folder_session_expiry_cancels_batch(tmp_path, monkeypatch):
+    """A CognosAPIError from one report is raised from migrate_folder."""
+    def fake_migrate_report(self, report_id, output_path):
+        if report_id == "r1":
+            raise CognosAPIError("Session key is expired or invalid")
+        time.sleep(0.01)
+        return True
+
+    monkeypatch.setattr(CognosModuleMigratorExplicit, "migrate_report", fake_migrate_report)
+    migrator = create_migrator(tmp_path, report_count=6, max_workers=3)
+
+    with pytest.raises(CognosAPIError):
+        migrator.migrate_folder("folder", str(tmp_path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Test script to verify the TMDL post-processor keeps the same relationships
+with the disjoint-set connectivity index as with a breadth-first search per
+candidate, and resolves a model with 2,000 tables quickly.
+"""
+import logging
+import random
+import sys
+import time
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.processors.tmdl_post_processor import ConnectivityIndex, Graph, TMDLPostProcessor
+
+DATE_TABLE = 'CentralDateTable'
+COLUMNS = ['CUSTOMER_ID', 'ORDER_KEY', 'PART_NUMBER', 'STATUS', 'PLANT_CODE', 'START_DATE', 'DESCRIPTION']
+
+
+@pytest.fixture
+def processor():
+    """Post-processor with a quiet logger; ambiguity resolution logs every candidate."""
+    logger = logging.getLogger('test_relationship_ambiguity')
+    logger.setLevel(logging.ERROR)
+    return TMDLPostProcessor(logger=logger)
+
+
+def synthetic_relationships(tables: int, candidates: int, seed: int):
+    """Random candidate joins between tables, with some joins to and from the date table."""
+    rng = random.Random(seed)
+    names = [f"Table_{i}" for i in range(tables)] + [DATE_TABLE]
+    relationships = []
+    for i in range(candidates):
+        from_table, to_table = rng.choice(names), rng.choice(names)
+        if rng.random() < 0.05:
+            from_table = DATE_TABLE
+        elif rng.random() < 0.1:
+            to_table = DATE_TABLE
+        relationships.append({
+            'id': f"rel_{i}",
+            'from_table': from_table,
+            'from_column': rng.choice(COLUMNS),
+            'to_table': to_table,
+            'to_column': rng.choice(COLUMNS),
+            'raw_body': '',
+        })
+    return relationships, sorted({t for r in relationships for t in (r['from_table'], r['to_table'])})
+
+
+def resolve_with_bfs(processor, relationships, all_tables):
+    """The previous resolution: a breadth-first search on the kept relationships per candidate."""
+    centrality = processor._calculate_centrality(relationships)
+    kept = []
+    graph = Graph(nodes=[t.lower() for t in all_tables])
+    for rel in sorted(relationships, key=lambda r: processor._get_relationship_priority(r, centrality)):
+        from_table, to_table = rel['from_table'].lower(), rel['to_table'].lower()
+        if not graph.path_exists(from_table, to_table, nodes_to_ignore=['centraldatetable']):
+            kept.append(rel)
+            graph.add_edge(from_table, to_table)
+    return kept
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_same_relationships_as_bfs(processor, seed):
+    """Priority order and the kept relationships are unchanged."""
+    relationships, all_tables = synthetic_relationships(tables=60, candidates=400, seed=seed)
+    expected = [r['id'] for r in resolve_with_bfs(processor, relationships, all_tables)]
+    assert [r['id'] for r in processor._resolve_ambiguities(relationships, all_tables)] == expected
+
+
+def test_connectivity_index_ignored_nodes():
+    """Paths start at but never pass through or end at an ignored node, like Graph.path_exists."""
+    index = ConnectivityIndex(['a', 'b', 'c', 'date'], nodes_to_ignore=['DATE'])
+    index.add_edge('a', 'date')
+    index.add_edge('date', 'b')
+    assert not index.path_exists('a', 'b')
+    assert index.path_exists('date', 'a') and index.path_exists('date', 'b')
+    assert not index.path_exists('a', 'date') and not index.path_exists('date', 'c')
+    index.add_edge('b', 'c')
+    assert index.path_exists('date', 'c') and index.path_exists('c', 'b')
+    assert index.path_exists('date', 'date') and not index.path_exists('a', 'unknown')
+
+
+def test_resolves_2000_tables(processor):
+    """2,000 tables and 20,000 candidate joins keep a spanning forest outside the date table."""
+    relationships, all_tables = synthetic_relationships(tables=2000, candidates=20000, seed=42)
+
+    start = time.perf_counter()
+    kept = processor._resolve_ambiguities(relationships, all_tables)
+    elapsed = time.perf_counter() - start
+
+    # Without the date table the kept relationships form a forest: one fewer than the tables they connect
+    forest = [r for r in kept if DATE_TABLE not in (r['from_table'], r['to_table'])]
+    index = ConnectivityIndex([t.lower() for t in all_tables])
+    for rel in forest:
+        assert not index.path_exists(rel['from_table'].lower(), rel['to_table'].lower())
+        index.add_edge(rel['from_table'].lower(), rel['to_table'].lower())
+    assert len(forest) >= 1990
+    assert elapsed < 5, f"Resolving 2,000 tables took {elapsed:.2f}s"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
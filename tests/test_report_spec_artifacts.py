@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Test script to verify the formatted report specification and its layout and
+query components are written from a single parse, with the same content as
+the minidom pretty-printer produced.
+"""
+import logging
+import sys
+import xml.dom.minidom as minidom
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.extractors.packages import ConsolidatedPackageExtractor, ParsedPackage
+from cognos_migrator.generators.utils import XmlDocument, save_report_specification_artifacts, split_report_specification
+
+REPORTS = sorted((Path(__file__).parent.parent / "examples" / "Report XMLs DE").glob("*.xml"))
+PACKAGE_FILE = Path(__file__).parent.parent / "examples" / "packages" / "Services_EID.xml"
+
+SPEC = """<!--before--><report xmlns="http://developer.cognos.com/schemas/report/16.2/" xmlns:x="urn:extra">
+    <!--upgraded-->
+    <queries><query name="Q&amp;A"><filter x:kind="a&quot;b">[A] &lt; 1</filter></query><!--last--></queries>
+    <layouts><layout><textItem> </textItem></layout></layouts>
+    <parameterList/>
+</report>"""
+
+
+def canonical(xml_content: str) -> str:
+    return ET.canonicalize(xml_content, with_comments=True, strip_text=True)
+
+
+def children(xml_content: str):
+    return [child.tag.split('}')[-1] for child in ET.fromstring(xml_content)]
+
+
+@pytest.mark.parametrize('report_file', REPORTS, ids=[r.stem for r in REPORTS])
+def test_formatted_specification_matches_minidom(report_file, tmp_path):
+    """Formatting keeps every element, attribute, text and comment, and the tree is the one extractors parse."""
+    specification = report_file.read_text(encoding='utf-8')
+
+    document = save_report_specification_artifacts(specification, tmp_path)
+
+    formatted = (tmp_path / "report_specification_formatted.xml").read_text(encoding='utf-8')
+    assert canonical(formatted) == canonical(minidom.parseString(specification).toprettyxml(indent='  '))
+    assert ET.tostring(document.root) == ET.tostring(ET.fromstring(specification))
+
+    layout = (tmp_path / "report_layout_specification.xml").read_text(encoding='utf-8')
+    query = (tmp_path / "report_query_specification.xml").read_text(encoding='utf-8')
+    assert children(layout) == [name for name in ('drillBehavior', 'layouts') if name in children(specification)]
+    assert children(query) == [name for name in ('drillBehavior', 'queries', 'parameterList')
+                               if name in children(specification)]
+
+
+def test_comments_namespaces_and_escaping(tmp_path):
+    """Comments stay in place, namespaces are declared once and special characters are escaped."""
+    save_report_specification_artifacts(SPEC, tmp_path)
+
+    formatted = (tmp_path / "report_specification_formatted.xml").read_text(encoding='utf-8')
+    assert canonical(formatted) == canonical(SPEC)
+    assert formatted.splitlines()[1:4] == [
+        '<!--before-->',
+        '<report xmlns="http://developer.cognos.com/schemas/report/16.2/" xmlns:x="urn:extra">',
+        '  <!--upgraded-->',
+    ]
+    assert '<filter x:kind="a&quot;b">[A] &lt; 1</filter>' in formatted
+    assert '<textItem> </textItem>' in formatted
+
+    # The components keep the root's declarations and comments, not the ones outside it
+    layout, query = split_report_specification(tmp_path / "report_specification_formatted.xml")
+    assert (tmp_path / "report_query_specification.xml").read_text(encoding='utf-8') == query
+    assert '<!--before-->' not in query and '<!--upgraded-->' in query and '<!--last-->' in query
+    assert canonical(query) == canonical(
+        '<report xmlns="http://developer.cognos.com/schemas/report/16.2/"><!--upgraded-->'
+        '<queries><query name="Q&amp;A"><filter xmlns:x="urn:extra" x:kind="a&quot;b">[A] &lt; 1</filter></query>'
+        '<!--last--></queries><parameterList/></report>')
+    assert children(layout) == ['layouts']
+
+    # Elements without declarations in scope get one
+    assert XmlDocument(ET.Element('{urn:a}r', {'{urn:b}x': '1'})).to_string().splitlines()[1] == \
+        '<ns1:r xmlns:ns1="urn:a" xmlns:ns2="urn:b" ns2:x="1"/>'
+
+
+def test_invalid_specification_is_reported(tmp_path):
+    with pytest.raises(ET.ParseError):
+        save_report_specification_artifacts("<report><queries></report>", tmp_path)
+    layout, query = split_report_specification(tmp_path / "missing.xml")
+    assert ET.fromstring(layout).tag == ET.fromstring(query).tag == 'report'
+
+
+def test_formatted_package_is_written_from_the_parsed_tree(tmp_path, monkeypatch):
+    """The formatted package copy keeps the original prefixes and reuses the package's tree."""
+    parsed_package = ParsedPackage.from_file(str(PACKAGE_FILE))
+    monkeypatch.setattr(minidom, 'parseString', lambda *args: pytest.fail("package parsed again"))
+    monkeypatch.setattr(ParsedPackage, 'from_file', lambda *args, **kwargs: pytest.fail("package parsed again"))
+
+    ConsolidatedPackageExtractor().extract_package(str(PACKAGE_FILE), str(tmp_path), parsed_package=parsed_package)
+
+    specification = PACKAGE_FILE.read_text(encoding='utf-8')
+    for name in (f"{PACKAGE_FILE.stem}_formatted.xml", PACKAGE_FILE.name):
+        formatted = (tmp_path / name).read_text(encoding='utf-8')
+        assert ET.canonicalize(formatted, strip_text=True) == ET.canonicalize(specification, strip_text=True)
+        assert formatted.splitlines()[1].startswith('<project xmlns="http://www.developer.cognos.com/schemas/bmt/60/7"')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
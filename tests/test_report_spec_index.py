@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Test script to verify the single-pass report specification index answers the
+same lookups as the ElementTree searches it replaces.
+"""
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.extractors import (
+    BaseExtractor, DataItemExtractor, ExpressionExtractor, ReportSpecIndex
+)
+
+REPORT_FILE = Path(__file__).parent.parent / "examples" / "Report XMLs DE" / "MaterialInquiryDetail_UC012.xml"
+
+
+def load_report():
+    """Parse the example report and detect its namespace like the migrator does."""
+    root = ET.parse(REPORT_FILE).getroot()
+    ns = {}
+    if root.tag.startswith('{'):
+        ns['ns'] = root.tag.split('}')[0].strip('{')
+    return root, ns
+
+
+def test_index_matches_descendant_searches():
+    """find/findall on the index must match BaseExtractor's './/' searches."""
+    root, ns = load_report()
+    index = ReportSpecIndex(root, ns)
+    base = BaseExtractor()
+
+    for tag in ["query", "dataItem", "expression", "filterExpression", "selection", "page", "list"]:
+        assert index.findall(root, tag) == base.findall_elements(root, tag, ns), tag
+        for parent in base.findall_elements(root, "query", ns):
+            assert index.findall(parent, tag) == base.findall_elements(parent, tag, ns), tag
+            assert index.find(parent, tag) is base.find_element(parent, tag, ns), tag
+
+
+def test_expression_context_lookups():
+    """Expression elements map back to their owning dataItem and query."""
+    root, ns = load_report()
+    index = ReportSpecIndex(root, ns)
+
+    for query in index.elements("query"):
+        for data_item in index.findall(query, "dataItem"):
+            expression = index.find(data_item, "expression")
+            if expression is None:
+                continue
+            assert index.data_item_for(expression) is data_item
+            assert index.query_for(expression) is query
+
+
+def test_extractors_share_index():
+    """Extractors give the same result with a shared index and with their own."""
+    root, ns = load_report()
+    index = ReportSpecIndex(root, ns)
+
+    assert DataItemExtractor().extract_data_items(root, ns, spec_index=index) == \
+        DataItemExtractor().extract_data_items(root, ns)
+    assert ExpressionExtractor().extract_expressions(root, ns, spec_index=index) == \
+        ExpressionExtractor().extract_expressions(root, ns)
+
+
+if __name__ == "__main__":
+    test_index_matches_descendant_searches()
+    test_expression_context_lookups()
+    test_extractors_share_index()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Test script to verify the streaming query subject extractor produces the same
+output as the tree-based extractor.
+"""
+import logging
+import sys
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.extractors.packages import (
+    ConsolidatedPackageExtractor, PackageQuerySubjectExtractor, StreamingQuerySubjectExtractor, ParsedPackage
+)
+
+PACKAGES_DIR = Path(__file__).parent.parent / "examples" / "packages"
+
+# One package per FM schema version (60/12, 60/7, 60/1, 60/11)
+PACKAGES = [
+    "CAM Dmail Reporting.xml",
+    "Services_EID.xml",
+    "ELECTRIC_GENERATION_MAT.xml",
+    "SHARED_KEY_ACCOUNTS.xml",
+]
+
+
+def test_streaming_query_subjects_match_tree_extraction(tmp_path):
+    """The streamed query_subjects.json must be identical to the tree-based one."""
+    logger = logging.getLogger(__name__)
+
+    for package_name in PACKAGES:
+        package_file = str(PACKAGES_DIR / package_name)
+        tree_dir = tmp_path / "tree" / package_name
+        stream_dir = tmp_path / "stream" / package_name
+
+        # The tree-based extractor is used with resolved namespaces, as in ConsolidatedPackageExtractor
+        parsed_package = ParsedPackage.from_file(package_file, logger)
+        tree_result = PackageQuerySubjectExtractor(logger).extract_and_save(package_file, str(tree_dir), parsed_package)
+        count = StreamingQuerySubjectExtractor(logger).stream_to_json(package_file, stream_dir)
+
+        assert count == len(tree_result["query_subjects"]), package_name
+        assert (stream_dir / "query_subjects.json").read_bytes() == \
+            (tree_dir / "query_subjects.json").read_bytes(), package_name
+
+
+def test_streaming_query_subjects_are_unique_by_name():
+    """Query subjects are emitted once per name, in document order."""
+    package_file = str(PACKAGES_DIR / "Shared_FH_Station_Logs_Datamart.xml")
+
+    names = [qs["name"] for qs in StreamingQuerySubjectExtractor().iter_query_subjects(package_file)]
+
+    assert names
+    assert len(names) == len(set(names))
+
+
+def test_consolidated_streaming_mode_does_not_share_the_tree(tmp_path, monkeypatch):
+    """In streaming mode query subjects are streamed before the tree is built and written by stream_to_json."""
+    package_file = str(PACKAGES_DIR / "ELECTRIC_GENERATION_MAT.xml")
+    tree_extractor = ConsolidatedPackageExtractor()
+    tree_info = tree_extractor.extract_package(package_file, str(tmp_path / "tree"))
+
+    events = []
+    stream_to_json = StreamingQuerySubjectExtractor.stream_to_json
+    from_file = ParsedPackage.from_file.__func__
+    monkeypatch.setattr(StreamingQuerySubjectExtractor, 'stream_to_json',
+                        lambda self, *args, **kwargs: events.append('stream') or stream_to_json(self, *args, **kwargs))
+    monkeypatch.setattr(ParsedPackage, 'from_file',
+                        classmethod(lambda cls, *args, **kwargs: events.append('tree') or from_file(cls, *args, **kwargs)))
+
+    extractor = ConsolidatedPackageExtractor(config={'package_extraction': {'query_subject_engine': 'streaming'}})
+    stream_info = extractor.extract_package(package_file, str(tmp_path / "stream"))
+
+    assert events == ['stream', 'tree']
+    assert extractor.query_subject_extractor.parsed_package is None
+    assert stream_info['query_subjects'] == tree_info['query_subjects']
+    assert (tmp_path / "stream" / "query_subjects.json").read_bytes() == \
+        (tmp_path / "tree" / "query_subjects.json").read_bytes()
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_streaming_query_subjects_match_tree_extraction(Path(tmp))
+    test_streaming_query_subjects_are_unique_by_name()
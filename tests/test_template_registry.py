@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Test script to verify compiled templates are shared by all TemplateEngine
+instances, recompiled when a template file changes, and that Jinja2 bytecode
+can be cached on disk across registries.
+"""
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from jinja2 import Environment
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.generators.template_engine import TEMPLATE_FILES, TemplateEngine
+from cognos_migrator.generators.template_registry import JINJA, TemplateRegistry, get_template_registry
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "cognos_migrator" / "templates"
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """A private copy of the templates, so compiled entries are not shared with other tests."""
+    directory = tmp_path / "templates"
+    shutil.copytree(TEMPLATE_DIR, directory)
+    return directory
+
+
+def test_engines_share_compiled_templates(template_dir):
+    """Only the first engine for a directory compiles anything."""
+    registry = get_template_registry()
+    first = TemplateEngine(str(template_dir))
+    compiles = registry.stats()['compiles']
+
+    second = TemplateEngine(str(template_dir))
+    assert registry.stats()['compiles'] == compiles
+    assert second.templates['table'] is first.templates['table']
+    assert second.templates['model'] is first.templates['model']
+    assert second.render('version', {}) == first.render('version', {}) == "1.28"
+
+
+def test_changed_template_is_recompiled(template_dir):
+    """Editing a template file, or invalidating the directory, recompiles it on next use."""
+    registry = get_template_registry()
+    engine = TemplateEngine(str(template_dir))
+    assert "edited" not in engine.render('version', {})
+
+    version_file = template_dir / "version.txt"
+    version_file.write_text(version_file.read_text(encoding='utf-8') + "\nedited", encoding='utf-8')
+    invalidations = registry.stats()['invalidations']
+
+    edited = TemplateEngine(str(template_dir))
+    assert "edited" in edited.render('version', {})
+    assert registry.stats()['invalidations'] == invalidations + 1
+    # Engines created before the edit keep their templates
+    assert "edited" not in engine.render('version', {})
+
+    template_count = len({info['filename'] for info in TEMPLATE_FILES.values()})
+    assert registry.invalidate(template_dir) == template_count
+    compiles = registry.stats()['compiles']
+    TemplateEngine(str(template_dir))
+    assert registry.stats()['compiles'] == compiles + template_count
+
+
+def test_jinja_bytecode_is_reused_across_registries(template_dir, tmp_path, monkeypatch):
+    """A new process, modelled by a new registry, loads Jinja2 bytecode instead of compiling."""
+    cache_dir = tmp_path / "bytecode"
+    TemplateRegistry(bytecode_cache_dir=cache_dir).get(template_dir, "model.tmdl", JINJA)
+    assert any(cache_dir.iterdir())
+
+    compiled = []
+    original_compile = Environment.compile
+
+    def counting_compile(self, *args, **kwargs):
+        compiled.append(args)
+        return original_compile(self, *args, **kwargs)
+
+    monkeypatch.setattr(Environment, "compile", counting_compile)
+    registry = TemplateRegistry(bytecode_cache_dir=cache_dir)
+    template = registry.get(template_dir, "model.tmdl", JINJA)
+
+    assert compiled == []
+    assert registry.stats()['compiles'] == 1
+    assert template.render(model={'name': 'Sales'}, tables=[], relationships=[]) is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Test script to verify table TMDL streamed by the table writer matches the
+pybars rendering of Table.tmdl, that a customized Table.tmdl disables the
+writer, and that Jinja2 templates only get the context they reference.
+"""
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.generators import template_engine as template_engine_module
+from cognos_migrator.generators.template_engine import TemplateEngine, get_render_metrics
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "cognos_migrator" / "templates"
+
+TABLE_CONTEXT = {
+    'source_name': "Sales & <Returns>",
+    'has_spaces_or_special_chars': True,
+    'is_hidden': False,
+    'columns': [
+        {'source_name': "Order 'Id'", 'datatype': 'int64', 'source_column': 'ORDER_ID', 'summarize_by': 'none',
+         'annotations': {'SummarizationSetBy': 'Automatic'}},
+        {'source_name': 'Amount', 'datatype': 'decimal', 'source_column': 'AMOUNT', 'summarize_by': 'sum',
+         'format_string': '#,0.00', 'is_hidden': True, 'annotations': {'PBI_FormatHint': True}},
+        {'source_name': 'Margin', 'datatype': 'double', 'source_column': '[Amount] * 0.2 <> 0',
+         'is_calculated': True, 'relationship_info': {'id': 'rel-1', 'hierarchy': "'Date'.'Hierarchy'"}},
+        {'source_name': 'Flag', 'datatype': 'boolean', 'source_column': None, 'is_data_type_inferred': True},
+    ],
+    'measures': [{'name': 'Total "Amount"', 'expression': "SUM('Sales'[Amount])", 'format_string': '0'}],
+    'hierarchies': [{'name': 'Dates', 'levels': [{'name': 'Year', 'column_name': 'Year', 'ordinal': 1}]}],
+    'partitions': [{'name': 'Sales', 'source_type': 'm', 'mode': 'import',
+                    'expression': 'let\n    Source = "x & y"\nin\n    Source'}],
+    'has_widget_serialization': True,
+    'visual_type': 'Table',
+    'column_settings': '[]',
+}
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """A private copy of the templates, which tests may edit."""
+    directory = tmp_path / "templates"
+    shutil.copytree(TEMPLATE_DIR, directory)
+    return directory
+
+
+def test_table_writer_matches_pybars(tmp_path):
+    """Streamed table TMDL is identical to the handlebars rendering, including escaping."""
+    engine = TemplateEngine(str(TEMPLATE_DIR))
+    assert engine.table_writer is not None
+
+    expected = engine.templates['table'](TABLE_CONTEXT)
+    assert engine.render('table', TABLE_CONTEXT) == expected
+    assert engine.render('table', {'source_name': 'Empty'}) == engine.templates['table']({'source_name': 'Empty'})
+
+    table_file = tmp_path / "Sales.tmdl"
+    engine.render_to_file('table', TABLE_CONTEXT, table_file)
+    assert table_file.read_text(encoding='utf-8') == expected
+
+
+def test_customized_table_template_uses_pybars(template_dir, tmp_path):
+    """The writer only reproduces the stock template, so an edited Table.tmdl is rendered by pybars."""
+    table_template = template_dir / "Table.tmdl"
+    table_template.write_text(table_template.read_text(encoding='utf-8') + "\n// custom", encoding='utf-8')
+
+    engine = TemplateEngine(str(template_dir))
+    assert engine.table_writer is None
+    table_file = tmp_path / "Sales.tmdl"
+    engine.render_to_file('table', TABLE_CONTEXT, table_file)
+    assert table_file.read_text(encoding='utf-8').endswith("// custom")
+
+
+def test_lazy_context_skips_unreferenced_values(monkeypatch):
+    """Only referenced variables are converted, and *_json keys only when the template uses them."""
+    converted = []
+    original = template_engine_module.model_to_dict
+
+    def counting_model_to_dict(value):
+        converted.append(value)
+        return original(value)
+
+    monkeypatch.setattr(template_engine_module, "model_to_dict", counting_model_to_dict)
+    context = {'version': '1.0', 'unused': [{'big': 'value'}]}
+
+    lazy = TemplateEngine(str(TEMPLATE_DIR))
+    eager = TemplateEngine(str(TEMPLATE_DIR), lazy_context=False)
+    assert 'unused' not in lazy.template_variables['pbixproj']
+
+    assert lazy.render('pbixproj', context) == eager.render('pbixproj', context)
+    # The eager engine converted both values, the lazy engine only the referenced one
+    assert converted.count(context['unused']) == 1
+
+    captured = {}
+    template = lazy.templates['pbixproj']
+    monkeypatch.setattr(template, "render", lambda **kwargs: captured.update(kwargs) or "")
+    lazy.render('pbixproj', context)
+    assert 'unused' not in captured and 'unused_json' not in captured
+
+
+def test_render_metrics_histogram():
+    """Each render is counted in the template's histogram."""
+    metrics = get_render_metrics()
+    metrics.reset()
+    engine = TemplateEngine(str(TEMPLATE_DIR))
+    for _ in range(3):
+        engine.render('table', TABLE_CONTEXT)
+    engine.render('version', {})
+
+    snapshot = metrics.snapshot()
+    assert snapshot['table']['renders'] == 3
+    assert sum(snapshot['table']['buckets'].values()) == 3
+    assert snapshot['version']['renders'] == 1
+    assert snapshot['table']['ms_mean'] >= 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Test script to verify WebSocket progress messages keep their task context when
+several migrations run in one process, that they are delivered on the calling
+thread by default, and that opt-in background delivery never blocks the
+migration thread.
+"""
+import logging
+import sys
+import threading
+import time
+
+import pytest
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+from cognos_migrator.common.parallel import run_ordered
+from cognos_migrator.common.websocket_client import (
+    flush_websocket_data, get_task_id, increment_progress, logging_helper,
+    set_async_delivery, set_db_save_batch_function, set_task_info, set_websocket_post_function, task_context
+)
+
+
+@pytest.fixture
+def posted():
+    """Collect posted messages and restore the module state afterwards."""
+    messages = []
+    lock = threading.Lock()
+
+    def post(data):
+        with lock:
+            messages.append(data)
+
+    set_websocket_post_function(post)
+    yield messages
+    flush_websocket_data(timeout=5)
+    set_async_delivery(False)
+    set_websocket_post_function(None)
+    set_db_save_batch_function(None)
+
+
+def test_concurrent_tasks_keep_their_own_task_id(posted):
+    """Messages from concurrent migrations carry the task ID of their own thread."""
+    def migration(task_id):
+        set_task_info(task_id, total_steps=5)
+        for step in range(5):
+            increment_progress()
+            logging_helper(f"{task_id} step {step}")
+            time.sleep(0.001)
+        return get_task_id()
+
+    threads = [threading.Thread(target=migration, args=(f"task-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert flush_websocket_data(timeout=5)
+
+    assert len(posted) == 20
+    for data in posted:
+        assert data["message"].startswith(data["task_id"] + " ")
+    # Progress is counted per task
+    assert sorted(d["progress"] for d in posted if d["task_id"] == "task-0") == [20, 40, 60, 80, 100]
+
+
+def test_nested_task_does_not_overwrite_outer_task(posted):
+    """Task information set inside a batch item stays local to that item."""
+    previous_task_id = get_task_id()
+    with task_context("shared-model", total_steps=10):
+        run_ordered(["a", "b"], lambda item: set_task_info(f"report-{item}", 8), max_workers=2)
+        logging_helper("after reports")
+        assert get_task_id() == "shared-model"
+    assert get_task_id() == previous_task_id
+
+    assert flush_websocket_data(timeout=5)
+    assert posted[-1]["task_id"] == "shared-model"
+
+
+def test_messages_are_delivered_on_the_calling_thread_by_default(posted):
+    """Without opt-in, each message is delivered and saved before logging_helper returns."""
+    saved_on = []
+    set_db_save_batch_function(lambda batch: saved_on.append(threading.current_thread()))
+
+    logging_helper("done", progress=100)
+
+    assert [d["message"] for d in posted] == ["done"]
+    assert saved_on == [threading.current_thread()]
+
+
+def test_task_context_exit_delivers_queued_messages(posted):
+    """With background delivery, a task's last message is delivered when its context ends."""
+    def slow_post(data):
+        time.sleep(0.05)
+        posted.append(data)
+
+    set_async_delivery(True)
+    set_websocket_post_function(slow_post)
+    with task_context("finishing-task"):
+        logging_helper("Migration completed successfully", progress=100)
+    assert [d["message"] for d in posted] == ["Migration completed successfully"]
+
+
+def test_slow_receivers_do_not_block_logging(posted):
+    """With background delivery, logging_helper returns immediately and the database is written in batches."""
+    batches = []
+    set_async_delivery(True)
+
+    def slow_post(data):
+        time.sleep(0.05)
+        posted.append(data)
+
+    set_websocket_post_function(slow_post)
+    set_db_save_batch_function(batches.append)
+
+    with task_context("slow-task"):
+        start = time.perf_counter()
+        for i in range(10):
+            logging_helper(f"message {i}")
+        assert time.perf_counter() - start < 0.25
+
+    assert flush_websocket_data(timeout=5)
+    assert [d["message"] for d in posted] == [f"message {i}" for i in range(10)]
+    assert sum(len(batch) for batch in batches) == 10
+    assert len(batches) < 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])